@@ -1,10 +1,11 @@
-from typing import AsyncGenerator, Optional, List
+from typing import AsyncGenerator, Optional, List, Tuple
 import logging
 from datetime import datetime
-from app.domain.models.session import Session, SessionSummary
+from app.domain.models.session import Session, SessionSummary, SessionEventPage
 from app.domain.repositories.session_repository import SessionRepository
 from app.domain.repositories.file_favorite_repository import FileFavoriteRepository
-from app.application.errors.exceptions import NotFoundError
+from app.domain.repositories.library_file_repository import LibraryFileRepository
+from app.application.errors.exceptions import BadRequestError, NotFoundError
 
 from app.interfaces.schemas.session import ShellViewResponse
 from app.interfaces.schemas.file import FileViewResponse
@@ -13,7 +14,7 @@ from app.domain.services.agent_domain_service import AgentDomainService
 from app.domain.models.event import AgentEvent
 from typing import Type
 from app.domain.models.agent import Agent
-from app.domain.external.sandbox import Sandbox
+from app.domain.external.sandbox import Sandbox, SandboxPool
 from app.domain.external.search import SearchEngine
 from app.domain.external.file import FileStorage
 from app.domain.external.llm import LLM
@@ -39,12 +40,15 @@ class AgentService:
         llm: LLM,
         search_engine: Optional[SearchEngine] = None,
         file_favorite_repository: Optional[FileFavoriteRepository] = None,
+        sandbox_pool: Optional[SandboxPool] = None,
+        library_file_repository: Optional[LibraryFileRepository] = None,
     ):
         logger.info("Initializing AgentService")
         self._agent_repository = agent_repository
         self._session_repository = session_repository
         self._file_storage = file_storage
         self._file_favorite_repository = file_favorite_repository
+        self._library_file_repository = library_file_repository
         self._agent_domain_service = AgentDomainService(
             self._agent_repository,
             self._session_repository,
@@ -54,6 +58,7 @@ class AgentService:
             mcp_repository,
             llm,
             search_engine,
+            sandbox_pool=sandbox_pool,
         )
         self._search_engine = search_engine
         self._sandbox_cls = sandbox_cls
@@ -111,6 +116,52 @@ class AgentService:
             logger.error(f"Session {session_id} not found for user {user_id}")
         return session
     
+    async def get_session_events(
+        self,
+        session_id: str,
+        user_id: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get a page of session events after the cursor, ensuring it belongs to the user"""
+        if user_id and not await self._session_repository.find_summary_by_id_and_user_id(session_id, user_id):
+            logger.error(f"Session {session_id} not found for user {user_id}")
+            raise NotFoundError("Session not found")
+        return await self._session_repository.get_events(session_id, cursor, limit)
+
+    async def get_session_events_before(
+        self,
+        session_id: str,
+        user_id: Optional[str] = None,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get the page of session events preceding the cursor, the latest when None"""
+        if user_id and not await self._session_repository.find_summary_by_id_and_user_id(session_id, user_id):
+            logger.error(f"Session {session_id} not found for user {user_id}")
+            raise NotFoundError("Session not found")
+        return await self._session_repository.get_events_before(session_id, before, limit)
+
+    async def get_session_events_after(
+        self,
+        session_id: str,
+        event_id: Optional[str],
+        limit: Optional[int] = None,
+    ) -> AsyncGenerator[SessionEventPage, None]:
+        """Page through session events strictly after the given event ID.
+
+        An unknown (or missing) event ID replays the whole history.
+        """
+        cursor = None
+        if event_id:
+            cursor = await self._session_repository.get_event_sequence(session_id, event_id)
+        while True:
+            page = await self._session_repository.get_events(session_id, cursor, limit)
+            yield page
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
     async def get_all_sessions(self, user_id: str) -> List[SessionSummary]:
         """Get all sessions for a specific user (lightweight summaries)"""
         logger.info(f"Getting all sessions for user {user_id}")
@@ -198,48 +249,53 @@ class AgentService:
         await self._file_favorite_repository.set_favorite(user_id, file_id, is_favorite)
 
     async def _user_owns_library_file(self, user_id: str, file_id: str) -> bool:
-        sessions = await self._session_repository.find_by_user_id(user_id)
-        for session in sessions:
-            for file_info in session.files or []:
-                if file_info.file_id == file_id:
-                    return True
-        return False
-
-    async def get_library_files(self, user_id: str, limit: int = 100) -> List[dict]:
-        """Aggregate recent files across the user's sessions for Library view"""
-        sessions = await self._session_repository.find_by_user_id(user_id)
-        sessions = sorted(
-            sessions,
-            key=lambda s: s.latest_message_at or s.updated_at,
-            reverse=True,
-        )
-        favorite_ids: set[str] = set()
-        if self._file_favorite_repository:
-            favorite_ids = await self._file_favorite_repository.list_favorite_file_ids(user_id)
+        if not self._library_file_repository:
+            raise RuntimeError("Library file repository not available")
+        return await self._library_file_repository.owns_file(user_id, file_id)
+
+    async def get_library_files(
+        self,
+        user_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Get a page of the files attached to the user's sessions for Library view
+
+        Returns:
+            The files, most recently attached first, and the cursor of the
+            next page (None on the last page)
+        """
+        if not self._library_file_repository:
+            raise RuntimeError("Library file repository not available")
+        try:
+            page = await self._library_file_repository.list_files(user_id, limit, cursor)
+        except ValueError as e:
+            raise BadRequestError(str(e))
+        session_ids = list(dict.fromkeys(file_info.session_id for file_info in page.files))
+        sessions = {
+            summary.id: summary
+            for summary in await self._session_repository.find_summaries_by_ids(session_ids)
+        }
         items: List[dict] = []
-        for session in sessions:
-            for file_info in session.files or []:
-                upload_date = getattr(file_info, "upload_date", None)
-                file_id = file_info.file_id
-                items.append({
-                    "session_id": session.id,
-                    "session_title": session.title,
-                    "file_id": file_id,
-                    "filename": file_info.filename,
-                    "file_path": getattr(file_info, "file_path", None),
-                    "content_type": getattr(file_info, "content_type", None),
-                    "size": getattr(file_info, "size", None),
-                    "upload_date": upload_date.isoformat() if upload_date else None,
-                    "is_favorite": bool(file_id and file_id in favorite_ids),
-                    "latest_message_at": (
-                        int(session.latest_message_at.timestamp())
-                        if session.latest_message_at
-                        else None
-                    ),
-                })
-                if len(items) >= limit:
-                    return items
-        return items
+        for file_info in page.files:
+            session = sessions.get(file_info.session_id)
+            items.append({
+                "session_id": file_info.session_id,
+                "session_title": session.title if session else None,
+                "file_id": file_info.file_id,
+                "filename": file_info.filename,
+                "file_path": file_info.file_path,
+                "content_type": file_info.content_type,
+                "size": file_info.size,
+                "upload_date": file_info.upload_date.isoformat() if file_info.upload_date else None,
+                "is_favorite": file_info.is_favorite,
+                "latest_message_at": (
+                    int(session.latest_message_at.timestamp())
+                    if session and session.latest_message_at
+                    else None
+                ),
+            })
+        return items, page.next_cursor
 
     async def stop_session(self, session_id: str, user_id: str) -> None:
         """Stop a session, ensuring it belongs to the user"""
@@ -375,6 +431,30 @@ class AgentService:
         await self._session_repository.update_shared_status(session_id, False)
         logger.info(f"Session {session_id} unshared successfully")
 
+    async def get_shared_session_events(
+        self,
+        session_id: str,
+        cursor: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get a page of events of a shared session"""
+        session = await self.get_shared_session(session_id)
+        if not session:
+            raise NotFoundError("Shared session not found")
+        return await self._session_repository.get_events(session_id, cursor, limit)
+
+    async def get_shared_session_events_before(
+        self,
+        session_id: str,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get the page of events of a shared session preceding the cursor"""
+        session = await self.get_shared_session(session_id)
+        if not session:
+            raise NotFoundError("Shared session not found")
+        return await self._session_repository.get_events_before(session_id, before, limit)
+
     async def get_shared_session(self, session_id: str) -> Optional[Session]:
         """Get a shared session by ID (no user authentication required)"""
         logger.info(f"Getting shared session {session_id}")
@@ -1,6 +1,7 @@
 import hashlib
 import secrets
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta, UTC
 from app.domain.models.user import User, UserRole
 from app.domain.repositories.user_repository import UserRepository
@@ -19,6 +20,9 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on users kept in the in-process user cache
+USER_CACHE_MAX_SIZE = 10_000
+
 
 class AuthService:
     """Authentication service handling user authentication and authorization"""
@@ -33,6 +37,8 @@ class AuthService:
         self.settings = get_settings()
         self.token_service = token_service
         self.session_store = session_store
+        # user_id -> (cached_at, user) for users resolved from credentials
+        self._user_cache: Dict[str, Tuple[float, User]] = {}
 
     def _hash_password(self, password: str) -> str:
         salt = self.settings.password_salt or ''
@@ -67,6 +73,9 @@ class AuthService:
             return max(1, self.settings.session_app_ttl_days * 24 * 3600)
         return max(1, self.settings.session_web_ttl_days * 24 * 3600)
 
+    def _ttl_seconds_by_client(self) -> Dict[AuthClientType, int]:
+        return {client: self._ttl_seconds_for_client(client) for client in AuthClientType}
+
     def parse_client(self, raw: Optional[str]) -> AuthClientType:
         if not raw:
             return AuthClientType.UNKNOWN
@@ -99,11 +108,41 @@ class AuthService:
         await self.session_store.create(session, ttl)
         return session
 
+    def _cached_user(self, user_id: str) -> Optional[User]:
+        entry = self._user_cache.get(user_id)
+        if entry is None:
+            return None
+        cached_at, user = entry
+        if time.monotonic() - cached_at > self.settings.auth_user_cache_ttl:
+            self._user_cache.pop(user_id, None)
+            return None
+        # Callers may modify the user they get back
+        return user.model_copy()
+
+    def _cache_user(self, user: User) -> None:
+        if self.settings.auth_user_cache_ttl <= 0:
+            return
+        self._user_cache.pop(user.id, None)
+        if len(self._user_cache) >= USER_CACHE_MAX_SIZE:
+            # Oldest entry first in insertion order
+            self._user_cache.pop(next(iter(self._user_cache)))
+        self._user_cache[user.id] = (time.monotonic(), user.model_copy())
+
+    async def _update_user(self, user: User) -> User:
+        """Persist a user change and drop the cached copy"""
+        updated = await self.user_repository.update_user(user)
+        self._user_cache.pop(user.id, None)
+        return updated
+
     async def _user_from_id(self, user_id: str) -> Optional[User]:
         if self.settings.auth_provider == "password":
+            user = self._cached_user(user_id)
+            if user:
+                return user
             user = await self.user_repository.get_user_by_id(user_id)
             if not user or not user.is_active:
                 return None
+            self._cache_user(user)
             return user
         if self.settings.auth_provider == "local" and user_id == "local_admin":
             return User(
@@ -116,11 +155,10 @@ class AuthService:
         return None
 
     async def resolve_session_token(self, token: str) -> Optional[ResolvedCredentials]:
-        session = await self.session_store.get(token)
+        # Validation and sliding renewal in a single store call
+        session = await self.session_store.touch(token, self._ttl_seconds_by_client())
         if not session:
             return None
-        ttl = self._ttl_seconds_for_client(session.client)
-        await self.session_store.touch(token, ttl)
         return ResolvedCredentials(
             session_id=session.session_id,
             user_id=session.user_id,
@@ -255,7 +293,7 @@ class AuthService:
                 logger.warning(f"Invalid password for user: {email}")
                 return None
             user.update_last_login()
-            await self.user_repository.update_user(user)
+            await self._update_user(user)
             logger.info(f"User authenticated successfully: {email}")
             return user
 
@@ -389,7 +427,7 @@ class AuthService:
             raise ValidationError("New password must be at least 6 characters long")
         user.password_hash = self._hash_password(new_password)
         user.updated_at = datetime.utcnow()
-        await self.user_repository.update_user(user)
+        await self._update_user(user)
         logger.info(f"Password changed successfully for user: {user_id}")
         return True
 
@@ -404,7 +442,7 @@ class AuthService:
             raise ValidationError("Full name must be at least 2 characters long")
         user.fullname = new_fullname.strip()
         user.updated_at = datetime.utcnow()
-        updated_user = await self.user_repository.update_user(user)
+        updated_user = await self._update_user(user)
         logger.info(f"Fullname changed successfully for user: {user_id}")
         return updated_user
 
@@ -417,7 +455,7 @@ class AuthService:
         if not user:
             raise ValidationError("User not found")
         user.deactivate()
-        await self.user_repository.update_user(user)
+        await self._update_user(user)
         logger.info(f"User deactivated successfully: {user_id}")
         return True
 
@@ -427,7 +465,7 @@ class AuthService:
         if not user:
             raise ValidationError("User not found")
         user.activate()
-        await self.user_repository.update_user(user)
+        await self._update_user(user)
         logger.info(f"User activated successfully: {user_id}")
         return True
 
@@ -444,6 +482,6 @@ class AuthService:
             raise ValidationError("New password must be at least 6 characters long")
         user.password_hash = self._hash_password(new_password)
         user.updated_at = datetime.utcnow()
-        await self.user_repository.update_user(user)
+        await self._update_user(user)
         logger.info(f"Password reset successfully for user: {email}")
         return True
@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional, BinaryIO, Tuple
+from typing import AsyncIterator, Dict, Any, Optional, BinaryIO, Tuple
 import logging
 from app.domain.external.file import FileStorage
 from app.domain.models.file import FileInfo
@@ -42,6 +42,13 @@ class FileService:
             logger.error(f"Failed to download file {file_id} for user {user_id}: {str(e)}")
             raise
 
+    def stream_file(self, file_id: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Stream a byte range of a file; check access with get_file_info first"""
+        if not self._file_storage:
+            logger.error("File storage service not available")
+            raise RuntimeError("File storage service not available")
+        return self._file_storage.stream_file(file_id, start, end)
+
     async def delete_file(self, file_id: str, user_id: str) -> bool:
         """Delete file"""
         logger.info(f"Delete file request: file_id={file_id}, user_id={user_id}")
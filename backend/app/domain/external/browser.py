@@ -72,9 +72,14 @@ class Browser(Protocol):
     
     async def screenshot(
         self,
-        full_page: Optional[bool] = False
+        full_page: Optional[bool] = False,
+        quality: Optional[int] = None
     ) -> bytes:
-        """Take a screenshot of the current page"""
+        """Take a screenshot of the current page, as JPEG when quality is given, else PNG"""
+        ...
+
+    async def page_fingerprint(self) -> Optional[str]:
+        """Cheap digest of what a screenshot would show, or None when unknown"""
         ...
     
     async def console_exec(self, javascript: str) -> ToolResult:
@@ -1,6 +1,29 @@
-from typing import Protocol, BinaryIO, Optional, Dict, Any, Tuple
+from typing import AsyncIterator, Protocol, BinaryIO, Optional, Dict, Any, Tuple
+import hashlib
 from app.domain.models.file import FileInfo
 
+# Metadata key holding the SHA-256 of a stored file's content
+CONTENT_HASH_KEY = "sha256"
+# Metadata key scoping stored content; uploads only share content of the
+# same kind, and plain user files have none
+CONTENT_KIND_KEY = "kind"
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_hash(file_data: BinaryIO) -> str:
+    """Return the SHA-256 hex digest of a seekable stream's content
+
+    The stream is read from its start and rewound afterwards.
+    """
+    digest = hashlib.sha256()
+    file_data.seek(0)
+    for chunk in iter(lambda: file_data.read(_HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    file_data.seek(0)
+    return digest.hexdigest()
+
+
 class FileStorage(Protocol):
     """File storage service interface for file upload and download operations"""
     
@@ -13,6 +36,13 @@ class FileStorage(Protocol):
         metadata: Optional[Dict[str, Any]] = None
     ) -> FileInfo:
         """Upload file to storage
+
+        Content is stored once per user, kind and SHA-256: uploading
+        identical content again, under any name, returns the existing file
+        and counts one more reference to it. The kind is read from
+        ``metadata[CONTENT_KIND_KEY]``, so e.g. browser frames never share
+        an entry with user files. Where the file is used (session, path) is
+        recorded by the caller, not by the storage.
         
         Args:
             file_data: Binary file data stream
@@ -41,8 +71,26 @@ class FileStorage(Protocol):
             FileDownloadResult containing file data and metadata for FastAPI streaming
         """
         ...
-    
 
+    def stream_file(
+        self,
+        file_id: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a byte range of a stored file in chunks
+
+        Does no access control; check ownership with get_file_info first.
+
+        Args:
+            file_id: File ID
+            start: Offset of the first byte
+            end: Offset of the last byte (inclusive), None for the end of the file
+
+        Returns:
+            Async iterator over the content, read from storage as it is consumed
+        """
+        ...
     
     async def delete_file(
         self,
@@ -50,6 +98,9 @@ class FileStorage(Protocol):
         user_id: str
     ) -> bool:
         """Delete file from storage
+
+        Releases one reference; the content is removed once no reference
+        is left.
         
         Args:
             file_id: File ID
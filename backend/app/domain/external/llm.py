@@ -1,5 +1,5 @@
-from typing import Any, Dict, List, Optional, Protocol
-from app.domain.models.message import LLMMessage
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
+from app.domain.models.message import LLMMessage, LLMStreamChunk
 
 
 class LLM(Protocol):
@@ -31,6 +31,22 @@ class LLM(Protocol):
         """
         ...
 
+    def ask_stream(
+        self,
+        messages: List[LLMMessage],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        response_format: Optional[str] = None,
+        tool_choice: Optional[str] = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        """Send a chat request and stream the assistant message as it is generated.
+
+        Takes the same arguments as :meth:`ask`. Text deltas are yielded as
+        they arrive while tool calls are assembled incrementally; the last
+        chunk carries the complete assistant :class:`LLMMessage` and the
+        call's token usage and latency.
+        """
+        ...
+
     async def parse_json(self, text: str) -> Dict[str, Any]:
         """Extract/repair a JSON object from raw model output."""
         ...
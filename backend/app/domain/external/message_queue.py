@@ -1,4 +1,4 @@
-from typing import Any, Protocol, Tuple, Optional
+from typing import Any, List, Protocol, Tuple, Optional
 
 class MessageQueue(Protocol):
     """Message queue interface for agent communication"""
@@ -22,21 +22,55 @@ class MessageQueue(Protocol):
             Tuple[str, Any]: (Message ID, Message content), returns (None, None) if no message
         """
         ...
+
+    async def get_batch(self, start_id: Optional[str] = None, count: int = 100, block_ms: Optional[int] = None) -> List[Tuple[str, Any]]:
+        """Get up to `count` messages after `start_id` in a single read
+        
+        Args:
+            start_id: Message ID to start reading from, defaults to "0" meaning from the earliest message
+            count: Maximum number of messages to return
+            block_ms: Block time in milliseconds when no message is available, defaults to None meaning no blocking
+            
+        Returns:
+            List[Tuple[str, Any]]: (Message ID, Message content) pairs in stream order, empty if no message
+        """
+        ...
     
-    async def pop(self) -> Tuple[str, Any]:
-        """Get and remove the first message from the queue
+    async def pop(self, block_ms: Optional[int] = None) -> Tuple[str, Any]:
+        """Take the next message off the queue for processing
+        
+        The message is delivered once and must be acknowledged with ack()
+        once handled; if the consumer dies before that, it is redelivered.
+        
+        Args:
+            block_ms: Block time in milliseconds waiting for a message, defaults to None meaning no blocking
         
         Returns:
             Tuple[str, Any]: (Message ID, Message content), returns (None, None) if queue is empty
         """
         ...
+
+    async def ack(self, message_id: str) -> None:
+        """Acknowledge a popped message as handled and remove it from the queue
+        
+        Args:
+            message_id: ID returned by pop()
+        """
+        ...
     
     async def clear(self) -> None:
         """Clear all messages from the queue"""
         ...
     
     async def is_empty(self) -> bool:
-        """Check if the queue is empty"""
+        """Check if no message is waiting to be popped"""
+        ...
+    
+    async def expire(self, seconds: int) -> None:
+        """Let the queue and its messages expire after `seconds`
+        
+        Used once nothing will be written to the queue any more.
+        """
         ...
     
     async def size(self) -> int:
@@ -27,12 +27,19 @@ class Sandbox(Protocol):
         """
         ...
     
-    async def view_shell(self, session_id: str, console: bool = False) -> ToolResult:
+    async def view_shell(
+        self,
+        session_id: str,
+        console: bool = False,
+        console_cursor: Optional[str] = None,
+    ) -> ToolResult:
         """View shell status
         
         Args:
             session_id: Session ID
             console: Whether to return console records
+            console_cursor: Cursor of a previous console view; only console
+                output after it is returned
 
         Returns:
             Shell status information
@@ -297,3 +304,23 @@ class Sandbox(Protocol):
             Sandbox instance
         """
         ...
+
+
+class SandboxPool(Protocol):
+    """Pool of pre-started sandboxes ready to be leased by new sessions"""
+
+    async def start(self) -> None:
+        """Start warming sandboxes in the background"""
+        ...
+
+    async def acquire(self) -> Sandbox:
+        """Lease a ready sandbox, booting one on demand if the pool is empty
+        
+        Returns:
+            Sandbox instance owned by the caller from now on
+        """
+        ...
+
+    async def shutdown(self) -> None:
+        """Stop refilling and destroy sandboxes that were never leased"""
+        ...
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from typing import Optional, Protocol
+from typing import Mapping, Optional, Protocol, Union
 
-from app.domain.models.auth_session import AuthSession
+from app.domain.models.auth_session import AuthClientType, AuthSession
 
 
 class SessionStore(Protocol):
@@ -18,8 +18,18 @@ class SessionStore(Protocol):
         """Load a session by opaque id, or None if missing/expired."""
         ...
 
-    async def touch(self, session_id: str, ttl_seconds: int) -> Optional[AuthSession]:
-        """Sliding renewal: refresh last_seen_at / expires_at and Redis TTL."""
+    async def touch(
+        self,
+        session_id: str,
+        ttl_seconds: Union[int, Mapping[AuthClientType, int]],
+    ) -> Optional[AuthSession]:
+        """Sliding renewal: refresh last_seen_at / expires_at and Redis TTL.
+
+        Loads and renews atomically in a single round trip, so it doubles as
+        validation: returns the renewed session, or None if missing/expired.
+        ``ttl_seconds`` may map every client type to its TTL, applied by
+        the stored session's client.
+        """
         ...
 
     async def delete(self, session_id: str) -> bool:
@@ -2,6 +2,10 @@ from typing import Any, Dict, Optional, Protocol
 from abc import ABC, abstractmethod
 from app.domain.external.message_queue import MessageQueue
 
+# Written to a task's output stream by the task backend once execution has
+# finished, so consumers learn about completion in-band instead of polling.
+OUTPUT_END_MARKER = "__task_output_end__"
+
 
 class TaskRunner(ABC):
     """Abstract base class defining the interface for task runners.
@@ -50,7 +50,8 @@ class PlanEvent(BaseEvent):
 
 class BrowserToolContent(BaseModel):
     """Browser tool content"""
-    screenshot: str
+    # File ID of the frame; None once the session's screenshot ring evicted it
+    screenshot: Optional[str] = None
 
 class SearchToolContent(BaseModel):
     """Search tool content"""
@@ -61,9 +62,17 @@ class ShellToolContent(BaseModel):
     console: Any
 
 class FileToolContent(BaseModel):
-    """File tool content"""
-    content: str
+    """File tool content
+
+    ``content`` is inlined for small files only; ``diff`` is a unified diff
+    against the file before the call. ``old_content`` is only set on events
+    recorded before diffs were introduced.
+    """
+    content: Optional[str] = None
     old_content: Optional[str] = None
+    diff: Optional[str] = None
+    size: Optional[int] = None
+    sha256: Optional[str] = None
 
 class McpToolContent(BaseModel):
     """MCP tool content"""
@@ -122,10 +131,15 @@ class TerminalUpdateEvent(BaseEvent):
 
     Streamed while a shell tool runs and once more with final console.
     Not required for history — ToolEvent already carries final content.
+    ``output`` holds the console records from record ``start`` on, the
+    first continuing that record after ``offset`` characters of its
+    output; ``start == offset == 0`` replaces the whole console.
     """
     type: Literal["terminal_update"] = "terminal_update"
     shell_id: str
     output: Any = None
+    start: int = 0
+    offset: int = 0
     description: Optional[str] = None
 
 
@@ -133,8 +147,11 @@ class FileUpdateEvent(BaseEvent):
     """Live file editor content (official text_editor / file panel updates)."""
     type: Literal["file_update"] = "file_update"
     path: str
-    content: str = ""
-    old_content: Optional[str] = None
+    # Same compact form as FileToolContent
+    content: Optional[str] = None
+    diff: Optional[str] = None
+    size: Optional[int] = None
+    sha256: Optional[str] = None
     file: Optional[FileInfo] = None
 
 
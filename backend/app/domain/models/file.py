@@ -13,3 +13,22 @@ class FileInfo(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
     user_id: Optional[str] = None
     file_url: Optional[str] = None
+
+
+class LibraryFile(BaseModel):
+    """A file attached to one of a user's sessions, as listed in the library"""
+    session_id: str
+    file_id: str
+    filename: Optional[str] = None
+    file_path: Optional[str] = None
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    upload_date: Optional[datetime] = None
+    is_favorite: bool = False
+
+
+class LibraryFilePage(BaseModel):
+    """A slice of a user's library, most recently attached first"""
+    files: List[LibraryFile] = []
+    # Opaque position after the last file returned; None on the last page.
+    next_cursor: Optional[str] = None
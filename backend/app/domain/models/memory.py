@@ -1,7 +1,7 @@
 import json
 import logging
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, PrivateAttr
+from typing import Any, List, Optional
 from app.domain.models.message import LLMMessage, Role
 
 logger = logging.getLogger(__name__)
@@ -23,6 +23,18 @@ def estimate_tokens(text: str) -> int:
     return max(1, len(text) // _CHARS_PER_TOKEN)
 
 
+def estimate_message_tokens(message: LLMMessage) -> int:
+    """Token estimate for one message: its content plus any tool calls."""
+    total = estimate_tokens(message.content)
+    for tool_call in message.tool_calls:
+        total += estimate_tokens(tool_call.name)
+        total += estimate_tokens(json.dumps(tool_call.args, default=str))
+    return total
+
+
+_ELIDED_TOKENS = estimate_tokens(_ELIDED_CONTENT)
+
+
 class Memory(BaseModel):
     """Agent conversation memory with token-aware compaction.
 
@@ -30,16 +42,54 @@ class Memory(BaseModel):
     by eliding the *content* of old tool results (oldest first) while keeping
     the message skeleton intact, so tool-call pairing required by LLM APIs is
     never broken and recent working context is preserved.
+
+    The memory also tracks how much of itself is already persisted, so the
+    repository can append only new messages and fall back to rewriting a
+    full checkpoint after in-place edits (roll back, elision, prompt refresh).
+
+    Token usage is kept in a per-message ledger that is updated as messages
+    are appended, rolled back or elided, so budget checks cost O(1).
     """
     messages: List[LLMMessage] = []
+    # Persistence bookkeeping (not part of the model data): number of leading
+    # messages already stored, the checkpoint they were appended on top of,
+    # and whether an in-place edit invalidated the stored copy.
+    _saved_count: int = PrivateAttr(default=0)
+    _checkpoint: int = PrivateAttr(default=0)
+    _rewritten: bool = PrivateAttr(default=False)
+    # Per-message token estimates and their running sum.
+    _token_ledger: List[int] = PrivateAttr(default_factory=list)
+    _total_tokens: int = PrivateAttr(default=0)
+    # Messages before this index are known to need no further elision.
+    _compacted_until: int = PrivateAttr(default=0)
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rebuild_token_ledger()
+
+    def _rebuild_token_ledger(self) -> None:
+        self._token_ledger = [estimate_message_tokens(m) for m in self.messages]
+        self._total_tokens = sum(self._token_ledger)
+        self._compacted_until = 0
+
+    def _record_tokens(self, message: LLMMessage) -> None:
+        tokens = estimate_message_tokens(message)
+        self._token_ledger.append(tokens)
+        self._total_tokens += tokens
+
+    def _update_tokens(self, index: int, tokens: int) -> None:
+        self._total_tokens += tokens - self._token_ledger[index]
+        self._token_ledger[index] = tokens
 
     def add_message(self, message: LLMMessage) -> None:
         """Add message to memory"""
         self.messages.append(message)
+        self._record_tokens(message)
     
     def add_messages(self, messages: List[LLMMessage]) -> None:
         """Add messages to memory"""
         self.messages.extend(messages)
+        for message in messages:
+            self._record_tokens(message)
 
     def get_messages(self) -> List[LLMMessage]:
         """Get all message history"""
@@ -54,16 +104,56 @@ class Memory(BaseModel):
     def roll_back(self) -> None:
         """Roll back memory"""
         self.messages = self.messages[:-1]
+        if self._token_ledger:
+            self._total_tokens -= self._token_ledger.pop()
+        self._compacted_until = min(self._compacted_until, len(self.messages))
+        if self._saved_count > len(self.messages):
+            self._saved_count = len(self.messages)
+            self._rewritten = True
+
+    def set_system_prompt(self, prompt: str) -> bool:
+        """Refresh the leading system message; return whether it changed."""
+        if not self.messages or self.messages[0].role != Role.SYSTEM:
+            return False
+        if self.messages[0].content == prompt:
+            return False
+        self.messages[0].content = prompt
+        self._update_tokens(0, estimate_message_tokens(self.messages[0]))
+        self._rewritten = True
+        return True
+
+    @property
+    def checkpoint(self) -> int:
+        """Checkpoint generation the persisted messages belong to."""
+        return self._checkpoint
+
+    @property
+    def saved_count(self) -> int:
+        """Number of leading messages already persisted."""
+        return self._saved_count
+
+    @property
+    def needs_checkpoint(self) -> bool:
+        """Whether stored messages were edited and must be rewritten."""
+        return self._rewritten
+
+    def get_unsaved_messages(self) -> List[LLMMessage]:
+        """Get messages appended since the last save"""
+        return self.messages[self._saved_count:]
+
+    def mark_saved(self, checkpoint: Optional[int] = None) -> None:
+        """Record that all messages are persisted, optionally as a new checkpoint."""
+        self._saved_count = len(self.messages)
+        self._rewritten = False
+        if checkpoint is not None:
+            self._checkpoint = checkpoint
 
     def estimate_tokens(self) -> int:
         """Estimate the total token footprint of the stored messages."""
-        total = 0
-        for message in self.messages:
-            total += estimate_tokens(message.content)
-            for tool_call in message.tool_calls:
-                total += estimate_tokens(tool_call.name)
-                total += estimate_tokens(json.dumps(tool_call.args, default=str))
-        return total
+        if len(self._token_ledger) != len(self.messages):
+            # Messages were replaced wholesale; resynchronise the ledger.
+            self._rebuild_token_ledger()
+        return self._total_tokens
 
     def compact(self, max_tokens: int = 0, keep_recent: int = 10) -> None:
         """Elide old tool results until the memory fits the token budget.
@@ -78,12 +168,16 @@ class Memory(BaseModel):
             return
 
         cutoff = max(0, len(self.messages) - keep_recent)
-        for message in self.messages[:cutoff]:
+        for index in range(self._compacted_until, cutoff):
+            message = self.messages[index]
+            self._compacted_until = index + 1
             if message.role != Role.TOOL:
                 continue
             if message.content == _ELIDED_CONTENT:
                 continue
             message.content = _ELIDED_CONTENT
+            self._update_tokens(index, _ELIDED_TOKENS)
+            self._rewritten = True
             logger.debug(f"Elided old tool result from memory: {message.name}")
             if max_tokens and self.estimate_tokens() <= max_tokens:
                 return
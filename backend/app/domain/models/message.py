@@ -83,3 +83,39 @@ class LLMMessage(BaseModel):
             name=name,
             artifact=artifact,
         )
+
+
+class LLMUsage(BaseModel):
+    """Token usage and timing of a single LLM call."""
+
+    model: str = ""
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # Prompt tokens served from the provider's prompt cache
+    cached_tokens: int = 0
+    # Prompt tokens written to the prompt cache (reported by providers with
+    # explicit cache breakpoints)
+    cache_write_tokens: int = 0
+    latency_ms: float = 0.0
+    # Only known for streamed calls
+    time_to_first_token_ms: Optional[float] = None
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Completion tokens per second of generation time."""
+        generation_ms = self.latency_ms - (self.time_to_first_token_ms or 0.0)
+        if not self.completion_tokens or generation_ms <= 0:
+            return None
+        return self.completion_tokens * 1000.0 / generation_ms
+
+
+class LLMStreamChunk(BaseModel):
+    """One item of a streamed LLM response.
+
+    Intermediate chunks carry a text ``delta``; the final chunk carries the
+    assembled assistant ``message`` (tool calls included) and its ``usage``.
+    """
+
+    delta: str = ""
+    message: Optional[LLMMessage] = None
+    usage: Optional[LLMUsage] = None
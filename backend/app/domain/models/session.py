@@ -1,9 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from datetime import datetime, UTC
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from enum import Enum
 import uuid
-from app.domain.models.event import PlanEvent, AgentEvent
+from app.domain.models.event import AgentEvent
 from app.domain.models.plan import Plan
 from app.domain.models.file import FileInfo
 
@@ -51,18 +51,54 @@ class Session(BaseModel):
     latest_message_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(UTC))
     created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
-    events: List[AgentEvent] = []
     files: List[FileInfo] = []
+    # Latest plan seen in the event history, kept alongside the session so
+    # flows can resume without replaying events.
+    last_plan: Optional[Plan] = None
+    # File IDs of the browser frames kept in storage, oldest first
+    screenshots: List[str] = []
     status: SessionStatus = SessionStatus.PENDING
     is_shared: bool = False  # Whether this session is shared publicly
     is_favorite: bool = False
     is_pinned: bool = False
     project_id: Optional[str] = None
     task_mode: TaskMode = TaskMode.AGENT
+    # Persistence bookkeeping (not part of the model data): field values as
+    # of the last load or save, None while the session was never stored.
+    _saved_state: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    @property
+    def is_saved(self) -> bool:
+        """Whether the session was loaded from or written to storage."""
+        return self._saved_state is not None
+
+    def mark_saved(self) -> None:
+        """Record the current field values as persisted."""
+        self._saved_state = self.model_dump()
+
+    def get_changed_fields(self) -> Dict[str, Any]:
+        """Dumped values of the fields changed since the last load or save."""
+        state = self.model_dump()
+        if self._saved_state is None:
+            return state
+        return {
+            name: value for name, value in state.items()
+            if name not in self._saved_state or self._saved_state[name] != value
+        }
 
     def get_last_plan(self) -> Optional[Plan]:
         """Get the last plan from the events"""
-        for event in reversed(self.events):
-            if isinstance(event, PlanEvent):
-                return event.plan
-        return None
+        return self.last_plan
+
+
+class SessionEventPage(BaseModel):
+    """A slice of a session's event history in sequence order"""
+    events: List[AgentEvent] = []
+    # Sequence of the last event returned (or the requested cursor when the
+    # page is empty); pass it back to continue after this page.
+    next_cursor: Optional[int] = None
+    has_more: bool = False
+    # Sequence of the first event returned; pass it back as ``before`` to
+    # page towards older events.
+    prev_cursor: Optional[int] = None
+    has_older: bool = False
@@ -25,5 +25,5 @@ class AgentRepository(Protocol):
         ...
 
     async def save_memory(self, agent_id: str, name: str, memory: Memory) -> None:
-        """Update the messages of a memory"""
+        """Persist messages added or changed since the memory was last saved"""
         ... 
\ No newline at end of file
@@ -0,0 +1,20 @@
+from typing import Optional, Protocol
+
+from app.domain.models.file import LibraryFilePage
+
+
+class LibraryFileRepository(Protocol):
+    """Per-user catalogue of the files attached to their sessions."""
+
+    async def list_files(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> LibraryFilePage:
+        """Return the user's files after the cursor, most recently attached first."""
+        ...
+
+    async def owns_file(self, user_id: str, file_id: str) -> bool:
+        """Whether the file is attached to one of the user's sessions."""
+        ...
@@ -1,6 +1,6 @@
 from typing import Optional, Protocol, List
 from datetime import datetime
-from app.domain.models.session import Session, SessionStatus, SessionSummary
+from app.domain.models.session import Session, SessionStatus, SessionSummary, SessionEventPage
 from app.domain.models.file import FileInfo
 from app.domain.models.event import BaseEvent
 
@@ -23,6 +23,10 @@ class SessionRepository(Protocol):
         """Find lightweight session summaries for a user (excludes events/files)"""
         ...
 
+    async def find_summaries_by_ids(self, session_ids: List[str]) -> List[SessionSummary]:
+        """Find lightweight session summaries by ID, skipping unknown IDs"""
+        ...
+
     async def find_summary_by_id_and_user_id(
         self, session_id: str, user_id: str
     ) -> Optional[SessionSummary]:
@@ -44,19 +48,49 @@ class SessionRepository(Protocol):
     async def add_event(self, session_id: str, event: BaseEvent) -> None:
         """Add an event to a session"""
         ...
+
+    async def get_events(
+        self,
+        session_id: str,
+        cursor: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get events of a session after the cursor, in sequence order"""
+        ...
+
+    async def get_events_before(
+        self,
+        session_id: str,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get the latest events of a session before the cursor (all when None), in sequence order"""
+        ...
+
+    async def get_event_sequence(self, session_id: str, event_id: str) -> Optional[int]:
+        """Get the sequence of an event, usable as a cursor"""
+        ...
     
     async def add_file(self, session_id: str, file_info: FileInfo) -> None:
         """Add a file to a session"""
         ...
     
-    async def remove_file(self, session_id: str, file_id: str) -> None:
-        """Remove a file from a session"""
+    async def remove_file(self, session_id: str, file_id: str, file_path: Optional[str] = None) -> None:
+        """Remove a file from a session, only at ``file_path`` when given"""
         ...
 
     async def get_file_by_path(self, session_id: str, file_path: str) -> Optional[FileInfo]:
         """Get file by path from a session"""
         ...
 
+    async def add_screenshot(self, session_id: str, file_id: str, keep: int) -> List[str]:
+        """Append a browser frame to a session, keeping the latest ``keep``; return evicted file IDs"""
+        ...
+
+    async def clear_screenshots(self, session_id: str, file_ids: List[str]) -> None:
+        """Drop evicted browser frames from the events that show them, except frames still in the ring"""
+        ...
+
     async def update_status(self, session_id: str, status: SessionStatus) -> None:
         """Update the status of a session"""
         ...
@@ -2,14 +2,14 @@ from typing import Optional, AsyncGenerator, List
 import logging
 from datetime import datetime
 from app.domain.models.session import Session, SessionStatus
-from app.domain.external.sandbox import Sandbox
+from app.domain.external.sandbox import Sandbox, SandboxPool
 from app.domain.external.search import SearchEngine
 from app.domain.models.event import BaseEvent, ErrorEvent, DoneEvent, MessageEvent, WaitEvent, AgentEvent
 from pydantic import TypeAdapter
 from app.domain.repositories.agent_repository import AgentRepository
 from app.domain.repositories.session_repository import SessionRepository
 from app.domain.services.agent_task_runner import AgentTaskRunnerFactory
-from app.domain.external.task import Task
+from app.domain.external.task import Task, OUTPUT_END_MARKER
 from typing import Type
 from app.domain.external.file import FileStorage
 from app.domain.external.llm import LLM
@@ -19,6 +19,10 @@ from app.domain.repositories.mcp_repository import MCPRepository
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Output stream events fetched per XREAD and how long a read may block
+OUTPUT_BATCH_SIZE = 100
+OUTPUT_BLOCK_MS = 1000
+
 class AgentDomainService:
     """
     Agent domain service, responsible for coordinating the work of planning agent and execution agent
@@ -34,6 +38,7 @@ class AgentDomainService:
         mcp_repository: MCPRepository,
         llm: LLM,
         search_engine: Optional[SearchEngine] = None,
+        sandbox_pool: Optional[SandboxPool] = None,
     ):
         self._repository = agent_repository
         self._session_repository = session_repository
@@ -43,12 +48,15 @@ class AgentDomainService:
         self._file_storage = file_storage
         self._mcp_repository = mcp_repository
         self._llm = llm
+        self._sandbox_pool = sandbox_pool
         logger.info("AgentDomainService initialization completed")
             
     async def shutdown(self) -> None:
         """Clean up all Agent's resources"""
         logger.info("Starting to close all Agents")
         await self._task_cls.destroy()
+        if self._sandbox_pool:
+            await self._sandbox_pool.shutdown()
         logger.info("All agents closed successfully")
 
     async def _create_task(self, session: Session) -> Task:
@@ -58,7 +66,10 @@ class AgentDomainService:
         if sandbox_id:
             sandbox = await self._sandbox_cls.get(sandbox_id)
         if not sandbox:
-            sandbox = await self._sandbox_cls.create()
+            if self._sandbox_pool:
+                sandbox = await self._sandbox_pool.acquire()
+            else:
+                sandbox = await self._sandbox_cls.create()
             session.sandbox_id = sandbox.id
             await self._session_repository.save(session)
 
@@ -140,24 +151,48 @@ class AgentDomainService:
             logger.info(f"Session {session_id} started")
             logger.debug(f"Session {session_id} task: {task}")
            
+            draining = False
+            unread_dirty = False
             while task:
-                # Check done state before reading so buffered events are
-                # fully drained even if the task finished in the meantime
-                task_done = await task.is_done()
-                event_id, event_str = await task.output_stream.get(start_id=latest_event_id, block_ms=1000)
-                if event_str is None:
-                    if task_done:
+                # One XREAD per batch; once the task is known to be done, only
+                # drain what is left without blocking.
+                batch = await task.output_stream.get_batch(
+                    start_id=latest_event_id,
+                    count=OUTPUT_BATCH_SIZE,
+                    block_ms=None if draining else OUTPUT_BLOCK_MS,
+                )
+                # Coalesce unread resets: one write per batch that followed
+                # delivered assistant messages, instead of one per event
+                if unread_dirty:
+                    await self._session_repository.update_unread_message_count(session_id, 0)
+                    unread_dirty = False
+                if not batch:
+                    if draining:
                         logger.debug(f"Session {session_id}'s task is done and event queue is drained")
                         break
+                    # Quiet period: fall back to the task state in case the
+                    # end marker was never written (e.g. a crashed worker)
+                    draining = await task.is_done()
                     logger.debug(f"No event found in Session {session_id}'s event queue")
                     continue
-                latest_event_id = event_id
-                event = TypeAdapter(AgentEvent).validate_json(event_str)
-                event.id = event_id
-                logger.debug(f"Got event from Session {session_id}'s event queue: {type(event).__name__}")
-                await self._session_repository.update_unread_message_count(session_id, 0)
-                yield event
-                if isinstance(event, (DoneEvent, ErrorEvent, WaitEvent)):
+
+                finished = False
+                for event_id, event_str in batch:
+                    latest_event_id = event_id
+                    if event_str == OUTPUT_END_MARKER:
+                        logger.debug(f"Session {session_id}'s task output ended")
+                        finished = True
+                        break
+                    event = TypeAdapter(AgentEvent).validate_json(event_str)
+                    event.id = event_id
+                    logger.debug(f"Got event from Session {session_id}'s event queue: {type(event).__name__}")
+                    if isinstance(event, MessageEvent):
+                        unread_dirty = True
+                    yield event
+                    if isinstance(event, (DoneEvent, ErrorEvent, WaitEvent)):
+                        finished = True
+                        break
+                if finished:
                     break
             
             logger.info(f"Session {session_id} completed")
@@ -24,10 +24,13 @@ from app.domain.models.event import (
     FileUpdateEvent,
 )
 from app.domain.services.flows.plan_act import PlanActFlow
-from app.domain.external.sandbox import Sandbox
+from app.domain.services.browser_screenshots import BrowserScreenshotRecorder
+from app.domain.services.file_diff import build_file_tool_content
+from app.domain.services.shell_console import ConsoleDelta, ShellConsoles
+from app.domain.external.sandbox import Sandbox, SandboxPool
 from app.domain.external.browser import Browser
 from app.domain.external.search import SearchEngine
-from app.domain.external.file import FileStorage
+from app.domain.external.file import CONTENT_HASH_KEY, FileStorage, content_hash
 from app.domain.external.llm import LLM
 from app.domain.repositories.agent_repository import AgentRepository
 from app.domain.external.task import TaskRunner, TaskRunnerFactory, Task
@@ -43,6 +46,9 @@ from app.domain.services.prompts.system import format_project_instructions
 
 logger = logging.getLogger(__name__)
 
+# How long each read of the input watcher blocks waiting for a new message
+INPUT_WATCH_BLOCK_MS = 5000
+
 class AgentTaskRunner(TaskRunner):
     """Agent task that can be cancelled"""
     def __init__(
@@ -87,6 +93,12 @@ class AgentTaskRunner(TaskRunner):
         )
         # Snapshot file contents before mutating file tools (for Diff/Original views).
         self._file_old_by_call: Dict[str, str] = {}
+        self._screenshots = BrowserScreenshotRecorder(
+            self._browser, self._file_storage, self._session_repository, self._session_id, self._user_id
+        )
+        self._consoles = ShellConsoles(self._sandbox)
+        # Console changes seen when a shell tool settled, pushed as terminalUpdate
+        self._console_delta_by_call: Dict[str, ConsoleDelta] = {}
 
     async def _resolve_project_instruction(self, project_id: Optional[str]) -> Optional[str]:
         if not project_id or not self._project_repository:
@@ -109,23 +121,44 @@ class AgentTaskRunner(TaskRunner):
         event_id, event_str = await task.input_stream.pop()
         if event_str is None:
             logger.warning(f"Agent {self._agent_id} received empty message")
+            if event_id:
+                await task.input_stream.ack(event_id)
             return
         event = TypeAdapter(AgentEvent).validate_json(event_str)
         event.id = event_id
         return event
     
-    async def _get_browser_screenshot(self) -> str:
-        screenshot = await self._browser.screenshot()
-        result = await self._file_storage.upload_file(screenshot, "screenshot.png", self._user_id)
-        return result.file_id
+    async def _watch_input(self, task: Task, after_id: str, arrived: asyncio.Event) -> None:
+        """Set ``arrived`` once a message newer than ``after_id`` is put
+
+        A blocking plain read wakes on arrival without delivering the
+        message to the consumer group, so the watcher can be cancelled at
+        any point.
+        """
+        try:
+            while True:
+                message_id, _ = await task.input_stream.get(start_id=after_id, block_ms=INPUT_WATCH_BLOCK_MS)
+                if message_id is not None:
+                    arrived.set()
+                    return
+        except Exception as e:
+            # New input then waits for the flow to finish
+            logger.warning(f"Agent {self._agent_id} stopped watching for input: {e}")
 
     async def _sync_file_to_storage(self, file_path: str) -> Optional[FileInfo]:
         """Upload or update file and return FileInfo"""
         try:
             file_info = await self._session_repository.get_file_by_path(self._session_id, file_path)
             file_data = await self._sandbox.file_download(file_path)
+            digest = content_hash(file_data)
+            if file_info and (file_info.metadata or {}).get(CONTENT_HASH_KEY) == digest:
+                # Unchanged since the last sync
+                return file_info
             if file_info:
-                await self._session_repository.remove_file(self._session_id, file_info.file_id)
+                # Each session file holds one storage reference; release the
+                # one of the content this path no longer has
+                await self._session_repository.remove_file(self._session_id, file_info.file_id, file_path)
+                await self._file_storage.delete_file(file_info.file_id, self._user_id)
             file_name = file_path.split("/")[-1]
             file_info = await self._file_storage.upload_file(file_data, file_name, self._user_id)
             file_info.file_path = file_path
@@ -141,6 +174,11 @@ class AgentTaskRunner(TaskRunner):
             file_path = "/home/ubuntu/upload/" + file_info.filename
             result = await self._sandbox.file_upload(file_data, file_path)
             if result.success:
+                # Take the session file's own reference, released when the
+                # path is re-synced; the content is not uploaded again
+                file_info = await self._file_storage.upload_file(
+                    file_data, file_info.filename, self._user_id, file_info.content_type
+                )
                 file_info.file_path = file_path
                 return file_info
         except Exception as e:
@@ -198,15 +236,18 @@ class AgentTaskRunner(TaskRunner):
 
             if event.status == ToolStatus.CALLED:
                 if event.tool_name == "browser":
-                    event.tool_content = BrowserToolContent(screenshot=await self._get_browser_screenshot())
+                    event.tool_content = BrowserToolContent(screenshot=await self._screenshots.capture())
                 elif event.tool_name == "search":
                     search_results: ToolResult[SearchResults] = event.function_result
                     logger.debug(f"Search tool results: {search_results}")
                     event.tool_content = SearchToolContent(results=search_results.data.results)
                 elif event.tool_name == "shell":
                     if "id" in event.function_args:
-                        shell_result = await self._sandbox.view_shell(event.function_args["id"], console=True)
-                        event.tool_content = ShellToolContent(console=shell_result.data.get("console", []))
+                        shell_id = event.function_args["id"]
+                        delta = await self._consoles.refresh(shell_id)
+                        if delta is not None:
+                            self._console_delta_by_call[event.tool_call_id] = delta
+                        event.tool_content = ShellToolContent(console=self._consoles.console(shell_id))
                     else:
                         event.tool_content = ShellToolContent(console="(No Console)")
                 elif event.tool_name == "file":
@@ -216,10 +257,10 @@ class AgentTaskRunner(TaskRunner):
                         file_read_result = await self._sandbox.file_read(file_path, max_length=None)
                         file_content: str = file_read_result.data.get("content", "")
                         old_content = self._file_old_by_call.pop(event.tool_call_id, None)
-                        # Only expose old_content when there was a prior snapshot (enables Diff tabs).
-                        event.tool_content = FileToolContent(
-                            content=file_content,
-                            old_content=old_content,
+                        # Diff only against a prior snapshot (enables Diff tabs); large
+                        # bodies are left to file_view
+                        event.tool_content = build_file_tool_content(
+                            file_path, file_content, old_content
                         )
                         await self._sync_file_to_storage(file_path)
                     else:
@@ -264,41 +305,52 @@ class AgentTaskRunner(TaskRunner):
                     await self._mcp_tool.initialized(await self._mcp_repository.get_mcp_config())
 
                 event = await self._pop_event(task)
-                message = ""
-                if isinstance(event, MessageEvent):
-                    message = event.message or ""
-                    if not is_chat:
-                        await self._sync_message_attachments_to_sandbox(event)
+                if event is None:
+                    continue
+                message_id = event.id
+                # Messages put while the flow runs interrupt it
+                arrived = asyncio.Event()
+                watcher = asyncio.create_task(self._watch_input(task, message_id, arrived))
+                try:
+                    message = ""
+                    if isinstance(event, MessageEvent):
+                        message = event.message or ""
+                        if not is_chat:
+                            await self._sync_message_attachments_to_sandbox(event)
                     
-                logger.info(f"Agent {self._agent_id} received new message: {message[:50]}...")
-
-                message_obj = Message(
-                    message=message,
-                    attachments=[
-                        attachment.file_path
-                        for attachment in (event.attachments or [])
-                        if attachment.file_path
-                    ],
-                )
+                    logger.info(f"Agent {self._agent_id} received new message: {message[:50]}...")
+
+                    message_obj = Message(
+                        message=message,
+                        attachments=[
+                            attachment.file_path
+                            for attachment in (event.attachments or [])
+                            if attachment.file_path
+                        ],
+                    )
                 
-                flow = self._run_chat(message_obj) if is_chat else self._run_flow(message_obj)
-                async for event in flow:
-                    # Flip WAITING before streaming WaitEvent so consumers that
-                    # read Mongo for the trailing status_update do not see RUNNING.
-                    if isinstance(event, WaitEvent):
-                        await self._session_repository.update_status(
-                            self._session_id, SessionStatus.WAITING
-                        )
+                    flow = self._run_chat(message_obj) if is_chat else self._run_flow(message_obj)
+                    async for event in flow:
+                        # Flip WAITING before streaming WaitEvent so consumers that
+                        # read Mongo for the trailing status_update do not see RUNNING.
+                        if isinstance(event, WaitEvent):
+                            await self._session_repository.update_status(
+                                self._session_id, SessionStatus.WAITING
+                            )
+                            await self._put_and_add_event(task, event)
+                            return
                         await self._put_and_add_event(task, event)
-                        return
-                    await self._put_and_add_event(task, event)
-                    if isinstance(event, TitleEvent):
-                        await self._session_repository.update_title(self._session_id, event.title)
-                    elif isinstance(event, MessageEvent):
-                        await self._session_repository.update_latest_message(self._session_id, event.message, event.timestamp)
-                        await self._session_repository.increment_unread_message_count(self._session_id)
-                    if not await task.input_stream.is_empty():
-                        break
+                        if isinstance(event, TitleEvent):
+                            await self._session_repository.update_title(self._session_id, event.title)
+                        elif isinstance(event, MessageEvent):
+                            await self._session_repository.update_latest_message(self._session_id, event.message, event.timestamp)
+                            await self._session_repository.increment_unread_message_count(self._session_id)
+                        if arrived.is_set():
+                            break
+                finally:
+                    watcher.cancel()
+                    # Handled (or failed for good): do not redeliver it
+                    await task.input_stream.ack(message_id)
 
             await self._session_repository.update_status(self._session_id, SessionStatus.COMPLETED)
         except asyncio.CancelledError:
@@ -345,7 +397,8 @@ class AgentTaskRunner(TaskRunner):
                 content=system_content,
             )
         ]
-        for ev in (session.events if session else []) or []:
+        page = await self._session_repository.get_events(self._session_id)
+        for ev in page.events:
             if isinstance(ev, MessageEvent) and ev.message:
                 role = Role.USER if ev.role == "user" else Role.ASSISTANT
                 history.append(LLMMessage(role=role, content=ev.message))
@@ -377,28 +430,29 @@ class AgentTaskRunner(TaskRunner):
                 # Official: terminalUpdate / text_editor file panel push after tool settles
                 if event.status == ToolStatus.CALLED:
                     if event.tool_name == "shell" and event.function_args.get("id"):
-                        console = None
-                        if isinstance(event.tool_content, ShellToolContent):
-                            console = event.tool_content.console
-                        yield TerminalUpdateEvent(
-                            shell_id=event.function_args["id"],
-                            output=console if console is not None else [],
-                        )
+                        # Nothing to push when the console is as last seen
+                        delta = self._console_delta_by_call.pop(event.tool_call_id, None)
+                        if delta is not None:
+                            yield TerminalUpdateEvent(
+                                shell_id=event.function_args["id"],
+                                output=delta.records,
+                                start=delta.start,
+                                offset=delta.offset,
+                            )
                     elif event.tool_name == "file" and event.function_args.get("file"):
                         path = event.function_args["file"]
-                        content = ""
-                        old_content = None
-                        if isinstance(event.tool_content, FileToolContent):
-                            content = event.tool_content.content or ""
-                            old_content = event.tool_content.old_content
+                        file_content = (
+                            event.tool_content.model_dump(include={"content", "diff", "size", "sha256"})
+                            if isinstance(event.tool_content, FileToolContent)
+                            else {}
+                        )
                         file_info = await self._session_repository.get_file_by_path(
                             self._session_id, path
                         )
                         yield FileUpdateEvent(
                             path=path,
-                            content=content,
-                            old_content=old_content,
                             file=file_info,
+                            **file_content,
                         )
             elif isinstance(event, MessageEvent):
                 await self._sync_message_attachments_to_storage(event)
@@ -454,6 +508,7 @@ class AgentTaskRunnerFactory(TaskRunnerFactory):
         llm: LLM,
         search_engine: Optional[SearchEngine] = None,
         project_repository: Optional[ProjectRepository] = None,
+        sandbox_pool: Optional[SandboxPool] = None,
     ):
         self._agent_repository = agent_repository
         self._session_repository = session_repository
@@ -463,6 +518,7 @@ class AgentTaskRunnerFactory(TaskRunnerFactory):
         self._llm = llm
         self._search_engine = search_engine
         self._project_repository = project_repository
+        self._sandbox_pool = sandbox_pool
 
     @staticmethod
     def build_params(session_id: str, agent_id: str, user_id: str, sandbox_id: str) -> Dict[str, Any]:
@@ -475,7 +531,7 @@ class AgentTaskRunnerFactory(TaskRunnerFactory):
 
     async def create_runner(self, params: Dict[str, Any]) -> AgentTaskRunner:
         sandbox_id = params["sandbox_id"]
-        sandbox = await self._sandbox_cls.get(sandbox_id)
+        sandbox = await self._get_sandbox(params["session_id"], sandbox_id)
         if not sandbox:
             raise RuntimeError(f"Sandbox {sandbox_id} not found")
         browser = await sandbox.get_browser()
@@ -495,3 +551,23 @@ class AgentTaskRunnerFactory(TaskRunnerFactory):
             search_engine=self._search_engine,
             project_repository=self._project_repository,
         )
+
+    async def _get_sandbox(self, session_id: str, sandbox_id: Optional[str]) -> Optional[Sandbox]:
+        """Look up the session's sandbox, leasing a warm one if it is gone"""
+        sandbox = None
+        if sandbox_id:
+            try:
+                sandbox = await self._sandbox_cls.get(sandbox_id)
+            except Exception as e:
+                if not self._sandbox_pool:
+                    raise
+                logger.warning(f"Sandbox {sandbox_id} unavailable, leasing a replacement: {str(e)}")
+        if sandbox or not self._sandbox_pool:
+            return sandbox
+
+        sandbox = await self._sandbox_pool.acquire()
+        session = await self._session_repository.find_by_id(session_id)
+        if session:
+            session.sandbox_id = sandbox.id
+            await self._session_repository.save(session)
+        return sandbox
@@ -2,7 +2,7 @@ import logging
 import asyncio
 import uuid
 from abc import ABC
-from typing import Any, List, Literal, Optional, AsyncGenerator
+from typing import Any, List, Literal, Optional, AsyncGenerator, Tuple
 from app.domain.models.message import Message, LLMMessage, Role, ToolCall
 from app.domain.services.tools.base import BaseToolkit, OutputTool, Tool, ValidationError, take_brief
 from app.domain.models.event import (
@@ -46,6 +46,12 @@ class BaseAgent(ABC):
     # and memory is compacted before each model call when over budget.
     max_tool_result_chars: int = 16000
     max_context_tokens: int = 100000
+    # Share of the budget compaction frees memory down to, so the history
+    # stays byte-identical (and prompt-cacheable) for the calls that follow
+    # instead of one more old message being rewritten on every call
+    context_compaction_target: float = 0.75
+    # Upper bound on parallel-safe tool calls running at once
+    max_parallel_tool_calls: int = 4
 
     def __init__(
         self,
@@ -60,6 +66,10 @@ class BaseAgent(ABC):
         self.toolkits = tools
         self.memory = None
         self._output_tool: Optional[OutputTool] = None
+        # Tool schemas sent with the last request and the per-toolkit lists
+        # and output tool they were assembled from
+        self._tool_schemas: List[dict] = []
+        self._tool_schema_sources: Optional[tuple] = None
         self._project_instruction: Optional[str] = None
 
     def set_project_instruction(self, instruction: Optional[str]) -> None:
@@ -79,9 +89,7 @@ class BaseAgent(ABC):
             self.memory.add_message(LLMMessage.system(prompt))
             await self._repository.save_memory(self._agent_id, self.name, self.memory)
             return
-        first = self.memory.messages[0]
-        if first.role == Role.SYSTEM and first.content != prompt:
-            first.content = prompt
+        if self.memory.set_system_prompt(prompt):
             await self._repository.save_memory(self._agent_id, self.name, self.memory)
 
     def get_tool(self, name: str) -> Optional[Tool]:
@@ -98,10 +106,17 @@ class BaseAgent(ABC):
         Includes the active output tool, if any, so the model can submit
         structured results through native function calling.
         """
-        schemas = [schema for toolkit in self.toolkits for schema in toolkit.get_tool_schemas()]
-        if self._output_tool:
-            schemas.append(self._output_tool.to_openai_schema())
-        return schemas
+        sources = (*(toolkit.get_tool_schemas() for toolkit in self.toolkits), self._output_tool)
+        cached = self._tool_schema_sources
+        if cached is None or len(cached) != len(sources) or any(a is not b for a, b in zip(cached, sources)):
+            # Reuse the same list while no toolkit's tool set changed, so
+            # consecutive requests carry an identical tools prefix
+            schemas = [schema for toolkit_schemas in sources[:-1] for schema in toolkit_schemas]
+            if self._output_tool:
+                schemas.append(self._output_tool.to_openai_schema())
+            self._tool_schemas = schemas
+            self._tool_schema_sources = sources
+        return self._tool_schemas
 
     def _truncate_tool_result(self, content: str) -> str:
         """Cap a tool result before it enters memory, to bound context growth."""
@@ -143,6 +158,78 @@ class BaseAgent(ABC):
 
         return LLMMessage.tool(tool_call_id=tool_call.id, name=tool.name, content=last_error)
 
+    def _parallel_batch(
+        self,
+        tool: Tool,
+        tool_calls: List[ToolCall],
+        start: int,
+    ) -> List[Tuple[Tool, ToolCall]]:
+        """Collect the parallel-safe calls directly following a parallel-safe one.
+
+        Any other call ends the batch, so a read never overtakes a write
+        the model issued before it.
+        """
+        batch: List[Tuple[Tool, ToolCall]] = []
+        if not tool.parallel_safe:
+            return batch
+        for tool_call in tool_calls[start:]:
+            if self._output_tool and tool_call.name == self._output_tool.name:
+                break
+            next_tool = self.get_tool(tool_call.name)
+            if not next_tool or not next_tool.parallel_safe:
+                break
+            batch.append((next_tool, tool_call))
+        return batch
+
+    async def _invoke_concurrently(
+        self,
+        calls: List[Tuple[Tool, ToolCall]],
+        tool_responses: List[LLMMessage],
+    ) -> AsyncGenerator[BaseEvent, None]:
+        """Run parallel-safe calls concurrently, reporting them in call order.
+
+        All calls are announced up front; results are awaited, emitted and
+        appended to ``tool_responses`` in the order the model issued them.
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_tool_calls)
+
+        async def run(tool: Tool, tool_call: ToolCall) -> LLMMessage:
+            async with semaphore:
+                return await self.invoke_tool(tool, tool_call)
+
+        for tool, tool_call in calls:
+            if not tool_call.id:
+                tool_call.id = str(uuid.uuid4())
+            brief, function_args = take_brief(tool_call.args)
+            yield ToolEvent(
+                status=ToolStatus.CALLING,
+                tool_call_id=tool_call.id,
+                tool_name=tool.toolkit.name,
+                function_name=tool_call.name,
+                function_args=function_args,
+                brief=brief,
+            )
+
+        tasks = [asyncio.create_task(run(tool, tool_call)) for tool, tool_call in calls]
+        try:
+            for (tool, tool_call), task in zip(calls, tasks):
+                tool_result = await task
+                brief, function_args = take_brief(tool_call.args)
+                yield ToolEvent(
+                    status=ToolStatus.CALLED,
+                    tool_call_id=tool_call.id,
+                    tool_name=tool.toolkit.name,
+                    function_name=tool_call.name,
+                    function_args=function_args,
+                    function_result=tool_result.artifact,
+                    brief=brief,
+                )
+                tool_responses.append(tool_result)
+        finally:
+            # The consumer may stop early (e.g. the task is cancelled)
+            for task in tasks:
+                task.cancel()
+
     def _handle_output_call(self, tool_call: ToolCall) -> tuple[LLMMessage, Optional[Any]]:
         """Validate a structured-output tool call.
 
@@ -196,11 +283,7 @@ class BaseAgent(ABC):
         self._output_tool = output_tool
         try:
             await self._ensure_memory()
-            if self.memory.estimate_tokens() > self.max_context_tokens:
-                self.memory.compact(max_tokens=self.max_context_tokens)
-                await self._repository.save_memory(
-                    self._agent_id, self.name, self.memory
-                )
+            await self._fit_context()
 
             message = await self._llm.ask(
                 messages=list(self.memory.get_messages()),
@@ -233,7 +316,11 @@ class BaseAgent(ABC):
 
             tool_responses = []
             structured_output: Optional[Any] = None
-            for tool_call in message.tool_calls:
+            tool_calls = message.tool_calls
+            index = 0
+            while index < len(tool_calls):
+                tool_call = tool_calls[index]
+                index += 1
                 function_name = tool_call.name
                 if not tool_call.id:
                     tool_call.id = str(uuid.uuid4())
@@ -258,6 +345,15 @@ class BaseAgent(ABC):
                     ))
                     continue
 
+                batch = self._parallel_batch(tool, tool_calls, index)
+                if batch:
+                    async for event in self._invoke_concurrently(
+                        [(tool, tool_call), *batch], tool_responses
+                    ):
+                        yield event
+                    index += len(batch)
+                    continue
+
                 # Generate event before tool call
                 yield ToolEvent(
                     status=ToolStatus.CALLING,
@@ -274,46 +370,21 @@ class BaseAgent(ABC):
                     if tool.toolkit.name == "shell" and isinstance(function_args, dict)
                     else None
                 )
-                if shell_id and hasattr(tool.toolkit, "sandbox"):
+                if shell_id and hasattr(tool.toolkit, "consoles"):
                     invoke_task = asyncio.create_task(self.invoke_tool(tool, tool_call))
-                    last_fingerprint: Optional[str] = None
-
-                    def _console_fingerprint(console: Any) -> str:
-                        """Cheap change detector — avoid repr() on large consoles."""
-                        if console is None:
-                            return "0:"
-                        if isinstance(console, str):
-                            return f"s:{len(console)}:{console[-80:]}"
-                        if isinstance(console, list):
-                            if not console:
-                                return "0:"
-                            last = console[-1]
-                            if isinstance(last, dict):
-                                tail = f"{last.get('command', '')}|{str(last.get('output', ''))[-60:]}"
-                            else:
-                                tail = str(last)[-80:]
-                            return f"l:{len(console)}:{tail}"
-                        return f"o:{type(console).__name__}:{str(console)[-80:]}"
-
                     while not invoke_task.done():
                         done, _ = await asyncio.wait({invoke_task}, timeout=1.0)
                         if done:
                             break
                         try:
-                            view = await tool.toolkit.sandbox.view_shell(
-                                shell_id, console=True
-                            )
-                            console = (
-                                view.data.get("console", [])
-                                if view and getattr(view, "data", None)
-                                else []
-                            )
-                            fingerprint = _console_fingerprint(console)
-                            if fingerprint != last_fingerprint:
-                                last_fingerprint = fingerprint
+                            # Only output written since the previous poll
+                            delta = await tool.toolkit.consoles.refresh(shell_id)
+                            if delta is not None:
                                 yield TerminalUpdateEvent(
                                     shell_id=shell_id,
-                                    output=console,
+                                    output=delta.records,
+                                    start=delta.start,
+                                    offset=delta.offset,
                                 )
                         except Exception:
                             logger.debug(
@@ -368,14 +439,16 @@ class BaseAgent(ABC):
         self.memory.roll_back()
         await self._repository.save_memory(self._agent_id, self.name, self.memory)
 
+    async def _fit_context(self) -> None:
+        """Reclaim budget from old tool results before the context is sent to the model"""
+        if self.memory.estimate_tokens() > self.max_context_tokens:
+            self.memory.compact(max_tokens=int(self.max_context_tokens * self.context_compaction_target))
+            await self._repository.save_memory(self._agent_id, self.name, self.memory)
+
     async def ask_with_messages(self, messages: List[LLMMessage]) -> LLMMessage:
         await self._add_to_memory(messages)
 
-        # Token-aware guard: reclaim budget from old tool results before the
-        # context is sent to the model.
-        if self.memory.estimate_tokens() > self.max_context_tokens:
-            self.memory.compact(max_tokens=self.max_context_tokens)
-            await self._repository.save_memory(self._agent_id, self.name, self.memory)
+        await self._fit_context()
 
         context = list(self.memory.get_messages())
         message = await self._llm.ask(
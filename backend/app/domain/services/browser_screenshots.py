@@ -0,0 +1,90 @@
+"""Browser frames attached to browser tool events."""
+import io
+import logging
+from typing import Optional
+
+from app.domain.external.browser import Browser
+from app.domain.external.file import CONTENT_KIND_KEY, FileStorage
+from app.domain.repositories.session_repository import SessionRepository
+
+logger = logging.getLogger(__name__)
+
+# JPEG quality of recorded frames; a PNG of the same viewport is several
+# times larger
+SCREENSHOT_QUALITY = 70
+# Frames a session keeps in storage; older frames are released
+SCREENSHOT_RING_SIZE = 30
+# Storage kind of recorded frames, so they never share an entry (and its
+# ID or filename) with a user file of identical content
+SCREENSHOT_KIND = "screenshot"
+
+
+class BrowserScreenshotRecorder:
+    """Captures the browser frame shown with each browser tool event.
+
+    The page fingerprint is checked first, so actions that leave the
+    visible page as it was (a failed click, a view) reuse the previous
+    frame without a capture or an upload. Uploaded frames form a bounded
+    ring kept on the session, so it spans every task run of the session.
+    Identical frames share one stored entry, so the ring may hold a file
+    ID more than once. Each evicted entry releases its storage reference;
+    a frame no longer held by the ring is also dropped from the events
+    showing it, which then replay without a screenshot.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        file_storage: FileStorage,
+        session_repository: SessionRepository,
+        session_id: str,
+        user_id: str,
+        ring_size: int = SCREENSHOT_RING_SIZE,
+    ):
+        self._browser = browser
+        self._file_storage = file_storage
+        self._session_repository = session_repository
+        self._session_id = session_id
+        self._user_id = user_id
+        self._ring_size = ring_size
+        self._fingerprint: Optional[str] = None
+        self._last_frame: Optional[str] = None
+
+    async def capture(self) -> str:
+        """Return the file ID of a frame showing the current page"""
+        fingerprint = await self._page_fingerprint()
+        if fingerprint is not None and fingerprint == self._fingerprint and self._last_frame:
+            return self._last_frame
+
+        screenshot = await self._browser.screenshot(quality=SCREENSHOT_QUALITY)
+        result = await self._file_storage.upload_file(
+            io.BytesIO(screenshot),
+            "screenshot.jpg",
+            self._user_id,
+            content_type="image/jpeg",
+            metadata={CONTENT_KIND_KEY: SCREENSHOT_KIND},
+        )
+        self._fingerprint = fingerprint
+        self._last_frame = result.file_id
+        evicted = await self._session_repository.add_screenshot(
+            self._session_id, result.file_id, self._ring_size
+        )
+        if evicted:
+            await self._session_repository.clear_screenshots(self._session_id, evicted)
+            for file_id in evicted:
+                await self._release(file_id)
+        return result.file_id
+
+    async def _page_fingerprint(self) -> Optional[str]:
+        try:
+            return await self._browser.page_fingerprint()
+        except Exception:
+            # Pages mid-navigation may refuse scripts; capture instead
+            logger.debug("Page fingerprint unavailable", exc_info=True)
+            return None
+
+    async def _release(self, file_id: str) -> None:
+        try:
+            await self._file_storage.delete_file(file_id, self._user_id)
+        except Exception:
+            logger.warning(f"Failed to release screenshot {file_id}", exc_info=True)
@@ -0,0 +1,69 @@
+"""Compact file tool payloads.
+
+File tool events carry a unified diff against the content before the
+call plus the size and SHA-256 of the resulting file. The body is inlined
+only for small files; larger ones are read through ``file_view`` when a
+client opens them.
+"""
+import difflib
+import hashlib
+from typing import Optional
+
+from app.domain.models.event import FileToolContent
+
+# Files up to this many characters travel inline with their events
+FILE_CONTENT_INLINE_MAX_CHARS = 32_000
+# Diffs beyond this size are dropped; clients show the file without one
+FILE_DIFF_MAX_CHARS = 256_000
+
+NO_NEWLINE_MARKER = "\\ No newline at end of file\n"
+
+
+def _split_lines(text: str) -> list[str]:
+    # Only "\n" ends a line, as for the clients applying the diff
+    # (str.splitlines also splits on \r, form feeds, ...)
+    parts = text.split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1])
+    return lines
+
+
+def unified_diff(old_content: str, new_content: str, path: str = "") -> str:
+    """Render a unified diff from ``old_content`` to ``new_content``"""
+    lines = []
+    for line in difflib.unified_diff(
+        _split_lines(old_content),
+        _split_lines(new_content),
+        fromfile=f"a{path}" if path.startswith("/") else f"a/{path}",
+        tofile=f"b{path}" if path.startswith("/") else f"b/{path}",
+    ):
+        if line.endswith("\n"):
+            lines.append(line)
+        else:
+            # A last line without newline, marked the way diff(1) does
+            lines.append(line + "\n" + NO_NEWLINE_MARKER)
+    return "".join(lines)
+
+
+def build_file_tool_content(
+    path: str,
+    content: str,
+    old_content: Optional[str] = None,
+) -> FileToolContent:
+    """Describe a file after a tool call, relative to ``old_content``.
+
+    ``old_content`` is None when the file did not exist before the call
+    or was not snapshotted (reads); such events carry no diff.
+    """
+    diff = None
+    if old_content is not None:
+        diff = unified_diff(old_content, content, path)
+        if len(diff) > FILE_DIFF_MAX_CHARS:
+            diff = None
+    return FileToolContent(
+        content=content if len(content) <= FILE_CONTENT_INLINE_MAX_CHARS else None,
+        diff=diff,
+        size=len(content.encode("utf-8")),
+        sha256=hashlib.sha256(content.encode("utf-8")).hexdigest(),
+    )
@@ -0,0 +1,81 @@
+"""Sandbox shell consoles kept current through cursor-based views."""
+import logging
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.domain.external.sandbox import Sandbox
+
+logger = logging.getLogger(__name__)
+
+
+class ConsoleDelta(BaseModel):
+    """Console records from record ``start`` on.
+
+    The first record continues record ``start`` of the previous console
+    after ``offset`` characters of its output. ``start == offset == 0``
+    replaces the whole console.
+    """
+    records: List[Dict[str, Any]] = []
+    start: int = 0
+    offset: int = 0
+
+
+def apply_console_delta(console: List[Dict[str, Any]], delta: ConsoleDelta) -> List[Dict[str, Any]]:
+    """Splice a delta into the console it was taken against"""
+    records = list(delta.records)
+    if delta.offset and records:
+        kept = (
+            str(console[delta.start].get("output") or "")
+            if delta.start < len(console) else ""
+        )
+        if len(kept) < delta.offset:
+            logger.warning(f"Console delta at {delta.start}:{delta.offset} does not fit the console it continues")
+            return records
+        records[0] = {**records[0], "output": kept[:delta.offset] + str(records[0].get("output") or "")}
+    return console[:delta.start] + records
+
+
+class ShellConsoles:
+    """Mirrors of a sandbox's shell consoles.
+
+    Each refresh asks the sandbox only for the output written since the
+    previous one, so polling a long-running shell costs its new output
+    rather than its whole history.
+    """
+
+    def __init__(self, sandbox: Sandbox):
+        self._sandbox = sandbox
+        self._consoles: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursors: Dict[str, str] = {}
+
+    async def refresh(self, shell_id: str) -> Optional[ConsoleDelta]:
+        """Fetch what changed in a shell's console, None if nothing did"""
+        result = await self._sandbox.view_shell(
+            shell_id, console=True, console_cursor=self._cursors.get(shell_id)
+        )
+        if not result.success or not isinstance(result.data, dict):
+            raise RuntimeError(f"Failed to view shell {shell_id}: {result.message}")
+        data = result.data
+        cursor = data.get("console_cursor")
+        if cursor and cursor == self._cursors.get(shell_id):
+            return None
+        # Sandboxes without cursor support return the whole console
+        delta = ConsoleDelta(
+            records=data.get("console") or [],
+            start=data.get("console_start") or 0,
+            offset=data.get("console_offset") or 0,
+        )
+        console = apply_console_delta(self.console(shell_id), delta)
+        if cursor:
+            self._cursors[shell_id] = cursor
+        else:
+            self._cursors.pop(shell_id, None)
+            if console == self.console(shell_id):
+                return None
+        self._consoles[shell_id] = console
+        return delta
+
+    def console(self, shell_id: str) -> List[Dict[str, Any]]:
+        """The full console of a shell as of its last refresh"""
+        return self._consoles.get(shell_id, [])
@@ -145,18 +145,28 @@ def _build_parameters(func: Callable, param_docs: Dict[str, str]) -> Dict[str, A
 class ToolFunction:
     """Marker produced by ``@tool``; collected by ``BaseToolkit`` at init."""
 
-    def __init__(self, func: Callable, name: str, description: str, parameters: Dict[str, Any]):
+    def __init__(
+        self,
+        func: Callable,
+        name: str,
+        description: str,
+        parameters: Dict[str, Any],
+        parallel_safe: bool = False,
+    ):
         self.func = func
         self.name = name
         self.description = description
         self.parameters = parameters
+        self.parallel_safe = parallel_safe
 
 
-def tool(func: Optional[Callable] = None, **_kwargs: Any):
+def tool(func: Optional[Callable] = None, parallel_safe: bool = False, **_kwargs: Any):
     """Decorator that turns an async method into a :class:`ToolFunction`.
 
-    Accepts and ignores extra keyword arguments (e.g. ``parse_docstring``) for
-    drop-in compatibility with the previous LangChain decorator call sites.
+    ``parallel_safe`` marks read-only tools that may run concurrently with
+    other such calls from the same model response. Accepts and ignores extra
+    keyword arguments (e.g. ``parse_docstring``) for drop-in compatibility
+    with the previous LangChain decorator call sites.
     """
 
     def decorator(f: Callable) -> ToolFunction:
@@ -167,6 +177,7 @@ def tool(func: Optional[Callable] = None, **_kwargs: Any):
             name=f.__name__,
             description=summary,
             parameters=parameters,
+            parallel_safe=parallel_safe,
         )
 
     if callable(func):
@@ -184,12 +195,15 @@ class Tool:
         parameters: Dict[str, Any],
         invoker: Callable[[Dict[str, Any]], Awaitable[Any]],
         toolkit: "BaseToolkit",
+        parallel_safe: bool = False,
     ):
         self.name = name
         self.description = description
         self.parameters = parameters
         self.toolkit = toolkit
+        self.parallel_safe = parallel_safe
         self._invoker = invoker
+        self._schema: Optional[Dict[str, Any]] = None
 
     @classmethod
     def from_function(cls, tool_function: ToolFunction, toolkit: "BaseToolkit") -> "Tool":
@@ -204,6 +218,7 @@ class Tool:
             parameters=tool_function.parameters,
             invoker=invoker,
             toolkit=toolkit,
+            parallel_safe=tool_function.parallel_safe,
         )
 
     @classmethod
@@ -214,6 +229,7 @@ class Tool:
         parameters: Dict[str, Any],
         invoker: Callable[[Dict[str, Any]], Awaitable[Any]],
         toolkit: "BaseToolkit",
+        parallel_safe: bool = False,
     ) -> "Tool":
         """Build a tool from a runtime-discovered schema (e.g. an MCP tool)."""
         return cls(
@@ -222,6 +238,7 @@ class Tool:
             parameters=parameters,
             invoker=invoker,
             toolkit=toolkit,
+            parallel_safe=parallel_safe,
         )
 
     async def invoke(self, args: Dict[str, Any]) -> Any:
@@ -230,22 +247,27 @@ class Tool:
         return await self._invoker(clean)
 
     def to_openai_schema(self) -> Dict[str, Any]:
-        """Render this tool as an OpenAI function-calling schema."""
-        # Soft chat/plan tools are not StandardToolUsed rows — no brief.
-        toolkit_name = getattr(self.toolkit, "name", "") or ""
-        parameters = (
-            self.parameters
-            if toolkit_name in {"message", "todo"}
-            else with_brief_parameter(self.parameters)
-        )
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": parameters,
-            },
-        }
+        """Render this tool as an OpenAI function-calling schema.
+
+        Rendered once and shared afterwards; callers must not mutate it.
+        """
+        if self._schema is None:
+            # Soft chat/plan tools are not StandardToolUsed rows — no brief.
+            toolkit_name = getattr(self.toolkit, "name", "") or ""
+            parameters = (
+                self.parameters
+                if toolkit_name in {"message", "todo"}
+                else with_brief_parameter(self.parameters)
+            )
+            self._schema = {
+                "type": "function",
+                "function": {
+                    "name": self.name,
+                    "description": self.description,
+                    "parameters": parameters,
+                },
+            }
+        return self._schema
 
 
 class OutputTool:
@@ -296,26 +318,45 @@ class BaseToolkit:
     instructions: str = ""
 
     def __init__(self):
-        self.tools: List[Tool] = []
-        for _, member in inspect.getmembers(
-            type(self), lambda x: isinstance(x, ToolFunction)
-        ):
-            self.tools.append(Tool.from_function(member, toolkit=self))
+        self.tools = [
+            Tool.from_function(member, toolkit=self)
+            for _, member in inspect.getmembers(
+                type(self), lambda x: isinstance(x, ToolFunction)
+            )
+        ]
+
+    @property
+    def tools(self) -> List[Tool]:
+        return self._tools
+
+    @tools.setter
+    def tools(self, tools: List[Tool]) -> None:
+        # Replacing the tool set (e.g. MCP discovery) drops the compiled
+        # schemas and name index; they are rebuilt on next use.
+        self._tools = tools
+        self._schemas: Optional[List[Dict[str, Any]]] = None
+        self._index: Optional[Dict[str, Tool]] = None
 
     def get_tools(self) -> List[Tool]:
         """Return all invocable tools in this toolkit."""
         return self.tools
 
     def get_tool_schemas(self) -> List[Dict[str, Any]]:
-        """Return OpenAI function schemas for all tools in this toolkit."""
-        return [t.to_openai_schema() for t in self.get_tools()]
+        """Return OpenAI function schemas for all tools in this toolkit.
+
+        The same list is returned until the tool set is replaced.
+        """
+        if self._schemas is None:
+            self._schemas = [t.to_openai_schema() for t in self.get_tools()]
+        return self._schemas
 
     def get_tool(self, tool_name: str) -> Optional[Tool]:
         """Return the tool with the given name, or ``None``."""
-        for t in self.get_tools():
-            if t.name == tool_name:
-                return t
-        return None
+        if self._index is None:
+            self._index = {}
+            for t in self.get_tools():
+                self._index.setdefault(t.name, t)
+        return self._index.get(tool_name)
 
 
 def describe_toolkits(toolkits: List[BaseToolkit]) -> str:
@@ -26,7 +26,7 @@ class FileToolkit(BaseToolkit):
         super().__init__()
         self.sandbox = sandbox
         
-    @tool(parse_docstring=True)
+    @tool(parse_docstring=True, parallel_safe=True)
     async def file_read(
         self,
         file: str,
@@ -111,7 +111,7 @@ class FileToolkit(BaseToolkit):
             sudo=sudo
         )
     
-    @tool(parse_docstring=True)
+    @tool(parse_docstring=True, parallel_safe=True)
     async def file_find_in_content(
         self,
         file: str,
@@ -132,7 +132,7 @@ class FileToolkit(BaseToolkit):
             sudo=sudo
         )
     
-    @tool(parse_docstring=True)
+    @tool(parse_docstring=True, parallel_safe=True)
     async def file_find_by_name(
         self,
         path: str,
@@ -1,13 +1,16 @@
 import os
+import time
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from contextlib import AsyncExitStack
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from mcp.client.sse import sse_client
 from mcp.client.streamable_http import streamablehttp_client
-from mcp.types import Tool as MCPToolkit
+from mcp.types import Tool as MCPTool
 
 from app.domain.services.tools.base import BaseToolkit, Tool
 from app.domain.models.tool_result import ToolResult
@@ -15,263 +18,269 @@ from app.domain.models.mcp_config import MCPConfig, MCPServerConfig
 
 logger = logging.getLogger(__name__)
 
+# 工具列表缓存时长，过期后在下次使用时重新获取
+TOOLS_TTL_SECONDS = 300.0
+# 连接空闲超过该时长后，复用前先 ping 检查
+HEALTH_CHECK_INTERVAL_SECONDS = 30.0
+PING_TIMEOUT_SECONDS = 5.0
+CONNECT_TIMEOUT_SECONDS = 30.0
 
-class MCPClientManager:
-    """MCP 客户端管理器"""
-    
-    def __init__(self, config: Optional[MCPConfig] = None):
-        self._clients: Dict[str, ClientSession] = {}
-        self._exit_stack = AsyncExitStack()
-        self._tools_cache: Dict[str, List[MCPToolkit]] = {}
-        self._initialized = False
-        self._config = config
-    
-    async def initialize(self):
-        """初始化 MCP 客户端管理器"""
-        if self._initialized:
-            return
-        
-        try:
-            logger.info(f"从配置加载了 {len(self._config.mcpServers)} 个 MCP 服务器配置")
-            
-            # 连接到所有启用的服务器
-            await self._connect_servers()
-            
-            self._initialized = True
-            logger.info("MCP 客户端管理器初始化成功")
-            
-        except Exception as e:
-            logger.error(f"MCP 客户端管理器初始化失败: {e}")
-            raise
 
-    
-    async def _connect_servers(self):
-        """连接到所有启用的 MCP 服务器"""
-        for server_name, server_config in self._config.mcpServers.items():
-            if not server_config.enabled:
-                continue
-                
-            try:
-                await self._connect_server(server_name, server_config)
-            except Exception as e:
-                logger.error(f"连接到 MCP 服务器 {server_name} 失败: {e}")
-                # 继续连接其他服务器
-                continue
-    
-    async def _connect_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到单个 MCP 服务器"""
-        try:
-            transport_type = server_config.transport
-            
-            if transport_type == 'stdio':
-                await self._connect_stdio_server(server_name, server_config)
-            elif transport_type == 'http' or transport_type == 'sse':
-                await self._connect_http_server(server_name, server_config)
-            elif transport_type == 'streamable-http':
-                await self._connect_streamable_http_server(server_name, server_config)
-            else:
-                logger.error(f"不支持的传输类型: {transport_type}")
-                
-        except Exception as e:
-            logger.error(f"连接 MCP 服务器 {server_name} 失败: {e}")
-            raise
-    
-    async def _connect_stdio_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到 stdio MCP 服务器"""
-        command = server_config.command
-        args = server_config.args or []
-        env = server_config.env or {}
-        
-        if not command:
-            raise ValueError(f"服务器 {server_name} 缺少 command 配置")
-        
+def _mcp_tool_name(server_name: str, tool_name: str) -> str:
+    """生成工具名称，避免重复的 mcp_ 前缀"""
+    if server_name.startswith('mcp_'):
+        return f"{server_name}_{tool_name}"
+    return f"mcp_{server_name}_{tool_name}"
+
 
-        # 创建服务器参数（路径处理已在配置提供者中完成）
+async def _open_session(
+    stack: AsyncExitStack,
+    server_name: str,
+    server_config: MCPServerConfig,
+) -> ClientSession:
+    """按传输类型建立连接并初始化会话，资源注册到 ``stack``"""
+    transport_type = server_config.transport
+
+    if transport_type == 'stdio':
+        if not server_config.command:
+            raise ValueError(f"服务器 {server_name} 缺少 command 配置")
+        # 路径处理已在配置提供者中完成
         server_params = StdioServerParameters(
-            command=command,
-            args=args,
-            env={**os.environ, **env}
+            command=server_config.command,
+            args=server_config.args or [],
+            env={**os.environ, **(server_config.env or {})}
         )
-        
-        try:
-            # 建立连接
-            stdio_transport = await self._exit_stack.enter_async_context(
-                stdio_client(server_params)
-            )
-            read_stream, write_stream = stdio_transport
-            
-            # 创建会话
-            session = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
-            )
-            
-            # 初始化会话
-            await session.initialize()
-            
-            # 缓存客户端
-            self._clients[server_name] = session
-            
-            # 获取并缓存工具列表
-            await self._cache_server_tools(server_name, session)
-            
-            logger.info(f"成功连接到 stdio MCP 服务器: {server_name}")
-            
-        except Exception as e:
-            logger.error(f"连接到 stdio MCP 服务器 {server_name} 失败: {e}")
-            raise
-    
-    async def _connect_http_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到 HTTP MCP 服务器"""
-        url = server_config.url
-        if not url:
+        streams = await stack.enter_async_context(stdio_client(server_params))
+    elif transport_type == 'http' or transport_type == 'sse':
+        if not server_config.url:
             raise ValueError(f"服务器 {server_name} 缺少 url 配置")
-        
+        streams = await stack.enter_async_context(sse_client(server_config.url))
+    elif transport_type == 'streamable-http':
+        if not server_config.url:
+            raise ValueError(f"服务器 {server_name} 缺少 url 配置")
+        client_params: Dict[str, Any] = {"url": server_config.url}
+        if server_config.headers:
+            client_params["headers"] = server_config.headers
+        # streamable-http 额外返回会话 ID 回调
+        streams = await stack.enter_async_context(streamablehttp_client(**client_params))
+    else:
+        raise ValueError(f"不支持的传输类型: {transport_type}")
+
+    read_stream, write_stream = streams[0], streams[1]
+    session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
+    await session.initialize()
+    return session
+
+
+class MCPServerConnection:
+    """单个 MCP 服务器的长连接
+
+    会话与 stdio 子进程由专属任务持有：anyio 要求在同一任务中进入和退出
+    传输上下文，这样连接才能跨 agent 任务存活。
+    """
+
+    def __init__(self, server_name: str, server_config: MCPServerConfig):
+        self.server_name = server_name
+        self.server_config = server_config
+        self.fingerprint = server_config.model_dump_json()
+        self.session: Optional[ClientSession] = None
+        self.last_ok = 0.0
+        self._tools: List[MCPTool] = []
+        self._tools_fetched_at: Optional[float] = None
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def open(self) -> None:
+        ready = asyncio.get_running_loop().create_future()
+        self._task = asyncio.create_task(self._hold(ready))
         try:
-            # 建立 SSE 连接
-            sse_transport = await self._exit_stack.enter_async_context(
-                sse_client(url)
-            )
-            read_stream, write_stream = sse_transport
-            
-            # 创建会话
-            session = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
-            )
-            
-            # 初始化会话
-            await session.initialize()
-            
-            # 缓存客户端
-            self._clients[server_name] = session
-            
-            # 获取并缓存工具列表
-            await self._cache_server_tools(server_name, session)
-            
-            logger.info(f"成功连接到 HTTP MCP 服务器: {server_name}")
-            
-        except Exception as e:
-            logger.error(f"连接到 HTTP MCP 服务器 {server_name} 失败: {e}")
+            await asyncio.wait_for(asyncio.shield(ready), timeout=CONNECT_TIMEOUT_SECONDS)
+        except BaseException:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
             raise
-    
-    async def _connect_streamable_http_server(self, server_name: str, server_config: MCPServerConfig):
-        """连接到 streamable-http MCP 服务器
-        
-        配置选项：
-        - url: 服务器 URL (必需)
-        - headers: 自定义 HTTP 头 (可选)
-        """
-        url = server_config.url
-        if not url:
-            raise ValueError(f"服务器 {server_name} 缺少 url 配置")
-        
-        # 获取可选配置
-        headers = server_config.headers or {}
-        
+        self.last_ok = time.monotonic()
+
+    async def _hold(self, ready: asyncio.Future) -> None:
         try:
-            # 准备连接参数
-            client_params = {"url": url}
-            
-            # 添加自定义 headers
-            if headers:
-                client_params["headers"] = headers
-            
-            # 建立 streamable-http 连接
-            streamable_transport = await self._exit_stack.enter_async_context(
-                streamablehttp_client(**client_params)
-            )
-            
-            # 解包返回的流和可选的第三个参数
-            if len(streamable_transport) == 3:
-                read_stream, write_stream, _ = streamable_transport
-            else:
-                read_stream, write_stream = streamable_transport
-            
-            # 创建 MCP 会话
-            session = await self._exit_stack.enter_async_context(
-                ClientSession(read_stream, write_stream)
-            )
-            
-            # 初始化会话
-            await session.initialize()
-            
-            # 缓存客户端
-            self._clients[server_name] = session
-            
-            # 获取并缓存工具列表
-            await self._cache_server_tools(server_name, session)
-            
-            logger.info(f"成功连接到 streamable-http MCP 服务器: {server_name} ({url})")
-            
+            async with AsyncExitStack() as stack:
+                self.session = await _open_session(stack, self.server_name, self.server_config)
+                ready.set_result(None)
+                await self._closing.wait()
         except Exception as e:
-            logger.error(f"连接到 streamable-http MCP 服务器 {server_name} 失败: {e}")
-            raise
-    
-    async def _cache_server_tools(self, server_name: str, session: ClientSession):
-        """缓存服务器工具列表"""
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"MCP 服务器 {self.server_name} 连接已断开: {e}")
+        finally:
+            self.session = None
+            if not ready.done():
+                ready.cancel()
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    async def healthy(self) -> bool:
+        """连接存活且近期可用；空闲过久时 ping 一次确认"""
+        if not self.alive:
+            return False
+        if time.monotonic() - self.last_ok < HEALTH_CHECK_INTERVAL_SECONDS:
+            return True
         try:
-            tools_response = await session.list_tools()
-            tools = tools_response.tools if tools_response else []
-            self._tools_cache[server_name] = tools
-            logger.info(f"服务器 {server_name} 提供 {len(tools)} 个工具")
-            
+            await asyncio.wait_for(self.session.send_ping(), timeout=PING_TIMEOUT_SECONDS)
         except Exception as e:
-            logger.error(f"获取服务器 {server_name} 工具列表失败: {e}")
-            self._tools_cache[server_name] = []
-    
-    async def get_all_tools(self) -> List[Dict[str, Any]]:
-        """获取所有 MCP 工具"""
+            logger.warning(f"MCP 服务器 {self.server_name} 健康检查失败: {e}")
+            return False
+        self.last_ok = time.monotonic()
+        return True
+
+    async def list_tools(self) -> List[MCPTool]:
+        """获取工具列表，在 TTL 内复用上次结果"""
+        now = time.monotonic()
+        if self._tools_fetched_at is None or now - self._tools_fetched_at >= TOOLS_TTL_SECONDS:
+            tools_response = await self.session.list_tools()
+            self._tools = tools_response.tools if tools_response else []
+            self._tools_fetched_at = now
+            self.last_ok = now
+            logger.info(f"服务器 {self.server_name} 提供 {len(self._tools)} 个工具")
+        return self._tools
+
+
+class MCPClientManager:
+    """进程级 MCP 连接池
+
+    各服务器并发连接，会话与 stdio 子进程在 agent 任务之间复用；断开或
+    健康检查失败的连接在下次使用时重连。工具列表按 TTL 共享。
+    """
+
+    def __init__(self):
+        self._connections: Dict[str, MCPServerConnection] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # 工具名 -> (服务器名, 原始工具名)
+        self._routes: Dict[str, Tuple[str, str]] = {}
+
+    async def connect(self, config: MCPConfig) -> List[str]:
+        """确保所有启用的服务器已连接，返回可用的服务器名"""
+        servers = {
+            name: server_config
+            for name, server_config in config.mcpServers.items()
+            if server_config.enabled
+        }
+        # 配置中已移除或禁用的服务器不再保留连接
+        for name in [name for name in self._connections if name not in servers]:
+            await self._close(name)
+            self._drop_routes(name)
+
+        results = await asyncio.gather(
+            *(self._ensure(name, server_config) for name, server_config in servers.items()),
+            return_exceptions=True,
+        )
+        connected = []
+        for name, result in zip(servers, results):
+            if isinstance(result, Exception):
+                logger.error(f"连接到 MCP 服务器 {name} 失败: {result}")
+            else:
+                connected.append(name)
+        return connected
+
+    async def _ensure(self, server_name: str, server_config: MCPServerConfig) -> MCPServerConnection:
+        async with self._locks.setdefault(server_name, asyncio.Lock()):
+            connection = self._connections.get(server_name)
+            reconnect = connection is not None
+            if connection is not None:
+                if connection.fingerprint == server_config.model_dump_json() and await connection.healthy():
+                    return connection
+                logger.info(f"重新连接 MCP 服务器: {server_name}")
+                await self._close(server_name)
+            connection = MCPServerConnection(server_name, server_config)
+            await connection.open()
+            self._connections[server_name] = connection
+            logger.info(f"成功连接到 MCP 服务器: {server_name}")
+            if reconnect:
+                # 运行中的任务仍按工具名调用，重连后按新的工具列表更新路由
+                try:
+                    self._set_routes(server_name, await connection.list_tools())
+                except Exception as e:
+                    logger.warning(f"重连后获取服务器 {server_name} 工具列表失败: {e}")
+            return connection
+
+    async def _close(self, server_name: str) -> None:
+        """关闭连接；路由保留，服务器重连后仍可按工具名调用"""
+        connection = self._connections.pop(server_name, None)
+        if connection is not None:
+            await connection.close()
+
+    def _drop_routes(self, server_name: str) -> None:
+        self._routes = {
+            name: route for name, route in self._routes.items() if route[0] != server_name
+        }
+
+    def _set_routes(self, server_name: str, tools: List[MCPTool]) -> None:
+        self._drop_routes(server_name)
+        for tool in tools:
+            self._routes[_mcp_tool_name(server_name, tool.name)] = (server_name, tool.name)
+
+    async def get_all_tools(self, server_names: List[str]) -> List[Dict[str, Any]]:
+        """获取指定服务器的所有 MCP 工具"""
+        connections = [
+            self._connections[name] for name in server_names if name in self._connections
+        ]
+        results = await asyncio.gather(
+            *(connection.list_tools() for connection in connections),
+            return_exceptions=True,
+        )
         all_tools = []
-        
-        for server_name, tools in self._tools_cache.items():
+        for connection, tools in zip(connections, results):
+            server_name = connection.server_name
+            if isinstance(tools, Exception):
+                logger.error(f"获取服务器 {server_name} 工具列表失败: {tools}")
+                connection.last_ok = 0.0
+                continue
+            self._set_routes(server_name, tools)
             for tool in tools:
-                # 生成工具名称，避免重复的 mcp_ 前缀
-                if server_name.startswith('mcp_'):
-                    tool_name = f"{server_name}_{tool.name}"
-                else:
-                    tool_name = f"mcp_{server_name}_{tool.name}"
-                
+                tool_name = _mcp_tool_name(server_name, tool.name)
                 # 转换为标准工具格式
-                tool_schema = {
+                all_tools.append({
                     "type": "function",
                     "function": {
                         "name": tool_name,
                         "description": f"[{server_name}] {tool.description or tool.name}",
                         "parameters": tool.inputSchema
-                    }
-                }
-                all_tools.append(tool_schema)
-        
+                    },
+                    # 服务器声明为只读的工具可与其他只读调用并发执行
+                    "read_only": bool(getattr(getattr(tool, "annotations", None), "readOnlyHint", False)),
+                })
+
         return all_tools
-    
+
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> ToolResult:
         """调用 MCP 工具"""
+        connection: Optional[MCPServerConnection] = None
         try:
-            # 解析工具名称
-            server_name = None
-            original_tool_name = None
-            
-            # 查找匹配的服务器名称
-            for srv_name in self._config.mcpServers.keys():
-                expected_prefix = srv_name if srv_name.startswith('mcp_') else f"mcp_{srv_name}"
-                if tool_name.startswith(f"{expected_prefix}_"):
-                    server_name = srv_name
-                    original_tool_name = tool_name[len(expected_prefix) + 1:]
-                    break
-            
-            if not server_name or not original_tool_name:
+            route = self._routes.get(tool_name)
+            if not route:
                 raise ValueError(f"无法解析 MCP 工具名称: {tool_name}")
-            
-            # 获取客户端会话
-            session = self._clients.get(server_name)
-            if not session:
+            server_name, original_tool_name = route
+
+            connection = self._connections.get(server_name)
+            if connection is not None and not connection.alive:
+                connection = await self._ensure(server_name, connection.server_config)
+            if connection is None:
                 return ToolResult(
                     success=False,
                     message=f"MCP 服务器 {server_name} 未连接"
                 )
-            
+
             # 调用工具
-            result = await session.call_tool(original_tool_name, arguments)
-            
+            result = await connection.session.call_tool(original_tool_name, arguments)
+            connection.last_ok = time.monotonic()
+
             # 处理结果
             if result:
                 content = []
@@ -281,7 +290,7 @@ class MCPClientManager:
                             content.append(item.text)
                         else:
                             content.append(str(item))
-                
+
                 return ToolResult(
                     success=True,
                     data='\n'.join(content) if content else "工具执行成功"
@@ -291,25 +300,31 @@ class MCPClientManager:
                     success=True,
                     data="工具执行成功"
                 )
-                
+
         except Exception as e:
             logger.error(f"调用 MCP 工具 {tool_name} 失败: {e}")
+            if connection is not None:
+                # 下次复用前先做健康检查
+                connection.last_ok = 0.0
             return ToolResult(
                 success=False,
                 message=f"调用 MCP 工具失败: {str(e)}"
             )
 
-    async def cleanup(self):
-        """清理资源"""
+    async def shutdown(self):
+        """关闭所有连接"""
         try:
-            await self._exit_stack.aclose()
-            self._clients.clear()
-            self._tools_cache.clear()
-            self._initialized = False
-            logger.info("MCP 客户端管理器已清理")
-            
+            await asyncio.gather(*(self._close(name) for name in list(self._connections)))
+            self._routes.clear()
+            logger.info("MCP 连接池已关闭")
         except Exception as e:
-            logger.error(f"清理 MCP 客户端管理器失败: {e}")
+            logger.error(f"关闭 MCP 连接池失败: {e}")
+
+
+@lru_cache()
+def get_mcp_client_manager() -> MCPClientManager:
+    """获取进程级 MCP 连接池"""
+    return MCPClientManager()
 
 
 class MCPToolkit(BaseToolkit):
@@ -328,11 +343,11 @@ class MCPToolkit(BaseToolkit):
         self.manager: Optional[MCPClientManager] = None
 
     async def initialized(self, config: Optional[MCPConfig] = None):
-        """确保管理器已初始化"""
+        """确保已从连接池获取工具"""
         if not self._initialized:
-            self.manager = MCPClientManager(config)
-            await self.manager.initialize()
-            self.tools = self._build_tools(await self.manager.get_all_tools())
+            self.manager = get_mcp_client_manager()
+            servers = await self.manager.connect(config or MCPConfig())
+            self.tools = self._build_tools(await self.manager.get_all_tools(servers))
             self._initialized = True
 
     def _build_tools(self, schemas: List[Dict[str, Any]]) -> List[Tool]:
@@ -353,10 +368,11 @@ class MCPToolkit(BaseToolkit):
                 parameters=function.get("parameters", {}) or {"type": "object", "properties": {}},
                 invoker=invoker,
                 toolkit=self,
+                parallel_safe=bool(schema.get("read_only")),
             ))
         return tools
 
     async def cleanup(self):
-        """清理资源"""
-        if self.manager:
-            await self.manager.cleanup() 
+        """释放工具；连接留在连接池中供后续任务复用"""
+        self.tools = []
+        self._initialized = False
@@ -1,5 +1,6 @@
 from typing import Optional
 from app.domain.external.sandbox import Sandbox
+from app.domain.services.shell_console import ShellConsoles
 from app.domain.services.tools.base import BaseToolkit, tool
 from app.domain.models.tool_result import ToolResult
 
@@ -23,6 +24,8 @@ class ShellToolkit(BaseToolkit):
         """
         super().__init__()
         self.sandbox = sandbox
+        # Consoles streamed while shell functions run
+        self.consoles = ShellConsoles(sandbox)
         
     @tool(parse_docstring=True)
     async def shell_exec(
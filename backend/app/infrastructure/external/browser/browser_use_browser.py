@@ -37,6 +37,7 @@ from browser_use.browser.views import BrowserStateSummary
 from browser_use.dom.markdown_extractor import extract_clean_markdown
 
 from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.browser.page_fingerprint import PAGE_FINGERPRINT_SCRIPT
 
 logger = logging.getLogger(__name__)
 
@@ -518,11 +519,17 @@ class BrowserUseBrowser:
         except Exception as exc:
             return ToolResult(success=False, message=f"Failed to scroll down: {exc}")
 
-    async def screenshot(self, full_page: Optional[bool] = False) -> bytes:
-        """Return a PNG screenshot of the current page."""
+    async def screenshot(self, full_page: Optional[bool] = False, quality: Optional[int] = None) -> bytes:
+        """Return a screenshot of the current page, JPEG when quality is given, else PNG."""
         session = await self._ensure_session()
+        if quality is not None:
+            return await session.take_screenshot(full_page=bool(full_page), format="jpeg", quality=quality)
         return await session.take_screenshot(full_page=bool(full_page))
 
+    async def page_fingerprint(self) -> Optional[str]:
+        """Return a cheap digest of what a screenshot would show."""
+        return await self._evaluate_expression(PAGE_FINGERPRINT_SCRIPT)
+
     async def _evaluate_expression(self, expression: str) -> Any:
         """Evaluate a JavaScript expression via CDP Runtime.evaluate.
 
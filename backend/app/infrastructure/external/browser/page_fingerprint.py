@@ -0,0 +1,19 @@
+"""Page fingerprint shared by the browser implementations."""
+
+# Cheap digest of what a viewport screenshot would show: URL, scroll
+# position, viewport size, the DOM and current form values (typed text is
+# not reflected in the markup).
+PAGE_FINGERPRINT_SCRIPT = """(() => {
+    const root = document.documentElement;
+    const parts = [
+        location.href, scrollX, scrollY, innerWidth, innerHeight, devicePixelRatio,
+        root ? root.outerHTML : "",
+        Array.from(document.querySelectorAll("input, textarea, select"), el => el.value).join("\\u0001"),
+    ];
+    const text = parts.join("\\u0000");
+    let hash = 0;
+    for (let i = 0; i < text.length; i++) {
+        hash = (Math.imul(31, hash) + text.charCodeAt(i)) | 0;
+    }
+    return parts.slice(0, 6).join("|") + "|" + text.length + ":" + (hash >>> 0).toString(16);
+})()"""
@@ -23,6 +23,7 @@ from playwright.async_api import Page, async_playwright
 from markdownify import markdownify
 
 from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.browser.page_fingerprint import PAGE_FINGERPRINT_SCRIPT
 
 logger = logging.getLogger(__name__)
 
@@ -456,11 +457,18 @@ class PlaywrightBrowser:
         except Exception as exc:
             return ToolResult(success=False, message=f"Failed to scroll down: {exc}")
 
-    async def screenshot(self, full_page: Optional[bool] = False) -> bytes:
-        """Return a PNG screenshot of the current page."""
+    async def screenshot(self, full_page: Optional[bool] = False, quality: Optional[int] = None) -> bytes:
+        """Return a screenshot of the current page, JPEG when quality is given, else PNG."""
         page = await self._ensure_page()
+        if quality is not None:
+            return await page.screenshot(full_page=bool(full_page), type="jpeg", quality=quality)
         return await page.screenshot(full_page=bool(full_page), type="png")
 
+    async def page_fingerprint(self) -> Optional[str]:
+        """Return a cheap digest of what a screenshot would show."""
+        page = await self._ensure_page()
+        return await page.evaluate(PAGE_FINGERPRINT_SCRIPT)
+
     async def console_exec(self, javascript: str) -> ToolResult:
         """Execute JavaScript in the page with browser-console semantics."""
         try:
@@ -1,11 +1,13 @@
 import logging
-import io
-from typing import BinaryIO, Optional, Dict, Any, Tuple
+import hashlib
+import tempfile
+from typing import AsyncIterator, BinaryIO, Optional, Dict, Any, Tuple
 from datetime import datetime
 from bson import ObjectId
-from gridfs import AsyncGridFSBucket
+from gridfs import AsyncGridFSBucket, NoFile
+from pymongo import ASCENDING, ReturnDocument
 
-from app.domain.external.file import FileStorage
+from app.domain.external.file import CONTENT_HASH_KEY, CONTENT_KIND_KEY, FileStorage, content_hash
 from app.domain.models.file import FileInfo
 from app.infrastructure.storage.mongodb import MongoDB
 from app.core.config import get_settings
@@ -13,9 +15,34 @@ from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Downloads larger than this are spooled to a temporary file instead of memory
+DOWNLOAD_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+
+class _HashingReader:
+    """File-like wrapper computing the SHA-256 of everything read through it"""
+
+    def __init__(self, file_data: BinaryIO):
+        self._file_data = file_data
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._file_data.read(size)
+        self._digest.update(chunk)
+        return chunk
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
 
 class GridFSFileStorage(FileStorage):
-    """MongoDB GridFS-based file storage implementation"""
+    """MongoDB GridFS-based file storage implementation
+
+    Stored files are content-addressed per user and kind: the SHA-256 and
+    a reference count live in the file metadata, so identical uploads of
+    one kind share one GridFS entry whatever their name, session or path,
+    and deletes only remove content nobody else references.
+    """
     
     def __init__(self, mongodb: MongoDB, bucket_name: str = "fs"):
         """
@@ -28,6 +55,7 @@ class GridFSFileStorage(FileStorage):
         self.mongodb = mongodb
         self.bucket_name = bucket_name
         self.settings = get_settings()
+        self._indexes_ready = False
     
     def _get_gridfs_bucket(self) -> AsyncGridFSBucket:
         """Get async GridFS Bucket instance"""
@@ -45,6 +73,19 @@ class GridFSFileStorage(FileStorage):
         
         database = self.mongodb.client[self.settings.mongodb_database]
         return database[f"{self.bucket_name}.files"]
+
+    async def _ensure_indexes(self) -> None:
+        """Index the content hash lookup used to deduplicate uploads"""
+        if self._indexes_ready:
+            return
+        await self._get_files_collection().create_index(
+            [
+                ("metadata.user_id", ASCENDING),
+                (f"metadata.{CONTENT_HASH_KEY}", ASCENDING),
+                (f"metadata.{CONTENT_KIND_KEY}", ASCENDING),
+            ]
+        )
+        self._indexes_ready = True
     
     def _create_file_info(self, file_info: Dict[str, Any], file_id: str) -> FileInfo:
         """Create FileInfo object from GridFS file metadata"""
@@ -67,30 +108,63 @@ class GridFSFileStorage(FileStorage):
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None
     ) -> FileInfo:
-        """Upload file to GridFS"""
+        """Upload file to GridFS, reusing an entry with identical content"""
         try:
             bucket = self._get_gridfs_bucket()
+            files_collection = self._get_files_collection()
+            await self._ensure_indexes()
+
+            # Seekable streams are hashed up front so identical content is
+            # never uploaded twice
+            digest = content_hash(file_data) if file_data.seekable() else None
+            if digest:
+                existing = await files_collection.find_one_and_update(
+                    {
+                        "metadata.user_id": user_id,
+                        f"metadata.{CONTENT_HASH_KEY}": digest,
+                        # None also matches entries without a kind
+                        f"metadata.{CONTENT_KIND_KEY}": (metadata or {}).get(CONTENT_KIND_KEY),
+                        "metadata.refcount": {"$gte": 1},
+                    },
+                    {"$inc": {"metadata.refcount": 1}},
+                    return_document=ReturnDocument.AFTER,
+                )
+                if existing:
+                    logger.info(f"File content already stored: {filename} (ID: {existing['_id']}) for user {user_id}")
+                    # The entry may have been stored under another name
+                    file_info = self._create_file_info(existing, str(existing['_id']))
+                    return file_info.model_copy(update={"filename": filename})
             
             # Prepare metadata
             file_metadata = {
                 'filename': filename,
                 'uploadDate': datetime.utcnow(),
                 'user_id': user_id,  # Store user_id in metadata
-                **(metadata or {})
+                **(metadata or {}),
+                'refcount': 1,
             }
             
             if content_type:
                 file_metadata['contentType'] = content_type
+            if digest:
+                file_metadata[CONTENT_HASH_KEY] = digest
             
-            # Upload directly from file stream to avoid loading entire file into memory
+            # Upload directly from file stream to avoid loading entire file into memory;
+            # streams that cannot be rewound are hashed while uploading
+            reader = file_data if digest else _HashingReader(file_data)
             file_id = await bucket.upload_from_stream(
                 filename,
-                file_data,
+                reader,
                 metadata=file_metadata
             )
+            if not digest:
+                file_metadata[CONTENT_HASH_KEY] = reader.hexdigest()
+                await files_collection.update_one(
+                    {"_id": file_id},
+                    {"$set": {f"metadata.{CONTENT_HASH_KEY}": file_metadata[CONTENT_HASH_KEY]}},
+                )
             
             # Get file size (can be retrieved from GridFS if needed)
-            files_collection = self._get_files_collection()
             file_info = await files_collection.find_one({"_id": file_id})
             file_size = file_info.get('length', 0) if file_info else 0
             
@@ -132,8 +206,13 @@ class GridFSFileStorage(FileStorage):
                 file_user_id = file_info.get('metadata', {}).get('user_id')
                 if file_user_id != user_id:
                     raise PermissionError(f"Access denied: file {file_id} does not belong to user {user_id}")
-            stream = io.BytesIO()
-            await bucket.download_to_stream(obj_id, stream)
+            stream = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_MEMORY)
+            try:
+                async for chunk in self.stream_file(file_id):
+                    stream.write(chunk)
+            except BaseException:
+                stream.close()
+                raise
             stream.seek(0)
             return stream, self._create_file_info(file_info, file_id)
             
@@ -145,6 +224,34 @@ class GridFSFileStorage(FileStorage):
             logger.error(f"Failed to download file {file_id} for user {user_id}: {str(e)}")
             raise
     
+    async def stream_file(
+        self,
+        file_id: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a byte range of a file, one GridFS chunk at a time"""
+        try:
+            obj_id = ObjectId(file_id)
+        except Exception:
+            raise ValueError(f"Invalid file ID format: {file_id}")
+        try:
+            grid_out = await self._get_gridfs_bucket().open_download_stream(obj_id)
+        except NoFile:
+            raise FileNotFoundError(f"File not found with ID: {file_id}")
+        try:
+            await grid_out.seek(start)
+            stop = grid_out.length if end is None else min(end + 1, grid_out.length)
+            remaining = stop - start
+            while remaining > 0:
+                chunk = await grid_out.read(min(grid_out.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await grid_out.close()
+    
     async def delete_file(self, file_id: str, user_id: str) -> bool:
         """Delete file"""
         try:
@@ -168,6 +275,33 @@ class GridFSFileStorage(FileStorage):
                 logger.warning(f"Delete access denied: file {file_id} does not belong to user {user_id}")
                 return False
             
+            # Release one reference while others remain; otherwise claim the
+            # last one (refcount 0 stops dedup lookups from handing the file
+            # out) and remove the content. Entries stored before reference
+            # counting have no refcount and are treated as a single reference.
+            while True:
+                released = await files_collection.find_one_and_update(
+                    {"_id": obj_id, "metadata.refcount": {"$gt": 1}},
+                    {"$inc": {"metadata.refcount": -1}},
+                )
+                if released:
+                    logger.info(f"File reference released: {file_id} by user {user_id}")
+                    return True
+                claimed = await files_collection.find_one_and_update(
+                    {
+                        "_id": obj_id,
+                        "$or": [
+                            {"metadata.refcount": {"$exists": False}},
+                            {"metadata.refcount": {"$lte": 1}},
+                        ],
+                    },
+                    {"$set": {"metadata.refcount": 0}},
+                )
+                if claimed:
+                    break
+                if not await files_collection.find_one({"_id": obj_id}):
+                    return False
+            
             # Delete file
             await bucket.delete(obj_id)
             logger.info(f"File deleted successfully: {file_id} by user {user_id}")
@@ -1,17 +1,20 @@
 """LangChain implementation of the domain :class:`LLM` gateway.
 
 Keeps all LangChain-specific concerns — model instantiation, message
-translation, tool binding, the JSON-repair chain and model-level retries —
-inside the infrastructure layer, so the domain agents depend only on the
-:class:`app.domain.external.llm.LLM` Protocol and domain message types.
+translation, tool binding, prompt cache breakpoints, the JSON-repair chain
+and model-level retries — inside the infrastructure layer, so the domain
+agents depend only on the :class:`app.domain.external.llm.LLM` Protocol and
+domain message types.
 """
 import logging
+import time
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from langchain.chat_models import init_chat_model
 from langchain.messages import (
     AIMessage,
+    AIMessageChunk,
     HumanMessage,
     SystemMessage,
     ToolMessage,
@@ -21,7 +24,12 @@ from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
 
 from app.core.config import Settings, get_settings
-from app.domain.models.message import LLMMessage, Role, ToolCall
+from app.domain.models.message import LLMMessage, LLMStreamChunk, LLMUsage, Role, ToolCall
+from app.infrastructure.external.llm.metrics import record_llm_usage
+from app.infrastructure.external.llm.prompt_cache import (
+    PROMPT_CACHE_PROVIDERS,
+    add_cache_breakpoints,
+)
 from app.infrastructure.external.llm.robust_json_parser import (
     RobustJsonParser,
     ToolCallParseError,
@@ -40,6 +48,8 @@ class LangchainLLM:
     def __init__(self, settings: Optional[Settings] = None, max_retries: int = 3):
         settings = settings or get_settings()
         self._max_retries = max_retries
+        self._model_name = settings.model_name
+        self._cache_breakpoints = settings.model_provider in PROMPT_CACHE_PROVIDERS
 
         kwargs: Dict[str, Any] = dict(
             model=settings.model_name,
@@ -50,6 +60,9 @@ class LangchainLLM:
         )
         if settings.extra_headers:
             kwargs["default_headers"] = settings.extra_headers
+        if settings.model_provider == "openai":
+            # OpenAI only reports token usage on streams when asked to
+            kwargs["stream_usage"] = True
         self._model = init_chat_model(**kwargs)
 
         self._json_output_parser = RetryWithErrorOutputParser.from_llm(
@@ -92,6 +105,11 @@ class LangchainLLM:
                 )
         return lc_messages
 
+    def _context(self, messages: List[LLMMessage]) -> List[Any]:
+        """Request context, with prompt cache breakpoints where the provider needs them"""
+        context = self._to_langchain(messages)
+        return add_cache_breakpoints(context) if self._cache_breakpoints else context
+
     def _from_langchain(self, message: AIMessage) -> LLMMessage:
         tool_calls = [
             ToolCall(
@@ -114,36 +132,67 @@ class LangchainLLM:
     # LLM Protocol
     # ------------------------------------------------------------------
 
-    async def ask(
+    def _bind(
         self,
-        messages: List[LLMMessage],
-        tools: Optional[List[Dict[str, Any]]] = None,
-        response_format: Optional[str] = None,
-        tool_choice: Optional[str] = None,
-    ) -> LLMMessage:
-        rf = {"type": response_format} if response_format else None
-
+        tools: Optional[List[Dict[str, Any]]],
+        response_format: Optional[str],
+        tool_choice: Optional[str],
+    ) -> Any:
         bind_kwargs: Dict[str, Any] = {}
-        if rf is not None:
-            bind_kwargs["response_format"] = rf
+        if response_format:
+            bind_kwargs["response_format"] = {"type": response_format}
         if tool_choice is not None:
             bind_kwargs["tool_choice"] = tool_choice
         model = self._model.bind(**bind_kwargs) if bind_kwargs else self._model
         if tools:
             model = model.bind_tools(tools)
+        return model
+
+    def _usage(
+        self,
+        message: Optional[AIMessage],
+        started: float,
+        first_token_at: Optional[float] = None,
+    ) -> LLMUsage:
+        """Build call stats from LangChain ``usage_metadata`` and timestamps."""
+        usage = (message.usage_metadata if message is not None else None) or {}
+        details = usage.get("input_token_details") or {}
+        return LLMUsage(
+            model=self._model_name,
+            prompt_tokens=usage.get("input_tokens") or 0,
+            completion_tokens=usage.get("output_tokens") or 0,
+            cached_tokens=details.get("cache_read") or 0,
+            cache_write_tokens=details.get("cache_creation") or 0,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            time_to_first_token_ms=(
+                (first_token_at - started) * 1000 if first_token_at is not None else None
+            ),
+        )
+
+    async def ask(
+        self,
+        messages: List[LLMMessage],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        response_format: Optional[str] = None,
+        tool_choice: Optional[str] = None,
+    ) -> LLMMessage:
+        model = self._bind(tools, response_format, tool_choice)
 
         # Stages 1-3: RobustJsonParser repairs invalid tool call JSON locally
         # and via a cheap fixing call. Stages 4-5: this outer loop retries the
         # model, silently first then with error feedback.
         chain = model | RobustJsonParser.from_llm(self._model)
 
-        context = self._to_langchain(messages)
+        context = self._context(messages)
         message: Optional[AIMessage] = None
         for attempt in range(self._max_retries):
+            started = time.perf_counter()
             try:
                 message = await chain.ainvoke(context)
+                record_llm_usage(self._usage(message, started))
                 break
             except ToolCallParseError as e:
+                record_llm_usage(self._usage(e.invalid_message, started))
                 if attempt == self._max_retries - 1:
                     raise
                 logger.warning(
@@ -158,6 +207,44 @@ class LangchainLLM:
         logger.debug("Response from model: %s", message)
         return self._from_langchain(message)
 
+    async def ask_stream(
+        self,
+        messages: List[LLMMessage],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        response_format: Optional[str] = None,
+        tool_choice: Optional[str] = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        model = self._bind(tools, response_format, tool_choice)
+        started = time.perf_counter()
+        first_token_at: Optional[float] = None
+        # Adding chunks merges text, tool call fragments and usage metadata
+        aggregate: Optional[AIMessageChunk] = None
+
+        async for chunk in model.astream(self._context(messages)):
+            aggregate = chunk if aggregate is None else aggregate + chunk
+            delta = chunk.text
+            if first_token_at is None and (delta or chunk.tool_call_chunks):
+                first_token_at = time.perf_counter()
+            if delta:
+                yield LLMStreamChunk(delta=delta)
+
+        usage = self._usage(aggregate, started, first_token_at)
+        record_llm_usage(usage)
+
+        try:
+            message = (
+                self._from_langchain(await RobustJsonParser.from_llm(self._model).ainvoke(aggregate))
+                if aggregate is not None
+                else LLMMessage.assistant()
+            )
+        except ToolCallParseError:
+            # Text was already streamed; only the tool calls need a retry,
+            # which the non-streaming path handles with its feedback loop.
+            logger.warning("Streamed tool call JSON repair failed, retrying without streaming")
+            message = await self.ask(messages, tools, response_format, tool_choice)
+        logger.debug("Response from model: %s", message)
+        yield LLMStreamChunk(message=message, usage=usage)
+
     async def parse_json(self, text: str) -> Dict[str, Any]:
         """Extract/repair a JSON object from raw model output."""
         prompt_value = self._JSON_PARSE_PROMPT.format_prompt(input=text)
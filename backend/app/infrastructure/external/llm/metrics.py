@@ -0,0 +1,108 @@
+"""Per-model token and latency metrics for LLM gateway calls.
+
+Every gateway call reports an :class:`LLMUsage` here. Each call is logged and
+added to process-wide per-model totals, so operators can follow token spend,
+cache hits, tokens/sec and time-to-first-token per model.
+"""
+import logging
+import threading
+from typing import Dict, Optional
+
+from app.domain.models.message import LLMUsage
+
+logger = logging.getLogger(__name__)
+
+
+class ModelMetrics:
+    """Running totals for one model."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.cache_write_tokens = 0
+        self.latency_ms = 0.0
+        self.streamed_calls = 0
+        self.time_to_first_token_ms = 0.0
+
+    def add(self, usage: LLMUsage) -> None:
+        self.calls += 1
+        self.prompt_tokens += usage.prompt_tokens
+        self.completion_tokens += usage.completion_tokens
+        self.cached_tokens += usage.cached_tokens
+        self.cache_write_tokens += usage.cache_write_tokens
+        self.latency_ms += usage.latency_ms
+        if usage.time_to_first_token_ms is not None:
+            self.streamed_calls += 1
+            self.time_to_first_token_ms += usage.time_to_first_token_ms
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            # Share of prompt tokens read from the prompt cache
+            "cache_hit_ratio": (
+                self.cached_tokens / self.prompt_tokens if self.prompt_tokens else None
+            ),
+            "avg_latency_ms": self.latency_ms / self.calls if self.calls else None,
+            "avg_time_to_first_token_ms": (
+                self.time_to_first_token_ms / self.streamed_calls
+                if self.streamed_calls
+                else None
+            ),
+            "tokens_per_second": (
+                self.completion_tokens * 1000.0 / self.latency_ms
+                if self.latency_ms
+                else None
+            ),
+        }
+
+
+class LLMMetrics:
+    """Process-wide per-model LLM metrics."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._models: Dict[str, ModelMetrics] = {}
+
+    def record(self, usage: LLMUsage) -> None:
+        with self._lock:
+            self._models.setdefault(usage.model, ModelMetrics()).add(usage)
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        with self._lock:
+            return {model: m.snapshot() for model, m in self._models.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+_metrics = LLMMetrics()
+
+
+def get_llm_metrics() -> LLMMetrics:
+    """Return the process-wide LLM metrics."""
+    return _metrics
+
+
+def record_llm_usage(usage: LLMUsage) -> None:
+    """Log a finished LLM call and add it to the per-model totals."""
+    tps = usage.tokens_per_second
+    logger.info(
+        "LLM call model=%s prompt_tokens=%d cached_tokens=%d cache_write_tokens=%d "
+        "completion_tokens=%d latency_ms=%.0f ttft_ms=%s tokens_per_s=%s",
+        usage.model,
+        usage.prompt_tokens,
+        usage.cached_tokens,
+        usage.cache_write_tokens,
+        usage.completion_tokens,
+        usage.latency_ms,
+        f"{usage.time_to_first_token_ms:.0f}" if usage.time_to_first_token_ms is not None else "-",
+        f"{tps:.1f}" if tps is not None else "-",
+    )
+    _metrics.record(usage)
@@ -14,13 +14,16 @@ Selected via ``LLM_PROVIDER=openai``.
 import json
 import logging
 import re
+import time
 from functools import lru_cache
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessage, ChatCompletionMessageFunctionToolCall
 
 from app.core.config import Settings, get_settings
-from app.domain.models.message import LLMMessage, Role, ToolCall
+from app.domain.models.message import LLMMessage, LLMStreamChunk, LLMUsage, Role, ToolCall
+from app.infrastructure.external.llm.metrics import record_llm_usage
 
 logger = logging.getLogger(__name__)
 
@@ -172,13 +175,13 @@ class OpenAILLM:
     # LLM Protocol
     # ------------------------------------------------------------------
 
-    async def _create(
+    def _request_kwargs(
         self,
         messages: List[Dict[str, Any]],
         tools: Optional[List[Dict[str, Any]]],
         response_format: Optional[str],
         tool_choice: Optional[str],
-    ) -> Any:
+    ) -> Dict[str, Any]:
         kwargs: Dict[str, Any] = dict(
             model=self._model,
             messages=messages,
@@ -191,7 +194,39 @@ class OpenAILLM:
                 kwargs["tool_choice"] = tool_choice
         if response_format:
             kwargs["response_format"] = {"type": response_format}
-        response = await self._client.chat.completions.create(**kwargs)
+        return kwargs
+
+    def _usage(
+        self,
+        raw_usage: Any,
+        started: float,
+        first_token_at: Optional[float] = None,
+    ) -> LLMUsage:
+        """Build call stats from an OpenAI ``usage`` object and timestamps."""
+        details = getattr(raw_usage, "prompt_tokens_details", None)
+        return LLMUsage(
+            model=self._model,
+            prompt_tokens=getattr(raw_usage, "prompt_tokens", None) or 0,
+            completion_tokens=getattr(raw_usage, "completion_tokens", None) or 0,
+            cached_tokens=getattr(details, "cached_tokens", None) or 0,
+            latency_ms=(time.perf_counter() - started) * 1000,
+            time_to_first_token_ms=(
+                (first_token_at - started) * 1000 if first_token_at is not None else None
+            ),
+        )
+
+    async def _create(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+        response_format: Optional[str],
+        tool_choice: Optional[str],
+    ) -> Any:
+        started = time.perf_counter()
+        response = await self._client.chat.completions.create(
+            **self._request_kwargs(messages, tools, response_format, tool_choice)
+        )
+        record_llm_usage(self._usage(response.usage, started))
         return response.choices[0].message
 
     async def ask(
@@ -231,6 +266,73 @@ class OpenAILLM:
         # Unreachable: loop either returns or raises.
         raise _ToolArgsParseError(["exhausted retries"])
 
+    async def ask_stream(
+        self,
+        messages: List[LLMMessage],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        response_format: Optional[str] = None,
+        tool_choice: Optional[str] = None,
+    ) -> AsyncIterator[LLMStreamChunk]:
+        kwargs = self._request_kwargs(
+            self._to_openai(messages), tools, response_format, tool_choice
+        )
+        started = time.perf_counter()
+        first_token_at: Optional[float] = None
+        content: List[str] = []
+        # Tool calls arrive as fragments keyed by their index in the message
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        raw_usage = None
+
+        stream = await self._client.chat.completions.create(
+            **kwargs, stream=True, stream_options={"include_usage": True}
+        )
+        async for chunk in stream:
+            if chunk.usage is not None:
+                raw_usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta is None:
+                continue
+            if first_token_at is None and (delta.content or delta.tool_calls):
+                first_token_at = time.perf_counter()
+            for tc in delta.tool_calls or []:
+                call = tool_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                if tc.id:
+                    call["id"] = tc.id
+                if tc.function is not None:
+                    call["name"] += tc.function.name or ""
+                    call["arguments"] += tc.function.arguments or ""
+            if delta.content:
+                content.append(delta.content)
+                yield LLMStreamChunk(delta=delta.content)
+
+        usage = self._usage(raw_usage, started, first_token_at)
+        record_llm_usage(usage)
+
+        assembled = ChatCompletionMessage(
+            role="assistant",
+            content="".join(content),
+            tool_calls=[
+                ChatCompletionMessageFunctionToolCall(
+                    id=call["id"],
+                    type="function",
+                    function={"name": call["name"], "arguments": call["arguments"]},
+                )
+                for _, call in sorted(tool_calls.items())
+            ]
+            or None,
+        )
+        try:
+            message = self._from_openai(assembled)
+        except _ToolArgsParseError as e:
+            # Text was already streamed; only the tool calls need a retry,
+            # which the non-streaming path handles with its feedback loop.
+            logger.warning("Streamed tool call JSON parse failed, retrying without streaming: %s", e)
+            message = await self.ask(messages, tools, response_format, tool_choice)
+        logger.debug("Response from model: %s", message)
+        yield LLMStreamChunk(message=message, usage=usage)
+
     async def parse_json(self, text: str) -> Dict[str, Any]:
         """Extract/repair a JSON object from raw model output."""
         local = _extract_json_object(text)
@@ -238,6 +340,7 @@ class OpenAILLM:
             return local
 
         logger.info("Local JSON extraction failed, asking model to repair")
+        started = time.perf_counter()
         response = await self._client.chat.completions.create(
             model=self._model,
             messages=[
@@ -246,6 +349,7 @@ class OpenAILLM:
             temperature=0,
             response_format={"type": "json_object"},
         )
+        record_llm_usage(self._usage(response.usage, started))
         repaired = _extract_json_object(response.choices[0].message.content)
         if repaired is None:
             raise ValueError(f"Failed to parse JSON from model output: {text!r}")
@@ -0,0 +1,47 @@
+"""Prompt cache breakpoints for providers that need them marked explicitly.
+
+Agent requests share a long prefix: the tool schemas, the system prompt and
+the history up to the previous turn, which the agents keep byte-identical
+from call to call. OpenAI-style endpoints cache such prefixes on their own;
+Anthropic only caches up to content blocks carrying ``cache_control``. Two
+breakpoints are marked there:
+
+* the system message, caching the tools and the system prompt, which are
+  identical across every call of an agent,
+* the last message that is not the model's own, caching the whole history
+  so the next call of the loop reads it back instead of prefilling it.
+"""
+from typing import Any, List, Optional
+
+from langchain.messages import AIMessage, SystemMessage
+
+# Model providers (``MODEL_PROVIDER``) whose prompt cache needs breakpoints
+PROMPT_CACHE_PROVIDERS = frozenset({"anthropic"})
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def _with_cache_control(content: Any) -> Optional[List[Any]]:
+    """Content as blocks with a breakpoint on the last one, None if empty"""
+    if isinstance(content, str):
+        if not content:
+            return None
+        return [{"type": "text", "text": content, "cache_control": CACHE_CONTROL}]
+    if isinstance(content, list) and content and isinstance(content[-1], dict):
+        return [*content[:-1], {**content[-1], "cache_control": CACHE_CONTROL}]
+    return None
+
+
+def add_cache_breakpoints(messages: List[Any]) -> List[Any]:
+    """Copy of LangChain messages with cache breakpoints marked"""
+    marked = list(messages)
+    targets = [next((i for i, m in enumerate(marked) if isinstance(m, SystemMessage)), None)]
+    targets.append(next(
+        (i for i in range(len(marked) - 1, -1, -1) if not isinstance(marked[i], AIMessage)),
+        None,
+    ))
+    for index in dict.fromkeys(i for i in targets if i is not None):
+        content = _with_cache_control(marked[index].content)
+        if content is not None:
+            marked[index] = marked[index].model_copy(update={"content": content})
+    return marked
@@ -1,77 +1,55 @@
 import json
+import os
+import socket
+import time
 import uuid
-import asyncio
-from typing import Any, AsyncGenerator, Optional, Tuple
+from typing import Any, AsyncGenerator, List, Optional, Tuple
 import logging
+from redis.exceptions import ResponseError
 from app.infrastructure.storage.redis import get_redis
 from app.domain.external.message_queue import MessageQueue
 
 logger = logging.getLogger(__name__)
 
+# Consumer group used by pop(); readers of get()/get_batch() are independent
+CONSUMER_GROUP = "consumers"
+
+# A popped message unacknowledged for this long is considered abandoned by
+# a dead consumer and may be reclaimed
+DEFAULT_CLAIM_IDLE_MS = 30_000
+
+
+def _stream_id(message_id: str) -> Tuple[int, int]:
+    milliseconds, _, sequence = message_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
 class RedisStreamQueue(MessageQueue):
-    """Redis Stream implementation of message queue"""
+    """Redis Stream implementation of message queue
+
+    Reads through get()/get_batch() are plain XREADs that leave the stream
+    untouched. pop() consumes through a consumer group: XREADGROUP wakes on
+    arrival without polling, ack() removes the message, and pending
+    messages of a dead consumer are reclaimed with XAUTOCLAIM, giving
+    at-least-once delivery.
+
+    With ``maxlen`` set, every XADD trims the stream to roughly that many
+    entries (``MAXLEN ~``), which lets Redis drop whole macro nodes cheaply.
+    """
     
-    def __init__(self, stream_name: str):
+    def __init__(
+        self,
+        stream_name: str,
+        claim_idle_ms: int = DEFAULT_CLAIM_IDLE_MS,
+        maxlen: Optional[int] = None,
+    ):
         self._stream_name = stream_name
+        self._maxlen = maxlen
         self._redis = get_redis()
-        self._lock_expire_seconds = 10  # Lock expiration time
-    
-    async def _acquire_lock(self, lock_key: str, timeout_seconds: int = 5) -> Optional[str]:
-        """Acquire distributed lock
-        
-        Args:
-            lock_key: Lock key name
-            timeout_seconds: Timeout in seconds for acquiring lock
-            
-        Returns:
-            str: Lock value if acquired successfully, None otherwise
-        """
-        lock_value = str(uuid.uuid4())
-        end_time = timeout_seconds
-        
-        while end_time > 0:
-            # Use SET with NX and EX for atomic lock acquisition
-            result = await self._redis.client.set(
-                lock_key,
-                lock_value,
-                nx=True,  # Only set if key doesn't exist
-                ex=self._lock_expire_seconds  # Set expiration time
-            )
-            
-            if result:
-                return lock_value
-            
-            # Wait a bit before retrying
-            await asyncio.sleep(0.1)
-            end_time -= 0.1
-        
-        return None
-    
-    async def _release_lock(self, lock_key: str, lock_value: str) -> bool:
-        """Release distributed lock
-        
-        Args:
-            lock_key: Lock key name
-            lock_value: Lock value for verification
-            
-        Returns:
-            bool: True if lock released successfully, False otherwise
-        """
-        # Lua script for atomic lock release
-        release_script = """
-        if redis.call("GET", KEYS[1]) == ARGV[1] then
-            return redis.call("DEL", KEYS[1])
-        else
-            return 0
-        end
-        """
-        
-        try:
-            script = self._redis.client.register_script(release_script)
-            result = await script(keys=[lock_key], args=[lock_value])
-            return result == 1
-        except Exception:
-            return False
+        self._consumer = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._claim_idle_ms = claim_idle_ms
+        self._group_ready = False
+        self._last_claim = float("-inf")
     
     async def put(self, message: Any) -> str:
         """Add a message to the stream
@@ -83,7 +61,12 @@ class RedisStreamQueue(MessageQueue):
             str: Message ID
         """
         logger.debug(f"Putting message into stream ({self._stream_name}): {message}")
-        message_id = await self._redis.client.xadd(self._stream_name, {"data": message})
+        message_id = await self._redis.client.xadd(
+            self._stream_name,
+            {"data": message},
+            maxlen=self._maxlen,
+            approximate=True,
+        )
         return message_id
     
     async def get(self, start_id: str = "0", block_ms: Optional[int] = None) -> Tuple[str, Any]:
@@ -123,6 +106,34 @@ class RedisStreamQueue(MessageQueue):
             return message_id, message_data.get("data")
         except (KeyError, json.JSONDecodeError):
             return None, None
+
+    async def get_batch(self, start_id: str = "0", count: int = 100, block_ms: Optional[int] = None) -> List[Tuple[str, Any]]:
+        """Get up to `count` messages from the stream with a single XREAD
+        
+        Args:
+            start_id: Message ID to start reading from, defaults to "0" meaning from the earliest message
+            count: Maximum number of messages to return
+            block_ms: Block time in milliseconds when no message is available, defaults to None meaning no blocking
+            
+        Returns:
+            List[Tuple[str, Any]]: (Message ID, Message content) pairs in stream order, empty if no message
+        """
+        logger.debug(f"Getting up to {count} messages from stream ({self._stream_name}): {start_id}")
+        if start_id is None:
+            start_id = "0"
+
+        messages = await self._redis.client.xread(
+            {self._stream_name: start_id},
+            count=count,
+            block=block_ms
+        )
+        if not messages:
+            return []
+
+        return [
+            (message_id, message_data.get("data"))
+            for message_id, message_data in messages[0][1]
+        ]
     
     async def get_range(self, start_id: str = "-", end_id: str = "+", count: int = 100) -> AsyncGenerator[Tuple[str, Any], None]:
         """Get messages within a specified range
@@ -164,8 +175,47 @@ class RedisStreamQueue(MessageQueue):
         await self._redis.client.xtrim(self._stream_name, 0)
     
     async def is_empty(self) -> bool:
-        """Check if the stream is empty"""
-        return await self.size() == 0
+        """Check if no message is waiting to be popped
+
+        Counts what pop() can return right now: messages not yet delivered
+        to the consumer group and, when a reclaim is due, messages another
+        consumer left unacknowledged for ``claim_idle_ms``. Messages pending
+        on this consumer or on one that is still within that time do not
+        count, so callers looping until empty do not spin on them. Takes a
+        single round trip.
+        """
+        await self._ensure_group()
+        claim_due = self._claim_due()
+        async with self._redis.client.pipeline(transaction=False) as pipe:
+            pipe.xinfo_groups(self._stream_name)
+            pipe.xrevrange(self._stream_name, "+", "-", count=1)
+            if claim_due:
+                pipe.xpending_range(
+                    self._stream_name,
+                    CONSUMER_GROUP,
+                    min="-",
+                    max="+",
+                    # This consumer holds at most a few of them
+                    count=16,
+                    idle=self._claim_idle_ms,
+                )
+            groups, newest, *stale = await pipe.execute()
+        last_delivered = next(
+            (g["last-delivered-id"] for g in groups if g["name"] == CONSUMER_GROUP),
+            "0-0",
+        )
+        # Entries are ordered by ID, so one is undelivered iff the newest is
+        if newest and _stream_id(newest[0][0]) > _stream_id(last_delivered):
+            return False
+        return not any(p["consumer"] != self._consumer for p in (stale[0] if stale else []))
+    
+    async def expire(self, seconds: int) -> None:
+        """Delete the stream ``seconds`` from now
+
+        XADD keeps an existing TTL, so this is meant for streams nobody
+        writes to any more.
+        """
+        await self._redis.client.expire(self._stream_name, seconds)
     
     async def size(self) -> int:
         """Get the number of messages in the stream"""
@@ -187,39 +237,83 @@ class RedisStreamQueue(MessageQueue):
         except Exception:
             return False
 
-    async def pop(self) -> Tuple[str, Any]:
-        """Get and remove the first message from the stream using distributed lock
-        
+    async def _ensure_group(self) -> None:
+        """Create the consumer group (and the stream) on first use"""
+        if self._group_ready:
+            return
+        try:
+            # Start at "0" so messages put before the first consumer arrives
+            # are delivered too
+            await self._redis.client.xgroup_create(self._stream_name, CONSUMER_GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def _claim_due(self) -> bool:
+        """Whether pop() tries to reclaim; attempts are spaced by ``claim_idle_ms``"""
+        return time.monotonic() - self._last_claim >= self._claim_idle_ms / 1000
+
+    async def _claim_stale(self) -> Optional[Tuple[str, Any]]:
+        """Take over a message left unacknowledged by a consumer that died"""
+        if not self._claim_due():
+            return None
+        self._last_claim = time.monotonic()
+        result = await self._redis.client.xautoclaim(
+            self._stream_name,
+            CONSUMER_GROUP,
+            self._consumer,
+            min_idle_time=self._claim_idle_ms,
+            start_id="0-0",
+            count=1,
+        )
+        for message_id, message_data in result[1]:
+            if message_data is None:
+                continue
+            logger.warning(f"Reclaimed unacknowledged message {message_id} from stream ({self._stream_name})")
+            return message_id, message_data.get("data")
+        return None
+
+    async def pop(self, block_ms: Optional[int] = None) -> Tuple[str, Any]:
+        """Receive the next message through the stream's consumer group
+
+        The message stays pending until :meth:`ack` is called; if this
+        consumer dies first, another consumer reclaims it once it has been
+        idle for ``claim_idle_ms``.
+
+        Args:
+            block_ms: Block time in milliseconds waiting for a message, defaults to None meaning no blocking
+
         Returns:
-            Tuple[str, Any]: (Message ID, Message content), returns (None, None) if stream is empty
+            Tuple[str, Any]: (Message ID, Message content), returns (None, None) if no message
         """
         logger.debug(f"Popping message from stream ({self._stream_name})")
-        lock_key = f"lock:{self._stream_name}:pop"
-        
-        # Acquire distributed lock
-        lock_value = await self._acquire_lock(lock_key)
-        if not lock_value:
+        await self._ensure_group()
+
+        claimed = await self._claim_stale()
+        if claimed:
+            return claimed
+
+        messages = await self._redis.client.xreadgroup(
+            CONSUMER_GROUP,
+            self._consumer,
+            {self._stream_name: ">"},
+            count=1,
+            block=block_ms,
+        )
+        if not messages or not messages[0][1]:
             return None, None
-        
-        try:
-            # Get the first message from stream
-            messages = await self._redis.client.xrange(self._stream_name, "-", "+", count=1)
-            
-            if not messages:
-                return None, None
-            
-            message_id, message_data = messages[0]
-            
-            # Delete the message from stream
-            await self._redis.client.xdel(self._stream_name, message_id)
-            
-            try:
-                # Try both bytes and string keys for compatibility
-                return message_id, message_data.get("data")
-            except (KeyError, json.JSONDecodeError):
-                logger.exception(f"Error parsing message from stream ({self._stream_name}): {message_data}")
-                return None, None
-                
-        finally:
-            # Always release the lock
-            await self._release_lock(lock_key, lock_value)
+
+        message_id, message_data = messages[0][1][0]
+        return message_id, message_data.get("data")
+
+    async def ack(self, message_id: str) -> None:
+        """Acknowledge a popped message and remove it from the stream
+
+        Args:
+            message_id: ID returned by :meth:`pop`
+        """
+        async with self._redis.client.pipeline(transaction=True) as pipe:
+            pipe.xack(self._stream_name, CONSUMER_GROUP, message_id)
+            pipe.xdel(self._stream_name, message_id)
+            await pipe.execute()
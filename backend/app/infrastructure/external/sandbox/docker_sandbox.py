@@ -5,17 +5,26 @@ import docker
 import socket
 import logging
 import asyncio
-import io
+import tempfile
 from async_lru import alru_cache
 from app.core.config import get_settings
 from app.domain.models.tool_result import ToolResult
 from app.domain.external.sandbox import Sandbox
+from app.infrastructure.external.sandbox.sandbox_transport import (
+    EXEC_TIMEOUT,
+    TRANSFER_TIMEOUT,
+    get_sandbox_transport,
+)
 from app.infrastructure.external.browser.browser_use_browser import BrowserUseBrowser
 from app.infrastructure.external.browser.playwright_browser import PlaywrightBrowser
 from app.domain.external.browser import Browser
 
 logger = logging.getLogger(__name__)
 
+# Downloads larger than this are spooled to a temporary file instead of memory
+DOWNLOAD_SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
 # Sentinel: omit max_length from the request so sandbox applies its agent-facing default.
 _UNSET = object()
 
@@ -23,13 +32,26 @@ _UNSET = object()
 class DockerSandbox(Sandbox):
     def __init__(self, ip: str = None, container_name: str = None):
         """Initialize Docker sandbox and API interaction client"""
-        self.client = httpx.AsyncClient(timeout=600)
         self.ip = ip
         self.base_url = f"http://{self.ip}:8080"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_acquired = False
         self._vnc_url = f"ws://{self.ip}:5901"
         self._cdp_url = f"http://{self.ip}:9222"
         self._container_name = container_name
     
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """HTTP client, pooled per sandbox host and shared with other instances of it"""
+        if self._client is None:
+            self._client = get_sandbox_transport().acquire(self.base_url)
+            self._client_acquired = True
+        return self._client
+
+    @client.setter
+    def client(self, client: httpx.AsyncClient) -> None:
+        self._client = client
+
     @property
     def id(self) -> str:
         """Sandbox ID"""
@@ -192,16 +214,23 @@ class DockerSandbox(Sandbox):
                 "id": session_id,
                 "exec_dir": exec_dir,
                 "command": command
-            }
+            },
+            timeout=EXEC_TIMEOUT,
         )
         return ToolResult(**response.json())
 
-    async def view_shell(self, session_id: str, console: bool = False) -> ToolResult:
+    async def view_shell(
+        self,
+        session_id: str,
+        console: bool = False,
+        console_cursor: Optional[str] = None,
+    ) -> ToolResult:
         response = await self.client.post(
             f"{self.base_url}/api/v1/shell/view",
             json={
                 "id": session_id,
-                "console": console
+                "console": console,
+                "console_cursor": console_cursor,
             }
         )
         return ToolResult(**response.json())
@@ -212,7 +241,8 @@ class DockerSandbox(Sandbox):
             json={
                 "id": session_id,
                 "seconds": seconds
-            }
+            },
+            timeout=EXEC_TIMEOUT,
         )
         return ToolResult(**response.json())
 
@@ -402,7 +432,9 @@ class DockerSandbox(Sandbox):
             json={
                 "path": path,
                 "glob": glob_pattern
-            }
+            },
+            # Walks a whole directory tree
+            timeout=EXEC_TIMEOUT,
         )
         return ToolResult(**response.json())
 
@@ -424,7 +456,8 @@ class DockerSandbox(Sandbox):
         response = await self.client.post(
             f"{self.base_url}/api/v1/file/upload",
             files=files,
-            data=data
+            data=data,
+            timeout=TRANSFER_TIMEOUT,
         )
         return ToolResult(**response.json())
 
@@ -437,15 +470,23 @@ class DockerSandbox(Sandbox):
         Returns:
             File content as binary stream
         """
-        response = await self.client.get(
-            f"{self.base_url}/api/v1/file/download",
-            params={"path": path}
-        )
-        response.raise_for_status()
-        
-        # Return the response content as a BinaryIO stream
-        # TODO: change to real stream
-        return io.BytesIO(response.content)
+        # Spool the body as it arrives so large files do not sit in memory
+        stream = tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_MAX_MEMORY)
+        try:
+            async with self.client.stream(
+                "GET",
+                f"{self.base_url}/api/v1/file/download",
+                params={"path": path},
+                timeout=TRANSFER_TIMEOUT,
+            ) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    stream.write(chunk)
+        except BaseException:
+            stream.close()
+            raise
+        stream.seek(0)
+        return stream
     
     @staticmethod
     @alru_cache(maxsize=128, typed=True)
@@ -486,8 +527,10 @@ class DockerSandbox(Sandbox):
     async def destroy(self) -> bool:
         """Destroy Docker sandbox"""
         try:
-            if self.client:
-                await self.client.aclose()
+            if self._client_acquired:
+                self._client = None
+                self._client_acquired = False
+                await get_sandbox_transport().release(self.base_url)
             if self.container_name:
                 docker_client = docker.from_env()
                 docker_client.containers.get(self.container_name).remove(force=True)
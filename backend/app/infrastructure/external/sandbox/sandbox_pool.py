@@ -0,0 +1,142 @@
+from typing import Deque, Optional, Set, Tuple, Type
+from collections import deque
+from functools import lru_cache
+import asyncio
+import logging
+import time
+from app.core.config import get_settings
+from app.domain.external.sandbox import Sandbox, SandboxPool
+
+logger = logging.getLogger(__name__)
+
+
+class WarmSandboxPool(SandboxPool):
+    """Keeps a number of sandboxes booted and health-checked ahead of time.
+
+    A new session leases a ready sandbox instead of waiting for the container
+    to start and its services to come up; every lease triggers a background
+    refill back to the target size.
+    """
+
+    def __init__(
+        self,
+        sandbox_cls: Type[Sandbox],
+        size: int,
+        max_idle_seconds: Optional[float] = None,
+    ):
+        """Initialize the pool
+
+        Args:
+            sandbox_cls: Sandbox implementation used to boot new sandboxes
+            size: Number of ready sandboxes to keep
+            max_idle_seconds: Discard ready sandboxes idle for longer than this,
+                defaults to None meaning they never expire
+        """
+        self._sandbox_cls = sandbox_cls
+        self._size = size
+        self._max_idle_seconds = max_idle_seconds
+        self._ready: Deque[Tuple[float, Sandbox]] = deque()
+        self._booting: Set[asyncio.Task] = set()
+        self._closed = False
+
+    @property
+    def ready_count(self) -> int:
+        """Number of sandboxes ready to be leased"""
+        return len(self._ready)
+
+    async def start(self) -> None:
+        """Start warming sandboxes in the background"""
+        logger.info(f"Starting sandbox pool with {self._size} warm sandboxes")
+        self._refill()
+
+    async def acquire(self) -> Sandbox:
+        """Lease a ready sandbox, booting one on demand if the pool is empty"""
+        sandbox = await self._take_ready()
+        self._refill()
+        if sandbox:
+            logger.info(f"Leased warm sandbox {sandbox.id} ({len(self._ready)} left)")
+            return sandbox
+
+        logger.info("Sandbox pool is empty, booting a sandbox on demand")
+        sandbox = await self._sandbox_cls.create()
+        await sandbox.ensure_sandbox()
+        return sandbox
+
+    async def shutdown(self) -> None:
+        """Stop refilling and destroy sandboxes that were never leased"""
+        self._closed = True
+        for task in list(self._booting):
+            task.cancel()
+        if self._booting:
+            await asyncio.gather(*self._booting, return_exceptions=True)
+        while self._ready:
+            _, sandbox = self._ready.popleft()
+            await self._destroy(sandbox)
+        logger.info("Sandbox pool shut down")
+
+    async def _take_ready(self) -> Optional[Sandbox]:
+        """Pop the oldest ready sandbox that has not been idle for too long"""
+        while self._ready:
+            ready_at, sandbox = self._ready.popleft()
+            if self._max_idle_seconds is None or time.monotonic() - ready_at <= self._max_idle_seconds:
+                return sandbox
+            logger.info(f"Discarding sandbox {sandbox.id} idle for more than {self._max_idle_seconds}s")
+            await self._destroy(sandbox)
+        return None
+
+    def _refill(self) -> None:
+        """Boot sandboxes in the background until the pool is back at its size"""
+        if self._closed:
+            return
+        missing = self._size - len(self._ready) - len(self._booting)
+        for _ in range(missing):
+            task = asyncio.create_task(self._boot())
+            self._booting.add(task)
+            task.add_done_callback(self._booting.discard)
+
+    async def _boot(self) -> None:
+        """Boot one sandbox and add it to the pool once its services are up"""
+        sandbox = None
+        try:
+            sandbox = await self._sandbox_cls.create()
+            await sandbox.ensure_sandbox()
+        except asyncio.CancelledError:
+            if sandbox:
+                await self._destroy(sandbox)
+            raise
+        except Exception as e:
+            logger.error(f"Failed to boot pooled sandbox: {str(e)}")
+            if sandbox:
+                await self._destroy(sandbox)
+            return
+
+        if self._closed:
+            await self._destroy(sandbox)
+            return
+        self._ready.append((time.monotonic(), sandbox))
+        logger.info(f"Sandbox {sandbox.id} is warm ({len(self._ready)}/{self._size} ready)")
+
+    async def _destroy(self, sandbox: Sandbox) -> None:
+        try:
+            await sandbox.destroy()
+        except Exception as e:
+            logger.warning(f"Failed to destroy pooled sandbox {sandbox.id}: {str(e)}")
+
+
+@lru_cache()
+def get_sandbox_pool() -> Optional[SandboxPool]:
+    """Get the process-wide sandbox pool, or None when pooling is disabled"""
+    settings = get_settings()
+    if settings.sandbox_pool_size <= 0:
+        return None
+    if settings.sandbox_address:
+        # A fixed sandbox address is a single shared container: nothing to pool
+        logger.info("Sandbox pool disabled: SANDBOX_ADDRESS is set")
+        return None
+
+    from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+
+    # Containers shut themselves down after the sandbox TTL; hand them out
+    # well before that
+    max_idle_seconds = settings.sandbox_ttl_minutes * 60 / 2 if settings.sandbox_ttl_minutes else None
+    return WarmSandboxPool(DockerSandbox, settings.sandbox_pool_size, max_idle_seconds=max_idle_seconds)
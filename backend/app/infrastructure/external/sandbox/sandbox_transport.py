@@ -0,0 +1,99 @@
+from typing import Dict
+from functools import lru_cache
+import logging
+import httpx
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Connections kept per sandbox host; requests beyond them wait for a free one
+SANDBOX_MAX_CONNECTIONS = 32
+SANDBOX_MAX_KEEPALIVE_CONNECTIONS = 8
+SANDBOX_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+# Timeout classes of sandbox operations. Read and write timeouts apply per
+# network operation, so a long transfer only fails when it stalls.
+# Quick reads of sandbox state (shell view, file reads, status checks)
+POLL_TIMEOUT = httpx.Timeout(30.0, connect=5.0, pool=30.0)
+# Commands that may run until the sandbox returns (exec, wait)
+EXEC_TIMEOUT = httpx.Timeout(600.0, connect=5.0, pool=30.0)
+# File uploads and downloads
+TRANSFER_TIMEOUT = httpx.Timeout(120.0, connect=5.0, pool=30.0)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class SandboxTransport:
+    """HTTP clients of the sandboxes, shared by every sandbox of the process.
+
+    Each sandbox host gets one client with a bounded keep-alive pool, so
+    sandbox instances of the same container share connections instead of
+    each opening its own. A host's client lives while a sandbox of it is
+    acquired and is closed when the last one is released.
+    """
+
+    def __init__(self, http2: bool = False):
+        """Initialize the transport
+
+        Args:
+            http2: Multiplex requests over HTTP/2 where the sandbox endpoint
+                negotiates it; needs the ``h2`` package
+        """
+        if http2 and not _http2_available():
+            logger.warning("Sandbox HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+            http2 = False
+        self._http2 = http2
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._refs: Dict[str, int] = {}
+
+    def acquire(self, host: str) -> httpx.AsyncClient:
+        """Get the client of a sandbox host until it is released"""
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=POLL_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=SANDBOX_MAX_CONNECTIONS,
+                    max_keepalive_connections=SANDBOX_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=SANDBOX_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                http2=self._http2,
+            )
+            self._clients[host] = client
+            self._refs[host] = 0
+        self._refs[host] += 1
+        return client
+
+    async def release(self, host: str) -> None:
+        """Release a client acquired for a sandbox host"""
+        refs = self._refs.get(host, 0) - 1
+        if refs > 0:
+            self._refs[host] = refs
+            return
+        self._refs.pop(host, None)
+        client = self._clients.pop(host, None)
+        if client is not None:
+            await client.aclose()
+            logger.debug(f"Closed sandbox client of {host}")
+
+    async def shutdown(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._refs.clear()
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception:
+                logger.debug("Failed to close sandbox client", exc_info=True)
+
+
+@lru_cache()
+def get_sandbox_transport() -> SandboxTransport:
+    """Get the process-wide sandbox transport"""
+    return SandboxTransport(http2=get_settings().sandbox_http2)
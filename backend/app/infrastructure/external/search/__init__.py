@@ -10,6 +10,20 @@ logger = logging.getLogger(__name__)
 @lru_cache()
 def get_search_engine() -> Optional[SearchEngine]:
     """Get search engine instance based on configuration"""
+    engine = _create_search_engine()
+    settings = get_settings()
+    if engine is None or settings.search_cache_ttl <= 0:
+        return engine
+
+    from app.infrastructure.external.cache import get_cache
+    from app.infrastructure.external.search.cached_search import CachedSearchEngine
+
+    logger.info(f"Caching search results for {settings.search_cache_ttl}s")
+    return CachedSearchEngine(engine, get_cache(), ttl=settings.search_cache_ttl)
+
+
+def _create_search_engine() -> Optional[SearchEngine]:
+    """Create the configured search provider"""
     from app.infrastructure.external.search.google_search import GoogleSearchEngine
     from app.infrastructure.external.search.baidu_search import BaiduSearchEngine
     from app.infrastructure.external.search.baidu_web_search import BaiduWebSearchEngine
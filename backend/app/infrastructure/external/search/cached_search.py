@@ -0,0 +1,107 @@
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import logging
+from app.domain.external.cache import Cache
+from app.domain.external.search import SearchEngine
+from app.domain.models.search import SearchResults
+from app.domain.models.tool_result import ToolResult
+
+logger = logging.getLogger(__name__)
+
+
+class CachedSearchEngine:
+    """Search engine decorator that caches results with a TTL.
+
+    Results are keyed on the normalised query and date range and shared
+    through the cache, so repeated searches within a session or across users
+    skip the upstream engine. Concurrent identical searches in this process
+    wait on a single upstream call. Failed searches are never cached.
+    """
+
+    def __init__(
+        self,
+        engine: SearchEngine,
+        cache: Cache,
+        ttl: int,
+        namespace: Optional[str] = None,
+    ):
+        """Initialize the cached search engine
+
+        Args:
+            engine: Search engine to delegate cache misses to
+            cache: Cache storing serialized search results
+            ttl: Time to live of cached results in seconds
+            namespace: Key namespace, defaults to the engine class name so
+                different providers never share results
+        """
+        self._engine = engine
+        self._cache = cache
+        self._ttl = ttl
+        self._namespace = namespace or type(engine).__name__
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalise a query so trivially different spellings share an entry"""
+        return " ".join(query.lower().split())
+
+    def cache_key(self, query: str, date_range: Optional[str] = None) -> str:
+        raw = f"{self.normalize_query(query)}\n{date_range or 'all'}"
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return f"search:{self._namespace}:{digest}"
+
+    async def search(
+        self,
+        query: str,
+        date_range: Optional[str] = None
+    ) -> ToolResult[SearchResults]:
+        key = self.cache_key(query, date_range)
+
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            logger.debug(f"Joining in-flight search for query: {query}")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leading caller was cancelled, not us: search ourselves
+                inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._lookup(key, query, date_range)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Nobody may be waiting; mark the exception as retrieved
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _lookup(
+        self,
+        key: str,
+        query: str,
+        date_range: Optional[str],
+    ) -> ToolResult[SearchResults]:
+        cached = await self._cache.get(key)
+        if cached is not None:
+            try:
+                result = ToolResult[SearchResults].model_validate(cached)
+                logger.info(f"Search cache hit for query: {query}")
+                return result
+            except Exception as e:
+                logger.warning(f"Discarding invalid cached search result for query {query}: {str(e)}")
+
+        result = await self._engine.search(query, date_range)
+        if result.success:
+            await self._cache.set(key, result.model_dump(mode="json"), ttl=self._ttl)
+        return result
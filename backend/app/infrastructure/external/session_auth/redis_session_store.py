@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import json
 import logging
 from datetime import datetime, timedelta, UTC
-from typing import Optional
+from typing import Mapping, Optional, Union
 
-from app.domain.models.auth_session import AuthSession
+from redis.commands.core import AsyncScript
+
+from app.domain.models.auth_session import AuthClientType, AuthSession
 from app.infrastructure.storage.redis import get_redis
 
 logger = logging.getLogger(__name__)
@@ -14,12 +17,35 @@ logger = logging.getLogger(__name__)
 SESSION_KEY_PREFIX = "session:"
 USER_SESSIONS_KEY_PREFIX = "user_sessions:"
 
+# Load + sliding renewal in one round trip. ARGV[1] is the new last_seen_at,
+# ARGV[2] maps each client type to [ttl, expires_at]. Payloads that are not
+# JSON objects are returned untouched so the caller can discard them.
+_TOUCH_SCRIPT = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return false
+end
+local ok, session = pcall(cjson.decode, raw)
+if not ok or type(session) ~= 'table' then
+    return raw
+end
+local renewals = cjson.decode(ARGV[2])
+local renewal = renewals[session['client']] or renewals['unknown']
+session['last_seen_at'] = ARGV[1]
+session['expires_at'] = renewal[2]
+raw = cjson.encode(session)
+redis.call('SET', KEYS[1], raw, 'EX', renewal[1])
+return raw
+"""
+
 
 class RedisSessionStore:
     """Redis-backed auth session store with per-user index for revoke-all."""
 
     def __init__(self) -> None:
         self._redis = get_redis()
+        # Registered once the client exists; it keeps the script's SHA
+        self._touch_script: Optional[AsyncScript] = None
 
     def _session_key(self, session_id: str) -> str:
         return f"{SESSION_KEY_PREFIX}{session_id}"
@@ -45,24 +71,43 @@ class RedisSessionStore:
         try:
             return AuthSession.model_validate_json(raw)
         except Exception:
-            logger.warning("Corrupt auth session payload for %s", session_id)
-            await self.delete(session_id)
+            await self._discard_corrupt(session_id)
             return None
 
-    async def touch(self, session_id: str, ttl_seconds: int) -> Optional[AuthSession]:
-        session = await self.get(session_id)
-        if not session:
-            return None
+    async def touch(
+        self,
+        session_id: str,
+        ttl_seconds: Union[int, Mapping[AuthClientType, int]],
+    ) -> Optional[AuthSession]:
         now = datetime.now(UTC)
-        session.last_seen_at = now
-        session.expires_at = now + timedelta(seconds=max(1, ttl_seconds))
+        if isinstance(ttl_seconds, int):
+            ttl_seconds = {client_type: ttl_seconds for client_type in AuthClientType}
+        renewals = {}
+        for client_type in AuthClientType:
+            ttl = max(1, ttl_seconds[client_type])
+            renewals[client_type.value] = [ttl, (now + timedelta(seconds=ttl)).isoformat()]
+
         await self._redis.initialize()
-        await self._redis.client.setex(
-            self._session_key(session_id),
-            max(1, ttl_seconds),
-            session.model_dump_json(),
+        client = self._redis.client
+        if self._touch_script is None:
+            self._touch_script = client.register_script(_TOUCH_SCRIPT)
+        raw = await self._touch_script(
+            keys=[self._session_key(session_id)],
+            args=[now.isoformat(), json.dumps(renewals)],
+            client=client,
         )
-        return session
+        if not raw:
+            return None
+        try:
+            return AuthSession.model_validate_json(raw)
+        except Exception:
+            await self._discard_corrupt(session_id)
+            return None
+
+    async def _discard_corrupt(self, session_id: str) -> None:
+        # delete() would load the session again; its user is unknown anyway
+        logger.warning("Corrupt auth session payload for %s", session_id)
+        await self._redis.client.delete(self._session_key(session_id))
 
     async def delete(self, session_id: str) -> bool:
         session = await self.get(session_id)
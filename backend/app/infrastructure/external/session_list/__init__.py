@@ -1,13 +1,21 @@
 from app.infrastructure.external.session_list.redis_session_list_notifier import (
+    SessionListNotifier,
     channel_for_user,
+    get_session_list_notifier,
     parse_notify_payload,
-    publish_session_remove,
-    publish_session_upsert,
+)
+from app.infrastructure.external.session_list.session_list_hub import (
+    RESYNC,
+    SessionListHub,
+    get_session_list_hub,
 )
 
 __all__ = [
+    "RESYNC",
+    "SessionListHub",
+    "SessionListNotifier",
     "channel_for_user",
+    "get_session_list_hub",
+    "get_session_list_notifier",
     "parse_notify_payload",
-    "publish_session_remove",
-    "publish_session_upsert",
 ]
@@ -2,36 +2,88 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from typing import Any, Literal, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
+from app.domain.models.session import SessionSummary
 from app.infrastructure.storage.redis import get_redis
 
 logger = logging.getLogger(__name__)
 
 CHANNEL_PREFIX = "session_list:"
 
+# Upserts of one session within this window are published once, with the
+# latest summary
+NOTIFY_DEBOUNCE_SECONDS = 0.25
+
 
 def channel_for_user(user_id: str) -> str:
     return f"{CHANNEL_PREFIX}{user_id}"
 
 
-async def publish_session_upsert(user_id: str, session_id: str) -> None:
-    await _publish(user_id, {"op": "upsert", "session_id": session_id})
+class SessionListNotifier:
+    """Publishes session list changes, coalescing bursts per session.
+
+    An agent turn updates title, latest message, unread count and status
+    in quick succession; subscribers only need the final state. Upsert
+    messages carry the session summary so subscribers do not have to read
+    it back from Mongo.
+    """
+
+    def __init__(self, window: float = NOTIFY_DEBOUNCE_SECONDS):
+        self._window = window
+        self._pending: Dict[str, SessionSummary] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def upsert(self, summary: SessionSummary) -> None:
+        """Queue an upsert; later ones in the same window replace it"""
+        self._pending[summary.id] = summary
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def remove(self, user_id: str, session_id: str) -> None:
+        """Publish a removal right away, dropping any queued upsert"""
+        self._pending.pop(session_id, None)
+        await _publish([(user_id, {"op": "remove", "session_id": session_id})])
+
+    async def flush(self) -> None:
+        """Publish queued upserts now"""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        await _publish([
+            (
+                summary.user_id,
+                {"op": "upsert", "session_id": summary.id, "session": summary.model_dump(mode="json")},
+            )
+            for summary in pending.values()
+        ])
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._window)
+        await self.flush()
 
 
-async def publish_session_remove(user_id: str, session_id: str) -> None:
-    await _publish(user_id, {"op": "remove", "session_id": session_id})
+@lru_cache()
+def get_session_list_notifier() -> SessionListNotifier:
+    """Get the process-wide session list notifier"""
+    return SessionListNotifier()
 
 
-async def _publish(user_id: str, payload: dict[str, Any]) -> None:
+async def _publish(messages: List[Tuple[str, dict[str, Any]]]) -> None:
     try:
         redis = get_redis()
         await redis.initialize()
-        await redis.client.publish(channel_for_user(user_id), json.dumps(payload))
+        async with redis.client.pipeline(transaction=False) as pipe:
+            for user_id, payload in messages:
+                pipe.publish(channel_for_user(user_id), json.dumps(payload))
+            await pipe.execute()
     except Exception as e:
-        logger.warning("Failed to publish session list notify for user %s: %s", user_id, e)
+        users = sorted({user_id for user_id, _ in messages})
+        logger.warning("Failed to publish session list notify for users %s: %s", users, e)
 
 
 def parse_notify_payload(raw: str) -> Optional[dict[str, Any]]:
@@ -0,0 +1,133 @@
+"""Per-process fan-out of session list notifications to WebSocket clients."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Set
+
+from app.infrastructure.external.session_list.redis_session_list_notifier import (
+    CHANNEL_PREFIX,
+    parse_notify_payload,
+)
+from app.infrastructure.storage.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per subscriber before it is asked to resync instead
+SUBSCRIBER_QUEUE_SIZE = 256
+RECONNECT_DELAY_SECONDS = 1.0
+# How long a new subscriber waits for the shared subscription to be live
+SUBSCRIBE_TIMEOUT_SECONDS = 5.0
+
+# Queued for a subscriber that may have missed messages; it should reload
+# the whole list
+RESYNC = {"op": "resync"}
+
+
+class SessionListHub:
+    """One Redis pub/sub connection per process, shared by all sockets.
+
+    Subscribes to every user's session list channel with a single pattern
+    and hands parsed notifications to the queues of that user's sockets.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+
+    async def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Get a queue receiving the user's notifications until unsubscribed"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        if self._reader is None or self._reader.done():
+            self._subscribed.clear()
+            self._reader = asyncio.create_task(self._run())
+        # Notifications published before this point are covered by the
+        # caller's initial snapshot. If Redis is unreachable, the queue gets
+        # a resync once the subscription is up.
+        try:
+            await asyncio.wait_for(self._subscribed.wait(), timeout=SUBSCRIBE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("Session list subscription is not live yet")
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if not queues:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    async def shutdown(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+
+    async def _run(self) -> None:
+        first = True
+        while True:
+            try:
+                await self._listen(resync=not first)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Session list subscription lost, reconnecting: {str(e)}")
+            first = False
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _listen(self, resync: bool) -> None:
+        redis = get_redis()
+        await redis.initialize()
+        pubsub = redis.client.pubsub()
+        try:
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            self._subscribed.set()
+            if resync:
+                # Anything published while disconnected was missed
+                for queues in self._subscribers.values():
+                    for queue in queues:
+                        self._deliver(queue, RESYNC)
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                self._dispatch(message.get("channel", ""), message.get("data", ""))
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                logger.debug("Failed to close session list pubsub", exc_info=True)
+
+    def _dispatch(self, channel: Any, raw: Any) -> None:
+        if isinstance(channel, (bytes, bytearray)):
+            channel = channel.decode("utf-8", errors="replace")
+        if isinstance(raw, (bytes, bytearray)):
+            raw = raw.decode("utf-8", errors="replace")
+        queues = self._subscribers.get(channel[len(CHANNEL_PREFIX):])
+        if not queues:
+            return
+        payload = parse_notify_payload(raw)
+        if not payload:
+            return
+        for queue in list(queues):
+            self._deliver(queue, payload)
+
+    @staticmethod
+    def _deliver(queue: asyncio.Queue, payload: dict[str, Any]) -> None:
+        try:
+            queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            # A socket this far behind reloads the list instead
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(RESYNC)
+
+
+@lru_cache()
+def get_session_list_hub() -> SessionListHub:
+    """Get the process-wide session list hub"""
+    return SessionListHub()
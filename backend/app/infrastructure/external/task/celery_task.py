@@ -8,6 +8,8 @@ state lives entirely in Redis:
 - ``task:meta:{id}``                          — task status + runner params (JSON)
 - ``task:cancel:{id}``                        — cancellation flag polled by the worker
 
+Streams are bounded and expire after the task ends, see retention.py.
+
 This makes tasks visible from any API replica and survives API restarts,
 unlike the in-process registry of RedisStreamTask.
 """
@@ -16,6 +18,7 @@ import uuid
 import logging
 from typing import Any, Dict, Optional
 
+from app.core.config import get_settings
 from app.domain.external.task import Task, TaskRunnerFactory
 from app.infrastructure.external.message_queue.redis_stream_queue import RedisStreamQueue, MessageQueue
 from app.infrastructure.storage.redis import get_redis
@@ -78,8 +81,9 @@ class CeleryTask(Task):
     def __init__(self, task_id: str, params: Optional[Dict[str, Any]] = None):
         self._id = task_id
         self._params = params
-        self._input_stream = RedisStreamQueue(f"task:input:{task_id}")
-        self._output_stream = RedisStreamQueue(f"task:output:{task_id}")
+        maxlen = get_settings().task_stream_maxlen or None
+        self._input_stream = RedisStreamQueue(f"task:input:{task_id}", maxlen=maxlen)
+        self._output_stream = RedisStreamQueue(f"task:output:{task_id}", maxlen=maxlen)
 
     @property
     def id(self) -> str:
@@ -12,6 +12,7 @@ from typing import Any, Dict, Optional
 from beanie import init_beanie
 
 from app.core.config import get_settings
+from app.domain.external.task import OUTPUT_END_MARKER
 from app.infrastructure.external.task.celery_app import celery_app, AGENT_TASK_NAME
 from app.infrastructure.external.task.celery_task import (
     CeleryTask,
@@ -21,6 +22,8 @@ from app.infrastructure.external.task.celery_task import (
     STATUS_RUNNING,
     STATUS_DONE,
 )
+from app.infrastructure.external.task.retention import expire_task_streams
+from app.infrastructure.external.session_list import get_session_list_notifier
 
 logger = logging.getLogger(__name__)
 
@@ -73,10 +76,13 @@ async def _ensure_initialized() -> None:
     from app.infrastructure.storage.redis import get_redis
     from app.infrastructure.models.documents import (
         AgentDocument,
+        AgentMemoryEntryDocument,
         SessionDocument,
+        SessionEventDocument,
         UserDocument,
         ProjectDocument,
         FileFavoriteDocument,
+        LibraryFileDocument,
     )
 
     settings = get_settings()
@@ -85,10 +91,13 @@ async def _ensure_initialized() -> None:
         database=get_mongodb().client[settings.mongodb_database],
         document_models=[
             AgentDocument,
+            AgentMemoryEntryDocument,
             SessionDocument,
+            SessionEventDocument,
             UserDocument,
             ProjectDocument,
             FileFavoriteDocument,
+            LibraryFileDocument,
         ],
     )
     await get_redis().initialize()
@@ -127,10 +136,17 @@ async def _run_agent(task_id: str, params: Dict[str, Any]) -> None:
         watcher.cancel()
         await clear_cancel(task_id)
         await write_meta(task_id, STATUS_DONE, params)
+        try:
+            await task_handle.output_stream.put(OUTPUT_END_MARKER)
+        except Exception:
+            logger.exception(f"Task {task_id} failed to write output end marker")
+        await expire_task_streams(task_handle)
         try:
             await runner.on_done(task_handle)
         except Exception:
             logger.exception(f"Task {task_id} on_done callback failed")
+        # The loop stops with this task; do not leave debounced updates behind
+        await get_session_list_notifier().flush()
 
 
 @celery_app.task(name=AGENT_TASK_NAME)
@@ -3,8 +3,10 @@ import uuid
 import logging
 from typing import Any, Dict, Optional
 
-from app.domain.external.task import Task, TaskRunner, TaskRunnerFactory
+from app.core.config import get_settings
+from app.domain.external.task import Task, TaskRunner, TaskRunnerFactory, OUTPUT_END_MARKER
 from app.infrastructure.external.message_queue.redis_stream_queue import RedisStreamQueue, MessageQueue
+from app.infrastructure.external.task.retention import expire_task_streams
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +36,9 @@ class RedisStreamTask(Task):
         # Create input/output streams based on task ID
         input_stream_name = f"task:input:{self._id}"
         output_stream_name = f"task:output:{self._id}"
-        self._input_stream = RedisStreamQueue(input_stream_name)
-        self._output_stream = RedisStreamQueue(output_stream_name)
+        maxlen = get_settings().task_stream_maxlen or None
+        self._input_stream = RedisStreamQueue(input_stream_name, maxlen=maxlen)
+        self._output_stream = RedisStreamQueue(output_stream_name, maxlen=maxlen)
         
         # Register task instance
         RedisStreamTask._task_registry[self._id] = self
@@ -115,7 +118,16 @@ class RedisStreamTask(Task):
         except Exception as e:
             logger.error(f"Task {self._id} execution failed: {str(e)}")
         finally:
+            await self._put_end_marker()
+            await expire_task_streams(self)
             self._on_task_done()
+
+    async def _put_end_marker(self) -> None:
+        """Mark the end of the output stream for consumers."""
+        try:
+            await self._output_stream.put(OUTPUT_END_MARKER)
+        except Exception:
+            logger.exception(f"Task {self._id} failed to write output end marker")
     
     @classmethod
     def set_runner_factory(cls, factory: TaskRunnerFactory) -> None:
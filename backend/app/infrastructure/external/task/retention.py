@@ -0,0 +1,188 @@
+"""Retention of task keys in Redis.
+
+Task streams are trimmed on every write (``TASK_STREAM_MAXLEN``) and expire
+``TASK_STREAM_TTL`` seconds after their task has finished, see
+``expire_task_streams``. ``TaskKeySweeper`` periodically removes what those
+two cannot reach:
+
+- ``task:meta:{id}`` / ``task:cancel:{id}`` of tasks whose streams are gone
+- streams left without a TTL by a process that died mid-task
+
+so Redis memory follows the number of active sessions rather than every
+session ever run.
+"""
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import AsyncGenerator, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.domain.external.task import Task
+from app.infrastructure.storage.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Keys fetched per SCAN call and checked per pipeline
+SWEEP_BATCH_SIZE = 500
+
+STREAM_PREFIXES = ("task:input:", "task:output:")
+META_PREFIX = "task:meta:"
+CANCEL_PREFIX = "task:cancel:"
+
+
+async def expire_task_streams(task: Task) -> None:
+    """Let a finished task's streams expire after ``TASK_STREAM_TTL`` seconds
+
+    Called by the task backends right after the output end marker, i.e.
+    after the runner's terminal DoneEvent / ErrorEvent / WaitEvent. Readers
+    that are still draining the output stream have that long to finish.
+    """
+    ttl = get_settings().task_stream_ttl
+    if ttl <= 0:
+        return
+    try:
+        await task.input_stream.expire(ttl)
+        await task.output_stream.expire(ttl)
+    except Exception:
+        logger.exception(f"Task {task.id} failed to set stream TTL")
+
+
+class TaskKeySweeper:
+    """Periodically deletes task keys no task will use again.
+
+    Safe to run in every API replica at once: each step only deletes or
+    expires keys that are already orphaned.
+    """
+
+    def __init__(self, interval: float, stream_ttl: int):
+        """Initialize the sweeper
+
+        Args:
+            interval: Seconds between sweeps
+            stream_ttl: TTL given to streams without one once they have not
+                been written to for that long, 0 to leave such streams alone
+        """
+        self._interval = interval
+        self._stream_ttl = stream_ttl
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start sweeping in the background"""
+        if self._task is None:
+            logger.info(f"Starting task key sweeper every {self._interval}s")
+            self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        """Stop sweeping"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                swept = await self.sweep()
+                if any(swept.values()):
+                    logger.info(f"Swept orphaned task keys: {swept}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task key sweep failed: {str(e)}")
+            await asyncio.sleep(self._interval)
+
+    async def sweep(self) -> Dict[str, int]:
+        """Run one sweep
+
+        Returns:
+            Dict[str, int]: Number of meta keys, cancel flags and streams cleaned up
+        """
+        return {
+            "meta": await self._sweep_meta(),
+            "cancel": await self._sweep_cancel(),
+            "streams": await self._sweep_streams() if self._stream_ttl > 0 else 0,
+        }
+
+    async def _scan(self, pattern: str) -> AsyncGenerator[List[str], None]:
+        batch: List[str] = []
+        async for key in get_redis().client.scan_iter(match=pattern, count=SWEEP_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= SWEEP_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _sweep_meta(self) -> int:
+        """Delete metadata of tasks whose input and output streams are gone"""
+        client = get_redis().client
+        swept = 0
+        async for keys in self._scan(f"{META_PREFIX}*"):
+            async with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    task_id = key[len(META_PREFIX):]
+                    pipe.exists(*(f"{prefix}{task_id}" for prefix in STREAM_PREFIXES))
+                streams = await pipe.execute()
+            orphans = [key for key, count in zip(keys, streams) if not count]
+            if orphans:
+                swept += await client.delete(*orphans)
+        return swept
+
+    async def _sweep_cancel(self) -> int:
+        """Delete cancellation flags of tasks without metadata"""
+        client = get_redis().client
+        swept = 0
+        async for keys in self._scan(f"{CANCEL_PREFIX}*"):
+            async with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.exists(f"{META_PREFIX}{key[len(CANCEL_PREFIX):]}")
+                metas = await pipe.execute()
+            orphans = [key for key, exists in zip(keys, metas) if not exists]
+            if orphans:
+                swept += await client.delete(*orphans)
+        return swept
+
+    async def _sweep_streams(self) -> int:
+        """Expire streams without a TTL that have been idle for the stream TTL
+
+        Such streams belong to tasks whose process died before it could
+        call ``expire_task_streams``.
+        """
+        client = get_redis().client
+        idle_before_ms = (time.time() - self._stream_ttl) * 1000
+        swept = 0
+        for prefix in STREAM_PREFIXES:
+            async for keys in self._scan(f"{prefix}*"):
+                async with client.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.ttl(key)
+                    ttls = await pipe.execute()
+                persistent = [key for key, ttl in zip(keys, ttls) if ttl == -1]
+                if not persistent:
+                    continue
+                async with client.pipeline(transaction=False) as pipe:
+                    for key in persistent:
+                        pipe.xinfo_stream(key)
+                    infos = await pipe.execute(raise_on_error=False)
+                stale = [
+                    key for key, info in zip(persistent, infos)
+                    if isinstance(info, dict)
+                    and int(str(info["last-generated-id"]).split("-")[0]) < idle_before_ms
+                ]
+                if stale:
+                    async with client.pipeline(transaction=False) as pipe:
+                        for key in stale:
+                            pipe.expire(key, self._stream_ttl)
+                        await pipe.execute()
+                    swept += len(stale)
+        return swept
+
+
+@lru_cache()
+def get_task_key_sweeper() -> Optional[TaskKeySweeper]:
+    """Get the process-wide task key sweeper, or None when sweeping is disabled"""
+    settings = get_settings()
+    if settings.task_sweep_interval <= 0:
+        return None
+    return TaskKeySweeper(settings.task_sweep_interval, settings.task_stream_ttl)
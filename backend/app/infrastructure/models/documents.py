@@ -9,6 +9,7 @@ from app.domain.models.session import Session, SessionStatus, TaskMode
 from app.domain.models.file import FileInfo
 from app.domain.models.user import User, UserRole
 from app.domain.models.project import Project
+from app.domain.models.plan import Plan
 from pymongo import IndexModel, ASCENDING, DESCENDING
 
 T = TypeVar('T', bound=BaseModel)
@@ -101,6 +102,29 @@ class AgentDocument(BaseDocument[Agent], id_field="agent_id", domain_model_class
         return doc
 
 
+class AgentMemoryEntryDocument(Document):
+    """A message appended to an agent memory on top of its last checkpoint.
+
+    ``AgentDocument.memories`` holds the checkpoint blob; entries tagged with
+    that checkpoint's generation form its tail, ordered by ``seq``.
+    """
+    agent_id: str
+    name: str
+    checkpoint: int = 0
+    seq: int
+    message: Dict[str, Any]
+
+    class Settings:
+        name = "agent_memory_entries"
+        indexes = [
+            IndexModel(
+                [("agent_id", ASCENDING), ("name", ASCENDING), ("checkpoint", ASCENDING), ("seq", ASCENDING)],
+                unique=True,
+                name="agent_id_name_checkpoint_seq",
+            ),
+        ]
+
+
 class SessionDocument(BaseDocument[Session], id_field="session_id", domain_model_class=Session):
     """MongoDB model for Session"""
     session_id: str
@@ -114,20 +138,32 @@ class SessionDocument(BaseDocument[Session], id_field="session_id", domain_model
     latest_message_at: Optional[datetime] = None
     created_at: datetime = datetime.now(timezone.utc)
     updated_at: datetime = datetime.now(timezone.utc)
-    events: List[AgentEvent]
+    # Legacy embedded event history; migrated lazily into SessionEventDocument.
+    events: List[AgentEvent] = []
+    # Sequence of the latest event in SessionEventDocument.
+    event_seq: int = 0
+    last_plan: Optional[Plan] = None
     status: SessionStatus
+    screenshots: List[str] = []
     files: List[FileInfo] = []
     is_shared: Optional[bool] = False
     is_favorite: Optional[bool] = False
     is_pinned: Optional[bool] = False
     project_id: Optional[str] = None
     task_mode: Optional[TaskMode] = TaskMode.AGENT
+    # Whether ``files`` is mirrored in LibraryFileDocument; sessions created
+    # before the catalogue existed are backfilled on the owner's first listing.
+    library_indexed: bool = False
     class Settings:
         name = "sessions"
         indexes = [
             "session_id",
             "user_id",
             "project_id",
+            IndexModel(
+                [("user_id", ASCENDING), ("library_indexed", ASCENDING)],
+                name="user_id_library_indexed",
+            ),
             IndexModel(
                 [("user_id", ASCENDING), ("latest_message_at", DESCENDING)],
                 name="user_id_latest_message_at",
@@ -143,6 +179,28 @@ class SessionDocument(BaseDocument[Session], id_field="session_id", domain_model
         ]
 
 
+class SessionEventDocument(Document):
+    """A single session event, ordered by a per-session sequence."""
+    session_id: str
+    sequence: int
+    event_id: str
+    event: AgentEvent
+
+    class Settings:
+        name = "session_events"
+        indexes = [
+            IndexModel(
+                [("session_id", ASCENDING), ("sequence", ASCENDING)],
+                unique=True,
+                name="session_id_sequence",
+            ),
+            IndexModel(
+                [("session_id", ASCENDING), ("event_id", ASCENDING)],
+                name="session_id_event_id",
+            ),
+        ]
+
+
 class ProjectDocument(BaseDocument[Project], id_field="project_id", domain_model_class=Project):
     """MongoDB document for Project"""
     project_id: str
@@ -181,3 +239,39 @@ class FileFavoriteDocument(Document):
                 name="user_id_file_id",
             ),
         ]
+
+
+class LibraryFileDocument(Document):
+    """A file attached to a session, catalogued per user for the library.
+
+    Mirrors ``SessionDocument.files``; ``is_favorite`` mirrors
+    FileFavoriteDocument so a page of the library is a single index scan.
+    """
+    user_id: str
+    session_id: str
+    file_id: str
+    filename: Optional[str] = None
+    file_path: Optional[str] = None
+    content_type: Optional[str] = None
+    size: Optional[int] = None
+    upload_date: Optional[datetime] = None
+    is_favorite: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+    class Settings:
+        name = "library_files"
+        indexes = [
+            IndexModel(
+                [("session_id", ASCENDING), ("file_id", ASCENDING), ("file_path", ASCENDING)],
+                unique=True,
+                name="session_id_file_id_file_path",
+            ),
+            IndexModel(
+                [("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="user_id_created_at",
+            ),
+            IndexModel(
+                [("user_id", ASCENDING), ("file_id", ASCENDING)],
+                name="user_id_file_id",
+            ),
+        ]
@@ -92,15 +92,30 @@ def _upgrade_message(raw: Any) -> Dict[str, Any]:
     return {k: v for k, v in data.items() if k in allowed}
 
 
-def deserialize_memory(raw: Optional[Dict[str, Any]]) -> Memory:
-    """Build a domain :class:`Memory` from its persisted representation."""
-    if not raw:
-        return Memory()
-    raw_messages: List[Any] = raw.get("messages", []) or []
+def deserialize_memory(
+    raw: Optional[Dict[str, Any]],
+    tail: Optional[List[Any]] = None,
+) -> Memory:
+    """Build a domain :class:`Memory` from its persisted representation.
+
+    ``raw`` is the checkpoint blob and ``tail`` the messages appended on top
+    of it since; the result is marked as fully saved at that checkpoint.
+    """
+    raw = raw or {}
+    raw_messages: List[Any] = list(raw.get("messages", []) or []) + list(tail or [])
     messages = [LLMMessage.model_validate(_upgrade_message(m)) for m in raw_messages]
-    return Memory(messages=messages)
+    memory = Memory(messages=messages)
+    memory.mark_saved(checkpoint=raw.get("checkpoint", 0))
+    return memory
 
 
-def serialize_memory(memory: Memory) -> Dict[str, Any]:
-    """Render a domain :class:`Memory` into its persisted representation."""
-    return memory.model_dump()
+def serialize_message(message: LLMMessage) -> Dict[str, Any]:
+    """Render a single domain message into its persisted representation."""
+    return message.model_dump()
+
+
+def serialize_memory(memory: Memory, checkpoint: Optional[int] = None) -> Dict[str, Any]:
+    """Render a domain :class:`Memory` into its persisted checkpoint blob."""
+    data = memory.model_dump()
+    data["checkpoint"] = memory.checkpoint if checkpoint is None else checkpoint
+    return data
@@ -3,8 +3,13 @@ from datetime import datetime, UTC
 from app.domain.models.agent import Agent
 from app.domain.models.memory import Memory
 from app.domain.repositories.agent_repository import AgentRepository
-from app.infrastructure.models.documents import AgentDocument
-from app.infrastructure.models.memory_serialization import deserialize_memory, serialize_memory
+from app.infrastructure.models.documents import AgentDocument, AgentMemoryEntryDocument
+from app.infrastructure.models.memory_serialization import (
+    deserialize_memory,
+    serialize_memory,
+    serialize_message,
+)
+from pymongo import ReplaceOne
 import logging
 
 
@@ -39,29 +44,71 @@ class MongoAgentRepository(AgentRepository):
                           name: str,
                           memory: Memory) -> None:
         """Add or update a memory for an agent"""
-        result = await AgentDocument.find_one(
-            AgentDocument.agent_id == agent_id
-        ).update(
-            {"$set": {f"memories.{name}": serialize_memory(memory), "updated_at": datetime.now(UTC)}}
-        )
-        if not result:
-            raise ValueError(f"Agent {agent_id} not found")
+        await self._write_checkpoint(agent_id, name, memory)
 
     async def get_memory(self, agent_id: str, name: str) -> Memory:
         """Get memory by name from agent, create if not exists"""
-        mongo_agent = await AgentDocument.find_one(
-            AgentDocument.agent_id == agent_id
+        mongo_agent = await AgentDocument.get_pymongo_collection().find_one(
+            {"agent_id": agent_id},
+            {f"memories.{name}": 1},
         )
         if not mongo_agent:
             raise ValueError(f"Agent {agent_id} not found")
-        return deserialize_memory(mongo_agent.memories.get(name))
+        raw = (mongo_agent.get("memories") or {}).get(name)
+        checkpoint = (raw or {}).get("checkpoint", 0)
+        entries = await AgentMemoryEntryDocument.find(
+            AgentMemoryEntryDocument.agent_id == agent_id,
+            AgentMemoryEntryDocument.name == name,
+            AgentMemoryEntryDocument.checkpoint == checkpoint,
+        ).sort("+seq").to_list()
+        return deserialize_memory(raw, [entry.message for entry in entries])
     
     async def save_memory(self, agent_id: str, name: str, memory: Memory) -> None:
-        """Update the messages of a memory"""
+        """Persist memory changes.
+
+        New messages are appended as entries on top of the current checkpoint,
+        so a turn costs O(new messages). In-place edits (roll back, elision,
+        system prompt refresh) are written as a new checkpoint instead.
+        """
+        if memory.needs_checkpoint:
+            await self._write_checkpoint(agent_id, name, memory)
+            return
+
+        messages = memory.get_unsaved_messages()
+        if not messages:
+            return
+        # Upserts keep a retried append idempotent.
+        await AgentMemoryEntryDocument.get_pymongo_collection().bulk_write([
+            ReplaceOne(
+                {"agent_id": agent_id, "name": name, "checkpoint": memory.checkpoint, "seq": seq},
+                {
+                    "agent_id": agent_id,
+                    "name": name,
+                    "checkpoint": memory.checkpoint,
+                    "seq": seq,
+                    "message": serialize_message(message),
+                },
+                upsert=True,
+            )
+            for seq, message in enumerate(messages, start=memory.saved_count)
+        ])
+        memory.mark_saved()
+
+    async def _write_checkpoint(self, agent_id: str, name: str, memory: Memory) -> None:
+        """Rewrite the full memory as a new checkpoint and drop the old tail"""
+        checkpoint = memory.checkpoint + 1
         result = await AgentDocument.find_one(
             AgentDocument.agent_id == agent_id
         ).update(
-            {"$set": {f"memories.{name}": serialize_memory(memory), "updated_at": datetime.now(UTC)}}
+            {"$set": {f"memories.{name}": serialize_memory(memory, checkpoint), "updated_at": datetime.now(UTC)}}
         )
         if not result:
             raise ValueError(f"Agent {agent_id} not found")
+        # Entries of older generations are ignored on load, so removing them
+        # after the checkpoint is written is safe even if interrupted.
+        await AgentMemoryEntryDocument.find(
+            AgentMemoryEntryDocument.agent_id == agent_id,
+            AgentMemoryEntryDocument.name == name,
+            AgentMemoryEntryDocument.checkpoint < checkpoint,
+        ).delete()
+        memory.mark_saved(checkpoint)
@@ -1,7 +1,7 @@
 from typing import Set
 from datetime import datetime, timezone
 from app.domain.repositories.file_favorite_repository import FileFavoriteRepository
-from app.infrastructure.models.documents import FileFavoriteDocument
+from app.infrastructure.models.documents import FileFavoriteDocument, LibraryFileDocument
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,19 +15,21 @@ class MongoFileFavoriteRepository(FileFavoriteRepository):
             FileFavoriteDocument.user_id == user_id,
             FileFavoriteDocument.file_id == file_id,
         )
-        if is_favorite:
-            if existing:
-                return
+        if is_favorite and not existing:
             await FileFavoriteDocument(
                 user_id=user_id,
                 file_id=file_id,
                 created_at=datetime.now(timezone.utc),
             ).insert()
             logger.info("File %s favorited by user %s", file_id, user_id)
-            return
-        if existing:
+        elif not is_favorite and existing:
             await existing.delete()
             logger.info("File %s unfavorited by user %s", file_id, user_id)
+        # The library lists the flag from its own catalogue
+        await LibraryFileDocument.get_pymongo_collection().update_many(
+            {"user_id": user_id, "file_id": file_id},
+            {"$set": {"is_favorite": is_favorite}},
+        )
 
     async def list_favorite_file_ids(self, user_id: str) -> Set[str]:
         docs = await FileFavoriteDocument.find(
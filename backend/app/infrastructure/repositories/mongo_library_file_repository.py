@@ -0,0 +1,155 @@
+from typing import Optional, Tuple
+from datetime import datetime, UTC
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from app.domain.models.file import FileInfo, LibraryFile, LibraryFilePage
+from app.domain.repositories.library_file_repository import LibraryFileRepository
+from app.infrastructure.models.documents import FileFavoriteDocument, LibraryFileDocument, SessionDocument
+import logging
+
+logger = logging.getLogger(__name__)
+
+LIBRARY_FILE_PROJECTION = {
+    "session_id": 1,
+    "file_id": 1,
+    "filename": 1,
+    "file_path": 1,
+    "content_type": 1,
+    "size": 1,
+    "upload_date": 1,
+    "is_favorite": 1,
+    "created_at": 1,
+}
+
+
+async def catalogue_file(user_id: str, session_id: str, file_info: FileInfo) -> None:
+    """Add a file just attached to a session to its owner's library"""
+    if not file_info.file_id:
+        return
+    favorite = await FileFavoriteDocument.get_pymongo_collection().find_one(
+        {"user_id": user_id, "file_id": file_info.file_id}, {"_id": 1}
+    )
+    await LibraryFileDocument.get_pymongo_collection().update_one(
+        {"session_id": session_id, "file_id": file_info.file_id, "file_path": file_info.file_path},
+        {
+            "$set": _file_fields(file_info),
+            "$setOnInsert": {
+                "user_id": user_id,
+                "is_favorite": favorite is not None,
+                "created_at": datetime.now(UTC),
+            },
+        },
+        upsert=True,
+    )
+
+
+async def uncatalogue_file(session_id: str, file_id: str, file_path: Optional[str] = None) -> None:
+    """Remove a file detached from a session from the library"""
+    query = {"session_id": session_id, "file_id": file_id}
+    if file_path is not None:
+        query["file_path"] = file_path
+    await LibraryFileDocument.get_pymongo_collection().delete_many(query)
+
+
+async def uncatalogue_session(session_id: str) -> None:
+    """Remove all files of a deleted session from the library"""
+    await LibraryFileDocument.get_pymongo_collection().delete_many({"session_id": session_id})
+
+
+def _file_fields(file_info: FileInfo) -> dict:
+    return file_info.model_dump(include={"filename", "file_path", "content_type", "size", "upload_date"})
+
+
+def encode_cursor(created_at: datetime, doc_id: ObjectId) -> str:
+    return f"{int(created_at.replace(tzinfo=UTC).timestamp() * 1000)}.{doc_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        millis, doc_id = cursor.split(".", 1)
+        return datetime.fromtimestamp(int(millis) / 1000, UTC), ObjectId(doc_id)
+    except (ValueError, InvalidId) as e:
+        raise ValueError(f"Invalid library cursor: {cursor}") from e
+
+
+class MongoLibraryFileRepository(LibraryFileRepository):
+    """MongoDB implementation of LibraryFileRepository"""
+
+    async def list_files(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> LibraryFilePage:
+        query: dict = {"user_id": user_id}
+        if cursor:
+            created_at, doc_id = decode_cursor(cursor)
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": doc_id}},
+            ]
+        else:
+            await self._backfill(user_id)
+        docs = await LibraryFileDocument.get_pymongo_collection().find(
+            query, LIBRARY_FILE_PROJECTION
+        ).sort([("created_at", -1), ("_id", -1)]).limit(limit + 1).to_list(limit + 1)
+        next_cursor = None
+        if len(docs) > limit:
+            docs = docs[:limit]
+            next_cursor = encode_cursor(docs[-1]["created_at"], docs[-1]["_id"])
+        return LibraryFilePage(
+            files=[
+                LibraryFile.model_validate({key: doc.get(key) for key in LibraryFile.model_fields})
+                for doc in docs
+            ],
+            next_cursor=next_cursor,
+        )
+
+    async def owns_file(self, user_id: str, file_id: str) -> bool:
+        doc = await LibraryFileDocument.get_pymongo_collection().find_one(
+            {"user_id": user_id, "file_id": file_id}, {"_id": 1}
+        )
+        return doc is not None
+
+    async def _backfill(self, user_id: str) -> None:
+        """Catalogue files of the user's sessions created before the library was.
+
+        Such sessions are found through the ``library_indexed`` flag, so
+        once every session is catalogued this is a single empty index scan.
+        """
+        sessions = SessionDocument.get_pymongo_collection()
+        library = LibraryFileDocument.get_pymongo_collection()
+        favorite_ids = None
+        async for doc in sessions.find(
+            {"user_id": user_id, "library_indexed": {"$ne": True}},
+            {"session_id": 1, "files": 1, "latest_message_at": 1, "created_at": 1},
+        ):
+            files = [FileInfo.model_validate(f) for f in doc.get("files") or []]
+            files = [f for f in files if f.file_id]
+            if files:
+                if favorite_ids is None:
+                    favorite_ids = {
+                        favorite["file_id"]
+                        async for favorite in FileFavoriteDocument.get_pymongo_collection().find(
+                            {"user_id": user_id}, {"file_id": 1}
+                        )
+                    }
+                attached_at = doc.get("latest_message_at") or doc.get("created_at") or datetime.now(UTC)
+                await library.bulk_write([
+                    UpdateOne(
+                        {"session_id": doc["session_id"], "file_id": f.file_id, "file_path": f.file_path},
+                        {"$setOnInsert": {
+                            **_file_fields(f),
+                            "user_id": user_id,
+                            "is_favorite": f.file_id in favorite_ids,
+                            "created_at": f.upload_date or attached_at,
+                        }},
+                        upsert=True,
+                    )
+                    for f in files
+                ], ordered=False)
+            await sessions.update_one(
+                {"session_id": doc["session_id"]}, {"$set": {"library_indexed": True}}
+            )
+            logger.info(f"Catalogued {len(files)} library files of session {doc['session_id']}")
@@ -1,13 +1,16 @@
 from typing import Optional, List
 from datetime import datetime, UTC
-from app.domain.models.session import Session, SessionStatus, SessionSummary, TaskMode
+from app.domain.models.session import Session, SessionStatus, SessionSummary, SessionEventPage, TaskMode
 from app.domain.models.file import FileInfo
 from app.domain.repositories.session_repository import SessionRepository
-from app.domain.models.event import BaseEvent
-from app.infrastructure.models.documents import SessionDocument
-from app.infrastructure.external.session_list import (
-    publish_session_remove,
-    publish_session_upsert,
+from app.domain.models.event import BaseEvent, PlanEvent
+from app.infrastructure.models.documents import SessionDocument, SessionEventDocument
+from pymongo import ReturnDocument, UpdateOne
+from app.infrastructure.external.session_list import get_session_list_notifier
+from app.infrastructure.repositories.mongo_library_file_repository import (
+    catalogue_file,
+    uncatalogue_file,
+    uncatalogue_session,
 )
 import logging
 
@@ -28,32 +31,85 @@ SESSION_LIST_PROJECTION = {
     "task_mode": 1,
 }
 
+# Owned by dedicated methods rather than written from the domain object
+UNSAVED_FIELDS = {"created_at", "last_plan", "files", "screenshots"}
+
 class MongoSessionRepository(SessionRepository):
     """MongoDB implementation of SessionRepository"""
     
     async def save(self, session: Session) -> None:
-        """Save or update a session"""
-        mongo_session = await SessionDocument.find_one(
-            SessionDocument.session_id == session.id
+        """Save or update a session
+
+        Only fields changed since the session was loaded or last saved are
+        written. Event bookkeeping (sequence counter, last plan) is owned by
+        add_event, the file list by add_file / remove_file, which keep
+        the library catalogue in step, and the screenshot ring by
+        add_screenshot, so save() never writes them.
+        """
+        if not session.is_saved:
+            await self._insert(session)
+            session.mark_saved()
+            return
+
+        data = {
+            field: value for field, value in session.get_changed_fields().items()
+            if field not in UNSAVED_FIELDS
+        }
+        if not data:
+            return
+        update = {"$set": {**data, "updated_at": datetime.now(UTC)}}
+        if data.keys() & SessionSummary.model_fields.keys():
+            await self._update_and_notify(session.id, update)
+        else:
+            result = await SessionDocument.get_pymongo_collection().update_one(
+                {"session_id": session.id}, update
+            )
+            if not result.matched_count:
+                raise ValueError(f"Session {session.id} not found")
+        session.mark_saved()
+
+    async def _insert(self, session: Session) -> None:
+        """Store a new session, or update it if it is already stored"""
+        mongo_session = SessionDocument.from_domain(session)
+        mongo_session.library_indexed = True
+        result = await SessionDocument.get_pymongo_collection().update_one(
+            {"session_id": session.id},
+            {"$setOnInsert": mongo_session.model_dump(exclude={"id", "revision_id"})},
+            upsert=True,
         )
-        
-        if not mongo_session:
-            mongo_session = SessionDocument.from_domain(session)
-            await mongo_session.save()
-            await publish_session_upsert(session.user_id, session.id)
+        if result.upserted_id is None:
+            data = session.model_dump(exclude={"id"} | UNSAVED_FIELDS)
+            await self._update_and_notify(
+                session.id, {"$set": {**data, "updated_at": datetime.now(UTC)}}
+            )
             return
-        
-        # Update fields from session domain model
-        mongo_session.update_from_domain(session)
-        await mongo_session.save()
-        await publish_session_upsert(session.user_id, session.id)
+        for file_info in session.files:
+            await catalogue_file(session.user_id, session.id, file_info)
+        get_session_list_notifier().upsert(self._summary_from_session(session))
 
-    async def _notify_upsert(self, session_id: str) -> None:
-        mongo_session = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
+    def _to_domain(self, mongo_session: SessionDocument) -> Session:
+        session = mongo_session.to_domain()
+        session.mark_saved()
+        return session
+
+    async def _update_and_notify(self, session_id: str, update: dict) -> None:
+        """Apply an update and notify the session list with the result
+
+        The list projection of the updated document comes back with the
+        update itself, so no extra read is needed for the notification.
+        """
+        doc = await SessionDocument.get_pymongo_collection().find_one_and_update(
+            {"session_id": session_id},
+            update,
+            projection=SESSION_LIST_PROJECTION,
+            return_document=ReturnDocument.AFTER,
         )
-        if mongo_session:
-            await publish_session_upsert(mongo_session.user_id, session_id)
+        if not doc:
+            raise ValueError(f"Session {session_id} not found")
+        get_session_list_notifier().upsert(self._summary_from_doc(doc))
+
+    def _summary_from_session(self, session: Session) -> SessionSummary:
+        return SessionSummary.model_validate(session.model_dump(include=set(SessionSummary.model_fields)))
 
     def _summary_from_doc(self, doc: dict) -> SessionSummary:
         return SessionSummary(
@@ -71,19 +127,61 @@ class MongoSessionRepository(SessionRepository):
             task_mode=doc.get("task_mode") or TaskMode.AGENT,
         )
 
+    async def _migrate_legacy_events(self, mongo_session: SessionDocument) -> None:
+        """Move events embedded in the session document to SessionEventDocument.
+
+        Legacy events take sequences 1..n, which ``add_event`` also reserves
+        for them, so migrating concurrently with new events is safe.
+        """
+        if not mongo_session.events:
+            return
+        events = mongo_session.events
+        last_plan = None
+        requests = []
+        for sequence, event in enumerate(events, start=1):
+            if isinstance(event, PlanEvent):
+                last_plan = event.plan
+            requests.append(UpdateOne(
+                {"session_id": mongo_session.session_id, "sequence": sequence},
+                {"$setOnInsert": {
+                    "session_id": mongo_session.session_id,
+                    "sequence": sequence,
+                    "event_id": event.id,
+                    "event": event.model_dump(),
+                }},
+                upsert=True,
+            ))
+        await SessionEventDocument.get_pymongo_collection().bulk_write(requests, ordered=False)
+        update = {
+            "$unset": {"events": ""},
+            "$max": {"event_seq": len(events)},
+        }
+        if last_plan and not mongo_session.last_plan:
+            update["$set"] = {"last_plan": last_plan.model_dump()}
+            mongo_session.last_plan = last_plan
+        await SessionDocument.get_pymongo_collection().update_one(
+            {"session_id": mongo_session.session_id}, update
+        )
+        mongo_session.events = []
+        mongo_session.event_seq = max(mongo_session.event_seq, len(events))
+        logger.info(f"Migrated {len(events)} embedded events of session {mongo_session.session_id}")
+
     async def find_by_id(self, session_id: str) -> Optional[Session]:
         """Find a session by its ID"""
         mongo_session = await SessionDocument.find_one(
             SessionDocument.session_id == session_id
         )
-        return mongo_session.to_domain() if mongo_session else None
+        if not mongo_session:
+            return None
+        await self._migrate_legacy_events(mongo_session)
+        return self._to_domain(mongo_session)
     
     async def find_by_user_id(self, user_id: str) -> List[Session]:
         """Find all sessions for a specific user"""
         mongo_sessions = await SessionDocument.find(
             SessionDocument.user_id == user_id
         ).sort("-latest_message_at").to_list()
-        return [mongo_session.to_domain() for mongo_session in mongo_sessions]
+        return [self._to_domain(mongo_session) for mongo_session in mongo_sessions]
 
     async def find_summaries_by_user_id(self, user_id: str) -> List[SessionSummary]:
         """Find lightweight session summaries for a user (excludes events/files)"""
@@ -97,6 +195,15 @@ class MongoSessionRepository(SessionRepository):
             summaries.append(self._summary_from_doc(doc))
         return summaries
 
+    async def find_summaries_by_ids(self, session_ids: List[str]) -> List[SessionSummary]:
+        """Find lightweight session summaries by ID, skipping unknown IDs"""
+        collection = SessionDocument.get_pymongo_collection()
+        cursor = collection.find(
+            {"session_id": {"$in": session_ids}},
+            SESSION_LIST_PROJECTION,
+        )
+        return [self._summary_from_doc(doc) async for doc in cursor]
+
     async def find_summary_by_id_and_user_id(
         self, session_id: str, user_id: str
     ) -> Optional[SessionSummary]:
@@ -116,197 +223,271 @@ class MongoSessionRepository(SessionRepository):
             SessionDocument.session_id == session_id,
             SessionDocument.user_id == user_id
         )
-        return mongo_session.to_domain() if mongo_session else None
+        if not mongo_session:
+            return None
+        await self._migrate_legacy_events(mongo_session)
+        return self._to_domain(mongo_session)
     
     async def update_title(self, session_id: str, title: str) -> None:
         """Update the title of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"title": title, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"title": title, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def update_latest_message(self, session_id: str, message: str, timestamp: datetime) -> None:
         """Update the latest message of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"latest_message": message, "latest_message_at": timestamp, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"latest_message": message, "latest_message_at": timestamp, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def add_event(self, session_id: str, event: BaseEvent) -> None:
         """Add an event to a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$push": {"events": event.model_dump()}, "$set": {"updated_at": datetime.now(UTC)}}
+        # Reserve the next sequence atomically; sessions not migrated yet
+        # continue after their embedded events.
+        fields = {
+            "event_seq": {"$add": [
+                {"$ifNull": ["$event_seq", {"$size": {"$ifNull": ["$events", []]}}]},
+                1,
+            ]},
+            "updated_at": datetime.now(UTC),
+        }
+        if isinstance(event, PlanEvent):
+            fields["last_plan"] = {"$literal": event.plan.model_dump()}
+        doc = await SessionDocument.get_pymongo_collection().find_one_and_update(
+            {"session_id": session_id},
+            [{"$set": fields}],
+            projection={"event_seq": 1},
+            return_document=ReturnDocument.AFTER,
         )
-        if not result:
+        if not doc:
             raise ValueError(f"Session {session_id} not found")
+        await SessionEventDocument(
+            session_id=session_id,
+            sequence=doc["event_seq"],
+            event_id=event.id,
+            event=event,
+        ).insert()
+
+    async def get_events(
+        self,
+        session_id: str,
+        cursor: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get events of a session after the cursor, in sequence order"""
+        query = SessionEventDocument.find(
+            SessionEventDocument.session_id == session_id,
+            SessionEventDocument.sequence > (cursor or 0),
+        ).sort("+sequence")
+        if limit:
+            # Fetch one extra document to learn whether another page follows.
+            query = query.limit(limit + 1)
+        docs = await query.to_list()
+        has_more = bool(limit) and len(docs) > limit
+        if has_more:
+            docs = docs[:limit]
+        return SessionEventPage(
+            events=[doc.event for doc in docs],
+            next_cursor=docs[-1].sequence if docs else cursor,
+            has_more=has_more,
+        )
+
+    async def get_events_before(
+        self,
+        session_id: str,
+        before: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> SessionEventPage:
+        """Get the latest events of a session before the cursor (all when None), in sequence order"""
+        filters = [SessionEventDocument.session_id == session_id]
+        if before is not None:
+            filters.append(SessionEventDocument.sequence < before)
+        query = SessionEventDocument.find(*filters).sort("-sequence")
+        if limit:
+            query = query.limit(limit + 1)
+        docs = await query.to_list()
+        has_older = bool(limit) and len(docs) > limit
+        if has_older:
+            docs = docs[:limit]
+        docs.reverse()
+        return SessionEventPage(
+            events=[doc.event for doc in docs],
+            next_cursor=docs[-1].sequence if docs else None,
+            prev_cursor=docs[0].sequence if docs else before,
+            has_older=has_older,
+        )
+
+    async def get_event_sequence(self, session_id: str, event_id: str) -> Optional[int]:
+        """Get the sequence of an event, usable as a cursor"""
+        doc = await SessionEventDocument.get_pymongo_collection().find_one(
+            {"session_id": session_id, "event_id": event_id},
+            {"sequence": 1},
+        )
+        return doc["sequence"] if doc else None
     
     async def add_file(self, session_id: str, file_info: FileInfo) -> None:
-        """Add a file to a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$push": {"files": file_info.model_dump()}, "$set": {"updated_at": datetime.now(UTC)}}
+        """Add a file to a session and to its owner's library"""
+        doc = await SessionDocument.get_pymongo_collection().find_one_and_update(
+            {"session_id": session_id},
+            {"$push": {"files": file_info.model_dump()}, "$set": {"updated_at": datetime.now(UTC)}},
+            projection={"user_id": 1},
         )
-        if not result:
+        if not doc:
             raise ValueError(f"Session {session_id} not found")
+        await catalogue_file(doc["user_id"], session_id, file_info)
     
-    async def remove_file(self, session_id: str, file_id: str) -> None:
-        """Remove a file from a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$pull": {"files": {"file_id": file_id}}, "$set": {"updated_at": datetime.now(UTC)}}
+    async def remove_file(self, session_id: str, file_id: str, file_path: Optional[str] = None) -> None:
+        """Remove a file from a session and from its owner's library"""
+        # Identical content shares a file ID, so one file ID may sit at
+        # several paths of a session
+        match = {"file_id": file_id}
+        if file_path is not None:
+            match["file_path"] = file_path
+        result = await SessionDocument.get_pymongo_collection().update_one(
+            {"session_id": session_id},
+            {"$pull": {"files": match}, "$set": {"updated_at": datetime.now(UTC)}},
         )
-        if not result:
+        if not result.matched_count:
             raise ValueError(f"Session {session_id} not found")
+        await uncatalogue_file(session_id, file_id, file_path)
 
     async def get_file_by_path(self, session_id: str, file_path: str) -> Optional[FileInfo]:
         """Get file by path from a session"""
-        mongo_session = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
+        # Project just the first matching file
+        doc = await SessionDocument.get_pymongo_collection().find_one(
+            {"session_id": session_id},
+            {"_id": 0, "files": {"$elemMatch": {"file_path": file_path}}},
         )
-        if not mongo_session:
+        if doc is None:
             raise ValueError(f"Session {session_id} not found")
-        
-        # Search for file with matching path
-        for file_info in mongo_session.files:
-            if file_info.file_path == file_path:
-                return file_info
-        return None
+        files = doc.get("files")
+        return FileInfo.model_validate(files[0]) if files else None
+
+    async def add_screenshot(self, session_id: str, file_id: str, keep: int) -> List[str]:
+        """Append a browser frame to a session, keeping the latest ``keep``; return evicted file IDs"""
+        doc = await SessionDocument.get_pymongo_collection().find_one_and_update(
+            {"session_id": session_id},
+            {"$push": {"screenshots": {"$each": [file_id], "$slice": -keep}}},
+            projection={"_id": 0, "screenshots": 1},
+            return_document=ReturnDocument.BEFORE,
+        )
+        if not doc:
+            raise ValueError(f"Session {session_id} not found")
+        frames = doc.get("screenshots", []) + [file_id]
+        return frames[:-keep]
+
+    async def clear_screenshots(self, session_id: str, file_ids: List[str]) -> None:
+        """Drop evicted browser frames from the events that show them, except frames still in the ring"""
+        if not file_ids:
+            return
+        doc = await SessionDocument.get_pymongo_collection().find_one(
+            {"session_id": session_id},
+            projection={"_id": 0, "screenshots": 1},
+        )
+        # A frame captured again after its eviction is shown by newer events
+        kept = set(doc.get("screenshots", [])) if doc else set()
+        file_ids = [file_id for file_id in file_ids if file_id not in kept]
+        if not file_ids:
+            return
+        await SessionEventDocument.get_pymongo_collection().update_many(
+            {"session_id": session_id, "event.tool_content.screenshot": {"$in": file_ids}},
+            {"$set": {"event.tool_content.screenshot": None}},
+        )
 
     async def delete(self, session_id: str) -> None:
         """Delete a session"""
-        mongo_session = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
+        doc = await SessionDocument.get_pymongo_collection().find_one_and_delete(
+            {"session_id": session_id},
+            projection={"user_id": 1},
         )
-        if mongo_session:
-            user_id = mongo_session.user_id
-            await mongo_session.delete()
-            await publish_session_remove(user_id, session_id)
+        if doc:
+            await SessionEventDocument.find(
+                SessionEventDocument.session_id == session_id
+            ).delete()
+            await uncatalogue_session(session_id)
+            await get_session_list_notifier().remove(doc["user_id"], session_id)
 
     async def get_all(self) -> List[Session]:
         """Get all sessions"""
         mongo_sessions = await SessionDocument.find().sort("-latest_message_at").to_list()
-        return [mongo_session.to_domain() for mongo_session in mongo_sessions]
+        return [self._to_domain(mongo_session) for mongo_session in mongo_sessions]
     
     async def update_status(self, session_id: str, status: SessionStatus) -> None:
         """Update the status of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"status": status, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"status": status, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def update_unread_message_count(self, session_id: str, count: int) -> None:
         """Update the unread message count of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"unread_message_count": count, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"unread_message_count": count, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def increment_unread_message_count(self, session_id: str) -> None:
         """Atomically increment the unread message count of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$inc": {"unread_message_count": 1}, "$set": {"updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$inc": {"unread_message_count": 1}, "$set": {"updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def decrement_unread_message_count(self, session_id: str) -> None:
         """Atomically decrement the unread message count of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$inc": {"unread_message_count": -1}, "$set": {"updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$inc": {"unread_message_count": -1}, "$set": {"updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def update_shared_status(self, session_id: str, is_shared: bool) -> None:
         """Update the shared status of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"is_shared": is_shared, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"is_shared": is_shared, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def update_favorite_status(self, session_id: str, is_favorite: bool) -> None:
         """Update the favorite status of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"is_favorite": is_favorite, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"is_favorite": is_favorite, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def update_pin_status(self, session_id: str, is_pinned: bool) -> None:
         """Update the pin status of a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"is_pinned": is_pinned, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"is_pinned": is_pinned, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def update_project_id(self, session_id: str, project_id: Optional[str]) -> None:
         """Assign or clear project association for a session"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"project_id": project_id, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"project_id": project_id, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
 
     async def clear_project_id(self, project_id: str) -> None:
         """Clear project_id from all sessions belonging to a project"""
-        affected = await SessionDocument.find(
-            SessionDocument.project_id == project_id
-        ).to_list()
-        await SessionDocument.find(
-            SessionDocument.project_id == project_id
-        ).update(
-            {"$set": {"project_id": None, "updated_at": datetime.now(UTC)}}
+        collection = SessionDocument.get_pymongo_collection()
+        affected = []
+        async for doc in collection.find({"project_id": project_id}, SESSION_LIST_PROJECTION):
+            doc["project_id"] = None
+            affected.append(self._summary_from_doc(doc))
+        await collection.update_many(
+            {"project_id": project_id},
+            {"$set": {"project_id": None, "updated_at": datetime.now(UTC)}},
         )
-        for mongo_session in affected:
-            await publish_session_upsert(mongo_session.user_id, mongo_session.session_id)
+        notifier = get_session_list_notifier()
+        for summary in affected:
+            notifier.upsert(summary)
 
     async def update_task_mode(self, session_id: str, task_mode: str) -> None:
         """Update session task mode (agent | chat)"""
-        result = await SessionDocument.find_one(
-            SessionDocument.session_id == session_id
-        ).update(
-            {"$set": {"task_mode": task_mode, "updated_at": datetime.now(UTC)}}
+        await self._update_and_notify(
+            session_id,
+            {"$set": {"task_mode": task_mode, "updated_at": datetime.now(UTC)}},
         )
-        if not result:
-            raise ValueError(f"Session {session_id} not found")
-        await self._notify_upsert(session_id)
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, UploadFile, File
-from fastapi.responses import StreamingResponse
+from typing import Optional, Tuple
+from fastapi import APIRouter, Depends, Request, UploadFile, File
+from fastapi.responses import Response, StreamingResponse
 import logging
+import urllib.parse
 
 from app.application.services.file_service import FileService
 from app.application.errors.exceptions import NotFoundError
 from app.interfaces.dependencies import get_file_service, get_current_user, get_optional_current_user, verify_signature
+from app.domain.external.file import CONTENT_HASH_KEY
+from app.domain.models.file import FileInfo
 from app.domain.models.user import User
 from app.interfaces.schemas.base import APIResponse
 from app.interfaces.schemas.file import FileInfoResponse
@@ -31,67 +35,115 @@ async def upload_file(
     
     return APIResponse.success(await FileInfoResponse.from_domain(result))
 
-@router.get("/{file_id}")
-async def download_file_with_signature(
+def _etag(file_info: FileInfo) -> str:
+    """Strong validator of a stored file's content"""
+    digest = (file_info.metadata or {}).get(CONTENT_HASH_KEY)
+    return f'"{digest}"' if digest else f'"{file_info.file_id}-{file_info.size or 0}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    return any(tag.strip() in ("*", etag, f"W/{etag}") for tag in header.split(","))
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes`` range into inclusive offsets
+
+    Returns None when the header should be ignored (malformed, other units,
+    several ranges); raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or not dash or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        if int(last) == 0 or size == 0:
+            raise ValueError(header)
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if last and start > end:
+        return None
+    if start >= size:
+        raise ValueError(header)
+    return start, min(end, size - 1)
+
+
+async def _file_response(
+    request: Request,
+    file_service: FileService,
     file_id: str,
-    file_service: FileService = Depends(get_file_service),
-    signature: str = Depends(verify_signature),
-):
-    """Download file with optional access token"""
-    
-    # Download file (authentication is handled by middleware for non-token requests)
-    try:
-        file_data, file_info = await file_service.download_file(file_id)
-    except FileNotFoundError:
+    user_id: Optional[str] = None,
+) -> Response:
+    """Stream a file, honouring Range, If-Range and If-None-Match"""
+    file_info = await file_service.get_file_info(file_id, user_id)
+    if not file_info:
+        # Also when the file exists but belongs to another user
         raise NotFoundError("File not found")
-    except PermissionError:
-        raise NotFoundError("File not found")  # Don't reveal if file exists but user has no access
-    
+
+    size = file_info.size or 0
+    etag = _etag(file_info)
     # Encode filename properly for Content-Disposition header
     # Use URL encoding for non-ASCII characters to ensure latin-1 compatibility
-    import urllib.parse
-    encoded_filename = urllib.parse.quote(file_info.filename, safe='')
-    
+    encoded_filename = urllib.parse.quote(file_info.filename or file_id, safe='')
     headers = {
-        'Content-Disposition': f'attachment; filename*=UTF-8\'\'{encoded_filename}'
+        'Content-Disposition': f'attachment; filename*=UTF-8\'\'{encoded_filename}',
+        'ETag': etag,
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private, no-cache',
     }
-    
+
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, 'Content-Range': f'bytes */{size}'})
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range:
+        start, end = byte_range
+        status_code = 206
+        headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+    headers['Content-Length'] = str(end - start + 1)
+
     return StreamingResponse(
-        file_data,
+        file_service.stream_file(file_id, start, end),
+        status_code=status_code,
         media_type=file_info.content_type or 'application/octet-stream',
         headers=headers
     )
 
+@router.get("/{file_id}")
+async def download_file_with_signature(
+    file_id: str,
+    request: Request,
+    file_service: FileService = Depends(get_file_service),
+    signature: str = Depends(verify_signature),
+):
+    """Download file with optional access token"""
+    # Authentication is handled by the signature for these requests
+    return await _file_response(request, file_service, file_id)
+
 @router.get("/{file_id}/download")
 async def download_file(
     file_id: str,
+    request: Request,
     file_service: FileService = Depends(get_file_service),
     current_user: User = Depends(get_optional_current_user)
 ):
     """Download file with optional access token"""
-    
-    # Download file (authentication is handled by middleware for non-token requests)
-    try:
-        file_data, file_info = await file_service.download_file(file_id, current_user.id if current_user else None)
-    except FileNotFoundError:
-        raise NotFoundError("File not found")
-    except PermissionError:
-        raise NotFoundError("File not found")  # Don't reveal if file exists but user has no access
-    
-    # Encode filename properly for Content-Disposition header
-    # Use URL encoding for non-ASCII characters to ensure latin-1 compatibility
-    import urllib.parse
-    encoded_filename = urllib.parse.quote(file_info.filename, safe='')
-    
-    headers = {
-        'Content-Disposition': f'attachment; filename*=UTF-8\'\'{encoded_filename}'
-    }
-    
-    return StreamingResponse(
-        file_data,
-        media_type=file_info.content_type or 'application/octet-stream',
-        headers=headers
-    )
+    # Authentication is handled by middleware for non-token requests
+    return await _file_response(request, file_service, file_id, current_user.id if current_user else None)
 
 @router.delete("/{file_id}", response_model=APIResponse[None])
 async def delete_file(
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 from app.application.services.agent_service import AgentService
 from app.interfaces.dependencies import get_current_user, get_agent_service
 from app.interfaces.schemas.base import APIResponse
@@ -11,14 +12,23 @@ from app.domain.models.user import User
 
 router = APIRouter(prefix="/library", tags=["library"])
 
+LIBRARY_PAGE_SIZE = 100
+MAX_LIBRARY_PAGE_SIZE = 500
+
 
 @router.get("/files", response_model=APIResponse[LibraryResponse])
 async def get_library_files(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(LIBRARY_PAGE_SIZE, ge=1, le=MAX_LIBRARY_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
     agent_service: AgentService = Depends(get_agent_service),
 ) -> APIResponse[LibraryResponse]:
-    files = await agent_service.get_library_files(current_user.id)
-    return APIResponse.success(LibraryResponse(files=[LibraryFileItem(**f) for f in files]))
+    """Get library files after the cursor returned by a previous page"""
+    files, next_cursor = await agent_service.get_library_files(current_user.id, limit, cursor)
+    return APIResponse.success(LibraryResponse(
+        files=[LibraryFileItem(**f) for f in files],
+        next_cursor=next_cursor,
+    ))
 
 
 @router.post("/files/{file_id}/favorite", response_model=APIResponse[FavoriteLibraryFileResponse])
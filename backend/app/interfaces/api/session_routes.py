@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from typing import List, Optional
 import logging
 from app.interfaces.dependencies import get_file_service
@@ -8,7 +8,7 @@ from app.application.errors.exceptions import NotFoundError, UnauthorizedError,
 from app.interfaces.dependencies import get_agent_service, get_current_user, get_optional_current_user
 from app.interfaces.schemas.base import APIResponse
 from app.interfaces.schemas.session import (
-    ShellViewRequest, CreateSessionResponse, GetSessionResponse,
+    ShellViewRequest, CreateSessionResponse, GetSessionResponse, SessionEventsResponse,
     ListSessionItem, ListSessionResponse, ShellViewResponse,
     ShareSessionResponse, SharedSessionResponse,
     UpdateSessionTitleRequest, UpdateSessionTitleResponse,
@@ -26,6 +26,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
+# Event history is paged so session loads do not scale with history length.
+EVENT_PAGE_SIZE = 200
+MAX_EVENT_PAGE_SIZE = 1000
+
 
 @router.put("", response_model=APIResponse[CreateSessionResponse])
 async def create_session(
@@ -42,17 +46,24 @@ async def create_session(
 @router.get("/{session_id}", response_model=APIResponse[GetSessionResponse])
 async def get_session(
     session_id: str,
+    limit: int = Query(EVENT_PAGE_SIZE, ge=1, le=MAX_EVENT_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
     agent_service: AgentService = Depends(get_agent_service)
 ) -> APIResponse[GetSessionResponse]:
     session = await agent_service.get_session(session_id, current_user.id)
     if not session:
         raise NotFoundError("Session not found")
+    # The latest page; older pages are fetched as the history is scrolled
+    page = await agent_service.get_session_events_before(session_id, limit=limit)
     return APIResponse.success(GetSessionResponse(
         session_id=session.id,
         title=session.title,
         status=session.status,
-        events=await EventMapper.events_to_stream_events(session.events),
+        events=await EventMapper.events_to_stream_events(page.events),
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+        prev_cursor=page.prev_cursor,
+        has_older=page.has_older,
         is_shared=session.is_shared,
         is_favorite=session.is_favorite,
         is_pinned=session.is_pinned,
@@ -60,6 +71,28 @@ async def get_session(
         task_mode=session.task_mode,
     ))
 
+@router.get("/{session_id}/events", response_model=APIResponse[SessionEventsResponse])
+async def get_session_events(
+    session_id: str,
+    cursor: Optional[int] = Query(None, ge=0),
+    before: Optional[int] = Query(None, ge=1),
+    limit: int = Query(EVENT_PAGE_SIZE, ge=1, le=MAX_EVENT_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    agent_service: AgentService = Depends(get_agent_service)
+) -> APIResponse[SessionEventsResponse]:
+    """Get session events after ``cursor``, or the older ones preceding ``before``"""
+    if before is not None:
+        page = await agent_service.get_session_events_before(session_id, current_user.id, before, limit)
+    else:
+        page = await agent_service.get_session_events(session_id, current_user.id, cursor, limit)
+    return APIResponse.success(SessionEventsResponse(
+        events=await EventMapper.events_to_stream_events(page.events),
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+        prev_cursor=page.prev_cursor,
+        has_older=page.has_older,
+    ))
+
 @router.delete("/{session_id}", response_model=APIResponse[None])
 async def delete_session(
     session_id: str,
@@ -271,6 +304,7 @@ async def unshare_session(
 @router.get("/shared/{session_id}", response_model=APIResponse[SharedSessionResponse])
 async def get_shared_session(
     session_id: str,
+    limit: int = Query(EVENT_PAGE_SIZE, ge=1, le=MAX_EVENT_PAGE_SIZE),
     agent_service: AgentService = Depends(get_agent_service)
 ) -> APIResponse[SharedSessionResponse]:
     """Get a shared session without authentication
@@ -281,11 +315,38 @@ async def get_shared_session(
     session = await agent_service.get_shared_session(session_id)
     if not session:
         raise NotFoundError("Shared session not found")
+    page = await agent_service.get_shared_session_events_before(session_id, limit=limit)
     
     return APIResponse.success(SharedSessionResponse(
         session_id=session.id,
         title=session.title,
         status=session.status,
-        events=await EventMapper.events_to_stream_events(session.events),
+        events=await EventMapper.events_to_stream_events(page.events),
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+        prev_cursor=page.prev_cursor,
+        has_older=page.has_older,
         is_shared=session.is_shared
+    ))
+
+
+@router.get("/shared/{session_id}/events", response_model=APIResponse[SessionEventsResponse])
+async def get_shared_session_events(
+    session_id: str,
+    cursor: Optional[int] = Query(None, ge=0),
+    before: Optional[int] = Query(None, ge=1),
+    limit: int = Query(EVENT_PAGE_SIZE, ge=1, le=MAX_EVENT_PAGE_SIZE),
+    agent_service: AgentService = Depends(get_agent_service)
+) -> APIResponse[SessionEventsResponse]:
+    """Get events of a shared session after ``cursor`` or preceding ``before``, without authentication"""
+    if before is not None:
+        page = await agent_service.get_shared_session_events_before(session_id, before, limit)
+    else:
+        page = await agent_service.get_shared_session_events(session_id, cursor, limit)
+    return APIResponse.success(SessionEventsResponse(
+        events=await EventMapper.events_to_stream_events(page.events),
+        next_cursor=page.next_cursor,
+        has_more=page.has_more,
+        prev_cursor=page.prev_cursor,
+        has_older=page.has_older,
     ))
\ No newline at end of file
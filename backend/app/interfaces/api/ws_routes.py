@@ -11,17 +11,14 @@ import websockets
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from app.domain.models.file import FileInfo
+from app.domain.models.session import SessionSummary
 from app.interfaces.dependencies import (
     resolve_ws_user,
     get_agent_service,
 )
 from app.interfaces.schemas.event import EventMapper
 from app.interfaces.schemas.session import ListSessionItem
-from app.infrastructure.storage.redis import get_redis
-from app.infrastructure.external.session_list import (
-    channel_for_user,
-    parse_notify_payload,
-)
+from app.infrastructure.external.session_list import get_session_list_hub
 
 logger = logging.getLogger(__name__)
 
@@ -70,16 +67,8 @@ def _final_agent_status(
     return _agent_status_from_session(session_status)
 
 
-def _events_after(events: list[Any], last_event_id: Optional[str]) -> list[Any]:
-    """Return domain events strictly after last_event_id (Mongo catch-up)."""
-    if not events:
-        return []
-    if not last_event_id:
-        return list(events)
-    idx = next((i for i, e in enumerate(events) if getattr(e, "id", None) == last_event_id), None)
-    if idx is None:
-        return list(events)
-    return list(events[idx + 1 :])
+# Page size for Mongo catch-up on join; replay is streamed page by page.
+CATCH_UP_PAGE_SIZE = 200
 
 
 @router.websocket("/sessions")
@@ -103,13 +92,10 @@ async def sessions_list_ws(websocket: WebSocket):
     await websocket.accept()
     agent_service = get_agent_service()
 
-    redis = get_redis()
-    await redis.initialize()
-    channel = channel_for_user(user.id)
-    pubsub = redis.client.pubsub()
-    await pubsub.subscribe(channel)
+    hub = get_session_list_hub()
+    notifications = await hub.subscribe(user.id)
 
-    try:
+    async def send_snapshot() -> None:
         summaries = await agent_service.get_all_sessions(user.id)
         await websocket.send_json({
             "op": "snapshot",
@@ -119,28 +105,31 @@ async def sessions_list_ws(websocket: WebSocket):
             ],
         })
 
+    try:
+        await send_snapshot()
+
         while True:
-            message = await pubsub.get_message(
-                ignore_subscribe_messages=True,
-                timeout=SESSION_LIST_KEEPALIVE_SECONDS,
-            )
-            if message is None:
+            try:
+                payload = await asyncio.wait_for(
+                    notifications.get(),
+                    timeout=SESSION_LIST_KEEPALIVE_SECONDS,
+                )
+            except asyncio.TimeoutError:
                 await websocket.send_json({"op": "ping"})
                 continue
-            if message.get("type") != "message":
-                continue
-            raw = message.get("data", "")
-            if isinstance(raw, (bytes, bytearray)):
-                raw = raw.decode("utf-8", errors="replace")
-            payload = parse_notify_payload(raw)
-            if not payload:
-                continue
             op = payload["op"]
+            if op == "resync":
+                await send_snapshot()
+                continue
             session_id = payload["session_id"]
             if op == "remove":
                 await websocket.send_json({"op": "remove", "session_id": session_id})
                 continue
-            summary = await agent_service.get_session_summary(session_id, user.id)
+            if payload.get("session"):
+                summary = SessionSummary.model_validate(payload["session"])
+            else:
+                # Published without a summary (older backend during a rollout)
+                summary = await agent_service.get_session_summary(session_id, user.id)
             if summary:
                 await websocket.send_json({
                     "op": "upsert",
@@ -155,11 +144,7 @@ async def sessions_list_ws(websocket: WebSocket):
         except Exception:
             pass
     finally:
-        try:
-            await pubsub.unsubscribe(channel)
-            await pubsub.aclose()
-        except Exception:
-            logger.debug("Failed to close session list pubsub", exc_info=True)
+        hub.unsubscribe(user.id, notifications)
 
 
 @router.websocket("/chat")
@@ -397,10 +382,15 @@ async def chat_ws(websocket: WebSocket):
                     )
                 else:
                     if last_event_id:
-                        for event in _events_after(session.events or [], last_event_id):
+                        async for page in agent_service.get_session_events_after(
+                            session_id, last_event_id, CATCH_UP_PAGE_SIZE
+                        ):
+                            for event in page.events:
+                                if joined_session_id != session_id:
+                                    break
+                                await send_agent_event(session_id, event)
                             if joined_session_id != session_id:
                                 break
-                            await send_agent_event(session_id, event)
                     await send_status_update(session_id, agent_status)
 
             elif msg_type == "leave_session":
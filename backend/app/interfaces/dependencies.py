@@ -25,6 +25,7 @@ from app.infrastructure.external.session_auth import RedisSessionStore
 from app.domain.external.task import Task
 from app.domain.services.agent_task_runner import AgentTaskRunnerFactory
 from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+from app.infrastructure.external.sandbox.sandbox_pool import get_sandbox_pool
 from app.infrastructure.external.task.redis_task import RedisStreamTask
 from app.infrastructure.repositories.mongo_agent_repository import MongoAgentRepository
 from app.infrastructure.repositories.mongo_session_repository import MongoSessionRepository
@@ -33,6 +34,7 @@ from app.infrastructure.repositories.user_repository import MongoUserRepository
 from app.application.services.project_service import ProjectService
 from app.infrastructure.repositories.mongo_project_repository import MongoProjectRepository
 from app.infrastructure.repositories.mongo_file_favorite_repository import MongoFileFavoriteRepository
+from app.infrastructure.repositories.mongo_library_file_repository import MongoLibraryFileRepository
 
 
 # Configure logging
@@ -68,6 +70,7 @@ def get_agent_service() -> AgentService:
     agent_repository = MongoAgentRepository()
     session_repository = MongoSessionRepository()
     sandbox_cls = DockerSandbox
+    sandbox_pool = get_sandbox_pool()
     task_cls = _get_task_cls()
     file_storage = get_file_storage()
     search_engine = get_search_engine()
@@ -86,6 +89,7 @@ def get_agent_service() -> AgentService:
         llm=llm,
         search_engine=search_engine,
         project_repository=MongoProjectRepository(),
+        sandbox_pool=sandbox_pool,
     ))
     
     # Create AgentService instance
@@ -99,6 +103,8 @@ def get_agent_service() -> AgentService:
         mcp_repository=mcp_repository,
         llm=llm,
         file_favorite_repository=MongoFileFavoriteRepository(),
+        sandbox_pool=sandbox_pool,
+        library_file_repository=MongoLibraryFileRepository(),
     )
 
 
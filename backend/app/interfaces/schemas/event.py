@@ -95,7 +95,8 @@ class ToolStreamEvent(BaseStreamEvent):
         content = event.tool_content
         if isinstance(content, BrowserToolContent):
             from app.interfaces.dependencies import get_file_service
-            content = BrowserToolContent(screenshot=await get_file_service().create_signed_url(content.screenshot))
+            if content.screenshot:
+                content = BrowserToolContent(screenshot=await get_file_service().create_signed_url(content.screenshot))
         return cls(
             data=ToolEventData(
                 **BaseEventData.base_event_data(event),
@@ -119,6 +120,8 @@ class WaitStreamEvent(BaseStreamEvent):
 class TerminalUpdateEventData(BaseEventData):
     shell_id: str
     output: Any = None
+    start: int = 0
+    offset: int = 0
     description: Optional[str] = None
 
 
@@ -129,8 +132,10 @@ class TerminalUpdateStreamEvent(BaseStreamEvent):
 
 class FileUpdateEventData(BaseEventData):
     path: str
-    content: str = ""
-    old_content: Optional[str] = None
+    content: Optional[str] = None
+    diff: Optional[str] = None
+    size: Optional[int] = None
+    sha256: Optional[str] = None
     file: Optional[FileInfoResponse] = None
 
 
@@ -148,7 +153,9 @@ class FileUpdateStreamEvent(BaseStreamEvent):
                 **BaseEventData.base_event_data(event),
                 path=event.path,
                 content=event.content,
-                old_content=event.old_content,
+                diff=event.diff,
+                size=event.size,
+                sha256=event.sha256,
                 file=file_resp,
             )
         )
@@ -20,6 +20,10 @@ class GetSessionResponse(BaseModel):
     title: Optional[str] = None
     status: SessionStatus
     events: List[AgentStreamEvent] = []
+    next_cursor: Optional[int] = None
+    has_more: bool = False
+    prev_cursor: Optional[int] = None
+    has_older: bool = False
     is_shared: bool = False
     is_favorite: bool = False
     is_pinned: bool = False
@@ -27,6 +31,15 @@ class GetSessionResponse(BaseModel):
     task_mode: TaskMode = TaskMode.AGENT
 
 
+class SessionEventsResponse(BaseModel):
+    """Session event page response schema"""
+    events: List[AgentStreamEvent] = []
+    next_cursor: Optional[int] = None
+    has_more: bool = False
+    prev_cursor: Optional[int] = None
+    has_older: bool = False
+
+
 class ListSessionItem(BaseModel):
     """List session item schema"""
     session_id: str
@@ -146,6 +159,8 @@ class LibraryFileItem(BaseModel):
 
 class LibraryResponse(BaseModel):
     files: List[LibraryFileItem]
+    # Pass back as ``cursor`` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
 
 
 class ShareSessionResponse(BaseModel):
@@ -160,4 +175,8 @@ class SharedSessionResponse(BaseModel):
     title: Optional[str] = None
     status: SessionStatus
     events: List[AgentStreamEvent] = []
+    next_cursor: Optional[int] = None
+    has_more: bool = False
+    prev_cursor: Optional[int] = None
+    has_older: bool = False
     is_shared: bool
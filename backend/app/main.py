@@ -8,15 +8,23 @@ from app.core.config import get_settings
 from app.infrastructure.storage.mongodb import get_mongodb
 from app.infrastructure.storage.redis import get_redis
 from app.interfaces.dependencies import get_agent_service
+from app.infrastructure.external.sandbox.sandbox_pool import get_sandbox_pool
+from app.infrastructure.external.task.retention import get_task_key_sweeper
+from app.infrastructure.external.session_list import get_session_list_hub, get_session_list_notifier
+from app.domain.services.tools.mcp import get_mcp_client_manager
+from app.infrastructure.external.sandbox.sandbox_transport import get_sandbox_transport
 from app.interfaces.api.routes import router
 from app.infrastructure.logging import setup_logging
 from app.interfaces.errors.exception_handlers import register_exception_handlers
 from app.infrastructure.models.documents import (
     AgentDocument,
+    AgentMemoryEntryDocument,
     SessionDocument,
+    SessionEventDocument,
     UserDocument,
     ProjectDocument,
     FileFavoriteDocument,
+    LibraryFileDocument,
 )
 from beanie import init_beanie
 
@@ -42,22 +50,40 @@ async def lifespan(app: FastAPI):
         database=get_mongodb().client[settings.mongodb_database],
         document_models=[
             AgentDocument,
+            AgentMemoryEntryDocument,
             SessionDocument,
+            SessionEventDocument,
             UserDocument,
             ProjectDocument,
             FileFavoriteDocument,
+            LibraryFileDocument,
         ]
     )
     logger.info("Successfully initialized Beanie")
     
     # Initialize Redis
     await get_redis().initialize()
+
+    # Start cleaning up task keys left behind in Redis
+    task_key_sweeper = get_task_key_sweeper()
+    if task_key_sweeper:
+        await task_key_sweeper.start()
+
+    # Start warming sandboxes for new sessions
+    sandbox_pool = get_sandbox_pool()
+    if sandbox_pool:
+        await sandbox_pool.start()
     
     try:
         yield
     finally:
         # Code executed on shutdown
         logger.info("Application shutdown - Manus AI Agent terminating")
+        if task_key_sweeper:
+            await task_key_sweeper.shutdown()
+        await get_session_list_hub().shutdown()
+        # Publish session list updates still waiting for their debounce window
+        await get_session_list_notifier().flush()
         # Disconnect from MongoDB
         await get_mongodb().shutdown()
         # Disconnect from Redis
@@ -72,6 +98,10 @@ async def lifespan(app: FastAPI):
             logger.warning("AgentService shutdown timed out after 30 seconds")
         except Exception as e:
             logger.error(f"Error during AgentService cleanup: {str(e)}")
+        # Close pooled MCP sessions and stdio servers once no task uses them
+        await get_mcp_client_manager().shutdown()
+        # Close sandbox connections left open by sandboxes still in use
+        await get_sandbox_transport().shutdown()
 
 app = FastAPI(title="Manus AI Agent", lifespan=lifespan)
 
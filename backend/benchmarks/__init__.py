@@ -0,0 +1,6 @@
+"""Load and latency benchmarks for the agent pipeline.
+
+Run from the backend directory, e.g.::
+
+    python -m benchmarks.chat_pipeline --sessions 50 --turns 2 --output result.json
+"""
@@ -0,0 +1,344 @@
+"""End-to-end load and latency benchmark for AgentService.chat.
+
+Drives many concurrent sessions through the real chat pipeline
+(AgentService -> AgentDomainService -> task backend -> AgentTaskRunner ->
+PlanActFlow) with a deterministic mock LLM and a fake sandbox, and reports
+throughput, event delivery latency, datastore operations per turn and RSS
+growth as JSON.
+
+Backends:
+    memory  In-memory repositories and streams (no services needed); Mongo
+            and Redis operations are counted per repository / queue call.
+    local   The real Mongo repositories and Redis streams from the app
+            settings (MONGODB_URI, REDIS_HOST, ...); operations are counted
+            from the actual commands sent.
+
+Usage (from the backend directory):
+    python -m benchmarks.chat_pipeline --sessions 50 --turns 2 --output result.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import resource
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from app.domain.models.event import DoneEvent, ErrorEvent, WaitEvent
+from benchmarks.memory_backends import (
+    BenchSandbox,
+    MemoryAgentRepository,
+    MemoryFileStorage,
+    MemoryMCPRepository,
+    MemorySessionRepository,
+    MemoryStreamTask,
+    OpCounter,
+    PolicyLLM,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """Nearest-rank p50/p95/p99 and max, rounded to 0.001"""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+        return round(ordered[index], 3)
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "max": round(ordered[-1], 3)}
+
+
+def rss_mb() -> float:
+    """Current resident set size in MiB"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except OSError:
+        # Peak RSS; KiB on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _MemoryPipeline:
+    def __init__(self, ops: OpCounter) -> None:
+        self.ops = ops
+        self.put_times: Dict[str, float] = {}
+        MemoryStreamTask.ops = ops
+        MemoryStreamTask.put_times = self.put_times
+        self.task_cls = MemoryStreamTask
+        self.agent_repository = MemoryAgentRepository(ops)
+        self.session_repository = MemorySessionRepository(ops)
+        self.file_storage = MemoryFileStorage(ops)
+
+    def delivery_ms(self, event_id: str, received: float) -> Optional[float]:
+        put = self.put_times.pop(event_id, None)
+        return (received - put) * 1000 if put is not None else None
+
+    async def close(self) -> None:
+        pass
+
+
+class _LocalPipeline:
+    """Real Mongo repositories and Redis streams, with command counting"""
+
+    def __init__(self, ops: OpCounter) -> None:
+        self.ops = ops
+
+    async def open(self) -> None:
+        from beanie import init_beanie
+        from pymongo import monitoring
+
+        from app.core.config import get_settings
+        from app.infrastructure.external.file.gridfsfile import GridFSFileStorage
+        from app.infrastructure.external.task.redis_task import RedisStreamTask
+        from app.infrastructure.models.documents import (
+            AgentDocument,
+            AgentMemoryEntryDocument,
+            FileFavoriteDocument,
+            LibraryFileDocument,
+            ProjectDocument,
+            SessionDocument,
+            SessionEventDocument,
+            UserDocument,
+        )
+        from app.infrastructure.repositories.mongo_agent_repository import MongoAgentRepository
+        from app.infrastructure.repositories.mongo_session_repository import MongoSessionRepository
+        from app.infrastructure.storage.mongodb import get_mongodb
+        from app.infrastructure.storage.redis import get_redis
+
+        ops = self.ops
+
+        class _MongoCommands(monitoring.CommandListener):
+            def started(self, event):
+                ops.add("mongo")
+
+            def succeeded(self, event):
+                pass
+
+            def failed(self, event):
+                pass
+
+        # Must be registered before the client is created
+        monitoring.register(_MongoCommands())
+        settings = get_settings()
+        mongodb = get_mongodb()
+        await mongodb.initialize()
+        await init_beanie(
+            database=mongodb.client[settings.mongodb_database],
+            document_models=[
+                AgentDocument,
+                AgentMemoryEntryDocument,
+                SessionDocument,
+                SessionEventDocument,
+                UserDocument,
+                ProjectDocument,
+                FileFavoriteDocument,
+                LibraryFileDocument,
+            ],
+        )
+        redis = get_redis()
+        await redis.initialize()
+        execute_command = redis.client.execute_command
+
+        async def counted_execute_command(*args, **kwargs):
+            ops.add("redis")
+            return await execute_command(*args, **kwargs)
+
+        redis.client.execute_command = counted_execute_command
+
+        self.task_cls = RedisStreamTask
+        self.agent_repository = MongoAgentRepository()
+        self.session_repository = MongoSessionRepository()
+        self.file_storage = GridFSFileStorage(mongodb=mongodb)
+
+    def delivery_ms(self, event_id: str, received: float) -> Optional[float]:
+        # Redis stream IDs start with the server's wall-clock milliseconds
+        try:
+            return time.time() * 1000 - int(event_id.split("-")[0])
+        except (AttributeError, ValueError):
+            return None
+
+    async def close(self) -> None:
+        from app.infrastructure.storage.mongodb import get_mongodb
+        from app.infrastructure.storage.redis import get_redis
+
+        await get_mongodb().shutdown()
+        await get_redis().shutdown()
+
+
+async def run_benchmark(
+    sessions: int = 20,
+    turns: int = 2,
+    concurrency: Optional[int] = None,
+    steps: int = 2,
+    work_calls: int = 2,
+    llm_latency_ms: float = 20.0,
+    sandbox_latency_ms: float = 5.0,
+    backend: str = "memory",
+) -> Dict[str, Any]:
+    """Run the chat pipeline benchmark and return the results
+
+    Args:
+        sessions: Number of sessions, each chatting for ``turns`` turns
+        turns: User messages sent per session, one after another
+        concurrency: Sessions in flight at once, defaults to all of them
+        steps: Plan steps per turn
+        work_calls: Work tool calls (file_write / shell_exec) per step
+        llm_latency_ms: Simulated latency of every LLM call
+        sandbox_latency_ms: Simulated latency of every sandbox call
+        backend: "memory" or "local", see the module docstring
+    """
+    # Settings are read when agents are created; no real key is needed
+    os.environ.setdefault("API_KEY", "benchmark")
+
+    from app.application.services.agent_service import AgentService
+    from app.domain.services.agent_task_runner import AgentTaskRunnerFactory
+    from app.infrastructure.external.task.redis_task import RedisStreamTask
+
+    ops = OpCounter()
+    if backend == "memory":
+        pipeline = _MemoryPipeline(ops)
+    elif backend == "local":
+        pipeline = _LocalPipeline(ops)
+        await pipeline.open()
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    BenchSandbox.latency = sandbox_latency_ms / 1000
+    llm = PolicyLLM(steps=steps, work_calls=work_calls, latency=llm_latency_ms / 1000)
+    mcp_repository = MemoryMCPRepository()
+    # RedisStreamTask.run looks the factory up on RedisStreamTask itself
+    RedisStreamTask.set_runner_factory(AgentTaskRunnerFactory(
+        agent_repository=pipeline.agent_repository,
+        session_repository=pipeline.session_repository,
+        sandbox_cls=BenchSandbox,
+        file_storage=pipeline.file_storage,
+        mcp_repository=mcp_repository,
+        llm=llm,
+    ))
+    service = AgentService(
+        agent_repository=pipeline.agent_repository,
+        session_repository=pipeline.session_repository,
+        sandbox_cls=BenchSandbox,
+        task_cls=pipeline.task_cls,
+        file_storage=pipeline.file_storage,
+        mcp_repository=mcp_repository,
+        llm=llm,
+    )
+
+    delivery_ms: List[float] = []
+    turn_ms: List[float] = []
+    counts = {"events": 0, "turns": 0, "errors": 0}
+    limit = asyncio.Semaphore(concurrency or sessions)
+
+    async def run_session(index: int) -> None:
+        user_id = f"bench-user-{index}"
+        async with limit:
+            session = await service.create_session(user_id)
+            for turn in range(turns):
+                started = time.perf_counter()
+                finished = False
+                async for event in service.chat(session.id, user_id, f"Benchmark request {turn + 1}"):
+                    received = time.perf_counter()
+                    counts["events"] += 1
+                    latency = pipeline.delivery_ms(event.id, received) if event.id else None
+                    if latency is not None:
+                        delivery_ms.append(latency)
+                    if isinstance(event, ErrorEvent):
+                        counts["errors"] += 1
+                        logger.warning(f"Session {session.id} turn {turn + 1} failed: {event.error}")
+                    finished = finished or isinstance(event, (DoneEvent, WaitEvent))
+                if not finished:
+                    counts["errors"] += 1
+                turn_ms.append((time.perf_counter() - started) * 1000)
+                counts["turns"] += 1
+
+    rss_start = rss_mb()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(run_session(i) for i in range(sessions)))
+        duration = time.perf_counter() - started
+        rss_end = rss_mb()
+        await service.shutdown()
+    finally:
+        await pipeline.close()
+
+    total_ops = ops.snapshot()
+    return {
+        "benchmark": "chat_pipeline",
+        "backend": backend,
+        "config": {
+            "sessions": sessions,
+            "turns": turns,
+            "concurrency": concurrency or sessions,
+            "steps": steps,
+            "work_calls": work_calls,
+            "llm_latency_ms": llm_latency_ms,
+            "sandbox_latency_ms": sandbox_latency_ms,
+        },
+        "turns": counts["turns"],
+        "events": counts["events"],
+        "errors": counts["errors"],
+        "llm_calls": llm.calls,
+        "duration_s": round(duration, 3),
+        "events_per_sec": round(counts["events"] / duration, 1) if duration else None,
+        "event_delivery_latency_ms": percentiles(delivery_ms),
+        "turn_latency_ms": percentiles(turn_ms),
+        "ops_total": total_ops,
+        "ops_per_turn": {
+            kind: round(count / counts["turns"], 1) if counts["turns"] else None
+            for kind, count in total_ops.items()
+        },
+        "rss_mb": {
+            "start": round(rss_start, 1),
+            "end": round(rss_end, 1),
+            "growth": round(rss_end - rss_start, 1),
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sessions", type=int, default=20, help="number of sessions (default: 20)")
+    parser.add_argument("--turns", type=int, default=2, help="turns per session (default: 2)")
+    parser.add_argument("--concurrency", type=int, default=None, help="sessions in flight at once (default: all)")
+    parser.add_argument("--steps", type=int, default=2, help="plan steps per turn (default: 2)")
+    parser.add_argument("--work-calls", type=int, default=2, help="work tool calls per step (default: 2)")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0, help="simulated LLM latency (default: 20)")
+    parser.add_argument("--sandbox-latency-ms", type=float, default=5.0, help="simulated sandbox latency (default: 5)")
+    parser.add_argument("--backend", choices=["memory", "local"], default="memory", help="storage backend (default: memory)")
+    parser.add_argument("--output", help="write the JSON result to this file instead of stdout")
+    parser.add_argument("--log-level", default="WARNING", help="log level of the app loggers (default: WARNING)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(name)s [%(levelname)s]: %(message)s")
+    result = asyncio.run(run_benchmark(
+        sessions=args.sessions,
+        turns=args.turns,
+        concurrency=args.concurrency,
+        steps=args.steps,
+        work_calls=args.work_calls,
+        llm_latency_ms=args.llm_latency_ms,
+        sandbox_latency_ms=args.sandbox_latency_ms,
+        backend=args.backend,
+    ))
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,445 @@
+"""In-memory stand-ins for the storage, queue, sandbox and LLM ports.
+
+They let the benchmark drive the real AgentService / AgentDomainService /
+AgentTaskRunner / PlanActFlow pipeline without Mongo, Redis, Docker or a
+model provider. Every call is counted in an :class:`OpCounter` so the
+benchmark can report datastore operations per turn: each repository call
+counts as one Mongo operation and each queue call as one Redis round trip,
+like the matching ``RedisStreamQueue`` method.
+"""
+import asyncio
+import io
+import itertools
+import time
+import uuid
+from collections import Counter
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from app.domain.models.agent import Agent
+from app.domain.models.event import BaseEvent, BrowserToolContent
+from app.domain.models.file import FileInfo
+from app.domain.models.mcp_config import MCPConfig
+from app.domain.models.memory import Memory
+from app.domain.models.message import LLMMessage, Role, ToolCall
+from app.domain.models.session import Session, SessionEventPage, SessionStatus
+from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.task.redis_task import RedisStreamTask
+
+
+class OpCounter:
+    """Counts datastore operations by kind ("mongo", "redis")"""
+
+    def __init__(self) -> None:
+        self._counts: Counter = Counter()
+
+    def add(self, kind: str, count: int = 1) -> None:
+        self._counts[kind] += count
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"mongo": self._counts["mongo"], "redis": self._counts["redis"]}
+
+
+# Globally unique, increasing stream IDs so delivery times can be looked up
+# by event ID alone
+_stream_ids = itertools.count(1)
+
+
+class MemoryStreamQueue:
+    """In-memory message queue with Redis Stream semantics"""
+
+    def __init__(self, name: str, ops: OpCounter, put_times: Dict[str, float]) -> None:
+        self._name = name
+        self._ops = ops
+        self._put_times = put_times
+        self._messages: List[Tuple[str, Any]] = []
+        self._changed = asyncio.Condition()
+
+    def _count(self, method: str) -> None:
+        self._ops.add("redis")
+
+    @staticmethod
+    def _seq(message_id: Optional[str]) -> int:
+        return int(message_id.split("-")[0]) if message_id else 0
+
+    async def put(self, message: Any) -> str:
+        self._count("put")
+        message_id = f"{next(_stream_ids)}-0"
+        self._put_times[message_id] = time.perf_counter()
+        async with self._changed:
+            self._messages.append((message_id, message))
+            self._changed.notify_all()
+        return message_id
+
+    def _after(self, start_id: Optional[str], count: int) -> List[Tuple[str, Any]]:
+        start = self._seq(start_id)
+        return [m for m in self._messages if self._seq(m[0]) > start][:count]
+
+    async def get_batch(self, start_id: Optional[str] = None, count: int = 100, block_ms: Optional[int] = None) -> List[Tuple[str, Any]]:
+        self._count("get_batch")
+        batch = self._after(start_id, count)
+        if batch or not block_ms:
+            return batch
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(lambda: self._after(start_id, 1)),
+                    timeout=block_ms / 1000,
+                )
+            except asyncio.TimeoutError:
+                return []
+        return self._after(start_id, count)
+
+    async def get(self, start_id: Optional[str] = None, block_ms: Optional[int] = None) -> Tuple[str, Any]:
+        batch = await self.get_batch(start_id, 1, block_ms)
+        return batch[0] if batch else (None, None)
+
+    async def pop(self, block_ms: Optional[int] = None) -> Tuple[str, Any]:
+        self._count("pop")
+        if not self._messages:
+            return None, None
+        return self._messages.pop(0)
+
+    async def ack(self, message_id: str) -> None:
+        self._count("ack")
+
+    async def clear(self) -> None:
+        self._count("clear")
+        self._messages.clear()
+
+    async def is_empty(self) -> bool:
+        self._count("is_empty")
+        return not self._messages
+
+    async def expire(self, seconds: int) -> None:
+        self._count("expire")
+
+    async def size(self) -> int:
+        self._count("size")
+        return len(self._messages)
+
+    async def delete_message(self, message_id: str) -> bool:
+        self._count("delete_message")
+        before = len(self._messages)
+        self._messages = [m for m in self._messages if m[0] != message_id]
+        return len(self._messages) < before
+
+
+class MemoryStreamTask(RedisStreamTask):
+    """The in-process task backend with its streams kept in memory.
+
+    Reuses RedisStreamTask's execution, registry and end-marker handling, so
+    only the stream transport differs from the local backend.
+    """
+
+    ops: OpCounter = OpCounter()
+    put_times: Dict[str, float] = {}
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__(params)
+        self._input_stream = MemoryStreamQueue(f"task:input:{self._id}", self.ops, self.put_times)
+        self._output_stream = MemoryStreamQueue(f"task:output:{self._id}", self.ops, self.put_times)
+
+
+class MemorySessionRepository:
+    """In-memory SessionRepository"""
+
+    def __init__(self, ops: OpCounter) -> None:
+        self._ops = ops
+        self._sessions: Dict[str, Session] = {}
+        self._events: Dict[str, List[BaseEvent]] = {}
+
+    def _get(self, session_id: str) -> Session:
+        self._ops.add("mongo")
+        session = self._sessions.get(session_id)
+        if not session:
+            raise ValueError(f"Session {session_id} not found")
+        return session
+
+    async def save(self, session: Session) -> None:
+        self._ops.add("mongo")
+        self._sessions[session.id] = session.model_copy(deep=True)
+
+    async def find_by_id(self, session_id: str) -> Optional[Session]:
+        self._ops.add("mongo")
+        session = self._sessions.get(session_id)
+        return session.model_copy(deep=True) if session else None
+
+    async def find_by_id_and_user_id(self, session_id: str, user_id: str) -> Optional[Session]:
+        session = await self.find_by_id(session_id)
+        return session if session and session.user_id == user_id else None
+
+    async def update_title(self, session_id: str, title: str) -> None:
+        self._get(session_id).title = title
+
+    async def update_latest_message(self, session_id: str, message: str, timestamp) -> None:
+        session = self._get(session_id)
+        session.latest_message = message
+        session.latest_message_at = timestamp
+
+    async def add_event(self, session_id: str, event: BaseEvent) -> None:
+        self._get(session_id)
+        self._events.setdefault(session_id, []).append(event)
+
+    async def get_events(self, session_id: str, cursor: Optional[int] = None, limit: Optional[int] = None) -> SessionEventPage:
+        self._ops.add("mongo")
+        events = self._events.get(session_id, [])[cursor or 0:]
+        if limit:
+            events = events[:limit]
+        return SessionEventPage(events=events, next_cursor=(cursor or 0) + len(events))
+
+    async def get_events_before(self, session_id: str, before: Optional[int] = None, limit: Optional[int] = None) -> SessionEventPage:
+        self._ops.add("mongo")
+        events = self._events.get(session_id, [])
+        end = len(events) if before is None else max(before - 1, 0)
+        start = max(end - limit, 0) if limit else 0
+        return SessionEventPage(
+            events=events[start:end],
+            next_cursor=end if end > start else None,
+            prev_cursor=start + 1 if end > start else before,
+            has_older=start > 0,
+        )
+
+    async def add_file(self, session_id: str, file_info: FileInfo) -> None:
+        self._get(session_id).files.append(file_info)
+
+    async def remove_file(self, session_id: str, file_id: str, file_path: Optional[str] = None) -> None:
+        session = self._get(session_id)
+        session.files = [
+            f for f in session.files
+            if f.file_id != file_id or (file_path is not None and f.file_path != file_path)
+        ]
+
+    async def get_file_by_path(self, session_id: str, file_path: str) -> Optional[FileInfo]:
+        return next((f for f in self._get(session_id).files if f.file_path == file_path), None)
+
+    async def add_screenshot(self, session_id: str, file_id: str, keep: int) -> List[str]:
+        session = self._get(session_id)
+        frames = session.screenshots + [file_id]
+        session.screenshots = frames[-keep:]
+        return frames[:-keep]
+
+    async def clear_screenshots(self, session_id: str, file_ids: List[str]) -> None:
+        kept = set(self._get(session_id).screenshots)
+        file_ids = [file_id for file_id in file_ids if file_id not in kept]
+        for event in self._events.get(session_id, []):
+            content = getattr(event, "tool_content", None)
+            if isinstance(content, BrowserToolContent) and content.screenshot in file_ids:
+                content.screenshot = None
+
+    async def update_status(self, session_id: str, status: SessionStatus) -> None:
+        self._get(session_id).status = status
+
+    async def update_unread_message_count(self, session_id: str, count: int) -> None:
+        self._get(session_id).unread_message_count = count
+
+    async def increment_unread_message_count(self, session_id: str) -> None:
+        self._get(session_id).unread_message_count += 1
+
+
+class MemoryAgentRepository:
+    """In-memory AgentRepository"""
+
+    def __init__(self, ops: OpCounter) -> None:
+        self._ops = ops
+        self._agents: Dict[str, Agent] = {}
+        self._memories: Dict[Tuple[str, str], Memory] = {}
+
+    async def save(self, agent: Agent) -> None:
+        self._ops.add("mongo")
+        self._agents[agent.id] = agent
+
+    async def find_by_id(self, agent_id: str) -> Optional[Agent]:
+        self._ops.add("mongo")
+        return self._agents.get(agent_id)
+
+    async def add_memory(self, agent_id: str, name: str, memory: Memory) -> None:
+        await self.save_memory(agent_id, name, memory)
+
+    async def get_memory(self, agent_id: str, name: str) -> Memory:
+        self._ops.add("mongo")
+        return self._memories.setdefault((agent_id, name), Memory())
+
+    async def save_memory(self, agent_id: str, name: str, memory: Memory) -> None:
+        self._ops.add("mongo")
+        memory.mark_saved()
+        self._memories[(agent_id, name)] = memory
+
+
+class MemoryMCPRepository:
+    async def get_mcp_config(self) -> MCPConfig:
+        return MCPConfig()
+
+
+class MemoryFileStorage:
+    """In-memory FileStorage; uploads count as Mongo (GridFS) operations"""
+
+    def __init__(self, ops: OpCounter) -> None:
+        self._ops = ops
+        self._files: Dict[str, Tuple[bytes, FileInfo]] = {}
+
+    async def upload_file(self, file_data: BinaryIO, filename: str, user_id: str, content_type=None, metadata=None) -> FileInfo:
+        self._ops.add("mongo")
+        info = FileInfo(file_id=uuid.uuid4().hex, filename=filename, user_id=user_id, metadata=metadata or {})
+        data = file_data.read()
+        info.size = len(data)
+        self._files[info.file_id] = (data, info)
+        return info
+
+    async def download_file(self, file_id: str, user_id: Optional[str] = None) -> Tuple[BinaryIO, FileInfo]:
+        self._ops.add("mongo")
+        data, info = self._files[file_id]
+        return io.BytesIO(data), info
+
+    async def delete_file(self, file_id: str, user_id: str) -> bool:
+        self._ops.add("mongo")
+        return self._files.pop(file_id, None) is not None
+
+    async def get_file_info(self, file_id: str, user_id: Optional[str] = None) -> Optional[FileInfo]:
+        self._ops.add("mongo")
+        entry = self._files.get(file_id)
+        return entry[1] if entry else None
+
+
+class BenchBrowser:
+    async def screenshot(self, full_page: Optional[bool] = False) -> bytes:
+        return b""
+
+
+class BenchSandbox:
+    """Sandbox whose tool calls succeed after a fixed simulated latency"""
+
+    latency: float = 0.0
+    _registry: Dict[str, "BenchSandbox"] = {}
+
+    def __init__(self) -> None:
+        self._id = uuid.uuid4().hex[:12]
+        self._files: Dict[str, str] = {}
+        self._consoles: Dict[str, List[Dict[str, Any]]] = {}
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @classmethod
+    async def create(cls) -> "BenchSandbox":
+        sandbox = cls()
+        cls._registry[sandbox.id] = sandbox
+        return sandbox
+
+    @classmethod
+    async def get(cls, id: str) -> Optional["BenchSandbox"]:
+        return cls._registry.get(id)
+
+    async def _work(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def ensure_sandbox(self) -> None:
+        pass
+
+    async def get_browser(self) -> BenchBrowser:
+        return BenchBrowser()
+
+    async def destroy(self) -> bool:
+        self._registry.pop(self._id, None)
+        return True
+
+    async def exec_command(self, session_id: str, exec_dir: str, command: str) -> ToolResult:
+        await self._work()
+        console = self._consoles.setdefault(session_id, [])
+        console.append({"ps1": f"ubuntu@sandbox:{exec_dir} $", "command": command, "output": "ok"})
+        return ToolResult(success=True, data={"status": "completed", "output": "ok"})
+
+    async def view_shell(
+        self, session_id: str, console: bool = False, console_cursor: Optional[str] = None
+    ) -> ToolResult:
+        await self._work()
+        entries = self._consoles.get(session_id, [])
+        data: Dict[str, Any] = {"output": entries[-1]["output"] if entries else ""}
+        if console:
+            data["console"] = list(entries)
+        return ToolResult(success=True, data=data)
+
+    async def file_write(self, file: str, content: str, append: bool = False, **kwargs: Any) -> ToolResult:
+        await self._work()
+        self._files[file] = (self._files.get(file, "") if append else "") + content
+        return ToolResult(success=True, message="File written")
+
+    async def file_read(self, file: str, **kwargs: Any) -> ToolResult:
+        await self._work()
+        if file not in self._files:
+            return ToolResult(success=False, message=f"File not found: {file}")
+        return ToolResult(success=True, data={"content": self._files[file], "file": file})
+
+    async def file_download(self, path: str) -> BinaryIO:
+        await self._work()
+        return io.BytesIO(self._files.get(path, "").encode())
+
+    async def file_upload(self, file_data: BinaryIO, path: str, filename: Optional[str] = None) -> ToolResult:
+        await self._work()
+        self._files[path] = file_data.read().decode(errors="replace")
+        return ToolResult(success=True)
+
+
+class PolicyLLM:
+    """Deterministic stand-in for a model, driven by the tools it is offered.
+
+    Stateless, so one instance serves any number of concurrent sessions:
+    the planner gets a fixed plan, each step runs ``work_calls`` alternating
+    file_write / shell_exec calls before complete_step, and the final
+    summary is delivered with deliver_result.
+    """
+
+    def __init__(self, steps: int = 2, work_calls: int = 2, latency: float = 0.0) -> None:
+        self._steps = steps
+        self._work_calls = work_calls
+        self._latency = latency
+        self.calls = 0
+
+    @staticmethod
+    def _tool_names(tools: Optional[List[Dict[str, Any]]]) -> List[str]:
+        names = []
+        for tool in tools or []:
+            name = (tool.get("function") or {}).get("name") or tool.get("name")
+            if name:
+                names.append(name)
+        return names
+
+    @staticmethod
+    def _call(name: str, args: Dict[str, Any]) -> LLMMessage:
+        return LLMMessage.assistant(tool_calls=[ToolCall(id=f"call_{uuid.uuid4().hex[:8]}", name=name, args=args)])
+
+    def _work_done(self, messages: List[LLMMessage]) -> int:
+        """Work tool results since the current step started"""
+        done = 0
+        for message in reversed(messages):
+            if message.role == Role.USER:
+                break
+            if message.role == Role.TOOL and message.name in ("file_write", "shell_exec"):
+                done += 1
+        return done
+
+    async def ask(self, messages, tools=None, response_format=None, tool_choice=None) -> LLMMessage:
+        self.calls += 1
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        names = self._tool_names(tools)
+
+        if "create_plan" in names:
+            return self._call("create_plan", {
+                "message": "Working on it.",
+                "language": "en",
+                "title": "Benchmark task",
+                "goal": "Exercise the agent pipeline",
+                "steps": [{"id": str(i + 1), "description": f"Step {i + 1}"} for i in range(self._steps)],
+            })
+        if "complete_step" in names:
+            done = self._work_done(list(messages))
+            if done >= self._work_calls:
+                return self._call("complete_step", {"success": True, "result": "Step finished", "attachments": []})
+            if done % 2 == 0:
+                return self._call("file_write", {"file": "/home/ubuntu/notes.md", "content": f"line {done}\n", "append": True})
+            return self._call("shell_exec", {"id": "main", "exec_dir": "/home/ubuntu", "command": "cat notes.md"})
+        if "deliver_result" in names:
+            return self._call("deliver_result", {"message": "All done.", "attachments": []})
+        return LLMMessage.assistant(content="All done.")
@@ -0,0 +1,170 @@
+"""Per-request auth resolution cost.
+
+A session token is validated and renewed in one Redis round trip, and the
+user behind it is served from a short-lived in-process cache that is
+dropped whenever the user is updated.
+"""
+from datetime import datetime, timedelta, UTC
+
+import fakeredis
+import pytest
+
+from app.application.services.auth_service import AuthService
+from app.domain.models.auth_session import AuthClientType, AuthSession
+from app.domain.models.user import User
+from app.infrastructure.external.session_auth import redis_session_store
+from app.infrastructure.external.session_auth.redis_session_store import RedisSessionStore
+
+
+@pytest.fixture(autouse=True)
+def _api_key(monkeypatch):
+    monkeypatch.setenv("API_KEY", "test")
+
+
+class CountingRedis:
+    def __init__(self) -> None:
+        self.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        self.commands = []
+        execute_command = self.client.execute_command
+
+        async def counted(*args, **kwargs):
+            self.commands.append(args[0])
+            return await execute_command(*args, **kwargs)
+
+        self.client.execute_command = counted
+
+    async def initialize(self) -> None:
+        pass
+
+
+@pytest.fixture
+def store(monkeypatch):
+    redis = CountingRedis()
+    monkeypatch.setattr(redis_session_store, "get_redis", lambda: redis)
+    return RedisSessionStore()
+
+
+def _session(client: AuthClientType = AuthClientType.WEB) -> AuthSession:
+    created = datetime.now(UTC) - timedelta(hours=1)
+    return AuthSession(
+        session_id="sid",
+        user_id="u1",
+        client=client,
+        created_at=created,
+        expires_at=created + timedelta(seconds=60),
+        last_seen_at=created,
+    )
+
+
+async def test_touch_validates_and_renews_in_one_round_trip(store):
+    await store.create(_session(AuthClientType.IOS), ttl_seconds=60)
+    # The first call also loads the script into Redis
+    await store.touch("sid", 60)
+    store._redis.commands.clear()
+
+    ttls = {client: 100 for client in AuthClientType}
+    ttls[AuthClientType.IOS] = 5000
+    session = await store.touch("sid", ttls)
+
+    assert len(store._redis.commands) == 1
+    assert session.user_id == "u1"
+    assert session.last_seen_at > session.created_at + timedelta(minutes=59)
+    assert 4990 <= session.remaining_ttl_seconds() <= 5000
+    assert 4990 <= await store._redis.client.ttl("session:sid") <= 5000
+    assert (await store.get("sid")).expires_at == session.expires_at
+
+
+async def test_touch_script_is_registered_once(store, monkeypatch):
+    registered = []
+    register_script = store._redis.client.register_script
+
+    def counted(script):
+        registered.append(script)
+        return register_script(script)
+
+    monkeypatch.setattr(store._redis.client, "register_script", counted)
+    for _ in range(3):
+        await store.touch("sid", 60)
+    assert len(registered) == 1
+
+
+async def test_touch_missing_or_corrupt_session(store):
+    assert await store.touch("missing", 60) is None
+
+    await store._redis.client.set("session:bad", "not json")
+    assert await store.touch("bad", 60) is None
+    assert not await store._redis.client.exists("session:bad")
+
+
+class FakeSessionStore:
+    def __init__(self, session: AuthSession) -> None:
+        self.session = session
+        self.calls = []
+
+    async def touch(self, session_id, ttl_seconds):
+        self.calls.append("touch")
+        return self.session if session_id == self.session.session_id else None
+
+    async def get(self, session_id):
+        self.calls.append("get")
+        return self.session if session_id == self.session.session_id else None
+
+
+class FakeUserRepository:
+    def __init__(self) -> None:
+        self.user = User(id="u1", fullname="Ada Lovelace", email="ada@example.com", is_active=True)
+        self.lookups = 0
+
+    async def get_user_by_id(self, user_id):
+        self.lookups += 1
+        return self.user.model_copy() if user_id == self.user.id else None
+
+    async def update_user(self, user):
+        self.user = user.model_copy()
+        return user
+
+
+def _service():
+    service = AuthService(
+        user_repository=FakeUserRepository(),
+        token_service=None,
+        session_store=FakeSessionStore(_session()),
+    )
+    service.settings = service.settings.model_copy(
+        update={"auth_provider": "password", "auth_user_cache_ttl": 30}
+    )
+    return service
+
+
+async def test_resolution_is_one_store_call_and_user_is_cached():
+    service = _service()
+
+    for _ in range(3):
+        resolved = await service.resolve_credentials(bearer_token="sid")
+        user = await service.user_from_resolved(resolved)
+        assert user.id == "u1"
+
+    assert service.session_store.calls == ["touch"] * 3
+    assert service.user_repository.lookups == 1
+
+
+async def test_user_update_invalidates_cache():
+    service = _service()
+    resolved = await service.resolve_credentials(bearer_token="sid")
+    await service.user_from_resolved(resolved)
+
+    await service.change_fullname("u1", "Ada King")
+    user = await service.user_from_resolved(resolved)
+
+    assert user.fullname == "Ada King"
+
+
+async def test_cache_can_be_disabled():
+    service = _service()
+    service.settings = service.settings.model_copy(update={"auth_user_cache_ttl": 0})
+    resolved = await service.resolve_credentials(bearer_token="sid")
+
+    await service.user_from_resolved(resolved)
+    await service.user_from_resolved(resolved)
+
+    assert service.user_repository.lookups == 2
@@ -0,0 +1,38 @@
+"""Smoke test for the chat pipeline benchmark harness.
+
+Keeps the harness runnable as the pipeline evolves and checks the shape of
+its JSON result.
+"""
+import json
+
+from benchmarks.chat_pipeline import percentiles, run_benchmark
+
+
+async def test_small_run_reports_metrics():
+    result = await run_benchmark(
+        sessions=3,
+        turns=2,
+        steps=2,
+        work_calls=2,
+        llm_latency_ms=0,
+        sandbox_latency_ms=0,
+    )
+
+    assert result["errors"] == 0
+    assert result["turns"] == 6
+    # create_plan + 2 steps x (2 work calls + complete_step) + deliver_result
+    assert result["llm_calls"] == 6 * 8
+    assert result["events"] > 0
+    assert result["events_per_sec"] > 0
+    assert result["event_delivery_latency_ms"]["p50"] is not None
+    assert result["ops_per_turn"]["mongo"] > 0
+    assert result["ops_per_turn"]["redis"] > 0
+    assert set(result["rss_mb"]) == {"start", "end", "growth"}
+    json.dumps(result)
+
+
+def test_percentiles_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentiles(values) == {"p50": 50, "p95": 95, "p99": 99, "max": 100}
+    assert percentiles([])["p50"] is None
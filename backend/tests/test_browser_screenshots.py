@@ -0,0 +1,176 @@
+"""Browser tool event frames.
+
+A frame is captured only when the page fingerprint changed, is stored as
+a JPEG, and at most a ring of recent frames per session is kept in
+storage. Events showing an evicted frame replay without a screenshot.
+"""
+import io
+from typing import Dict, List, Optional
+
+from benchmarks.memory_backends import MemorySessionRepository, OpCounter
+
+from app.domain.external.file import CONTENT_KIND_KEY
+from app.domain.models.event import BrowserToolContent, ToolEvent, ToolStatus
+from app.domain.models.file import FileInfo
+from app.domain.models.session import Session
+from app.domain.services.browser_screenshots import (
+    BrowserScreenshotRecorder,
+    SCREENSHOT_KIND,
+    SCREENSHOT_QUALITY,
+)
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.fingerprint: Optional[str] = "page-1"
+        self.captures = []
+
+    async def page_fingerprint(self) -> Optional[str]:
+        if self.fingerprint is None:
+            raise RuntimeError("navigating")
+        return self.fingerprint
+
+    async def screenshot(self, full_page: Optional[bool] = False, quality: Optional[int] = None) -> bytes:
+        self.captures.append(quality)
+        return f"frame-{len(self.captures)}".encode()
+
+
+class PageBrowser(FakeBrowser):
+    """Renders the same bytes whenever the same page is shown"""
+
+    async def screenshot(self, full_page: Optional[bool] = False, quality: Optional[int] = None) -> bytes:
+        self.captures.append(quality)
+        return self.fingerprint.encode()
+
+
+class FakeFileStorage:
+    """Shares identical content of one kind, like the real storage"""
+
+    def __init__(self) -> None:
+        self.uploads = []
+        self.kinds = []
+        self.deleted = []
+        self._stored: Dict[tuple, str] = {}
+
+    async def upload_file(self, file_data, filename, user_id, content_type=None, metadata=None) -> FileInfo:
+        content = file_data.read()
+        self.uploads.append((content, filename, content_type))
+        kind = (metadata or {}).get(CONTENT_KIND_KEY)
+        self.kinds.append(kind)
+        file_id = self._stored.setdefault((content, kind), f"f{len(self._stored) + 1}")
+        return FileInfo(file_id=file_id, filename=filename)
+
+    async def delete_file(self, file_id: str, user_id: str) -> bool:
+        self.deleted.append(file_id)
+        return True
+
+
+def _session_repository() -> MemorySessionRepository:
+    repository = MemorySessionRepository(OpCounter())
+    repository._sessions["s1"] = Session(id="s1", user_id="u1", agent_id="a1")
+    return repository
+
+
+def _recorder(browser, storage, repository=None, ring_size: int = 30) -> BrowserScreenshotRecorder:
+    return BrowserScreenshotRecorder(
+        browser, storage, repository or _session_repository(), "s1", "u1", ring_size=ring_size
+    )
+
+
+async def test_unchanged_page_reuses_the_last_frame():
+    browser, storage = FakeBrowser(), FakeFileStorage()
+    recorder = _recorder(browser, storage)
+
+    assert await recorder.capture() == "f1"
+    assert await recorder.capture() == "f1"
+    assert browser.captures == [SCREENSHOT_QUALITY]
+    assert storage.uploads == [(b"frame-1", "screenshot.jpg", "image/jpeg")]
+    assert storage.kinds == [SCREENSHOT_KIND]
+
+    browser.fingerprint = "page-2"
+    assert await recorder.capture() == "f2"
+
+
+async def test_unknown_fingerprint_always_captures():
+    browser, storage = FakeBrowser(), FakeFileStorage()
+    browser.fingerprint = None
+    recorder = _recorder(browser, storage)
+
+    await recorder.capture()
+    await recorder.capture()
+    assert len(browser.captures) == 2
+
+
+async def test_frames_beyond_the_ring_are_released():
+    browser, storage = FakeBrowser(), FakeFileStorage()
+    recorder = _recorder(browser, storage, ring_size=2)
+
+    for i in range(4):
+        browser.fingerprint = f"page-{i}"
+        await recorder.capture()
+    assert storage.deleted == ["f1", "f2"]
+
+
+async def test_ring_spans_the_task_runs_of_a_session():
+    browser, storage = FakeBrowser(), FakeFileStorage()
+    repository = _session_repository()
+
+    # Each task run gets its own recorder
+    for run in range(3):
+        recorder = _recorder(browser, storage, repository, ring_size=2)
+        browser.fingerprint = f"page-{run}"
+        await recorder.capture()
+    assert storage.deleted == ["f1"]
+    assert (await repository.find_by_id("s1")).screenshots == ["f2", "f3"]
+
+
+async def _navigate(recorder, browser, repository, pages) -> List[ToolEvent]:
+    events = []
+    for i, page in enumerate(pages):
+        browser.fingerprint = page
+        event = ToolEvent(
+            tool_call_id=f"c{i}",
+            tool_name="browser",
+            function_name="browser_navigate",
+            function_args={},
+            status=ToolStatus.CALLED,
+            tool_content=BrowserToolContent(screenshot=await recorder.capture()),
+        )
+        await repository.add_event("s1", event)
+        events.append(event)
+    return events
+
+
+async def test_events_of_evicted_frames_drop_the_screenshot():
+    browser, storage = FakeBrowser(), FakeFileStorage()
+    repository = _session_repository()
+    recorder = _recorder(browser, storage, repository, ring_size=1)
+
+    first, second = await _navigate(recorder, browser, repository, ["page-0", "page-1"])
+
+    assert storage.deleted == ["f1"]
+    assert first.tool_content.screenshot is None
+    assert second.tool_content.screenshot == "f2"
+
+
+async def test_frame_still_in_the_ring_keeps_its_events():
+    browser, storage = PageBrowser(), FakeFileStorage()
+    repository = _session_repository()
+    recorder = _recorder(browser, storage, repository, ring_size=2)
+
+    first, _, again = await _navigate(recorder, browser, repository, ["page-a", "page-b", "page-a"])
+    # The older f1 entry left the ring and released its reference, but
+    # the ring still holds f1 through the return to page A
+    assert (await repository.find_by_id("s1")).screenshots == ["f2", "f1"]
+    assert storage.deleted == ["f1"]
+    assert first.tool_content.screenshot == "f1"
+    assert again.tool_content.screenshot == "f1"
+
+
+async def test_frames_never_share_a_user_file():
+    browser, storage = PageBrowser(), FakeFileStorage()
+    user_file = await storage.upload_file(io.BytesIO(b"page-a"), "page.jpg", "u1")
+    recorder = _recorder(browser, storage)
+
+    browser.fingerprint = "page-a"
+    assert await recorder.capture() != user_file.file_id
@@ -0,0 +1,104 @@
+"""Batched output stream consumption in AgentDomainService.chat.
+
+The chat loop reads task events in batches, resets the unread counter once
+per batch rather than per event, and stops on the backend's end marker
+without polling the task state.
+"""
+from typing import Any, List, Optional, Tuple
+
+from app.domain.external.task import OUTPUT_END_MARKER
+from app.domain.models.event import DoneEvent, MessageEvent, StepEvent
+from app.domain.models.plan import Step
+from app.domain.models.session import Session, SessionStatus
+from app.domain.services.agent_domain_service import AgentDomainService
+
+
+class FakeOutputStream:
+    def __init__(self, entries: List[str]) -> None:
+        self.entries = [(f"{i}-0", data) for i, data in enumerate(entries, start=1)]
+        self.reads = 0
+
+    async def get_batch(
+        self, start_id: Optional[str] = None, count: int = 100, block_ms: Optional[int] = None
+    ) -> List[Tuple[str, Any]]:
+        self.reads += 1
+        start = int(start_id.split("-")[0]) if start_id else 0
+        return self.entries[start:start + count]
+
+
+class FakeTask:
+    def __init__(self, entries: List[str]) -> None:
+        self.id = "t1"
+        self.output_stream = FakeOutputStream(entries)
+        self.done_checks = 0
+
+    async def is_done(self) -> bool:
+        self.done_checks += 1
+        return True
+
+
+class FakeSessionRepository:
+    def __init__(self) -> None:
+        self.unread_resets = 0
+
+    async def find_by_id_and_user_id(self, session_id: str, user_id: str) -> Session:
+        return Session(id=session_id, user_id=user_id, agent_id="a1", task_id="t1", status=SessionStatus.RUNNING)
+
+    async def update_unread_message_count(self, session_id: str, count: int) -> None:
+        self.unread_resets += 1
+
+
+def _service(repository: FakeSessionRepository, task: FakeTask) -> AgentDomainService:
+    service = AgentDomainService.__new__(AgentDomainService)
+    service._session_repository = repository
+
+    async def get_task(session):
+        return task
+
+    service._get_task = get_task
+    return service
+
+
+def _step_events(n: int) -> List[str]:
+    return [
+        StepEvent(status="started", step=Step(id=str(i), description=f"step {i}")).model_dump_json()
+        for i in range(n)
+    ]
+
+
+async def _collect(service: AgentDomainService) -> list:
+    return [event async for event in service.chat("s1", "u1")]
+
+
+async def test_events_are_read_in_batches_until_end_marker():
+    entries = _step_events(250) + [MessageEvent(message="hi").model_dump_json(), OUTPUT_END_MARKER]
+    task = FakeTask(entries)
+    repository = FakeSessionRepository()
+
+    events = await _collect(_service(repository, task))
+
+    assert len(events) == 251
+    assert task.output_stream.reads == 3
+    assert task.done_checks == 0
+    # Only the batch that delivered a message and the final reset hit Mongo
+    assert repository.unread_resets <= 2
+
+
+async def test_terminal_event_stops_before_reading_further():
+    entries = _step_events(3) + [DoneEvent().model_dump_json()] + _step_events(3)
+    task = FakeTask(entries)
+
+    events = await _collect(_service(FakeSessionRepository(), task))
+
+    assert isinstance(events[-1], DoneEvent)
+    assert len(events) == 4
+    assert task.output_stream.reads == 1
+
+
+async def test_missing_end_marker_falls_back_to_task_state():
+    task = FakeTask(_step_events(2))
+
+    events = await _collect(_service(FakeSessionRepository(), task))
+
+    assert len(events) == 2
+    assert task.done_checks == 1
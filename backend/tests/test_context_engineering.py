@@ -5,15 +5,18 @@ calling (OutputTool + self-repair), token-aware memory compaction, tool
 result truncation, and the dynamic MCP tool bridge. Pure unit tests — no
 running backend required.
 """
+import asyncio
 import json
 from typing import List, Optional
 
 from pydantic import BaseModel
 
 from app.domain.models.agent_output import PlanOutput, StepReport
-from app.domain.models.memory import Memory, estimate_tokens
+from app.domain.models import memory as memory_module
+from app.domain.models.memory import Memory, estimate_message_tokens, estimate_tokens
 from app.domain.models.message import LLMMessage, Role, ToolCall
 from app.domain.models.tool_result import ToolResult
+from app.domain.models.event import ToolEvent
 from app.domain.services.agents.base import BaseAgent, StructuredOutputEvent
 from app.domain.services.prompts.system import build_system_prompt
 from app.domain.services.tools.base import (
@@ -139,6 +142,30 @@ class TestMemoryCompaction:
         m.compact(max_tokens=before // 2, keep_recent=2)
         assert m.estimate_tokens() <= before // 2
 
+    def test_token_ledger_matches_full_recount(self):
+        m = self._memory_with_tool_results(20)
+        m.compact(max_tokens=m.estimate_tokens() // 2, keep_recent=4)
+        m.roll_back()
+        m.set_system_prompt("a much longer system prompt than before")
+        m.add_messages([LLMMessage.user("more"), LLMMessage.assistant("reply")])
+        assert m.estimate_tokens() == sum(estimate_message_tokens(x) for x in m.messages)
+
+    def test_per_turn_cost_is_flat(self, monkeypatch):
+        # 2,000 synthetic messages; a turn (append + budget check + compact)
+        # must only price the new message, not rescan the history.
+        m = self._memory_with_tool_results(1000, size=40)
+        budget = m.estimate_tokens() * 2
+        calls = []
+        real = memory_module.estimate_message_tokens
+        monkeypatch.setattr(
+            memory_module, "estimate_message_tokens", lambda msg: calls.append(msg) or real(msg)
+        )
+        for i in range(50):
+            m.add_message(LLMMessage.user(f"turn {i}"))
+            assert m.estimate_tokens() <= budget
+            m.compact(max_tokens=budget)
+        assert len(calls) == 50
+
     def test_compact_preserves_message_skeleton(self):
         m = self._memory_with_tool_results(5)
         count = len(m.messages)
@@ -315,6 +342,85 @@ class TestToolResultTruncation:
         assert "truncated" in tool_msg.content
 
 
+class LookupToolkit(BaseToolkit):
+    name = "lookup"
+
+    def __init__(self):
+        super().__init__()
+        self.running = 0
+        self.peak = 0
+        self.order: List[str] = []
+
+    async def _track(self, key: str, delay: float) -> ToolResult:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(delay)
+        self.running -= 1
+        self.order.append(key)
+        return ToolResult(success=True, data=key)
+
+    @tool(parse_docstring=True, parallel_safe=True)
+    async def lookup(self, key: str, delay: float = 0.0) -> ToolResult:
+        """Look a key up.
+
+        Args:
+            key: Key to look up
+            delay: Simulated latency in seconds
+        """
+        return await self._track(key, delay)
+
+    @tool(parse_docstring=True)
+    async def store(self, key: str) -> ToolResult:
+        """Store a key.
+
+        Args:
+            key: Key to store
+        """
+        return await self._track(key, 0.0)
+
+
+class TestParallelToolCalls:
+    async def test_parallel_safe_runs_overlap_and_keep_call_order(self):
+        llm = _ScriptedLLM([
+            LLMMessage.assistant("", tool_calls=[
+                ToolCall(id="c1", name="lookup", args={"key": "a", "delay": 0.05}),
+                ToolCall(id="c2", name="lookup", args={"key": "b"}),
+                ToolCall(id="c3", name="store", args={"key": "c"}),
+                ToolCall(id="c4", name="lookup", args={"key": "d"}),
+            ]),
+            LLMMessage.assistant("done"),
+        ])
+        toolkit = LookupToolkit()
+        agent = _agent(llm, toolkits=[toolkit])
+        events = await _collect(agent.execute("look up"))
+
+        # a and b ran together (b finished first); the store was a barrier
+        assert toolkit.peak == 2
+        assert toolkit.order == ["b", "a", "c", "d"]
+        tool_events = [(e.status.value, e.tool_call_id) for e in events if isinstance(e, ToolEvent)]
+        assert tool_events == [
+            ("calling", "c1"), ("calling", "c2"), ("called", "c1"), ("called", "c2"),
+            ("calling", "c3"), ("called", "c3"), ("calling", "c4"), ("called", "c4"),
+        ]
+        responses = [m.tool_call_id for m in agent.memory.get_messages() if m.role == Role.TOOL]
+        assert responses == ["c1", "c2", "c3", "c4"]
+
+    async def test_concurrency_is_bounded(self):
+        llm = _ScriptedLLM([
+            LLMMessage.assistant("", tool_calls=[
+                ToolCall(id=f"c{i}", name="lookup", args={"key": str(i), "delay": 0.01})
+                for i in range(5)
+            ]),
+            LLMMessage.assistant("done"),
+        ])
+        toolkit = LookupToolkit()
+        agent = _agent(llm, toolkits=[toolkit])
+        agent.max_parallel_tool_calls = 2
+        await _collect(agent.execute("look up"))
+        assert toolkit.peak == 2
+        assert sorted(toolkit.order) == ["0", "1", "2", "3", "4"]
+
+
 class TestDynamicMcpTools:
     def test_mcp_schemas_become_invocable_tools(self):
         from app.domain.services.tools.mcp import MCPToolkit
@@ -335,3 +441,10 @@ class TestDynamicMcpTools:
         assert isinstance(found, Tool)
         assert found.toolkit is toolkit
         assert toolkit.get_tool_schemas()[0]["function"]["name"] == "mcp_server_lookup"
+
+    def test_read_only_mcp_tools_are_parallel_safe(self):
+        from app.domain.services.tools.mcp import MCPToolkit
+
+        schema = {"type": "function", "function": {"name": "mcp_s_get", "parameters": {}}}
+        tools = MCPToolkit()._build_tools([schema, {**schema, "read_only": True}])
+        assert [t.parallel_safe for t in tools] == [False, True]
@@ -128,3 +128,32 @@ class TestTakeBrief:
         brief, args = take_brief({"file": "a.py"})
         assert brief is None
         assert args == {"file": "a.py"}
+
+
+class TestCompiledSchemas:
+    def test_schemas_are_compiled_once(self):
+        tk = SampleToolkit(backend=_FakeBackend())
+        schemas = tk.get_tool_schemas()
+        assert tk.get_tool_schemas() is schemas
+        assert tk.get_tool("do_thing").to_openai_schema() is schemas[0]
+
+    def test_replacing_tools_rebuilds_schemas_and_index(self):
+        tk = SampleToolkit(backend=_FakeBackend())
+        schemas = tk.get_tool_schemas()
+        assert tk.get_tool("do_thing") is not None
+
+        tk.tools = []
+        assert tk.get_tool_schemas() == []
+        assert tk.get_tool_schemas() is not schemas
+        assert tk.get_tool("do_thing") is None
+
+    def test_agent_reuses_schema_list_until_tools_change(self):
+        from app.domain.services.agents.base import BaseAgent
+
+        tk = SampleToolkit(backend=_FakeBackend())
+        agent = BaseAgent(agent_id="a", agent_repository=None, llm=None, tools=[tk])
+        schemas = agent.get_tool_schemas()
+        assert agent.get_tool_schemas() is schemas
+
+        tk.tools = []
+        assert agent.get_tool_schemas() == []
@@ -0,0 +1,321 @@
+"""Content-addressed file sync to GridFS.
+
+Re-syncing an unchanged sandbox file must not upload anything, identical
+content is stored once per user whatever its name or path, and deletes
+only drop content nobody references.
+"""
+import io
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+from bson import ObjectId
+
+from app.domain.external.file import CONTENT_HASH_KEY, CONTENT_KIND_KEY
+from app.domain.models.file import FileInfo
+from app.domain.services.agent_task_runner import AgentTaskRunner
+from app.infrastructure.external.file.gridfsfile import GridFSFileStorage
+
+
+@pytest.fixture(autouse=True)
+def _api_key(monkeypatch):
+    # GridFSFileStorage reads settings, which require an API key
+    monkeypatch.setenv("API_KEY", "test")
+
+
+_MISSING = object()
+
+
+def _get(doc: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return _MISSING
+        doc = doc[part]
+    return doc
+
+
+def _set(doc: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[leaf] = value
+
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+            continue
+        value = _get(doc, key)
+        if isinstance(cond, dict):
+            for op, arg in cond.items():
+                if op == "$exists" and (value is not _MISSING) != arg:
+                    return False
+                if op in ("$gt", "$gte", "$lte") and value is _MISSING:
+                    return False
+                if op == "$gt" and not value > arg:
+                    return False
+                if op == "$gte" and not value >= arg:
+                    return False
+                if op == "$lte" and not value <= arg:
+                    return False
+        elif cond is None:
+            # Like MongoDB, null also matches a missing field
+            if value is not _MISSING and value is not None:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class FakeFilesCollection:
+    """In-memory stand-in for the GridFS ``fs.files`` collection"""
+
+    def __init__(self) -> None:
+        self.docs: List[Dict[str, Any]] = []
+
+    async def create_index(self, keys) -> None:
+        pass
+
+    async def find_one(self, query):
+        return next((d for d in self.docs if _matches(d, query)), None)
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        doc = await self.find_one(query)
+        if doc is None:
+            return None
+        for path, value in update.get("$set", {}).items():
+            _set(doc, path, value)
+        for path, value in update.get("$inc", {}).items():
+            _set(doc, path, _get(doc, path) + value)
+        return doc
+
+    async def update_one(self, query, update):
+        await self.find_one_and_update(query, update)
+
+
+class FakeBucket:
+    def __init__(self, files: FakeFilesCollection) -> None:
+        self.files = files
+        self.uploads = 0
+        self.contents: Dict[ObjectId, bytes] = {}
+
+    async def upload_from_stream(self, filename, source, metadata=None):
+        self.uploads += 1
+        file_id = ObjectId()
+        data = source.read()
+        self.contents[file_id] = data
+        self.files.docs.append({"_id": file_id, "filename": filename, "length": len(data), "metadata": dict(metadata)})
+        return file_id
+
+    async def delete(self, file_id):
+        del self.contents[file_id]
+        self.files.docs = [d for d in self.files.docs if d["_id"] != file_id]
+
+
+def _storage():
+    storage = GridFSFileStorage(mongodb=SimpleNamespace(client=None))
+    files = FakeFilesCollection()
+    bucket = FakeBucket(files)
+    storage._get_files_collection = lambda: files
+    storage._get_gridfs_bucket = lambda: bucket
+    return storage, bucket
+
+
+class _Unseekable(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        self._data = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def read(self, size: int = -1) -> bytes:
+        return self._data.read(size)
+
+
+async def test_identical_content_is_stored_once():
+    storage, bucket = _storage()
+
+    first = await storage.upload_file(io.BytesIO(b"report"), "report.md", "u1")
+    second = await storage.upload_file(io.BytesIO(b"report"), "report.md", "u1")
+    other_user = await storage.upload_file(io.BytesIO(b"report"), "report.md", "u2")
+    changed = await storage.upload_file(io.BytesIO(b"report v2"), "report.md", "u1")
+
+    assert second.file_id == first.file_id
+    assert other_user.file_id != first.file_id
+    assert changed.file_id != first.file_id
+    assert bucket.uploads == 3
+    assert second.metadata["refcount"] == 2
+
+
+async def test_delete_keeps_content_while_referenced():
+    storage, bucket = _storage()
+    first = await storage.upload_file(io.BytesIO(b"data"), "a.txt", "u1")
+    await storage.upload_file(io.BytesIO(b"data"), "a.txt", "u1")
+
+    assert await storage.delete_file(first.file_id, "u1")
+    assert bucket.contents
+
+    assert await storage.delete_file(first.file_id, "u1")
+    assert not bucket.contents
+    assert not await storage.delete_file(first.file_id, "u1")
+
+
+async def test_delete_checks_ownership():
+    storage, bucket = _storage()
+    info = await storage.upload_file(io.BytesIO(b"data"), "a.txt", "u1")
+
+    assert not await storage.delete_file(info.file_id, "u2")
+    assert bucket.contents
+
+
+async def test_legacy_entries_without_refcount_are_deleted():
+    storage, bucket = _storage()
+    info = await storage.upload_file(io.BytesIO(b"data"), "a.txt", "u1")
+    del bucket.files.docs[0]["metadata"]["refcount"]
+
+    assert await storage.delete_file(info.file_id, "u1")
+    assert not bucket.contents
+
+
+async def test_unseekable_stream_is_hashed_while_uploading():
+    storage, bucket = _storage()
+
+    await storage.upload_file(_Unseekable(b"streamed"), "s.bin", "u1")
+    again = await storage.upload_file(io.BytesIO(b"streamed"), "s.bin", "u1")
+
+    assert bucket.uploads == 1
+    assert again.metadata[CONTENT_HASH_KEY] == bucket.files.docs[0]["metadata"][CONTENT_HASH_KEY]
+
+
+class FakeSessionRepository:
+    def __init__(self) -> None:
+        self.files: Dict[str, FileInfo] = {}
+
+    async def get_file_by_path(self, session_id: str, file_path: str) -> Optional[FileInfo]:
+        return self.files.get(file_path)
+
+    async def remove_file(self, session_id: str, file_id: str, file_path: Optional[str] = None) -> None:
+        self.files = {
+            p: f for p, f in self.files.items()
+            if f.file_id != file_id or (file_path is not None and p != file_path)
+        }
+
+    async def add_file(self, session_id: str, file_info: FileInfo) -> None:
+        self.files[file_info.file_path] = file_info
+
+
+class FakeSandbox:
+    def __init__(self) -> None:
+        self.content = b""
+
+    async def file_download(self, path: str):
+        return io.BytesIO(self.content)
+
+    async def file_upload(self, file_data, path: str):
+        self.content = file_data.read()
+        return SimpleNamespace(success=True)
+
+
+def _runner():
+    storage, bucket = _storage()
+    runner = AgentTaskRunner.__new__(AgentTaskRunner)
+    runner._agent_id = "agent"
+    runner._session_id = "session"
+    runner._user_id = "u1"
+    runner._sandbox = FakeSandbox()
+    runner._file_storage = storage
+    runner._session_repository = FakeSessionRepository()
+    return runner, bucket
+
+
+async def test_unchanged_file_sync_is_a_no_op():
+    runner, bucket = _runner()
+    runner._sandbox.content = b"# Report"
+
+    first = await runner._sync_file_to_storage("/home/ubuntu/report.md")
+    second = await runner._sync_file_to_storage("/home/ubuntu/report.md")
+
+    assert bucket.uploads == 1
+    assert second.file_id == first.file_id
+    assert bucket.files.docs[0]["metadata"]["refcount"] == 1
+
+
+async def test_changed_file_is_uploaded_again():
+    runner, bucket = _runner()
+    runner._sandbox.content = b"v1"
+    first = await runner._sync_file_to_storage("/home/ubuntu/a.txt")
+
+    runner._sandbox.content = b"v2"
+    second = await runner._sync_file_to_storage("/home/ubuntu/a.txt")
+
+    assert bucket.uploads == 2
+    assert second.file_id != first.file_id
+    assert runner._session_repository.files["/home/ubuntu/a.txt"].file_id == second.file_id
+    # The previous content is not left behind
+    assert list(bucket.contents.values()) == [b"v2"]
+
+
+async def test_content_is_shared_across_names():
+    storage, bucket = _storage()
+
+    first = await storage.upload_file(io.BytesIO(b"data"), "a.txt", "u1")
+    other = await storage.upload_file(io.BytesIO(b"data"), "b.txt", "u1")
+
+    assert other.file_id == first.file_id
+    assert other.filename == "b.txt"
+    assert bucket.uploads == 1
+
+
+async def test_paths_with_identical_content_share_it():
+    runner, bucket = _runner()
+    runner._sandbox.content = b"# Readme"
+    first = await runner._sync_file_to_storage("/home/ubuntu/a/README.md")
+    second = await runner._sync_file_to_storage("/home/ubuntu/b/README.md")
+    assert second.file_id == first.file_id
+    assert bucket.uploads == 1
+
+    # Re-syncing one path detaches only that path and releases its reference
+    runner._sandbox.content = b"# Readme v2"
+    await runner._sync_file_to_storage("/home/ubuntu/a/README.md")
+
+    files = runner._session_repository.files
+    assert files["/home/ubuntu/b/README.md"].file_id == first.file_id
+    assert files["/home/ubuntu/a/README.md"].file_id != first.file_id
+    shared = next(d for d in bucket.files.docs if str(d["_id"]) == first.file_id)
+    assert shared["metadata"]["refcount"] == 1
+
+
+async def test_attachment_synced_to_the_sandbox_takes_its_own_reference():
+    runner, bucket = _runner()
+    storage = runner._file_storage
+    upload = await storage.upload_file(io.BytesIO(b"notes"), "notes.txt", "u1")
+
+    async def download_file(file_id, user_id=None):
+        return io.BytesIO(bucket.contents[ObjectId(file_id)]), await storage.get_file_info(file_id, user_id)
+    storage.download_file = download_file
+
+    attached = await runner._sync_file_to_sandbox(upload.file_id)
+
+    assert attached.file_id == upload.file_id
+    assert attached.file_path == "/home/ubuntu/upload/notes.txt"
+    assert bucket.uploads == 1
+    assert bucket.files.docs[0]["metadata"]["refcount"] == 2
+
+
+async def test_content_of_another_kind_is_stored_apart():
+    storage, _ = _storage()
+
+    first = await storage.upload_file(io.BytesIO(b"same"), "a.jpg", "u1")
+    frame = await storage.upload_file(
+        io.BytesIO(b"same"), "screenshot.jpg", "u1", metadata={CONTENT_KIND_KEY: "screenshot"}
+    )
+    assert frame.file_id != first.file_id
+    again = await storage.upload_file(
+        io.BytesIO(b"same"), "screenshot.jpg", "u1", metadata={CONTENT_KIND_KEY: "screenshot"}
+    )
+    assert again.file_id == frame.file_id
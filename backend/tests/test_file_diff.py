@@ -0,0 +1,62 @@
+"""Compact file tool payloads.
+
+File events carry a unified diff, size and hash instead of the whole
+file before and after the call; only small bodies are inlined.
+"""
+import hashlib
+import shutil
+import subprocess
+
+import pytest
+
+from app.domain.services import file_diff
+from app.domain.services.file_diff import build_file_tool_content, unified_diff
+
+
+def test_edit_carries_diff_size_and_hash():
+    content = build_file_tool_content("/home/ubuntu/a.py", "x = 2\n", "x = 1\n")
+    assert content.diff == (
+        "--- a/home/ubuntu/a.py\n+++ b/home/ubuntu/a.py\n"
+        "@@ -1 +1 @@\n-x = 1\n+x = 2\n"
+    )
+    assert content.content == "x = 2\n"
+    assert content.old_content is None
+    assert content.size == 6
+    assert content.sha256 == hashlib.sha256(b"x = 2\n").hexdigest()
+
+
+def test_reads_and_new_files_have_no_diff():
+    assert build_file_tool_content("a.txt", "hello").diff is None
+
+
+def test_large_bodies_are_not_inlined(monkeypatch):
+    monkeypatch.setattr(file_diff, "FILE_CONTENT_INLINE_MAX_CHARS", 10)
+    old = "line\n" * 100
+    content = build_file_tool_content("a.txt", old + "tail\n", old)
+    assert content.content is None
+    assert content.size == len(old) + 5
+    # Context lines only, not the whole file
+    assert content.diff.count("\n") < 10
+
+
+def test_oversized_diffs_are_dropped(monkeypatch):
+    monkeypatch.setattr(file_diff, "FILE_DIFF_MAX_CHARS", 10)
+    assert build_file_tool_content("a.txt", "new\n", "old\n").diff is None
+
+
+@pytest.mark.skipif(shutil.which("patch") is None, reason="patch(1) not installed")
+@pytest.mark.parametrize("old, new", [
+    ("a\nb", "a\nb\n"),
+    ("a\r\nb\n", "a\r\nc\n"),
+    ("gone\n", ""),
+    ("", "fresh"),
+])
+def test_diff_applies_with_patch(tmp_path, old, new):
+    target = tmp_path / "f.txt"
+    target.write_bytes(new.encode())
+    # Reverse-apply, as clients rebuilding the original do
+    subprocess.run(
+        ["patch", "-s", "-R", str(target)],
+        input=unified_diff(old, new, "f.txt").encode(), check=True,
+    )
+    assert target.read_bytes() == old.encode()
@@ -0,0 +1,129 @@
+"""Streaming file downloads.
+
+Files are streamed chunk by chunk from storage with Range, ETag and
+If-None-Match support, and sandbox downloads are spooled as they arrive
+instead of being buffered whole.
+"""
+from typing import AsyncIterator, Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.domain.models.file import FileInfo
+from app.infrastructure.external.sandbox import docker_sandbox
+from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+from app.interfaces.api import file_routes
+from app.interfaces.dependencies import get_file_service, get_optional_current_user
+from app.interfaces.errors.exception_handlers import register_exception_handlers
+
+CONTENT = bytes(range(256)) * 40
+
+
+class FakeFileService:
+    def __init__(self) -> None:
+        self.info = FileInfo(
+            file_id="f1",
+            filename="report.pdf",
+            content_type="application/pdf",
+            size=len(CONTENT),
+            metadata={"sha256": "abc"},
+        )
+        self.streamed = []
+
+    async def get_file_info(self, file_id: str, user_id: Optional[str] = None) -> Optional[FileInfo]:
+        return self.info if file_id == "f1" else None
+
+    async def stream_file(self, file_id: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        self.streamed.append((start, end))
+        data = CONTENT[start:end + 1]
+        for i in range(0, len(data), 1000):
+            yield data[i:i + 1000]
+
+
+@pytest.fixture
+def service():
+    return FakeFileService()
+
+
+@pytest.fixture
+def client(service):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(file_routes.router)
+    app.dependency_overrides[get_file_service] = lambda: service
+    app.dependency_overrides[get_optional_current_user] = lambda: None
+    return TestClient(app)
+
+
+def test_full_download_streams_with_validators(client, service):
+    response = client.get("/files/f1/download")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert service.streamed == [(0, len(CONTENT) - 1)]
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=100-199", 100, 199),
+    ("bytes=10000-", 10000, len(CONTENT) - 1),
+    ("bytes=-50", len(CONTENT) - 50, len(CONTENT) - 1),
+    ("bytes=10200-99999", 10200, len(CONTENT) - 1),
+])
+def test_range_returns_partial_content(client, header, start, end):
+    response = client.get("/files/f1/download", headers={"Range": header})
+    assert response.status_code == 206
+    assert response.content == CONTENT[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+
+
+def test_unsatisfiable_and_ignored_ranges(client):
+    response = client.get("/files/f1/download", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+    for header in ("bytes=0-1,5-6", "lines=1-2", "bytes=9-2"):
+        response = client.get("/files/f1/download", headers={"Range": header})
+        assert response.status_code == 200
+
+
+def test_conditional_requests(client, service):
+    response = client.get("/files/f1/download", headers={"If-None-Match": '"abc"'})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # A stale If-Range gets the whole (changed) file
+    response = client.get("/files/f1/download", headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+    assert response.status_code == 200
+    assert len(service.streamed) == 1
+
+
+def test_unknown_file_is_not_found(client):
+    assert client.get("/files/missing/download").status_code == 404
+
+
+async def test_sandbox_download_is_spooled(monkeypatch):
+    monkeypatch.setattr(docker_sandbox, "DOWNLOAD_SPOOL_MAX_MEMORY", 1024)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["path"] == "/tmp/a.bin"
+        return httpx.Response(200, content=CONTENT)
+
+    sandbox = DockerSandbox(ip="127.0.0.1")
+    sandbox.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    stream = await sandbox.file_download("/tmp/a.bin")
+    # Rolled over to a temporary file rather than held in memory
+    assert stream._rolled
+    assert stream.read() == CONTENT
+    stream.seek(0)
+    assert stream.read(3) == CONTENT[:3]
+
+
+async def test_sandbox_download_errors_are_raised():
+    sandbox = DockerSandbox(ip="127.0.0.1")
+    sandbox.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(404)))
+    with pytest.raises(httpx.HTTPStatusError):
+        await sandbox.file_download("/tmp/missing")
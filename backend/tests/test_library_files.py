@@ -0,0 +1,115 @@
+"""Library file listing.
+
+Files attached to sessions are catalogued per user, so a library page is
+read from the catalogue and joined with the titles of just the sessions
+on that page instead of loading every session of the user.
+"""
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import pytest
+from bson import ObjectId
+
+from app.application.errors.exceptions import BadRequestError, NotFoundError
+from app.application.services.agent_service import AgentService
+from app.domain.models.file import LibraryFile, LibraryFilePage
+from app.domain.models.session import SessionSummary
+from app.infrastructure.repositories.mongo_library_file_repository import decode_cursor, encode_cursor
+
+
+class FakeLibraryFileRepository:
+    def __init__(self, files: List[LibraryFile]) -> None:
+        self.files = files
+
+    async def list_files(self, user_id: str, limit: int, cursor: Optional[str] = None) -> LibraryFilePage:
+        if cursor is not None and not cursor.isdigit():
+            raise ValueError(f"Invalid library cursor: {cursor}")
+        start = int(cursor or 0)
+        end = start + limit
+        return LibraryFilePage(
+            files=self.files[start:end],
+            next_cursor=str(end) if end < len(self.files) else None,
+        )
+
+    async def owns_file(self, user_id: str, file_id: str) -> bool:
+        return any(f.file_id == file_id for f in self.files)
+
+
+class FakeSessionRepository:
+    def __init__(self, summaries: List[SessionSummary]) -> None:
+        self.summaries = {s.id: s for s in summaries}
+        self.requested: List[List[str]] = []
+
+    async def find_summaries_by_ids(self, session_ids: List[str]) -> List[SessionSummary]:
+        self.requested.append(session_ids)
+        return [self.summaries[i] for i in session_ids if i in self.summaries]
+
+    async def find_by_user_id(self, user_id: str):
+        raise AssertionError("library must not load every session")
+
+
+class FakeFileFavoriteRepository:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def set_favorite(self, user_id: str, file_id: str, is_favorite: bool) -> None:
+        self.calls.append((file_id, is_favorite))
+
+
+def _service(files: List[LibraryFile], summaries: List[SessionSummary]) -> AgentService:
+    service = AgentService.__new__(AgentService)
+    service._library_file_repository = FakeLibraryFileRepository(files)
+    service._session_repository = FakeSessionRepository(summaries)
+    service._file_favorite_repository = FakeFileFavoriteRepository()
+    return service
+
+
+def _files() -> List[LibraryFile]:
+    return [
+        LibraryFile(session_id="s1", file_id="f1", filename="a.md", is_favorite=True),
+        LibraryFile(session_id="s2", file_id="f2", filename="b.png"),
+        LibraryFile(session_id="s1", file_id="f3", filename="c.txt"),
+    ]
+
+
+async def test_pages_join_titles_of_listed_sessions_only():
+    latest = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    service = _service(_files(), [
+        SessionSummary(id="s1", user_id="u1", title="Report", latest_message_at=latest),
+        SessionSummary(id="s2", user_id="u1", title="Images"),
+    ])
+
+    items, cursor = await service.get_library_files("u1", limit=2)
+    assert [i["file_id"] for i in items] == ["f1", "f2"]
+    assert items[0]["session_title"] == "Report"
+    assert items[0]["latest_message_at"] == int(latest.timestamp())
+    assert items[0]["is_favorite"] is True
+    assert service._session_repository.requested == [["s1", "s2"]]
+
+    items, cursor = await service.get_library_files("u1", limit=2, cursor=cursor)
+    assert [i["file_id"] for i in items] == ["f3"]
+    assert cursor is None
+    assert service._session_repository.requested[-1] == ["s1"]
+
+
+async def test_invalid_cursor_is_a_bad_request():
+    with pytest.raises(BadRequestError):
+        await _service(_files(), []).get_library_files("u1", cursor="bogus")
+
+
+async def test_favorite_requires_a_catalogued_file():
+    service = _service(_files(), [])
+    await service.update_library_file_favorite("f2", "u1", True)
+    assert service._file_favorite_repository.calls == [("f2", True)]
+    with pytest.raises(NotFoundError):
+        await service.update_library_file_favorite("other", "u1", True)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000, tzinfo=timezone.utc)
+    doc_id = ObjectId()
+    # Mongo hands back naive UTC datetimes
+    cursor = encode_cursor(created_at.replace(tzinfo=None), doc_id)
+    assert decode_cursor(cursor) == (created_at, doc_id)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -62,3 +62,45 @@ class TestMemoryOperations:
         m = self._memory()
         m.compact()  # default keep_recent window covers all 4 messages
         assert m.messages[-1].content == "huge page content"
+
+
+class TestMemoryPersistenceTracking:
+    def _saved_memory(self):
+        m = Memory(messages=[LLMMessage.system("sys"), LLMMessage.user("hi")])
+        m.mark_saved()
+        return m
+
+    def test_appends_are_unsaved_until_marked(self):
+        m = self._saved_memory()
+        m.add_message(LLMMessage.assistant("hello"))
+        assert [x.content for x in m.get_unsaved_messages()] == ["hello"]
+        assert m.saved_count == 2 and m.needs_checkpoint is False
+        m.mark_saved()
+        assert m.get_unsaved_messages() == []
+
+    def test_roll_back_of_unsaved_message_needs_no_checkpoint(self):
+        m = self._saved_memory()
+        m.add_message(LLMMessage.assistant("draft"))
+        m.roll_back()
+        assert m.needs_checkpoint is False
+
+    def test_roll_back_of_saved_message_needs_checkpoint(self):
+        m = self._saved_memory()
+        m.roll_back()
+        assert m.needs_checkpoint is True
+
+    def test_system_prompt_refresh(self):
+        m = self._saved_memory()
+        assert m.set_system_prompt("sys") is False
+        assert m.needs_checkpoint is False
+        assert m.set_system_prompt("new sys") is True
+        assert m.messages[0].content == "new sys" and m.needs_checkpoint is True
+
+    def test_elision_needs_checkpoint(self):
+        m = Memory()
+        m.add_message(LLMMessage.tool(tool_call_id="1", name="t", content="big"))
+        m.mark_saved(checkpoint=3)
+        m.compact(keep_recent=0)
+        assert m.needs_checkpoint is True
+        m.mark_saved(checkpoint=4)
+        assert m.checkpoint == 4 and m.needs_checkpoint is False
@@ -0,0 +1,189 @@
+"""Streaming LLM gateway calls and per-call usage metrics.
+
+Both gateways yield text deltas as they arrive, assemble tool calls from
+fragments, and finish with the complete message plus token and latency
+stats. The model side is faked; no network calls are made.
+"""
+from types import SimpleNamespace
+
+from langchain.messages import AIMessageChunk
+from openai.types.chat import ChatCompletionChunk
+
+from app.core.config import Settings
+from app.domain.models.message import LLMMessage, LLMUsage
+from app.infrastructure.external.llm.langchain_llm import LangchainLLM
+from app.infrastructure.external.llm.metrics import LLMMetrics, get_llm_metrics
+from app.infrastructure.external.llm.openai_llm import OpenAILLM
+
+
+def _settings() -> Settings:
+    return Settings(api_key="test", api_base=None, model_name="test-model")
+
+
+def _chunk(delta=None, usage=None) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "c1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "test-model",
+            "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": None}],
+            "usage": usage,
+        }
+    )
+
+
+class _FakeStream:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+def _openai_gateway(chunks) -> OpenAILLM:
+    gw = OpenAILLM(settings=_settings())
+    requests = []
+
+    async def create(**kwargs):
+        requests.append(kwargs)
+        return _FakeStream(chunks)
+
+    gw._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    gw.requests = requests
+    return gw
+
+
+async def _collect(gw):
+    deltas, final = [], None
+    async for chunk in gw.ask_stream([LLMMessage.user("hi")]):
+        if chunk.message is not None:
+            final = chunk
+        else:
+            deltas.append(chunk.delta)
+    return deltas, final
+
+
+class TestOpenAIStream:
+    async def test_text_deltas_and_usage(self):
+        gw = _openai_gateway(
+            [
+                _chunk({"role": "assistant", "content": ""}),
+                _chunk({"content": "Hel"}),
+                _chunk({"content": "lo"}),
+                _chunk(
+                    usage={
+                        "prompt_tokens": 12,
+                        "completion_tokens": 2,
+                        "total_tokens": 14,
+                        "prompt_tokens_details": {"cached_tokens": 8},
+                    }
+                ),
+            ]
+        )
+
+        deltas, final = await _collect(gw)
+
+        assert deltas == ["Hel", "lo"]
+        assert final.message.content == "Hello"
+        assert final.usage.prompt_tokens == 12
+        assert final.usage.completion_tokens == 2
+        assert final.usage.cached_tokens == 8
+        assert final.usage.time_to_first_token_ms is not None
+        assert gw.requests[0]["stream"] is True
+        assert gw.requests[0]["stream_options"] == {"include_usage": True}
+
+    async def test_tool_call_fragments_are_assembled(self):
+        gw = _openai_gateway(
+            [
+                _chunk({"tool_calls": [{"index": 0, "id": "call_1", "type": "function", "function": {"name": "shell_exec", "arguments": ""}}]}),
+                _chunk({"tool_calls": [{"index": 0, "function": {"arguments": '{"command": '}}]}),
+                _chunk({"tool_calls": [{"index": 1, "id": "call_2", "type": "function", "function": {"name": "file_read", "arguments": '{"file": "/a"}'}}]}),
+                _chunk({"tool_calls": [{"index": 0, "function": {"arguments": '"ls"}'}}]}),
+            ]
+        )
+
+        deltas, final = await _collect(gw)
+
+        assert deltas == []
+        calls = [(tc.id, tc.name, tc.args) for tc in final.message.tool_calls]
+        assert calls == [
+            ("call_1", "shell_exec", {"command": "ls"}),
+            ("call_2", "file_read", {"file": "/a"}),
+        ]
+
+
+class _FakeLangchainModel:
+    def __init__(self, chunks):
+        self._chunks = chunks
+
+    async def astream(self, messages):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class TestLangchainStream:
+    async def test_deltas_tool_calls_and_usage(self, monkeypatch):
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        gw = LangchainLLM(settings=_settings())
+        chunks = [
+            AIMessageChunk(content="Working"),
+            AIMessageChunk(
+                content="",
+                tool_call_chunks=[{"name": "shell_exec", "args": '{"command": ', "id": "call_1", "index": 0}],
+            ),
+            AIMessageChunk(
+                content="",
+                tool_call_chunks=[{"name": None, "args": '"ls"}', "id": None, "index": 0}],
+                usage_metadata={
+                    "input_tokens": 20,
+                    "output_tokens": 5,
+                    "total_tokens": 25,
+                    "input_token_details": {"cache_read": 16},
+                },
+            ),
+        ]
+        gw._bind = lambda tools, response_format, tool_choice: _FakeLangchainModel(chunks)
+
+        deltas, final = await _collect(gw)
+
+        assert deltas == ["Working"]
+        assert final.message.content == "Working"
+        assert [(tc.name, tc.args) for tc in final.message.tool_calls] == [("shell_exec", {"command": "ls"})]
+        assert final.usage.prompt_tokens == 20
+        assert final.usage.completion_tokens == 5
+        assert final.usage.cached_tokens == 16
+
+
+class TestMetrics:
+    def test_per_model_totals(self):
+        metrics = LLMMetrics()
+        metrics.record(LLMUsage(model="a", prompt_tokens=10, completion_tokens=50, latency_ms=1000, time_to_first_token_ms=200))
+        metrics.record(LLMUsage(model="a", prompt_tokens=30, completion_tokens=50, cached_tokens=20, latency_ms=1000))
+        metrics.record(LLMUsage(model="b", prompt_tokens=1, completion_tokens=1, latency_ms=10))
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["a"]["calls"] == 2
+        assert snapshot["a"]["prompt_tokens"] == 40
+        assert snapshot["a"]["cached_tokens"] == 20
+        assert snapshot["a"]["avg_latency_ms"] == 1000
+        assert snapshot["a"]["avg_time_to_first_token_ms"] == 200
+        assert snapshot["a"]["tokens_per_second"] == 50
+        assert snapshot["b"]["calls"] == 1
+
+    def test_tokens_per_second_excludes_time_to_first_token(self):
+        usage = LLMUsage(completion_tokens=100, latency_ms=1500, time_to_first_token_ms=500)
+        assert usage.tokens_per_second == 100
+
+    async def test_stream_records_usage(self):
+        get_llm_metrics().reset()
+        gw = _openai_gateway([_chunk({"content": "x"}), _chunk(usage={"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4})])
+
+        await _collect(gw)
+
+        assert get_llm_metrics().snapshot()["test-model"]["prompt_tokens"] == 3
@@ -0,0 +1,138 @@
+"""Process-wide MCP connection pool.
+
+Servers are connected concurrently once and their sessions are reused by
+later agent tasks; tool lists are shared under a TTL and dead connections
+are reopened on next use.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from mcp.types import Tool as MCPTool, ToolAnnotations
+
+from app.domain.models.mcp_config import MCPConfig
+from app.domain.services.tools import mcp
+from app.domain.services.tools.mcp import MCPClientManager, MCPToolkit
+
+
+class FakeSession:
+    def __init__(self, server_name: str) -> None:
+        self.server_name = server_name
+        self.list_calls = 0
+        self.calls = []
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return SimpleNamespace(tools=[
+            MCPTool(name="search", inputSchema={"type": "object"},
+                    annotations=ToolAnnotations(readOnlyHint=True)),
+            MCPTool(name="write", inputSchema={"type": "object"}),
+        ])
+
+    async def call_tool(self, name, arguments):
+        self.calls.append((name, arguments))
+        return SimpleNamespace(content=[SimpleNamespace(text=f"{self.server_name}:{name}")])
+
+    async def send_ping(self):
+        return None
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    servers = SimpleNamespace(opened=[], closed=[])
+
+    async def open_session(stack, server_name, server_config):
+        # Connecting takes a while, so serial connects would add up
+        await asyncio.sleep(0.05)
+        session = FakeSession(server_name)
+        servers.opened.append(session)
+        stack.callback(servers.closed.append, server_name)
+        return session
+
+    monkeypatch.setattr(mcp, "_open_session", open_session)
+    return servers
+
+
+def _config(*names: str, command: str = "server") -> MCPConfig:
+    return MCPConfig(mcpServers={
+        name: {"transport": "stdio", "command": command} for name in names
+    })
+
+
+async def _toolkit(manager: MCPClientManager, config: MCPConfig) -> MCPToolkit:
+    toolkit = MCPToolkit()
+    toolkit.manager = manager
+    servers = await manager.connect(config)
+    toolkit.tools = toolkit._build_tools(await manager.get_all_tools(servers))
+    return toolkit
+
+
+async def test_servers_connect_concurrently_and_are_reused(servers):
+    manager = MCPClientManager()
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    first = await _toolkit(manager, _config("a", "b", "c"))
+    assert loop.time() - started < 0.14
+    assert len(servers.opened) == 3
+
+    second = await _toolkit(manager, _config("a", "b", "c"))
+    assert len(servers.opened) == 3
+    # Tool lists are shared within the TTL
+    assert all(session.list_calls == 1 for session in servers.opened)
+    assert [t.name for t in second.tools] == [t.name for t in first.tools]
+    await manager.shutdown()
+    assert sorted(servers.closed) == ["a", "b", "c"]
+
+
+async def test_tool_calls_are_routed_by_name(servers):
+    manager = MCPClientManager()
+    toolkit = await _toolkit(manager, _config("a", "mcp_b"))
+
+    assert {t.name: t.parallel_safe for t in toolkit.tools} == {
+        "mcp_a_search": True, "mcp_a_write": False,
+        "mcp_b_search": True, "mcp_b_write": False,
+    }
+    result = await toolkit.get_tool("mcp_b_write").invoke({"x": 1})
+    assert result.success and result.data == "mcp_b:write"
+    result = await manager.call_tool("mcp_c_write", {})
+    assert not result.success
+    await manager.shutdown()
+
+
+async def test_dead_and_changed_connections_are_reopened(servers):
+    manager = MCPClientManager()
+    toolkit = await _toolkit(manager, _config("a"))
+
+    connection = manager._connections["a"]
+    connection._task.cancel()
+    await asyncio.gather(connection._task, return_exceptions=True)
+    assert not connection.alive
+
+    result = await toolkit.get_tool("mcp_a_search").invoke({})
+    assert result.success
+    assert len(servers.opened) == 2
+    # Later calls of the running task still resolve the server's tools
+    result = await toolkit.get_tool("mcp_a_write").invoke({})
+    assert result.success and servers.opened[-1].calls[-1][0] == "write"
+
+    # A changed server configuration replaces the connection; removed
+    # servers are closed
+    await manager.connect(_config("a", command="other"))
+    assert len(servers.opened) == 3
+    assert (await toolkit.get_tool("mcp_a_search").invoke({})).success
+    await manager.connect(_config())
+    assert manager._connections == {}
+    assert servers.closed.count("a") == 3
+    assert not (await toolkit.get_tool("mcp_a_search").invoke({})).success
+
+
+async def test_failed_servers_are_skipped(servers, monkeypatch):
+    async def open_session(stack, server_name, server_config):
+        if server_name == "broken":
+            raise ConnectionError("refused")
+        return FakeSession(server_name)
+
+    monkeypatch.setattr(mcp, "_open_session", open_session)
+    manager = MCPClientManager()
+    assert await manager.connect(_config("ok", "broken")) == ["ok"]
+    await manager.shutdown()
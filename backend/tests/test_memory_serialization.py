@@ -9,6 +9,7 @@ from app.domain.models.memory import Memory
 from app.infrastructure.models.memory_serialization import (
     deserialize_memory,
     serialize_memory,
+    serialize_message,
 )
 
 
@@ -97,3 +98,26 @@ class TestNativeAndRoundTrip:
         assert [x.role for x in restored.messages] == [Role.SYSTEM, Role.ASSISTANT, Role.TOOL]
         assert restored.messages[1].tool_calls[0].args == {"cmd": "ls"}
         assert restored.messages[2].name == "shell_exec"
+
+
+class TestCheckpointAndTail:
+    def test_tail_appended_after_checkpoint(self):
+        raw = {"messages": [{"role": "system", "content": "sys"}], "checkpoint": 2}
+        tail = [serialize_message(LLMMessage.user("hi")), {"type": "ai", "content": "hello"}]
+        m = deserialize_memory(raw, tail)
+        assert [x.role for x in m.messages] == [Role.SYSTEM, Role.USER, Role.ASSISTANT]
+        assert m.checkpoint == 2
+        assert m.saved_count == 3 and m.get_unsaved_messages() == []
+
+    def test_legacy_blob_is_checkpoint_zero(self):
+        m = deserialize_memory({"messages": [{"role": "user", "content": "hi"}]})
+        assert m.checkpoint == 0 and m.saved_count == 1
+
+    def test_tail_without_checkpoint(self):
+        m = deserialize_memory(None, [{"role": "user", "content": "hi"}])
+        assert [x.content for x in m.messages] == ["hi"]
+
+    def test_serialize_records_checkpoint(self):
+        mem = Memory(messages=[LLMMessage.user("hi")])
+        assert serialize_memory(mem)["checkpoint"] == 0
+        assert serialize_memory(mem, checkpoint=5)["checkpoint"] == 5
@@ -0,0 +1,175 @@
+"""Prompt-cache friendly requests.
+
+Consecutive model calls of an agent loop send the same tools and a message
+prefix that is byte-identical to the previous request, so provider prompt
+caches can serve it. Compaction frees budget in batches to keep it that
+way, providers that need explicit cache breakpoints get them, and cache
+reads and writes are recorded per call.
+"""
+import json
+from typing import List
+
+from langchain.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, ToolMessage
+
+from app.core.config import Settings
+from app.domain.models.message import LLMMessage, LLMUsage, ToolCall
+from app.domain.models.memory import Memory
+from app.domain.models.tool_result import ToolResult
+from app.domain.services.agents.base import BaseAgent
+from app.domain.services.tools.base import BaseToolkit, tool
+from app.infrastructure.external.llm.langchain_llm import LangchainLLM
+from app.infrastructure.external.llm.metrics import LLMMetrics
+from app.infrastructure.external.llm.openai_llm import OpenAILLM
+from app.infrastructure.external.llm.prompt_cache import CACHE_CONTROL, add_cache_breakpoints
+
+
+class EchoToolkit(BaseToolkit):
+    name = "echo"
+
+    @tool(parse_docstring=True)
+    async def echo(self, text: str) -> ToolResult:
+        """Echo the given text back.
+
+        Args:
+            text: Text to echo
+        """
+        return ToolResult(success=True, data=text)
+
+
+class _Repository:
+    def __init__(self) -> None:
+        self.memory = Memory()
+
+    async def get_memory(self, agent_id: str, name: str) -> Memory:
+        return self.memory
+
+    async def save_memory(self, agent_id: str, name: str, memory: Memory) -> None:
+        self.memory = memory
+
+
+class _RecordingLLM:
+    """Serializes each request the way the OpenAI gateway sends it."""
+
+    def __init__(self, responses: List[LLMMessage]) -> None:
+        self._responses = list(responses)
+        self.requests: List[List[str]] = []
+        self.tools: List[str] = []
+
+    async def ask(self, messages, tools=None, response_format=None, tool_choice=None):
+        payload = OpenAILLM._to_openai(OpenAILLM.__new__(OpenAILLM), messages)
+        self.requests.append([json.dumps(m) for m in payload])
+        self.tools.append(json.dumps(tools))
+        return self._responses.pop(0)
+
+
+class _Agent(BaseAgent):
+    name = "test"
+
+    def build_system_prompt(self) -> str:
+        return "test system prompt"
+
+
+def _echo_loop(turns: int, size: int = 10) -> List[LLMMessage]:
+    responses = [
+        LLMMessage.assistant("", tool_calls=[ToolCall(id=f"c{i}", name="echo", args={"text": "x" * size})])
+        for i in range(turns)
+    ]
+    return responses + [LLMMessage.assistant("done")]
+
+
+async def _run(llm: _RecordingLLM, max_context_tokens: int = 100000) -> None:
+    agent = _Agent(agent_id="a1", agent_repository=_Repository(), llm=llm, tools=[EchoToolkit()])
+    agent.max_context_tokens = max_context_tokens
+    async for _ in agent.execute("echo"):
+        pass
+
+
+def _rewrites(requests: List[List[str]]) -> int:
+    """Requests that do not extend the previous request's messages"""
+    return sum(
+        1 for previous, current in zip(requests, requests[1:])
+        if current[:len(previous)] != previous
+    )
+
+
+async def test_agent_requests_extend_the_previous_prefix():
+    llm = _RecordingLLM(_echo_loop(5))
+    await _run(llm)
+
+    assert len(llm.requests) == 6
+    assert _rewrites(llm.requests) == 0
+    assert len(set(llm.tools)) == 1
+
+
+async def test_compaction_frees_budget_in_batches():
+    llm = _RecordingLLM(_echo_loop(40, size=400))
+    await _run(llm, max_context_tokens=6000)
+
+    # Compacting just down to the budget rewrote the history on 12 of the
+    # 40 calls
+    assert 0 < _rewrites(llm.requests) <= 3
+
+
+def test_breakpoints_mark_system_prompt_and_history():
+    messages = [
+        SystemMessage("system"),
+        HumanMessage("task"),
+        AIMessage("", tool_calls=[{"name": "echo", "args": {}, "id": "c1", "type": "tool_call"}]),
+        ToolMessage(tool_call_id="c1", content="result"),
+        AIMessage("thinking"),
+    ]
+    marked = add_cache_breakpoints(messages)
+
+    assert marked[0].content == [{"type": "text", "text": "system", "cache_control": CACHE_CONTROL}]
+    assert marked[3].content == [{"type": "text", "text": "result", "cache_control": CACHE_CONTROL}]
+    assert [m.content for m in marked[1:3] + marked[4:]] == ["task", "", "thinking"]
+    # The gateway's own messages are left as they were
+    assert messages[0].content == "system"
+
+
+class _FakeModel:
+    def __init__(self, chunks) -> None:
+        self._chunks = chunks
+        self.inputs = []
+
+    async def astream(self, messages):
+        self.inputs.append(messages)
+        for chunk in self._chunks:
+            yield chunk
+
+
+async def _stream(provider: str, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    gw = LangchainLLM(settings=Settings(api_key="test", model_name="test-model", model_provider=provider))
+    model = _FakeModel([AIMessageChunk(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 100,
+            "output_tokens": 1,
+            "total_tokens": 101,
+            "input_token_details": {"cache_read": 60, "cache_creation": 30},
+        },
+    )])
+    gw._bind = lambda tools, response_format, tool_choice: model
+    chunks = [c async for c in gw.ask_stream([LLMMessage.system("system"), LLMMessage.user("task")])]
+    return model.inputs[0], chunks[-1].usage
+
+
+async def test_breakpoints_only_for_providers_that_need_them(monkeypatch):
+    sent, usage = await _stream("anthropic", monkeypatch)
+    assert sent[0].content[0]["cache_control"] == CACHE_CONTROL
+    assert (usage.cached_tokens, usage.cache_write_tokens) == (60, 30)
+
+    sent, _ = await _stream("openai", monkeypatch)
+    assert [m.content for m in sent] == ["system", "task"]
+
+
+def test_cache_hit_ratio_is_tracked():
+    metrics = LLMMetrics()
+    metrics.record(LLMUsage(model="a", prompt_tokens=100, cached_tokens=0, cache_write_tokens=90))
+    metrics.record(LLMUsage(model="a", prompt_tokens=100, cached_tokens=90))
+
+    snapshot = metrics.snapshot()["a"]
+    assert snapshot["cache_write_tokens"] == 90
+    assert snapshot["cache_hit_ratio"] == 0.45
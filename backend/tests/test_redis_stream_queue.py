@@ -0,0 +1,132 @@
+"""Consumer-group pop/ack on RedisStreamQueue.
+
+pop() must hand each message to one consumer only, ack() must remove it,
+and another consumer must reclaim messages a dead consumer never
+acknowledged. Checking for waiting messages is one round trip, and the
+task runner learns of new input from a blocking read instead of polling.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.infrastructure.external.message_queue import redis_stream_queue
+from app.domain.services.agent_task_runner import AgentTaskRunner
+from app.infrastructure.external.message_queue.redis_stream_queue import RedisStreamQueue
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(redis_stream_queue, "get_redis", lambda: SimpleNamespace(client=client))
+    return client
+
+
+async def test_pop_then_ack_removes_the_message(redis_client):
+    queue = RedisStreamQueue("task:input:1")
+    await queue.put("hello")
+
+    message_id, data = await queue.pop()
+    assert data == "hello"
+    assert await queue.pop() == (None, None)
+
+    await queue.ack(message_id)
+    assert await queue.size() == 0
+    assert await queue.is_empty()
+
+
+async def test_is_empty_ignores_own_pending_message(redis_client):
+    queue = RedisStreamQueue("task:input:1")
+    await queue.put("first")
+    await queue.pop()
+
+    assert await queue.is_empty()
+    await queue.put("second")
+    assert not await queue.is_empty()
+
+
+async def test_each_message_goes_to_one_consumer(redis_client):
+    a = RedisStreamQueue("task:input:1")
+    b = RedisStreamQueue("task:input:1")
+    await a.put("only once")
+
+    results = [await a.pop(), await b.pop()]
+
+    assert sorted(data for _, data in results if data) == ["only once"]
+    assert (None, None) in results
+
+
+async def test_unacknowledged_message_is_reclaimed(redis_client):
+    dead = RedisStreamQueue("task:input:1")
+    await dead.put("orphan")
+    message_id, _ = await dead.pop()
+
+    survivor = RedisStreamQueue("task:input:1", claim_idle_ms=0)
+    claimed_id, data = await survivor.pop()
+
+    assert (claimed_id, data) == (message_id, "orphan")
+    await survivor.ack(claimed_id)
+    assert await survivor.size() == 0
+
+
+async def test_message_pending_on_a_live_consumer_is_not_waiting(redis_client):
+    dead = RedisStreamQueue("task:input:1")
+    await dead.put("orphan")
+    await dead.pop()
+
+    survivor = RedisStreamQueue("task:input:1")
+    # Not reclaimable for claim_idle_ms yet: pop() cannot return it, so a
+    # caller looping until the queue is empty must stop instead of spinning
+    assert await survivor.is_empty()
+    assert await survivor.pop() == (None, None)
+    assert await survivor.is_empty()
+
+    await survivor.put("next")
+    assert not await survivor.is_empty()
+
+
+async def test_message_of_a_dead_consumer_waits_until_reclaimed(redis_client):
+    dead = RedisStreamQueue("task:input:1")
+    await dead.put("orphan")
+    await dead.pop()
+
+    survivor = RedisStreamQueue("task:input:1", claim_idle_ms=0)
+    assert not await survivor.is_empty()
+    message_id, data = await survivor.pop()
+    assert data == "orphan"
+    # Now pending on the survivor itself
+    assert await survivor.is_empty()
+
+
+async def test_is_empty_takes_one_round_trip(redis_client, monkeypatch):
+    queue = RedisStreamQueue("task:input:1", claim_idle_ms=0)
+    await queue.put("hello")
+    await queue._ensure_group()
+
+    executed = []
+    pipeline = redis_client.pipeline
+    monkeypatch.setattr(redis_client, "pipeline", lambda **kwargs: executed.append(kwargs) or pipeline(**kwargs))
+    assert not await queue.is_empty()
+    assert len(executed) == 1
+
+    await queue.clear()
+    assert await queue.is_empty()
+
+
+async def test_input_watcher_wakes_on_new_messages_only(redis_client):
+    queue = RedisStreamQueue("task:input:1")
+    current = await queue.put("current")
+    await queue.pop()
+    task = SimpleNamespace(input_stream=queue)
+
+    arrived = asyncio.Event()
+    watcher = asyncio.create_task(AgentTaskRunner._watch_input(None, task, current, arrived))
+    await asyncio.sleep(0.05)
+    assert not arrived.is_set()
+
+    await queue.put("next")
+    await asyncio.wait_for(watcher, timeout=1)
+    assert arrived.is_set()
+    # Watching does not deliver the message
+    assert (await queue.pop())[1] == "next"
@@ -0,0 +1,114 @@
+"""Warm sandbox pool.
+
+New sessions lease sandboxes that were booted and health-checked ahead of
+time, so container start-up is off the time-to-first-token path.
+"""
+import asyncio
+import time
+
+from app.infrastructure.external.sandbox.sandbox_pool import WarmSandboxPool
+
+BOOT_SECONDS = 0.2
+
+
+class SlowSandbox:
+    """Fake sandbox whose boot and health check take a noticeable time."""
+
+    created = 0
+    destroyed = 0
+
+    def __init__(self, index: int) -> None:
+        self.id = f"sandbox-{index}"
+        self.ready = False
+
+    @classmethod
+    def reset(cls) -> None:
+        cls.created = 0
+        cls.destroyed = 0
+
+    @classmethod
+    async def create(cls) -> "SlowSandbox":
+        cls.created += 1
+        sandbox = cls(cls.created)
+        await asyncio.sleep(BOOT_SECONDS / 2)
+        return sandbox
+
+    async def ensure_sandbox(self) -> None:
+        await asyncio.sleep(BOOT_SECONDS / 2)
+        self.ready = True
+
+    async def destroy(self) -> bool:
+        SlowSandbox.destroyed += 1
+        return True
+
+
+async def _warm(pool: WarmSandboxPool, count: int) -> None:
+    await pool.start()
+    for _ in range(100):
+        if pool.ready_count >= count:
+            return
+        await asyncio.sleep(BOOT_SECONDS / 10)
+    raise AssertionError("pool did not warm up")
+
+
+async def test_lease_from_warm_pool_skips_boot():
+    SlowSandbox.reset()
+    pool = WarmSandboxPool(SlowSandbox, size=2)
+    await _warm(pool, 2)
+
+    started = time.monotonic()
+    sandbox = await pool.acquire()
+    elapsed = time.monotonic() - started
+
+    assert sandbox.ready
+    assert elapsed < BOOT_SECONDS / 4
+    await pool.shutdown()
+
+
+async def test_pool_refills_in_background_after_lease():
+    SlowSandbox.reset()
+    pool = WarmSandboxPool(SlowSandbox, size=2)
+    await _warm(pool, 2)
+
+    await pool.acquire()
+    assert pool.ready_count == 1
+    await _warm(pool, 2)
+
+    assert SlowSandbox.created == 3
+    await pool.shutdown()
+
+
+async def test_empty_pool_boots_on_demand():
+    SlowSandbox.reset()
+    pool = WarmSandboxPool(SlowSandbox, size=1)
+
+    sandbox = await pool.acquire()
+
+    assert sandbox.ready
+    await pool.shutdown()
+    # The background refill was cancelled, never handed out, and cleaned up
+    assert SlowSandbox.destroyed == SlowSandbox.created - 1
+
+
+async def test_idle_sandboxes_expire():
+    SlowSandbox.reset()
+    pool = WarmSandboxPool(SlowSandbox, size=1, max_idle_seconds=0)
+    await _warm(pool, 1)
+    stale_id = pool._ready[0][1].id
+
+    sandbox = await pool.acquire()
+
+    assert sandbox.id != stale_id
+    assert SlowSandbox.destroyed >= 1
+    await pool.shutdown()
+
+
+async def test_shutdown_destroys_unleased_sandboxes():
+    SlowSandbox.reset()
+    pool = WarmSandboxPool(SlowSandbox, size=3)
+    await _warm(pool, 3)
+
+    await pool.shutdown()
+
+    assert SlowSandbox.destroyed == 3
+    assert pool.ready_count == 0
@@ -0,0 +1,71 @@
+"""Shared sandbox transport.
+
+Sandboxes of the same host share one pooled HTTP client that is closed
+once the last of them is destroyed, and each sandbox operation runs under
+the timeout of its class instead of one ten-minute timeout for all.
+"""
+import io
+
+import httpx
+import pytest
+
+from app.infrastructure.external.sandbox import docker_sandbox, sandbox_transport
+from app.infrastructure.external.sandbox.docker_sandbox import DockerSandbox
+from app.infrastructure.external.sandbox.sandbox_transport import (
+    EXEC_TIMEOUT,
+    POLL_TIMEOUT,
+    TRANSFER_TIMEOUT,
+    SandboxTransport,
+)
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    transport = SandboxTransport()
+    monkeypatch.setattr(docker_sandbox, "get_sandbox_transport", lambda: transport)
+    return transport
+
+
+async def test_sandboxes_of_a_host_share_a_client(transport):
+    first = DockerSandbox(ip="10.0.0.2")
+    second = DockerSandbox(ip="10.0.0.2")
+    other = DockerSandbox(ip="10.0.0.3")
+    client, other_client = first.client, other.client
+    assert second.client is client
+    assert other_client is not client
+
+    await first.destroy()
+    await first.destroy()
+    assert not client.is_closed
+
+    await second.destroy()
+    assert client.is_closed
+    assert not other_client.is_closed
+    # Sandboxes used again get a fresh client of the host
+    assert not second.client.is_closed
+
+    await transport.shutdown()
+    assert other_client.is_closed
+
+
+async def test_operations_use_their_timeout_class(transport):
+    timeouts = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        timeouts[request.url.path] = request.extensions["timeout"]
+        return httpx.Response(200, json={"success": True, "data": {}})
+
+    sandbox = DockerSandbox(ip="10.0.0.2")
+    sandbox.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), timeout=POLL_TIMEOUT)
+    await sandbox.view_shell("s1", console=True)
+    await sandbox.exec_command("s1", "/home", "make")
+    await sandbox.file_upload(io.BytesIO(b"x"), "/tmp/x")
+
+    assert timeouts["/api/v1/shell/view"] == POLL_TIMEOUT.as_dict()
+    assert timeouts["/api/v1/shell/exec"] == EXEC_TIMEOUT.as_dict()
+    assert timeouts["/api/v1/file/upload"] == TRANSFER_TIMEOUT.as_dict()
+
+
+def test_http2_needs_the_h2_package(monkeypatch):
+    monkeypatch.setattr(sandbox_transport, "_http2_available", lambda: False)
+    assert SandboxTransport(http2=True)._http2 is False
@@ -0,0 +1,134 @@
+"""Shared TTL cache for web search results.
+
+Repeated and concurrent identical searches should reach the upstream engine
+once; failures are not cached.
+"""
+import asyncio
+from typing import Any, Dict, Optional
+
+import pytest
+
+from app.domain.models.search import SearchResultItem, SearchResults
+from app.domain.models.tool_result import ToolResult
+from app.infrastructure.external.search.cached_search import CachedSearchEngine
+
+
+class CountingEngine:
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def search(self, query: str, date_range: Optional[str] = None) -> ToolResult[SearchResults]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            return ToolResult(success=False, message="upstream down")
+        return ToolResult(
+            success=True,
+            data=SearchResults(
+                query=query,
+                date_range=date_range,
+                total_results=1,
+                results=[SearchResultItem(title="t", link="https://example.com", snippet="s")],
+            ),
+        )
+
+
+class MemoryCache:
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.ttls: Dict[str, Optional[int]] = {}
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        self.values[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.values.get(key)
+
+
+async def test_repeated_query_hits_cache():
+    engine, cache = CountingEngine(), MemoryCache()
+    cached = CachedSearchEngine(engine, cache, ttl=60)
+
+    first = await cached.search("Python asyncio", "past_week")
+    second = await cached.search("  python   ASYNCIO ", "past_week")
+
+    assert engine.calls == 1
+    assert second == first
+    assert second.data.results[0].link == "https://example.com"
+    assert list(cache.ttls.values()) == [60]
+
+
+async def test_date_range_is_part_of_the_key():
+    engine = CountingEngine()
+    cached = CachedSearchEngine(engine, MemoryCache(), ttl=60)
+
+    await cached.search("python", None)
+    await cached.search("python", "past_day")
+
+    assert engine.calls == 2
+
+
+async def test_concurrent_identical_queries_share_one_call():
+    engine = CountingEngine(delay=0.05)
+    cached = CachedSearchEngine(engine, MemoryCache(), ttl=60)
+
+    results = await asyncio.gather(*(cached.search("same query") for _ in range(10)))
+
+    assert engine.calls == 1
+    assert all(r.success for r in results)
+
+
+async def test_failures_are_not_cached():
+    engine, cache = CountingEngine(fail=True), MemoryCache()
+    cached = CachedSearchEngine(engine, cache, ttl=60)
+
+    await cached.search("python")
+    await cached.search("python")
+
+    assert engine.calls == 2
+    assert cache.values == {}
+
+
+async def test_upstream_exception_reaches_every_waiter():
+    class BrokenEngine(CountingEngine):
+        async def search(self, query, date_range=None):
+            self.calls += 1
+            await asyncio.sleep(0.02)
+            raise RuntimeError("boom")
+
+    engine = BrokenEngine()
+    cached = CachedSearchEngine(engine, MemoryCache(), ttl=60)
+
+    results = await asyncio.gather(*(cached.search("q") for _ in range(3)), return_exceptions=True)
+
+    assert engine.calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+async def test_waiters_recover_when_leader_is_cancelled():
+    engine = CountingEngine(delay=0.05)
+    cached = CachedSearchEngine(engine, MemoryCache(), ttl=60)
+
+    leader = asyncio.create_task(cached.search("q"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cached.search("q"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    result = await follower
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert result.success
+    assert engine.calls == 2
+
+
+async def test_providers_do_not_share_entries():
+    cache = MemoryCache()
+    a = CachedSearchEngine(CountingEngine(), cache, ttl=60, namespace="a")
+    b = CachedSearchEngine(CountingEngine(), cache, ttl=60, namespace="b")
+
+    assert a.cache_key("q") != b.cache_key("q")
@@ -0,0 +1,98 @@
+"""Session event history paging.
+
+Events live in their own collection ordered by a per-session sequence; the
+session API and chat WS catch-up read them a page at a time instead of
+loading the whole history with the session. Sessions open on their
+latest page and page back towards older events on demand.
+"""
+from typing import List, Optional
+
+from benchmarks.memory_backends import MemorySessionRepository, OpCounter
+from app.application.services.agent_service import AgentService
+from app.domain.models.event import MessageEvent
+from app.domain.models.plan import Plan
+from app.domain.models.session import Session, SessionEventPage
+
+
+class FakeSessionRepository:
+    def __init__(self, events: List[MessageEvent]) -> None:
+        self.events = events
+        self.page_requests: list[tuple[Optional[int], Optional[int]]] = []
+
+    async def get_events(
+        self, session_id: str, cursor: Optional[int] = None, limit: Optional[int] = None
+    ) -> SessionEventPage:
+        self.page_requests.append((cursor, limit))
+        start = cursor or 0
+        end = start + limit if limit else len(self.events)
+        chunk = self.events[start:end]
+        return SessionEventPage(
+            events=chunk,
+            next_cursor=start + len(chunk) if chunk else cursor,
+            has_more=end < len(self.events),
+        )
+
+    async def get_event_sequence(self, session_id: str, event_id: str) -> Optional[int]:
+        for sequence, event in enumerate(self.events, start=1):
+            if event.id == event_id:
+                return sequence
+        return None
+
+
+def _service(repository: FakeSessionRepository) -> AgentService:
+    service = AgentService.__new__(AgentService)
+    service._session_repository = repository
+    return service
+
+
+def _events(n: int) -> List[MessageEvent]:
+    return [MessageEvent(id=f"e{i}", message=f"m{i}") for i in range(1, n + 1)]
+
+
+async def _replay(service: AgentService, event_id: Optional[str], limit: int) -> List[str]:
+    ids = []
+    async for page in service.get_session_events_after("s1", event_id, limit):
+        ids.extend(event.id for event in page.events)
+    return ids
+
+
+async def test_replay_after_known_event_is_paged():
+    repository = FakeSessionRepository(_events(7))
+    ids = await _replay(_service(repository), "e2", limit=2)
+    assert ids == ["e3", "e4", "e5", "e6", "e7"]
+    assert repository.page_requests == [(2, 2), (4, 2), (6, 2)]
+
+
+async def test_replay_after_unknown_event_replays_everything():
+    repository = FakeSessionRepository(_events(3))
+    assert await _replay(_service(repository), "missing", limit=10) == ["e1", "e2", "e3"]
+
+
+async def test_replay_after_last_event_is_empty():
+    repository = FakeSessionRepository(_events(3))
+    assert await _replay(_service(repository), "e3", limit=10) == []
+
+
+def test_last_plan_is_kept_on_session():
+    plan = Plan(title="t", goal="g", steps=[])
+    session = Session(agent_id="a", user_id="u", last_plan=plan)
+    assert session.get_last_plan() == plan
+    assert Session(agent_id="a", user_id="u").get_last_plan() is None
+
+
+async def test_history_pages_backwards_from_the_latest_events():
+    repository = MemorySessionRepository(OpCounter())
+    repository._sessions["s1"] = Session(id="s1", agent_id="a", user_id="u")
+    for event in _events(5):
+        await repository.add_event("s1", event)
+    service = _service(repository)
+
+    page = await service.get_session_events_before("s1", limit=2)
+    assert [e.id for e in page.events] == ["e4", "e5"]
+    assert (page.prev_cursor, page.has_older) == (4, True)
+
+    page = await service.get_session_events_before("s1", before=page.prev_cursor, limit=2)
+    assert [e.id for e in page.events] == ["e2", "e3"]
+    page = await service.get_session_events_before("s1", before=page.prev_cursor, limit=2)
+    assert [e.id for e in page.events] == ["e1"]
+    assert not page.has_older
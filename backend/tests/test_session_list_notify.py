@@ -0,0 +1,121 @@
+"""Session list notifications.
+
+Bursts of updates to one session are published once with the latest
+summary, and one pub/sub connection per process fans them out to every
+socket of the user.
+"""
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.domain.models.session import SessionSummary
+from app.infrastructure.external.session_list import redis_session_list_notifier, session_list_hub
+from app.infrastructure.external.session_list.redis_session_list_notifier import SessionListNotifier
+from app.infrastructure.external.session_list.session_list_hub import RESYNC, SessionListHub
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        self.pubsubs = 0
+        pubsub = self.client.pubsub
+
+        def counted_pubsub(**kwargs):
+            self.pubsubs += 1
+            return pubsub(**kwargs)
+
+        self.client.pubsub = counted_pubsub
+
+    async def initialize(self) -> None:
+        pass
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(redis_session_list_notifier, "get_redis", lambda: redis)
+    monkeypatch.setattr(session_list_hub, "get_redis", lambda: redis)
+    return redis
+
+
+def _summary(session_id: str = "s1", user_id: str = "u1", **fields) -> SessionSummary:
+    return SessionSummary(id=session_id, user_id=user_id, **fields)
+
+
+async def _drain(queue: asyncio.Queue, timeout: float = 0.5) -> list:
+    items = [await asyncio.wait_for(queue.get(), timeout=timeout)]
+    await asyncio.sleep(0.05)
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+async def test_updates_within_window_are_published_once(redis):
+    hub = SessionListHub()
+    queue = await hub.subscribe("u1")
+    notifier = SessionListNotifier(window=0.05)
+
+    notifier.upsert(_summary(title="draft"))
+    notifier.upsert(_summary(title="final", unread_message_count=2))
+    notifier.upsert(_summary("s2"))
+
+    messages = await _drain(queue)
+    await hub.shutdown()
+
+    assert sorted(m["session_id"] for m in messages) == ["s1", "s2"]
+    s1 = next(m for m in messages if m["session_id"] == "s1")
+    assert s1["session"]["title"] == "final"
+    assert s1["session"]["unread_message_count"] == 2
+
+
+async def test_remove_drops_pending_upsert(redis):
+    hub = SessionListHub()
+    queue = await hub.subscribe("u1")
+    notifier = SessionListNotifier(window=0.05)
+
+    notifier.upsert(_summary())
+    await notifier.remove("u1", "s1")
+
+    messages = await _drain(queue)
+    await hub.shutdown()
+
+    assert messages == [{"op": "remove", "session_id": "s1"}]
+
+
+async def test_hub_fans_out_over_one_connection(redis):
+    hub = SessionListHub()
+    tabs = [await hub.subscribe("u1") for _ in range(3)]
+    other_user = await hub.subscribe("u2")
+    notifier = SessionListNotifier(window=0)
+
+    notifier.upsert(_summary())
+    await notifier.flush()
+
+    for tab in tabs:
+        assert [m["session_id"] for m in await _drain(tab)] == ["s1"]
+    assert other_user.empty()
+    assert redis.pubsubs == 1
+
+    hub.unsubscribe("u1", tabs[0])
+    notifier.upsert(_summary("s2"))
+    await notifier.flush()
+    await _drain(tabs[1])
+    await hub.shutdown()
+
+    assert tabs[0].empty()
+
+
+async def test_slow_socket_is_asked_to_resync(redis, monkeypatch):
+    monkeypatch.setattr(session_list_hub, "SUBSCRIBER_QUEUE_SIZE", 2)
+    hub = SessionListHub()
+    queue = await hub.subscribe("u1")
+    notifier = SessionListNotifier(window=0)
+
+    for i in range(3):
+        notifier.upsert(_summary(f"s{i}"))
+    await notifier.flush()
+    await asyncio.sleep(0.1)
+    await hub.shutdown()
+
+    assert queue.get_nowait() == RESYNC
@@ -0,0 +1,115 @@
+"""Partial session writes.
+
+Saving a loaded session writes only the fields changed since it was
+loaded, so concurrent updates of other fields (title, unread count, ...)
+are not overwritten and no read precedes the write.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.domain.models.session import Session, SessionStatus
+from app.infrastructure.models.documents import SessionDocument
+from app.infrastructure.repositories import mongo_session_repository
+from app.infrastructure.repositories.mongo_session_repository import MongoSessionRepository
+
+
+class FakeCollection:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def update_one(self, query, update, **kwargs):
+        self.calls.append(("update_one", query, update))
+        return SimpleNamespace(matched_count=1, upserted_id=None)
+
+    async def find_one_and_update(self, query, update, **kwargs):
+        self.calls.append(("find_one_and_update", query, update, kwargs.get("projection")))
+        return {"session_id": query["session_id"], "user_id": "u1", **update["$set"]}
+
+    async def find_one(self, query, projection=None):
+        self.calls.append(("find_one", query, projection))
+        return {"files": [{"file_id": "f1", "file_path": "/a.md"}]}
+
+
+class FakeNotifier:
+    def __init__(self) -> None:
+        self.upserts = []
+
+    def upsert(self, summary) -> None:
+        self.upserts.append(summary)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(SessionDocument, "get_pymongo_collection", classmethod(lambda cls: collection))
+    return collection
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    notifier = FakeNotifier()
+    monkeypatch.setattr(mongo_session_repository, "get_session_list_notifier", lambda: notifier)
+    return notifier
+
+
+def _loaded_session() -> Session:
+    session = Session(id="s1", agent_id="a", user_id="u1", title="Report")
+    session.mark_saved()
+    return session
+
+
+def test_changed_fields_are_tracked_from_the_last_save():
+    session = Session(agent_id="a", user_id="u1")
+    assert not session.is_saved
+    assert "agent_id" in session.get_changed_fields()
+
+    session.mark_saved()
+    assert session.get_changed_fields() == {}
+    session.sandbox_id = "sb"
+    session.status = SessionStatus.RUNNING
+    assert session.get_changed_fields() == {"sandbox_id": "sb", "status": SessionStatus.RUNNING}
+
+
+async def test_save_writes_only_changed_fields(collection, notifier):
+    session = _loaded_session()
+    session.task_id = "t1"
+    await MongoSessionRepository().save(session)
+
+    [(op, query, update)] = collection.calls
+    assert op == "update_one" and query == {"session_id": "s1"}
+    assert set(update["$set"]) == {"task_id", "updated_at"}
+    assert notifier.upserts == []
+
+    await MongoSessionRepository().save(session)
+    assert len(collection.calls) == 1
+
+
+async def test_save_of_list_fields_notifies_from_the_stored_document(collection, notifier):
+    session = _loaded_session()
+    session.status = SessionStatus.RUNNING
+    await MongoSessionRepository().save(session)
+
+    [(op, _, update, projection)] = collection.calls
+    assert op == "find_one_and_update"
+    assert set(update["$set"]) == {"status", "updated_at"}
+    assert "files" not in projection
+    assert [s.status for s in notifier.upserts] == [SessionStatus.RUNNING]
+
+
+async def test_saving_a_stored_new_session_keeps_its_owned_lists(collection, notifier):
+    session = Session(id="s1", agent_id="a", user_id="u1", screenshots=["stale"])
+    await MongoSessionRepository().save(session)
+
+    # Already stored: the upsert matched, so the fallback $set follows
+    (_, _, insert), (op, _, update, _) = collection.calls
+    assert "$setOnInsert" in insert and op == "find_one_and_update"
+    assert not {"files", "screenshots", "last_plan"} & set(update["$set"])
+
+
+async def test_file_lookup_projects_only_the_matching_file(collection):
+    file_info = await MongoSessionRepository().get_file_by_path("s1", "/a.md")
+
+    assert file_info.file_id == "f1"
+    [(_, _, projection)] = collection.calls
+    assert projection == {"_id": 0, "files": {"$elemMatch": {"file_path": "/a.md"}}}
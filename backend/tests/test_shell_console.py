@@ -0,0 +1,79 @@
+"""Incremental shell consoles.
+
+Shell consoles are viewed through a cursor, so each poll of a running
+shell fetches and pushes only the output written since the previous one
+while the backend keeps the whole console.
+"""
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.domain.models.tool_result import ToolResult
+from app.domain.services.shell_console import ConsoleDelta, ShellConsoles, apply_console_delta
+
+
+def _record(command: str, output: str) -> Dict[str, Any]:
+    return {"ps1": "$", "command": command, "output": output}
+
+
+class FakeSandbox:
+    def __init__(self, views: List[Dict[str, Any]]) -> None:
+        self.views = views
+        self.cursors: List[Optional[str]] = []
+
+    async def view_shell(self, session_id: str, console: bool = False, console_cursor: Optional[str] = None) -> ToolResult:
+        self.cursors.append(console_cursor)
+        return ToolResult(success=True, data=self.views.pop(0))
+
+
+def test_deltas_splice_into_the_console():
+    console = [_record("ls", "a"), _record("make", "step 1\n")]
+
+    delta = ConsoleDelta(records=[_record("make", "step 2\n"), _record("pwd", "/")], start=1, offset=7)
+    assert apply_console_delta(console, delta) == [
+        _record("ls", "a"), _record("make", "step 1\nstep 2\n"), _record("pwd", "/"),
+    ]
+    assert apply_console_delta(console, ConsoleDelta(records=[_record("pwd", "/")])) == [_record("pwd", "/")]
+    # A delta continuing output the console does not have replaces it
+    delta = ConsoleDelta(records=[_record("make", "x")], start=1, offset=50)
+    assert apply_console_delta(console, delta) == [_record("make", "x")]
+
+
+async def test_refresh_sends_the_cursor_and_keeps_the_full_console():
+    sandbox = FakeSandbox([
+        {"console": [_record("make", "step 1\n")], "console_cursor": "0:7:d1"},
+        {"console": [_record("make", "step 2\n")], "console_start": 0, "console_offset": 7, "console_cursor": "0:14:d2"},
+        {"console": [_record("make", "")], "console_start": 0, "console_offset": 14, "console_cursor": "0:14:d2"},
+    ])
+    consoles = ShellConsoles(sandbox)
+
+    first = await consoles.refresh("s1")
+    assert first.records == [_record("make", "step 1\n")]
+    second = await consoles.refresh("s1")
+    assert (second.records, second.start, second.offset) == ([_record("make", "step 2\n")], 0, 7)
+    assert await consoles.refresh("s1") is None
+
+    assert sandbox.cursors == [None, "0:7:d1", "0:14:d2"]
+    assert consoles.console("s1") == [_record("make", "step 1\nstep 2\n")]
+
+
+async def test_sandboxes_without_cursors_send_whole_consoles():
+    full = {"console": [_record("ls", "a")]}
+    consoles = ShellConsoles(FakeSandbox([full, dict(full), {"console": [_record("ls", "a"), _record("pwd", "/")]}]))
+
+    assert (await consoles.refresh("s1")).records == [_record("ls", "a")]
+    assert await consoles.refresh("s1") is None
+    delta = await consoles.refresh("s1")
+    assert (delta.start, delta.offset) == (0, 0)
+    assert consoles.console("s1") == [_record("ls", "a"), _record("pwd", "/")]
+
+
+async def test_failed_views_leave_the_console_alone():
+    class FailingSandbox(FakeSandbox):
+        async def view_shell(self, *args: Any, **kwargs: Any) -> ToolResult:
+            return ToolResult(success=False, message="Session ID does not exist")
+
+    consoles = ShellConsoles(FailingSandbox([]))
+    with pytest.raises(RuntimeError):
+        await consoles.refresh("s1")
+    assert consoles.console("s1") == []
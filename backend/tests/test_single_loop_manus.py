@@ -79,7 +79,7 @@ class FakeSandbox:
         self.shell_exec_calls += 1
         return ToolResult(success=True, message="Command executed", data={})
 
-    async def view_shell(self, id: str, console: bool = False) -> ToolResult:
+    async def view_shell(self, id: str, console: bool = False, console_cursor: str | None = None) -> ToolResult:
         return ToolResult(success=True, data={"console": []})
 
     async def wait_for_process(self, id: str, seconds: int | None = None) -> ToolResult:
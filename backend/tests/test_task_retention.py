@@ -0,0 +1,76 @@
+"""Bounded retention of task keys in Redis.
+
+Task streams are trimmed on write and expire once their task has ended;
+the sweeper removes metadata, cancel flags and streams nothing will use
+again.
+"""
+import time
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from app.infrastructure.external.message_queue import redis_stream_queue
+from app.infrastructure.external.message_queue.redis_stream_queue import RedisStreamQueue
+from app.infrastructure.external.task import retention
+from app.infrastructure.external.task.retention import TaskKeySweeper, expire_task_streams
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    monkeypatch.setenv("API_KEY", "test")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    redis = SimpleNamespace(client=client)
+    monkeypatch.setattr(redis_stream_queue, "get_redis", lambda: redis)
+    monkeypatch.setattr(retention, "get_redis", lambda: redis)
+    return client
+
+
+async def test_put_trims_the_stream(redis_client):
+    queue = RedisStreamQueue("task:output:1", maxlen=10)
+    for i in range(200):
+        await queue.put(f"event {i}")
+
+    assert await queue.size() < 200
+    assert await queue.get_latest_id() != "0"
+
+
+async def test_finished_task_streams_expire(redis_client):
+    task = SimpleNamespace(
+        id="1",
+        input_stream=RedisStreamQueue("task:input:1"),
+        output_stream=RedisStreamQueue("task:output:1"),
+    )
+    await task.input_stream.put("message")
+    await task.output_stream.put("event")
+
+    await expire_task_streams(task)
+
+    assert await redis_client.ttl("task:input:1") > 0
+    assert await redis_client.ttl("task:output:1") > 0
+
+
+async def test_sweeper_removes_orphaned_meta_and_cancel_flags(redis_client):
+    await redis_client.set("task:meta:live", "{}")
+    await redis_client.xadd("task:output:live", {"data": "event"})
+    await redis_client.set("task:meta:gone", "{}")
+    await redis_client.set("task:cancel:live", "1")
+    await redis_client.set("task:cancel:gone", "1")
+
+    swept = await TaskKeySweeper(interval=60, stream_ttl=3600).sweep()
+
+    assert swept["meta"] == 1 and swept["cancel"] == 1
+    assert await redis_client.exists("task:meta:live", "task:cancel:live") == 2
+    assert await redis_client.exists("task:meta:gone", "task:cancel:gone") == 0
+
+
+async def test_sweeper_expires_idle_streams_without_ttl(redis_client):
+    idle_ms = int((time.time() - 7200) * 1000)
+    await redis_client.xadd("task:output:crashed", {"data": "event"}, id=f"{idle_ms}-0")
+    await redis_client.xadd("task:output:running", {"data": "event"})
+
+    swept = await TaskKeySweeper(interval=60, stream_ttl=3600).sweep()
+
+    assert swept["streams"] == 1
+    assert await redis_client.ttl("task:output:crashed") > 0
+    assert await redis_client.ttl("task:output:running") == -1
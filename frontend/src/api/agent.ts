@@ -2,7 +2,7 @@
 import { apiClient, ApiResponse, BASE_URL } from './client';
 import { AgentEvent } from '../types/event';
 import type { AgentStatus } from '../types/event';
-import { CreateSessionResponse, GetSessionResponse, ShellViewResponse, FileViewResponse, ListSessionResponse, ListSessionItem, ShareSessionResponse, SharedSessionResponse } from '../types/response';
+import { CreateSessionResponse, GetSessionResponse, ShellViewResponse, FileViewResponse, ListSessionResponse, ListSessionItem, ShareSessionResponse, SharedSessionResponse, SessionEventsResponse } from '../types/response';
 import type { FileInfo } from './file';
 
 export type ChatStreamCallbacks = {
@@ -25,6 +25,17 @@ export async function getSession(sessionId: string): Promise<GetSessionResponse>
   return response.data.data;
 }
 
+/**
+ * Get the page of events preceding `before` (a page's prev_cursor).
+ * Sessions open on their latest events; older history is loaded on demand.
+ */
+export async function getSessionEventsBefore(sessionId: string, before: number): Promise<SessionEventsResponse> {
+  const response = await apiClient.get<ApiResponse<SessionEventsResponse>>(`/sessions/${sessionId}/events`, {
+    params: { before },
+  });
+  return response.data.data;
+}
+
 export async function getSessions(): Promise<ListSessionResponse> {
   const response = await apiClient.get<ApiResponse<ListSessionResponse>>('/sessions');
   return response.data.data;
@@ -331,6 +342,22 @@ export async function getSharedSession(sessionId: string): Promise<SharedSession
   return response.data.data;
 }
 
+/** Get the page of a shared session's events preceding `before`. */
+export async function getSharedSessionEventsBefore(sessionId: string, before: number): Promise<SessionEventsResponse> {
+  const response = await apiClient.get<ApiResponse<SessionEventsResponse>>(`/sessions/shared/${sessionId}/events`, {
+    params: { before },
+  });
+  return response.data.data;
+}
+
+/** Get the page of a shared session's events after `cursor` (0 for the first page), for replay. */
+export async function getSharedSessionEventsAfter(sessionId: string, cursor: number): Promise<SessionEventsResponse> {
+  const response = await apiClient.get<ApiResponse<SessionEventsResponse>>(`/sessions/shared/${sessionId}/events`, {
+    params: { cursor },
+  });
+  return response.data.data;
+}
+
 export async function getSharedSessionFiles(sessionId: string): Promise<FileInfo[]> {
   const response = await apiClient.get<ApiResponse<FileInfo[]>>(`/sessions/${sessionId}/share/files`);
   return response.data.data;
@@ -35,8 +35,14 @@ export async function pinProject(projectId: string, isPinned: boolean): Promise<
   return response.data.data;
 }
 
-export async function getLibraryFiles(): Promise<LibraryResponse> {
-  const response = await apiClient.get<ApiResponse<LibraryResponse>>('/library/files');
+/**
+ * Get a page of library files, most recently attached first.
+ * Pass the previous page's next_cursor to continue after it.
+ */
+export async function getLibraryFiles(cursor?: string | null): Promise<LibraryResponse> {
+  const response = await apiClient.get<ApiResponse<LibraryResponse>>('/library/files', {
+    params: cursor ? { cursor } : undefined,
+  });
   return response.data.data;
 }
 
@@ -94,6 +94,36 @@ describe('Computer tool views e2e', () => {
     expect(modified?.attributes('data-state')).toBe('on')
   })
 
+  it('FileToolView rebuilds Original from the event diff', async () => {
+    const wrapper = mount(FileToolView, {
+      global: {
+        plugins: [i18n],
+        stubs: {
+          MonacoEditor: MonacoStub,
+          MonacoDiffEditor: MonacoStub,
+        },
+      },
+      props: {
+        sessionId: 'sess-1',
+        live: false,
+        toolContent: fileTool({
+          content: {
+            content: 'new line\n',
+            diff: '--- a/example.txt\n+++ b/example.txt\n@@ -1 +1 @@\n-old line\n+new line\n',
+            size: 9,
+            sha256: 'abc',
+          },
+        }),
+      },
+    })
+    await flushPromises()
+
+    const original = wrapper.findAll('button').find((b) => b.text() === 'Original')
+    await original?.trigger('click')
+    const editor = wrapper.findComponent(MonacoStub)
+    expect(editor.props('value')).toBe('old line\n')
+  })
+
   it('FileToolView hides tabs when there is no old_content', async () => {
     const wrapper = mount(FileToolView, {
       global: {
@@ -176,3 +176,39 @@ describe('useAgentEvents computer follow', () => {
     expect(activity[0].function).toBe('file_write')
   })
 })
+
+describe('useAgentEvents older history', () => {
+  it('prepends an older page without repeating tools or moving the live state', () => {
+    const messages = ref<Message[]>([])
+    const title = ref('')
+    const plan = ref<PlanEventData | undefined>()
+    const lastEventId = ref<string | undefined>()
+    const lastTool = ref<ToolContent | undefined>()
+    const lastNoMessageTool = ref<ToolContent | undefined>()
+
+    const { handleEvent, prependEvents } = useAgentEvents(
+      { messages, title, plan, lastEventId, lastTool, lastNoMessageTool },
+    )
+
+    // Latest page: the tool finished, then the agent replied
+    handleEvent(makeToolEvent({ tool_call_id: 'tc-1', status: 'called' }))
+    handleEvent({
+      event: 'message',
+      data: { event_id: 'e3', timestamp: 0, content: 'done', role: 'assistant', attachments: [] },
+    } as AgentEvent)
+
+    // Older page: the user asked and the same tool started
+    prependEvents([
+      {
+        event: 'message',
+        data: { event_id: 'e1', timestamp: 0, content: 'hi', role: 'user', attachments: [] },
+      } as AgentEvent,
+      makeToolEvent({ tool_call_id: 'tc-1', status: 'calling' }),
+    ])
+
+    expect(messages.value.map(m => m.type)).toEqual(['user', 'tool', 'assistant'])
+    expect((messages.value[1].content as ToolContent).status).toBe('called')
+    expect(lastEventId.value).toBe('e3')
+    expect(lastTool.value?.tool_call_id).toBe('tc-1')
+  })
+})
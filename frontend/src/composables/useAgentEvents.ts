@@ -1,3 +1,4 @@
+import { ref } from 'vue';
 import type { Ref } from 'vue';
 import {
   Message,
@@ -236,5 +237,52 @@ export function useAgentEvents(state: AgentEventState, options: AgentEventOption
     lastEventId.value = event.data.event_id;
   };
 
-  return { handleEvent };
+  /**
+   * Put an older page of history in front of the messages built so far.
+   * The page is converted on its own, so it does not disturb the live
+   * state (last tool, last event ID); tools already shown from a later
+   * event are not repeated and steps take their status from the latest plan.
+   */
+  const prependEvents = (events: AgentEvent[]) => {
+    const older = {
+      messages: ref<Message[]>([]),
+      title: ref(''),
+      plan: ref<PlanEventData | undefined>(),
+      lastEventId: ref<string | undefined>(),
+      lastTool: ref<ToolContent | undefined>(),
+      lastNoMessageTool: ref<ToolContent | undefined>(),
+    };
+    const { handleEvent: handleOlderEvent } = useAgentEvents(older);
+    events.forEach(handleOlderEvent);
+
+    const shownToolIds = new Set<string>();
+    for (const message of messages.value) {
+      if (message.type === 'tool') {
+        shownToolIds.add((message.content as ToolContent).tool_call_id);
+      } else if (message.type === 'step') {
+        (message.content as StepContent).tools.forEach(tool => shownToolIds.add(tool.tool_call_id));
+      }
+    }
+    const planSteps = new Map((plan.value?.steps ?? []).map(step => [step.id, step.status]));
+    const prepended = older.messages.value.filter(message => {
+      if (message.type === 'tool') {
+        return !shownToolIds.has((message.content as ToolContent).tool_call_id);
+      }
+      if (message.type === 'step') {
+        const step = message.content as StepContent;
+        step.tools = step.tools.filter(tool => !shownToolIds.has(tool.tool_call_id));
+        const status = planSteps.get(step.id);
+        if (status === 'completed' || status === 'failed') {
+          step.status = status;
+        }
+      }
+      return true;
+    });
+    messages.value = [...prepended, ...messages.value];
+    if (!plan.value) {
+      plan.value = older.plan.value;
+    }
+  };
+
+  return { handleEvent, prependEvents };
 }
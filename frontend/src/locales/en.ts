@@ -85,6 +85,7 @@ export default {
   'Others': 'Others',
   'Untitled task': 'Untitled task',
   '{count} more files': '{count} more files',
+  'Load more files': 'Load more files',
   'Library coming soon': 'Library coming soon',
   'Projects coming soon': 'Projects coming soon',
   'More options': 'More options',
@@ -199,7 +200,9 @@ export default {
   'Viewable by yourself only': 'Viewable by yourself only',
   'Copy link': 'Copy link',
   'Link copied': 'Link copied',
+  'Load earlier messages': 'Load earlier messages',
   'Take control': 'Take control',
+  'Screenshot no longer available': 'Screenshot no longer available',
   'View all files in this task': 'View all files in this task',
   'Share privacy tip': "Don't share personal information or third-party content without permission.",
   // Shell tools
@@ -85,6 +85,7 @@ export default {
   'Others': '其他',
   'Untitled task': '未命名任务',
   '{count} more files': '还有 {count} 个文件',
+  'Load more files': '加载更多文件',
   'Library coming soon': '库即将推出',
   'Projects coming soon': '项目功能即将推出',
   'More options': '更多选项',
@@ -199,7 +200,9 @@ export default {
   'Viewable by yourself only': '仅自己可见',
   'Copy link': '复制链接',
   'Link copied': '链接已复制',
+  'Load earlier messages': '加载更早的消息',
   'Take control': '接管',
+  'Screenshot no longer available': '截图已不可用',
   'View all files in this task': '查看此任务中的所有文件',
   'Share privacy tip': '请勿在未获许可的情况下分享个人信息或第三方内容。',
   // Shell tools
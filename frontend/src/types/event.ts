@@ -22,14 +22,22 @@ export interface StatusUpdateEventData extends BaseEventData {
 export interface TerminalUpdateEventData extends BaseEventData {
   shell_id: string;
   output: unknown;
+  /** First console record in `output`; earlier records are unchanged */
+  start?: number;
+  /** Output characters of record `start` that `output[0]` continues */
+  offset?: number;
   description?: string | null;
 }
 
 /** Official text_editor / file panel content push. */
 export interface FileUpdateEventData extends BaseEventData {
   path: string;
-  content: string;
-  old_content?: string | null;
+  /** Omitted for large files; read through viewFile instead */
+  content?: string | null;
+  /** Unified diff against the file before the tool call */
+  diff?: string | null;
+  size?: number | null;
+  sha256?: string | null;
   file?: FileInfo | null;
 }
 
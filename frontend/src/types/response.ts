@@ -16,6 +16,10 @@ export interface GetSessionResponse {
     title: string | null;
     status: SessionStatus;
     events: AgentEvent[];
+    next_cursor: number | null;
+    has_more: boolean;
+    prev_cursor: number | null;
+    has_older: boolean;
     is_shared: boolean;
     is_favorite: boolean;
     is_pinned: boolean;
@@ -70,6 +74,7 @@ export interface LibraryFileItem {
 
 export interface LibraryResponse {
     files: LibraryFileItem[];
+    next_cursor?: string | null;
 }
 
 export interface ConsoleRecord {
@@ -104,6 +109,18 @@ export interface SharedSessionResponse {
     title: string | null;
     status: SessionStatus;
     events: AgentEvent[];
+    next_cursor: number | null;
+    has_more: boolean;
+    prev_cursor: number | null;
+    has_older: boolean;
     is_shared: boolean;
 }
+
+export interface SessionEventsResponse {
+    events: AgentEvent[];
+    next_cursor: number | null;
+    has_more: boolean;
+    prev_cursor: number | null;
+    has_older: boolean;
+}
   
\ No newline at end of file
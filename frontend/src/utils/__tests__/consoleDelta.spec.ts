@@ -0,0 +1,38 @@
+import { describe, expect, it } from 'vitest';
+import { applyConsoleDelta } from '../consoleDelta';
+
+const record = (command: string, output: string) => ({ ps1: '$', command, output });
+
+describe('applyConsoleDelta', () => {
+  it('replaces the console when the delta starts at the beginning', () => {
+    const console = [record('ls', 'a')];
+    expect(applyConsoleDelta(console, { output: [record('pwd', '/')] })).toEqual([record('pwd', '/')]);
+    expect(applyConsoleDelta(null, { output: [], start: 0, offset: 0 })).toEqual([]);
+  });
+
+  it('continues the output of the last known record', () => {
+    const console = [record('ls', 'a'), record('make', 'step 1\n')];
+    const delta = { output: [record('make', 'step 2\n'), record('ls', 'b')], start: 1, offset: 7 };
+    expect(applyConsoleDelta(console, delta)).toEqual([
+      record('ls', 'a'),
+      record('make', 'step 1\nstep 2\n'),
+      record('ls', 'b'),
+    ]);
+  });
+
+  it('appends records after the known console', () => {
+    const console = [record('ls', 'a')];
+    expect(applyConsoleDelta(console, { output: [record('pwd', '/')], start: 1 })).toEqual([
+      record('ls', 'a'),
+      record('pwd', '/'),
+    ]);
+  });
+
+  it('rejects deltas that do not fit', () => {
+    const console = [record('ls', 'a')];
+    expect(applyConsoleDelta(null, { output: [record('ls', 'b')], start: 1 })).toBeNull();
+    expect(applyConsoleDelta(console, { output: [], start: 3 })).toBeNull();
+    expect(applyConsoleDelta(console, { output: [record('ls', 'b')], start: 0, offset: 5 })).toBeNull();
+    expect(applyConsoleDelta(console, { output: 'text', start: 1 })).toBeNull();
+  });
+});
@@ -0,0 +1,51 @@
+import { describe, expect, it } from 'vitest';
+import { revertUnifiedDiff } from '../unifiedDiff';
+
+// Produced by the backend (difflib.unified_diff) for the cases below
+describe('revertUnifiedDiff', () => {
+  it('restores changed, added and removed lines', () => {
+    const content = 'a\nB\nc\nd\ne\nf\ng\nh\ni\nnew\n';
+    const diff = [
+      '--- a/x.txt',
+      '+++ b/x.txt',
+      '@@ -1,5 +1,5 @@',
+      ' a',
+      '-b',
+      '+B',
+      ' c',
+      ' d',
+      ' e',
+      '@@ -7,4 +7,4 @@',
+      ' g',
+      ' h',
+      ' i',
+      '-j',
+      '+new',
+      '',
+    ].join('\n');
+    expect(revertUnifiedDiff(content, diff)).toBe('a\nb\nc\nd\ne\nf\ng\nh\ni\nj\n');
+  });
+
+  it('handles missing final newlines and emptied files', () => {
+    const diff = [
+      '--- a/x.txt',
+      '+++ b/x.txt',
+      '@@ -1,2 +1,2 @@',
+      ' a',
+      '-b',
+      '\\ No newline at end of file',
+      '+b',
+      '',
+    ].join('\n');
+    expect(revertUnifiedDiff('a\nb\n', diff)).toBe('a\nb');
+
+    const emptied = '--- a/x\n+++ b/x\n@@ -1 +0,0 @@\n-gone\n';
+    expect(revertUnifiedDiff('', emptied)).toBe('gone\n');
+    expect(revertUnifiedDiff('same\n', '')).toBe('same\n');
+  });
+
+  it('rejects diffs that do not match the content', () => {
+    const diff = '--- a/x\n+++ b/x\n@@ -1 +1 @@\n-old\n+new\n';
+    expect(revertUnifiedDiff('other\n', diff)).toBeNull();
+  });
+});
@@ -0,0 +1,42 @@
+/**
+ * Splice the console deltas carried by terminal_update events.
+ * Events send the console records from `start` on, the first continuing
+ * that record after `offset` characters of its output, instead of the
+ * whole console every time.
+ */
+
+export interface ConsoleRecord {
+  ps1?: string;
+  command?: string;
+  output?: string;
+}
+
+export interface ConsoleDelta {
+  output: unknown;
+  start?: number;
+  offset?: number;
+}
+
+/**
+ * Apply a delta to the console it continues.
+ * Returns null when it does not fit (e.g. updates were missed), in which
+ * case the whole console has to be reloaded.
+ */
+export function applyConsoleDelta(
+  console: ConsoleRecord[] | null,
+  delta: ConsoleDelta,
+): ConsoleRecord[] | null {
+  if (!Array.isArray(delta.output)) return null;
+  const records = delta.output as ConsoleRecord[];
+  const start = delta.start ?? 0;
+  const offset = delta.offset ?? 0;
+  if (start === 0 && offset === 0) return [...records];
+  if (!console || start > console.length) return null;
+  const merged = [...console.slice(0, start), ...records];
+  if (offset && records.length) {
+    const kept = console[start]?.output ?? '';
+    if (kept.length < offset) return null;
+    merged[start] = { ...records[0], output: kept.slice(0, offset) + (records[0].output ?? '') };
+  }
+  return merged;
+}
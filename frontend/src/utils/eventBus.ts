@@ -31,13 +31,16 @@ export type AppEvents = {
     sessionId: string
     shellId: string
     output: unknown
+    start?: number
+    offset?: number
   }
   /** Official file / text_editor panel update */
   'tool:file_update': {
     sessionId: string
     path: string
-    content: string
-    oldContent?: string | null
+    /** Omitted for large files */
+    content?: string | null
+    diff?: string | null
     file?: FileInfo | null
   }
 }
@@ -0,0 +1,63 @@
+/**
+ * Reverse-apply the unified diffs carried by file tool events.
+ * Events send the file after the call plus a diff against the file before
+ * it, so the Original side is rebuilt here instead of being sent in full.
+ */
+
+const HUNK_HEADER = /^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@/;
+
+/** Split into lines that keep their "\n" (the last one may lack it). */
+function splitLines(text: string): string[] {
+  const parts = text.split('\n');
+  const lines = parts.slice(0, -1).map((part) => `${part}\n`);
+  const last = parts[parts.length - 1];
+  if (last) lines.push(last);
+  return lines;
+}
+
+function stripEol(line: string): string {
+  return line.endsWith('\n') ? line.slice(0, -1) : line;
+}
+
+/**
+ * Rebuild the text a diff was taken from, given the text it produced.
+ * Returns null when the diff does not apply (e.g. the file changed since).
+ */
+export function revertUnifiedDiff(content: string, diff: string): string | null {
+  const newLines = splitLines(content);
+  const diffLines = splitLines(diff);
+  const oldLines: string[] = [];
+  let next = 0;
+  let inHunk = false;
+
+  for (let i = 0; i < diffLines.length; i++) {
+    const line = diffLines[i];
+    const header = HUNK_HEADER.exec(line);
+    if (header) {
+      // An empty range names the line the hunk follows
+      const count = header[2] === undefined ? 1 : Number(header[2]);
+      const start = count === 0 ? Number(header[1]) : Number(header[1]) - 1;
+      if (start < next || start > newLines.length) return null;
+      while (next < start) oldLines.push(newLines[next++]);
+      inHunk = true;
+      continue;
+    }
+    // File headers before the first hunk
+    if (!inHunk) continue;
+
+    const marker = line[0];
+    const text = line.slice(1);
+    if (marker === ' ' || marker === '+') {
+      if (next >= newLines.length || stripEol(newLines[next]) !== stripEol(text)) return null;
+      if (marker === ' ') oldLines.push(newLines[next]);
+      next++;
+    } else if (marker === '-') {
+      const noNewline = diffLines[i + 1]?.startsWith('\\');
+      oldLines.push(noNewline ? stripEol(text) : text);
+    } else if (marker !== '\\') {
+      return null;
+    }
+  }
+  while (next < newLines.length) oldLines.push(newLines[next++]);
+  return oldLines.join('');
+}
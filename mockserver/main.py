@@ -1,5 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import json
 import yaml
@@ -9,6 +10,8 @@ from pathlib import Path
 import asyncio
 import logging
 import sys
+import time
+import uuid
 
 # Configure logging
 logger = logging.getLogger()
@@ -43,6 +46,7 @@ class ChatCompletionRequest(BaseModel):
     temperature: Optional[float] = 0.7
     max_tokens: Optional[int] = None
     stream: Optional[bool] = False
+    stream_options: Optional[Dict[str, Any]] = None
 
 class ChatCompletionResponse(BaseModel):
     #id: str
@@ -50,6 +54,7 @@ class ChatCompletionResponse(BaseModel):
     #created: int
     #model: str
     choices: List[Dict[str, Any]]
+    usage: Optional[Dict[str, Any]] = None
 
 def load_mock_data():
     # Get mock data filename from environment variable, default to default.yaml
@@ -86,4 +91,74 @@ async def chat_completions(request: ChatCompletionRequest):
     response = mock_data[current_index]
     current_index = (current_index + 1) % len(mock_data)
     logger.info(f"Returning mock response {current_index}/{len(mock_data)}")
-    return response
+    usage = response.get("usage") or estimate_usage(request, response)
+    if request.stream:
+        include_usage = bool((request.stream_options or {}).get("include_usage"))
+        return StreamingResponse(
+            stream_response(request.model, response, usage if include_usage else None),
+            media_type="text/event-stream",
+        )
+    return {**response, "usage": usage}
+
+
+def estimate_usage(request: ChatCompletionRequest, response: Dict[str, Any]) -> Dict[str, Any]:
+    """Rough token counts (~4 characters per token) for canned responses"""
+    prompt_chars = sum(len(m.content or "") for m in request.messages)
+    message = response["choices"][0].get("message") or {}
+    completion_chars = len(message.get("content") or "") + sum(
+        len(tc.get("function", {}).get("arguments") or "") for tc in message.get("tool_calls") or []
+    )
+    prompt_tokens = prompt_chars // 4 + 1
+    completion_tokens = completion_chars // 4 + 1
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": 0},
+    }
+
+
+def split_text(text: str, size: int) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] if text else []
+
+
+async def stream_response(model: str, response: Dict[str, Any], usage: Optional[Dict[str, Any]]):
+    """Replay a canned response as OpenAI chat.completion.chunk SSE events"""
+    chunk_chars = int(os.getenv("MOCK_STREAM_CHUNK_CHARS", "16"))
+    chunk_delay = float(os.getenv("MOCK_STREAM_CHUNK_DELAY", "0.02"))
+    completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+
+    def event(delta: Dict[str, Any], finish_reason: Optional[str] = None, chunk_usage=None) -> str:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [] if chunk_usage else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        if chunk_usage:
+            chunk["usage"] = chunk_usage
+        return f"data: {json.dumps(chunk)}\n\n"
+
+    message = response["choices"][0].get("message") or {}
+    yield event({"role": "assistant", "content": ""})
+    for piece in split_text(message.get("content") or "", chunk_chars):
+        await asyncio.sleep(chunk_delay)
+        yield event({"content": piece})
+    tool_calls = message.get("tool_calls") or []
+    for index, tool_call in enumerate(tool_calls):
+        function = tool_call.get("function") or {}
+        yield event({"tool_calls": [{
+            "index": index,
+            "id": tool_call.get("id") or f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": function.get("name"), "arguments": ""},
+        }]})
+        for piece in split_text(function.get("arguments") or "", chunk_chars):
+            await asyncio.sleep(chunk_delay)
+            yield event({"tool_calls": [{"index": index, "function": {"arguments": piece}}]})
+    yield event({}, finish_reason="tool_calls" if tool_calls else "stop")
+    if usage:
+        yield event({}, chunk_usage=usage)
+    yield "data: [DONE]\n\n"
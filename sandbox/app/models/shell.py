@@ -35,6 +35,9 @@ class ShellViewResult(BaseModel):
     output: str = Field(..., description="Shell session output content")
     session_id: str = Field(..., description="Shell session ID")
     console: Optional[List[ConsoleRecord]] = Field(None, description="Console command records")
+    console_start: int = Field(0, description="Index of the first returned console record")
+    console_offset: int = Field(0, description="Output length of the first returned record already known to the caller; its returned output continues from there")
+    console_cursor: Optional[str] = Field(None, description="Cursor to pass to the next view to get only newer console output")
 
 
 class ShellWaitResult(BaseModel):
@@ -12,6 +12,7 @@ class ShellViewRequest(BaseModel):
     """Shell session content view request model"""
     id: str = Field(..., description="Unique identifier of the target shell session")
     console: Optional[bool] = Field(False, description="Whether to return console records")
+    console_cursor: Optional[str] = Field(None, description="Cursor from a previous view; only console output after it is returned")
 
 
 class ShellWaitRequest(BaseModel):
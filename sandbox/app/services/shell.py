@@ -11,8 +11,12 @@ a fresh subprocess per command.
 
 Command completion, exit code, user, host and cwd are detected through a
 PS1 sentinel that prints a machine-readable JSON block after every command.
+Every block carries an increasing sequence number, so the pane is read
+incrementally: each refresh only captures the rows after the newest prompt
+already parsed instead of the whole scrollback.
 """
 import asyncio
+import hashlib
 import json
 import logging
 import os
@@ -43,11 +47,13 @@ PS1_REGEX = re.compile(re.escape(PS1_BEGIN) + r"\n(.*?)" + re.escape(PS1_END), r
 # The PS1 value exported before every prompt via PROMPT_COMMAND:
 # - `$?` and `$(pwd)` expand when PROMPT_COMMAND re-exports PS1 (i.e. right
 #   after each command finishes), capturing exit code and working directory.
+# - `$((++__manus_ps1_seq))` numbers the prompts, so a block that is captured
+#   again (or redrawn by readline) is never mistaken for a new one.
 # - `\u`, `\h` and `\n` survive as-is and are rendered by bash prompt expansion.
 _PS1_EXPORT = (
     "export PROMPT_COMMAND='export PS1=\""
     r"\n" + PS1_BEGIN + r"\n"
-    r"{\"exit_code\": \"$?\", \"username\": \"\u\", \"hostname\": \"\h\", \"working_dir\": \"$(pwd)\"}"
+    r"{\"exit_code\": \"$?\", \"seq\": $((++__manus_ps1_seq)), \"username\": \"\u\", \"hostname\": \"\h\", \"working_dir\": \"$(pwd)\"}"
     r"\n" + PS1_END + r"\n"
     "\"'"
 )
@@ -64,9 +70,18 @@ export PAGER=cat
 export GIT_PAGER=cat
 """
 
-# tmux pane history limit (lines); large enough for block counting to stay valid
+# tmux pane history limit (lines); once reached, rows scroll off the top and
+# absolute row numbers drift, so refreshes fall back to a full capture
 HISTORY_LIMIT = 100000
 
+# Scrollback is cleared between commands once it grows past this many rows;
+# finished commands live on in the console records, not in the pane
+HISTORY_TRIM_ROWS = 10000
+
+# Attempts at an incremental capture before falling back to a full capture
+# when output keeps scrolling between reading the history size and capturing
+CAPTURE_ATTEMPTS = 3
+
 # Special tmux key names accepted by shell_write (e.g. sending Ctrl-C)
 SPECIAL_KEY_REGEX = re.compile(r"^C-[a-zA-Z]$")
 
@@ -122,26 +137,75 @@ class ShellService:
     # tmux plumbing (synchronous — always called through asyncio.to_thread)
     # ------------------------------------------------------------------
 
-    def _capture_sync(self, pane: libtmux.Pane) -> str:
-        """Capture the full pane content including scrollback history"""
-        result = pane.cmd("capture-pane", "-J", "-p", "-S", "-", "-E", "-")
+    def _capture_sync(self, pane: libtmux.Pane, start: Optional[int] = None) -> str:
+        """Capture pane content from row `start` (tmux-relative, negative rows
+        are scrollback) to the bottom, or the whole scrollback if omitted"""
+        result = pane.cmd("capture-pane", "-J", "-p", "-S", "-" if start is None else str(start), "-E", "-")
         if result.stderr and not result.stdout:
             raise ShellDeadError("\n".join(result.stderr))
         # `-J` joins wrapped lines but preserves trailing spaces (tmux pads
         # lines to the pane width on some versions, e.g. 3.2a), so strip them
         return "\n".join(line.rstrip() for line in result.stdout)
 
+    def _pane_rows_sync(self, pane: libtmux.Pane) -> Tuple[int, int]:
+        """Rows in the pane's scrollback and the cursor row within the screen"""
+        result = pane.cmd("display-message", "-p", "#{history_size} #{cursor_y}")
+        if result.stderr and not result.stdout:
+            raise ShellDeadError("\n".join(result.stderr))
+        history, cursor = result.stdout[0].split()
+        return int(history), int(cursor)
+
+    def _capture_new_sync(self, shell: Dict[str, Any]) -> Tuple[int, str]:
+        """Capture the pane from the first row not yet known to be parsed
+
+        Rows are addressed absolutely (scrollback rows first, then screen
+        rows). The history size is read before and after the capture so rows
+        scrolling into the history in between cannot shift the window past
+        unseen output.
+
+        Returns:
+            (absolute row of the first captured line, captured content)
+        """
+        pane = shell["pane"]
+        scan_row = shell["scan_row"]
+        for _ in range(CAPTURE_ATTEMPTS):
+            history, cursor = self._pane_rows_sync(pane)
+            if history < shell["history_size"] or history + cursor < scan_row or history >= HISTORY_LIMIT:
+                # The screen or scrollback was cleared (e.g. `clear`), a
+                # full-screen program is drawing, or the scrollback is full
+                # and rows drop off the top: row numbers are no longer valid
+                break
+            content = self._capture_sync(pane, scan_row - history)
+            if self._pane_rows_sync(pane)[0] == history:
+                shell["history_size"] = history
+                return scan_row, content
+
+        content = self._capture_sync(pane)
+        shell["history_size"] = self._pane_rows_sync(pane)[0]
+        return 0, content
+
+    def _trim_history_sync(self, shell: Dict[str, Any]) -> None:
+        """Drop scrollback rows of finished commands (shell must be idle)"""
+        pane = shell["pane"]
+        history, _ = self._pane_rows_sync(pane)
+        if history < HISTORY_TRIM_ROWS:
+            return
+        pane.cmd("clear-history")
+        # Screen rows move up by the number of dropped scrollback rows
+        shell["scan_row"] = max(0, shell["scan_row"] - history)
+        shell["history_size"] = 0
+
     def _parse_blocks(self, content: str) -> List[Tuple[re.Match, Dict[str, Any]]]:
         """Find all valid PS1 sentinel blocks (match + parsed metadata)"""
         blocks = []
         for match in PS1_REGEX.finditer(content):
             try:
                 meta = json.loads(match.group(1).strip(), strict=False)
-                if isinstance(meta, dict):
-                    blocks.append((match, meta))
             except json.JSONDecodeError:
                 # e.g. the echoed rc file line or partially rendered prompt
                 continue
+            if isinstance(meta, dict) and isinstance(meta.get("seq"), int):
+                blocks.append((match, meta))
         return blocks
 
     def _create_tmux_shell_sync(self, session_id: str, start_dir: str) -> Tuple[libtmux.Session, libtmux.Pane]:
@@ -202,10 +266,27 @@ class ShellService:
             text = "\n".join(text.splitlines()[sent_lines:])
         return text.rstrip()
 
+    def _output_start(self, content: str, blocks: List[Tuple[re.Match, Dict[str, Any]]], prompt_seq: int) -> int:
+        """Offset in `content` where the output of the command typed after
+        prompt `prompt_seq` begins"""
+        start = 0
+        for match, meta in blocks:
+            if meta["seq"] <= prompt_seq:
+                start = match.end()
+        if start:
+            return start
+        # The capture may begin inside the prompt block (row positions are a
+        # lower bound when long lines wrap); skip its tail
+        end = content.find(PS1_END)
+        begin = content.find(PS1_BEGIN)
+        if end != -1 and (begin == -1 or end < begin):
+            return end + len(PS1_END)
+        return 0
+
     def _refresh_sync(self, shell: Dict[str, Any]) -> None:
-        """Re-read the tmux pane and update current command state/output"""
+        """Read new pane rows and update current command state/output"""
         try:
-            content = self._capture_sync(shell["pane"])
+            first_row, content = self._capture_new_sync(shell)
         except ShellDeadError:
             # bash exited (e.g. the user ran `exit`); finalize gracefully
             shell["dead"] = True
@@ -217,49 +298,38 @@ class ShellService:
             return
 
         blocks = self._parse_blocks(content)
-        if blocks:
-            meta = blocks[-1][1]
-            shell["meta"] = meta
-            if meta.get("working_dir"):
-                shell["last_cwd"] = meta["working_dir"]
 
         cur = shell.get("current")
-        if cur is None or cur["done"]:
-            return
-
-        k = cur["k"]
-        idle = content.rstrip().endswith(PS1_END)
-        completing = None
-        prompt_block = None
-        if len(blocks) > k:
-            prompt_block = blocks[k - 1][0]
-            completing = blocks[k]
-        elif blocks and len(blocks) >= k:
-            prompt_block = blocks[k - 1][0]
-        elif blocks:
-            # History overflowed and earlier prompts were dropped; approximate
-            if idle:
-                completing = blocks[-1]
-                prompt_block = blocks[-2][0] if len(blocks) >= 2 else None
+        if cur is not None and not cur["done"]:
+            completing = next((b for b in blocks if b[1]["seq"] > cur["prompt_seq"]), None)
+            start = self._output_start(content, blocks, cur["prompt_seq"])
+            if completing is not None:
+                raw = content[start:completing[0].start()]
+                cur["done"] = True
+                try:
+                    cur["returncode"] = int(completing[1].get("exit_code", -1))
+                except (TypeError, ValueError):
+                    cur["returncode"] = -1
+                shell["last_returncode"] = cur["returncode"]
             else:
-                prompt_block = blocks[-1][0]
+                raw = content[start:]
 
-        start = prompt_block.end() if prompt_block is not None else 0
-        if completing is not None:
-            raw = content[start:completing[0].start()]
-            cur["done"] = True
-            try:
-                cur["returncode"] = int(completing[1].get("exit_code", -1))
-            except (TypeError, ValueError):
-                cur["returncode"] = -1
-            shell["last_returncode"] = cur["returncode"]
-        else:
-            raw = content[start:]
+            output = self._remove_ansi_escape_codes(self._extract_output(raw, cur["sent_text"]))
+            cur["output"] = output
+            if shell["console"]:
+                shell["console"][-1].output = output
 
-        output = self._remove_ansi_escape_codes(self._extract_output(raw, cur["sent_text"]))
-        cur["output"] = output
-        if shell["console"]:
-            shell["console"][-1].output = output
+        if blocks:
+            match, meta = blocks[-1]
+            if meta["seq"] > shell["last_seq"]:
+                shell["last_seq"] = meta["seq"]
+                shell["meta"] = meta
+                if meta.get("working_dir"):
+                    shell["last_cwd"] = meta["working_dir"]
+            # Everything up to the newest prompt is parsed; the next refresh
+            # starts at the prompt line. Joined (-J) lines may span several
+            # rows, so counting lines gives a lower bound of the real row.
+            shell["scan_row"] = first_row + content.count("\n", 0, match.end()) + 1
 
     async def _refresh(self, shell: Dict[str, Any]) -> None:
         await asyncio.to_thread(self._refresh_sync, shell)
@@ -288,13 +358,13 @@ class ShellService:
         """Run a housekeeping command (e.g. cd) without recording it in console"""
         pane = shell["pane"]
         async with shell["lock"]:
-            blocks_before = len(self._parse_blocks(await asyncio.to_thread(self._capture_sync, pane)))
+            await self._refresh(shell)
+            seq_before = shell["last_seq"]
             await asyncio.to_thread(pane.send_keys, command, enter=True, literal=True)
         deadline = time.monotonic() + timeout
         while time.monotonic() < deadline:
-            content = await asyncio.to_thread(self._capture_sync, pane)
-            if len(self._parse_blocks(content)) > blocks_before:
-                await self._locked_refresh(shell)
+            await self._locked_refresh(shell)
+            if shell["last_seq"] > seq_before:
                 return
             await asyncio.sleep(0.1)
         raise AppException(message=f"Timed out running internal command: {command}")
@@ -330,6 +400,10 @@ class ShellService:
                 "meta": None,
                 "last_cwd": exec_dir,
                 "dead": False,
+                # Incremental capture state (see _capture_new_sync)
+                "scan_row": 0,
+                "history_size": 0,
+                "last_seq": 0,
             })
             await self._refresh(shell)
             return shell
@@ -386,15 +460,16 @@ class ShellService:
 
             async with shell["lock"]:
                 pane = shell["pane"]
+                await self._refresh(shell)
+                await asyncio.to_thread(self._trim_history_sync, shell)
                 ps1 = self._format_ps1(shell)
-                content = await asyncio.to_thread(self._capture_sync, pane)
-                blocks_before = len(self._parse_blocks(content))
+                prompt_seq = shell["last_seq"]
 
                 await asyncio.to_thread(pane.send_keys, command, enter=True, literal=True)
                 shell["current"] = {
                     "command": command,
                     "sent_text": command,
-                    "k": blocks_before,
+                    "prompt_seq": prompt_seq,
                     "done": False,
                     "returncode": None,
                     "output": "",
@@ -439,9 +514,17 @@ class ShellService:
         shell["dead"] = True
         await self._ensure_shell(session_id, start_dir)
 
-    async def view_shell(self, session_id: str, console: bool = False) -> ShellViewResult:
+    async def view_shell(
+        self,
+        session_id: str,
+        console: bool = False,
+        console_cursor: Optional[str] = None,
+    ) -> ShellViewResult:
         """
         View the current command output of the specified shell session
+
+        Given the cursor of a previous view, only console output after it is
+        returned (see ``_console_since``).
         """
         logger.debug(f"Viewing shell content for session: {session_id}")
         if session_id not in self.active_shells:
@@ -452,17 +535,71 @@ class ShellService:
         await self._locked_refresh(shell)
         output = self._current_output(shell)
 
-        if console:
-            console_records = self.get_console_records(session_id)
-        else:
-            console_records = None
+        if not console:
+            return ShellViewResult(output=output, session_id=session_id)
 
+        records, start, offset, cursor = self._console_since(shell, console_cursor)
         return ShellViewResult(
             output=output,
             session_id=session_id,
-            console=console_records
+            console=records,
+            console_start=start,
+            console_offset=offset,
+            console_cursor=cursor,
         )
 
+    @staticmethod
+    def _console_digest(record: ConsoleRecord, length: int) -> str:
+        text = f"{record.ps1}\0{record.command}\0{record.output[:length]}"
+        return hashlib.sha1(text.encode("utf-8", errors="replace")).hexdigest()[:16]
+
+    def _console_since(
+        self,
+        shell: Dict[str, Any],
+        cursor: Optional[str],
+    ) -> Tuple[List[ConsoleRecord], int, int, str]:
+        """Console records after a cursor, as (records, start, offset, new cursor)
+
+        Records are only ever appended and only the last one's output
+        changes, so the records from the cursor's record on are returned,
+        the first without the ``offset`` characters of output the caller
+        already has. A cursor that does not match (unknown record, output
+        rewritten rather than appended) yields that record in full, or the
+        whole console.
+        """
+        raw_console = shell["console"]
+        start, offset, digest = 0, 0, None
+        if cursor:
+            try:
+                index, length, digest = cursor.split(":", 2)
+                start, offset = int(index), int(length)
+            except ValueError:
+                start, offset = 0, 0
+            if not 0 <= start < len(raw_console):
+                start, offset = 0, 0
+
+        records = [
+            ConsoleRecord(
+                ps1=record.ps1,
+                command=record.command,
+                output=self._remove_ansi_escape_codes(record.output),
+            )
+            for record in raw_console[start:]
+        ]
+        if records:
+            last = records[-1]
+            new_cursor = f"{start + len(records) - 1}:{len(last.output)}:{self._console_digest(last, len(last.output))}"
+        else:
+            new_cursor = ""
+
+        if offset:
+            first = records[0]
+            if offset <= len(first.output) and self._console_digest(first, offset) == digest:
+                first.output = first.output[offset:]
+            else:
+                offset = 0
+        return records, start, offset, new_cursor
+
     def get_console_records(self, session_id: str) -> List[ConsoleRecord]:
         """
         Get command console records for the specified session
@@ -21,10 +21,10 @@ def _exec(client, session_id, command, exec_dir=None):
     return response.json()["data"]
 
 
-def _view(client, session_id, console=False):
+def _view(client, session_id, console=False, console_cursor=None):
     response = client.post(
         f"{BASE_URL}/api/v1/shell/view",
-        json={"id": session_id, "console": console},
+        json={"id": session_id, "console": console, "console_cursor": console_cursor},
     )
     assert response.status_code == 200, response.text
     return response.json()["data"]
@@ -225,6 +225,18 @@ class TestShellConsole:
         assert "@" in console[0]["ps1"]
         assert console[0]["ps1"].endswith("$")
 
+    def test_console_cursor_returns_new_output_only(self, client, session_id):
+        _exec(client, session_id, "echo cmd_one")
+        cursor = _view(client, session_id, console=True)["console_cursor"]
+        _exec(client, session_id, "echo cmd_two")
+
+        data = _view(client, session_id, console=True, console_cursor=cursor)
+        assert data["console_start"] == 0
+        assert data["console_offset"] > 0
+        assert [r["command"] for r in data["console"]] == ["echo cmd_one", "echo cmd_two"]
+        assert data["console"][0]["output"] == ""
+        assert "cmd_two" in data["console"][1]["output"]
+
     def test_view_unknown_session(self, client):
         response = client.post(
             f"{BASE_URL}/api/v1/shell/view",
@@ -0,0 +1,79 @@
+"""Unit tests for incremental tmux capture in ShellService.
+
+Each refresh should only capture pane rows after the newest parsed prompt,
+so polling cost follows new output instead of the whole scrollback.
+Requires a local tmux binary.
+"""
+import shutil
+import uuid
+
+import pytest
+
+from app.services.shell import ShellService
+
+pytestmark = pytest.mark.skipif(shutil.which("tmux") is None, reason="tmux not installed")
+
+
+@pytest.fixture
+def shell_service():
+    service = ShellService()
+    service.active_shells = {}
+    yield service
+    for shell in service.active_shells.values():
+        service._kill_tmux_session(shell)
+
+
+def _record_capture_starts(service: ShellService) -> list:
+    starts = []
+    original = service._capture_sync
+
+    def capture(pane, start=None):
+        starts.append(start)
+        return original(pane, start)
+
+    service._capture_sync = capture
+    return starts
+
+
+@pytest.mark.asyncio
+async def test_polls_do_not_recapture_scrollback(shell_service):
+    session_id = str(uuid.uuid4())
+    result = await shell_service.exec_command(session_id, "/tmp", "seq 1 3000")
+    assert result.status == "completed"
+
+    starts = _record_capture_starts(shell_service)
+    result = await shell_service.exec_command(session_id, None, "echo fresh")
+    view = await shell_service.view_shell(session_id)
+
+    assert result.output == "fresh"
+    assert view.output == "fresh"
+    # Every capture starts after the 3000 lines of the previous command
+    assert starts and None not in starts
+    shell = shell_service.active_shells[session_id]
+    assert shell["scan_row"] > 3000
+
+
+@pytest.mark.asyncio
+async def test_long_running_output_and_exit_code(shell_service):
+    session_id = str(uuid.uuid4())
+    result = await shell_service.exec_command(session_id, "/tmp", "sleep 6; seq 1 5; false")
+    assert result.status == "running"
+
+    wait = await shell_service.wait_for_process(session_id, 10)
+    view = await shell_service.view_shell(session_id)
+
+    assert wait.returncode == 1
+    assert view.output == "1\n2\n3\n4\n5"
+
+
+@pytest.mark.asyncio
+async def test_commands_still_complete_after_clear(shell_service):
+    session_id = str(uuid.uuid4())
+    await shell_service.exec_command(session_id, "/tmp", "seq 1 50")
+    result = await shell_service.exec_command(session_id, None, "clear")
+    assert result.status == "completed"
+
+    result = await shell_service.exec_command(session_id, None, "echo after-clear")
+
+    assert result.status == "completed"
+    assert result.output == "after-clear"
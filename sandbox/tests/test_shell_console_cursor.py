@@ -0,0 +1,63 @@
+"""Unit tests for cursor-based console views in ShellService.
+
+A view given the cursor of the previous one returns only the console
+output produced since, so polling cost follows new output instead of the
+whole console history.
+"""
+from app.models.shell import ConsoleRecord
+from app.services.shell import ShellService
+
+
+def _shell(*records):
+    return {"console": [ConsoleRecord(ps1="u@h:~ $", command=c, output=o) for c, o in records]}
+
+
+def _apply(records, start, offset, delta):
+    """Splice a delta into a client-side copy of the console"""
+    merged = [dict(r) for r in records[:start]]
+    delta = [r.model_dump() for r in delta]
+    if delta and offset:
+        delta[0]["output"] = records[start]["output"][:offset] + delta[0]["output"]
+    return merged + delta
+
+
+def test_views_return_only_new_output():
+    service = ShellService()
+    shell = _shell(("make", "step 1\n"))
+
+    records, start, offset, cursor = service._console_since(shell, None)
+    assert (start, offset) == (0, 0)
+    client = _apply([], start, offset, records)
+
+    shell["console"][0].output += "step 2\n"
+    shell["console"].append(ConsoleRecord(ps1="u@h:~ $", command="ls", output="a b"))
+    records, start, offset, cursor = service._console_since(shell, cursor)
+    assert (start, offset) == (0, len("step 1\n"))
+    assert [r.output for r in records] == ["step 2\n", "a b"]
+    client = _apply(client, start, offset, records)
+    assert [r["output"] for r in client] == ["step 1\nstep 2\n", "a b"]
+
+    # Nothing new: the last record comes back with empty output
+    records, start, offset, _ = service._console_since(shell, cursor)
+    assert (start, offset) == (1, 3)
+    assert [r.output for r in records] == [""]
+
+
+def test_rewritten_output_is_returned_in_full():
+    service = ShellService()
+    shell = _shell(("ls", "x"), ("pip install", "10%"))
+    _, _, _, cursor = service._console_since(shell, None)
+
+    # Progress bars redraw rather than append
+    shell["console"][1].output = "100%"
+    records, start, offset, _ = service._console_since(shell, cursor)
+    assert (start, offset) == (1, 0)
+    assert [r.output for r in records] == ["100%"]
+
+
+def test_unknown_cursor_returns_whole_console():
+    service = ShellService()
+    shell = _shell(("ls", "x"))
+    for cursor in ("bogus", "7:0:abc", ""):
+        records, start, offset, _ = service._console_since(shell, cursor)
+        assert (start, offset, len(records)) == (0, 0, 1)